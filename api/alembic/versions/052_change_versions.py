@@ -0,0 +1,51 @@
+"""Add change_versions — cheap per-tenant / per-site change counters.
+
+Revision ID: 052
+Revises: 051
+Create Date: 2026-10-19
+
+Additive only.  Creates one new table — ``change_versions`` — holding a
+monotonic counter per ``(tenant_id, scope_key)``.  The LLLM summary
+cache reads it with a single primary-key lookup to decide whether a
+cached summary is still current, instead of re-loading every device,
+call-record aggregate and incident first.
+
+The table starts empty; a missing row reads as version 0, so no
+backfill is needed.  Guarded by a table-existence check (idempotent,
+safe to re-run).  The downgrade is a clean ``drop_table``.
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "052"
+down_revision = "051"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    existing = set(sa.inspect(bind).get_table_names())
+
+    if "change_versions" not in existing:
+        op.create_table(
+            "change_versions",
+            sa.Column("tenant_id", sa.String(100), primary_key=True),
+            sa.Column("scope_key", sa.String(100), primary_key=True),
+            sa.Column("version", sa.BigInteger(), nullable=False, server_default="0"),
+            sa.Column(
+                "updated_at",
+                sa.DateTime(timezone=True),
+                server_default=sa.func.now(),
+                nullable=False,
+            ),
+        )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    existing = set(sa.inspect(bind).get_table_names())
+
+    if "change_versions" in existing:
+        op.drop_table("change_versions")
@@ -0,0 +1,92 @@
+"""Add the precomputed customer portfolio read model.
+
+Revision ID: 053
+Revises: 052
+Create Date: 2026-10-19
+
+Additive only.  Creates two derived-data tables:
+
+  * ``customer_portfolio_read_models`` — one header row per tenant
+    (change versions at build time, visibility config key, portfolio
+    aggregates, TTL, refresh debounce timestamp).
+  * ``customer_portfolio_buildings`` — one serialized building record
+    per row, with ``position`` / ``status`` / ``search_text`` so the
+    customer locations page, search and detail views read O(page) rows.
+
+Both start empty and are filled on first read; no backfill is needed.
+Guarded by table-existence checks (idempotent, safe to re-run).  The
+downgrade drops both tables — they hold nothing that cannot be rebuilt.
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects.postgresql import JSONB
+
+revision = "053"
+down_revision = "052"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    existing = set(sa.inspect(bind).get_table_names())
+
+    if "customer_portfolio_read_models" not in existing:
+        op.create_table(
+            "customer_portfolio_read_models",
+            sa.Column("tenant_id", sa.String(100), primary_key=True),
+            sa.Column("config_key", sa.String(64), nullable=False),
+            sa.Column("versions", JSONB(), nullable=False),
+            sa.Column("aggregates", JSONB(), nullable=False),
+            sa.Column("building_count", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("built_at", sa.DateTime(timezone=True), nullable=False),
+            sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+            sa.Column("refresh_requested_at", sa.DateTime(timezone=True), nullable=True),
+            sa.Column(
+                "updated_at",
+                sa.DateTime(timezone=True),
+                server_default=sa.func.now(),
+                nullable=False,
+            ),
+        )
+
+    if "customer_portfolio_buildings" not in existing:
+        op.create_table(
+            "customer_portfolio_buildings",
+            sa.Column("tenant_id", sa.String(100), primary_key=True),
+            sa.Column("building_id", sa.Integer(), primary_key=True),
+            sa.Column("position", sa.Integer(), nullable=False),
+            sa.Column("status", sa.String(40), nullable=True),
+            sa.Column("search_text", sa.Text(), nullable=False, server_default=""),
+            sa.Column("site_ids", JSONB(), nullable=False),
+            sa.Column("record", JSONB(), nullable=False),
+        )
+        op.create_index(
+            "ix_customer_portfolio_buildings_tenant_position",
+            "customer_portfolio_buildings",
+            ["tenant_id", "position"],
+        )
+        op.create_index(
+            "ix_customer_portfolio_buildings_tenant_status",
+            "customer_portfolio_buildings",
+            ["tenant_id", "status"],
+        )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    existing = set(sa.inspect(bind).get_table_names())
+
+    if "customer_portfolio_buildings" in existing:
+        op.drop_index(
+            "ix_customer_portfolio_buildings_tenant_status",
+            table_name="customer_portfolio_buildings",
+        )
+        op.drop_index(
+            "ix_customer_portfolio_buildings_tenant_position",
+            table_name="customer_portfolio_buildings",
+        )
+        op.drop_table("customer_portfolio_buildings")
+    if "customer_portfolio_read_models" in existing:
+        op.drop_table("customer_portfolio_read_models")
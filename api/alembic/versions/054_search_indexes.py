@@ -0,0 +1,83 @@
+"""Add search indexes for customer portfolio search and ops-center lookup.
+
+Revision ID: 054
+Revises: 053
+Create Date: 2026-10-19
+
+Additive only — indexes, no table or data changes.
+
+  * Postgres: enables ``pg_trgm`` and creates GIN trigram indexes on
+    ``lower(col)`` for every column the customer portfolio search matches
+    with ``LIKE '%q%'`` (``app.services.text_search``) — except the
+    two-letter ``e911_state``, too short for trigrams — plus the read
+    model's already-lower-cased ``search_text``.  If the extension cannot
+    be created (insufficient privilege), the trigram indexes are skipped
+    and search keeps working by scanning, as before.
+  * Every dialect: btree expression indexes on ``lower(sites.site_name)``
+    and ``lower(service_units.unit_name)`` for the ops-center exact-name
+    lookup, and a btree on ``devices.iccid`` (``msisdn`` / ``imei`` /
+    ``serial_number`` / ``device_id`` are already indexed).
+
+All statements use ``IF NOT EXISTS`` (idempotent, safe to re-run).  The
+downgrade drops the indexes; the extension is left in place.
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "054"
+down_revision = "053"
+branch_labels = None
+depends_on = None
+
+
+# (index name, table, indexed expression)
+_TRIGRAM = [
+    ("ix_sites_site_name_trgm", "sites", "lower(site_name)"),
+    ("ix_sites_e911_city_trgm", "sites", "lower(e911_city)"),
+    ("ix_sites_site_id_trgm", "sites", "lower(site_id)"),
+    ("ix_service_units_unit_type_trgm", "service_units", "lower(unit_type)"),
+    ("ix_service_units_unit_name_trgm", "service_units", "lower(unit_name)"),
+    ("ix_service_units_location_description_trgm", "service_units", "lower(location_description)"),
+    ("ix_devices_msisdn_trgm", "devices", "lower(msisdn)"),
+    ("ix_lines_did_trgm", "lines", "lower(did)"),
+    ("ix_customer_portfolio_buildings_search_trgm", "customer_portfolio_buildings", "search_text"),
+]
+
+_BTREE = [
+    ("ix_sites_lower_site_name", "sites", "lower(site_name)"),
+    ("ix_service_units_lower_unit_name", "service_units", "lower(unit_name)"),
+    ("ix_devices_iccid", "devices", "iccid"),
+]
+
+
+def _ensure_pg_trgm(bind) -> bool:
+    installed = bind.execute(
+        sa.text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+    ).scalar()
+    if installed:
+        return True
+    try:
+        with bind.begin_nested():
+            bind.execute(sa.text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    except sa.exc.DBAPIError:
+        return False
+    return True
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+
+    for name, table, expr in _BTREE:
+        op.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({expr})")
+
+    if bind.dialect.name == "postgresql" and _ensure_pg_trgm(bind):
+        for name, table, expr in _TRIGRAM:
+            op.execute(
+                f"CREATE INDEX IF NOT EXISTS {name} ON {table} USING gin ({expr} gin_trgm_ops)"
+            )
+
+
+def downgrade() -> None:
+    for name, _table, _expr in _TRIGRAM + _BTREE:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
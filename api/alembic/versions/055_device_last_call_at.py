@@ -0,0 +1,53 @@
+"""Add devices.last_call_at — denormalized most-recent call per device.
+
+Revision ID: 055
+Revises: 054
+Create Date: 2026-10-19
+
+The health loaders read ``MAX(call_records.started_at)`` per device with
+an ``IN`` list of every device id in the tenant.  This column holds the
+same value, maintained when a CDR is ingested
+(``app.services.call_activity.record_call``), so tenant health loading
+is a single device scan.
+
+The upgrade backfills it with one set-based ``UPDATE`` from the
+aggregate; ``devices.last_call_backfill`` jobs re-run the same backfill
+and report parity afterwards.  Guarded by a column-existence check
+(idempotent, safe to re-run).
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "055"
+down_revision = "054"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    columns = {c["name"] for c in sa.inspect(bind).get_columns("devices")}
+
+    if "last_call_at" not in columns:
+        op.add_column("devices", sa.Column("last_call_at", sa.DateTime(timezone=True), nullable=True))
+
+    op.execute("""
+        UPDATE devices SET last_call_at = (
+            SELECT MAX(cr.started_at) FROM call_records cr
+            WHERE cr.tenant_id = devices.tenant_id AND cr.device_id = devices.device_id
+        )
+        WHERE EXISTS (
+            SELECT 1 FROM call_records cr
+            WHERE cr.tenant_id = devices.tenant_id AND cr.device_id = devices.device_id
+              AND cr.started_at IS NOT NULL
+        )
+    """)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    columns = {c["name"] for c in sa.inspect(bind).get_columns("devices")}
+
+    if "last_call_at" in columns:
+        op.drop_column("devices", "last_call_at")
@@ -0,0 +1,48 @@
+"""Unique in-flight jobs.idempotency_key for job de-duplication.
+
+Revision ID: 056
+Revises: 055
+Create Date: 2026-10-19
+
+``job_service.create_and_enqueue`` / ``create_and_enqueue_many`` insert
+with ``ON CONFLICT DO NOTHING`` against a partial UNIQUE index on
+``idempotency_key`` over queued / running rows, so two concurrent bulk runs
+(or a double-clicked SIM action) can never queue the same SIM / line
+operation twice.  Completed and failed rows keep their key without
+blocking a new job.
+
+Existing in-flight duplicates would fail the index build, so the upgrade
+first marks every in-flight row but the newest per key failed.
+
+``IF NOT EXISTS`` (idempotent, safe to re-run); the downgrade drops it.
+"""
+
+from alembic import op
+
+revision = "056"
+down_revision = "055"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        UPDATE jobs
+        SET status = 'failed', completed_at = now(),
+            error = 'Superseded by a newer in-flight job with the same idempotency key'
+        WHERE idempotency_key IS NOT NULL
+          AND status IN ('queued', 'running')
+          AND id NOT IN (
+              SELECT max(id) FROM jobs
+              WHERE idempotency_key IS NOT NULL AND status IN ('queued', 'running')
+              GROUP BY idempotency_key
+          )
+    """)
+    op.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS ux_jobs_active_idempotency_key "
+        "ON jobs (idempotency_key) WHERE status IN ('queued', 'running')"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ux_jobs_active_idempotency_key")
@@ -0,0 +1,41 @@
+"""Add sim_usage_monthly — per-tenant monthly usage rollup.
+
+Revision ID: 057
+Revises: 056
+Create Date: 2026-10-19
+
+Carrier usage polling (``app.services.usage_polling``) upserts
+``sim_usage_daily`` rows — unique on ``(sim_id, usage_date)`` since 007 —
+and rebuilds this rollup for the months it touched.  Additive; guarded by a
+table-existence check (safe to re-run).  The downgrade drops the table.
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "057"
+down_revision = "056"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if sa.inspect(op.get_bind()).has_table("sim_usage_monthly"):
+        return
+    op.create_table(
+        "sim_usage_monthly",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("tenant_id", sa.String(100), nullable=False, index=True),
+        sa.Column("carrier", sa.String(50), nullable=False),
+        sa.Column("month", sa.Date(), nullable=False),
+        sa.Column("sim_count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("bytes_up", sa.BigInteger(), nullable=False, server_default=sa.text("0")),
+        sa.Column("bytes_down", sa.BigInteger(), nullable=False, server_default=sa.text("0")),
+        sa.Column("sms_count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.UniqueConstraint("tenant_id", "carrier", "month", name="uq_sim_usage_monthly"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("sim_usage_monthly")
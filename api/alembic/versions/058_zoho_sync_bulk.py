@@ -0,0 +1,80 @@
+"""Unique customers.zoho_account_id; add zoho_sync_state.
+
+Revision ID: 058
+Revises: 057
+Create Date: 2026-10-19
+
+``zoho_crm.sync_accounts`` now upserts a page of Accounts with one
+``INSERT ... ON CONFLICT (zoho_account_id)``, which needs a unique index —
+the plain ``ix_customers_zoho_account_id`` is rebuilt as unique (NULLs stay
+distinct, so manual customers are unaffected).  The sync already treated
+the column as a key (``scalar_one_or_none``), so duplicates would have
+broken it before.  This runs in ``upgrade head`` at web startup, so the
+upgrade checks for duplicate ids FIRST and stops with the offending
+``zoho_account_id`` values and their customer ids — before touching the
+existing index — rather than failing half-way through the index build.
+Merge or clear the duplicates, then redeploy.
+
+``zoho_sync_state`` holds the per-module watermark for incremental
+(``If-Modified-Since``) syncs.  Guarded (safe to re-run); the downgrade
+restores the plain index and drops the table.
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "058"
+down_revision = "057"
+branch_labels = None
+depends_on = None
+
+
+_DUPLICATES_SHOWN = 20
+
+
+def _assert_no_duplicate_zoho_ids() -> None:
+    rows = op.get_bind().execute(sa.text(
+        "SELECT zoho_account_id, count(*) AS n FROM customers "
+        "WHERE zoho_account_id IS NOT NULL "
+        "GROUP BY zoho_account_id HAVING count(*) > 1 "
+        "ORDER BY zoho_account_id"
+    )).all()
+    if not rows:
+        return
+    lines = []
+    for zoho_id, n in rows[:_DUPLICATES_SHOWN]:
+        ids = op.get_bind().execute(sa.text(
+            "SELECT id FROM customers WHERE zoho_account_id = :z ORDER BY id"
+        ), {"z": zoho_id}).scalars().all()
+        lines.append(f"  zoho_account_id={zoho_id!r}: {n} customers (ids {', '.join(map(str, ids))})")
+    if len(rows) > _DUPLICATES_SHOWN:
+        lines.append(f"  ... and {len(rows) - _DUPLICATES_SHOWN} more")
+    raise RuntimeError(
+        f"058: cannot make customers.zoho_account_id unique — {len(rows)} id(s) are shared "
+        "by more than one customer.  Merge the duplicate customers (or clear "
+        "zoho_account_id on the stale rows), then re-run the upgrade:\n" + "\n".join(lines)
+    )
+
+
+def upgrade() -> None:
+    _assert_no_duplicate_zoho_ids()
+    op.execute("DROP INDEX IF EXISTS ix_customers_zoho_account_id")
+    op.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS ix_customers_zoho_account_id "
+        "ON customers (zoho_account_id)"
+    )
+    if sa.inspect(op.get_bind()).has_table("zoho_sync_state"):
+        return
+    op.create_table(
+        "zoho_sync_state",
+        sa.Column("module", sa.String(50), primary_key=True),
+        sa.Column("scope", sa.String(100), primary_key=True),
+        sa.Column("last_synced_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("zoho_sync_state")
+    op.execute("DROP INDEX IF EXISTS ix_customers_zoho_account_id")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_customers_zoho_account_id ON customers (zoho_account_id)")
@@ -0,0 +1,33 @@
+"""Add provisioning_scan_state.
+
+Revision ID: 059
+Revises: 058
+Create Date: 2026-10-19
+
+Holds the per-scope watermark for incremental provisioning scans
+(``scan_and_enqueue(incremental=True)`` only looks at SIMs / devices /
+lines updated since the last completed scan).  Guarded (safe to re-run).
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "059"
+down_revision = "058"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if sa.inspect(op.get_bind()).has_table("provisioning_scan_state"):
+        return
+    op.create_table(
+        "provisioning_scan_state",
+        sa.Column("scope", sa.String(100), primary_key=True),
+        sa.Column("last_scanned_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("provisioning_scan_state")
@@ -0,0 +1,58 @@
+"""Add the Portfolio Fusion store.
+
+Revision ID: 060
+Revises: 059
+Create Date: 2026-10-19
+
+``portfolio_fusion_records`` / ``portfolio_fusion_twins`` hold the previous
+fusion run (source-record content hashes, join keys, per-cluster twins) so
+``app.services.portfolio_fusion`` only rebuilds the buildings whose inputs
+changed.  Derived data; guarded (safe to re-run).
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects.postgresql import JSONB
+
+revision = "060"
+down_revision = "059"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if "portfolio_fusion_records" not in existing:
+        op.create_table(
+            "portfolio_fusion_records",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("tenant_id", sa.String(100), nullable=False),
+            sa.Column("record_key", sa.String(80), nullable=False),
+            sa.Column("source", sa.String(20), nullable=False),
+            sa.Column("join_keys", JSONB(), nullable=False),
+            sa.Column("cluster_key", sa.String(64), nullable=False),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.UniqueConstraint("tenant_id", "record_key", name="uq_portfolio_fusion_record"),
+        )
+        op.create_index("ix_portfolio_fusion_records_tenant_id", "portfolio_fusion_records", ["tenant_id"])
+        op.create_index("ix_portfolio_fusion_records_cluster_key", "portfolio_fusion_records",
+                        ["cluster_key"])
+
+    if "portfolio_fusion_twins" not in existing:
+        op.create_table(
+            "portfolio_fusion_twins",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("tenant_id", sa.String(100), nullable=False),
+            sa.Column("cluster_key", sa.String(64), nullable=False),
+            sa.Column("member_keys", JSONB(), nullable=False),
+            sa.Column("twin", sa.Text(), nullable=False),
+            sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.UniqueConstraint("tenant_id", "cluster_key", name="uq_portfolio_fusion_twin"),
+        )
+        op.create_index("ix_portfolio_fusion_twins_tenant_id", "portfolio_fusion_twins", ["tenant_id"])
+
+
+def downgrade() -> None:
+    op.drop_table("portfolio_fusion_twins")
+    op.drop_table("portfolio_fusion_records")
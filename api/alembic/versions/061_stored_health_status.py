@@ -0,0 +1,108 @@
+"""Store computed_status / health_status on devices and sites.
+
+Revision ID: 061
+Revises: 060
+Create Date: 2026-10-19
+
+GET /api/sites filters and sorts on these in SQL instead of deriving them
+from every device of the tenant.  They are maintained on flush and by the
+deadline sweep (``app.services.status_rollup``); ``devices.status_due_at``
+is that sweep's index.
+
+The upgrade backfills existing rows so ``?health=`` works right after
+deploy: device statuses with the service's own rules
+(``status_rollup.device_statuses``, in id-ordered chunks), then every site
+with the same rollup SQL the flush hook uses.  Only rows still NULL are
+touched.  Guarded by column / index existence checks (safe to re-run).
+"""
+
+from datetime import datetime, timezone
+
+import sqlalchemy as sa
+from alembic import op
+
+from app.services import status_rollup
+
+revision = "061"
+down_revision = "060"
+branch_labels = None
+depends_on = None
+
+_COLUMNS = {
+    "devices": (("computed_status", sa.String(30)), ("health_status", sa.String(20)),
+                ("status_due_at", sa.DateTime(timezone=True))),
+    "sites": (("computed_status", sa.String(30)), ("health_status", sa.String(20))),
+}
+_CHUNK = 1000
+
+_devices = sa.table(
+    "devices",
+    sa.column("id", sa.Integer), sa.column("status", sa.String),
+    sa.column("last_heartbeat", sa.DateTime(timezone=True)),
+    sa.column("heartbeat_interval", sa.Integer),
+    sa.column("network_status", sa.String),
+    sa.column("last_network_event", sa.DateTime(timezone=True)),
+    sa.column("computed_status", sa.String), sa.column("health_status", sa.String),
+    sa.column("status_due_at", sa.DateTime(timezone=True)),
+)
+
+_INDEXES = (
+    ("ix_devices_status_due_at", "devices", ["status_due_at"]),
+    ("ix_sites_tenant_health", "sites", ["tenant_id", "health_status"]),
+    ("ix_sites_tenant_computed", "sites", ["tenant_id", "computed_status"]),
+)
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    for table, columns in _COLUMNS.items():
+        existing = {c["name"] for c in inspector.get_columns(table)}
+        for name, type_ in columns:
+            if name not in existing:
+                op.add_column(table, sa.Column(name, type_, nullable=True))
+    for name, table, cols in _INDEXES:
+        if name not in {i["name"] for i in inspector.get_indexes(table)}:
+            op.create_index(name, table, cols)
+
+    _backfill_devices(op.get_bind())
+    op.execute(status_rollup.unrolled_sites_statement())
+
+
+def _backfill_devices(conn) -> None:
+    now = datetime.now(timezone.utc)
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(_devices)
+            .where(_devices.c.id > last_id, _devices.c.computed_status.is_(None))
+            .order_by(_devices.c.id)
+            .limit(_CHUNK)
+        ).all()
+        if not rows:
+            return
+        values = []
+        for row in rows:
+            computed, health, due = status_rollup.device_statuses(row, now)
+            values.append({"_id": row.id, "_computed": computed,
+                           "_health": health, "_due": due})
+        conn.execute(
+            _devices.update().where(_devices.c.id == sa.bindparam("_id")).values(
+                computed_status=sa.bindparam("_computed"),
+                health_status=sa.bindparam("_health"),
+                status_due_at=sa.bindparam("_due"),
+            ),
+            values,
+        )
+        last_id = rows[-1].id
+
+
+def downgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    for name, table, _cols in _INDEXES:
+        if name in {i["name"] for i in inspector.get_indexes(table)}:
+            op.drop_index(name, table_name=table)
+    for table, columns in _COLUMNS.items():
+        existing = {c["name"] for c in inspector.get_columns(table)}
+        for name, _type in columns:
+            if name in existing:
+                op.drop_column(table, name)
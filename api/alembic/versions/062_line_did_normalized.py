@@ -0,0 +1,61 @@
+"""Add lines.did_normalized and an unprocessed-payload index.
+
+Revision ID: 062
+Revises: 061
+Create Date: 2026-10-19
+
+Telnyx CDR ingestion matched a call's DID by loading every line with a DID
+and normalizing each in Python when the exact match missed.  The digits are
+now stored (``Line.did`` assignment sets them) and indexed, so a batch of
+calls resolves with one indexed ``IN`` query.  The upgrade backfills
+existing rows with the same rule (digits only; 11 digits with a leading 1
+drop the 1; no digits → NULL).
+
+``ix_integration_payloads_unprocessed`` is the batch drain's queue index —
+partial on ``processed = false`` so it stays the size of the backlog.
+Guarded by column / index existence checks (safe to re-run).
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "062"
+down_revision = "061"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if "did_normalized" not in {c["name"] for c in inspector.get_columns("lines")}:
+        op.add_column("lines", sa.Column("did_normalized", sa.String(30), nullable=True))
+    if "ix_lines_did_normalized" not in {i["name"] for i in inspector.get_indexes("lines")}:
+        op.create_index("ix_lines_did_normalized", "lines", ["did_normalized"])
+    if "ix_integration_payloads_unprocessed" not in {
+        i["name"] for i in inspector.get_indexes("integration_payloads")
+    }:
+        op.create_index(
+            "ix_integration_payloads_unprocessed", "integration_payloads", ["source", "id"],
+            postgresql_where=sa.text("processed = false"),
+        )
+
+    op.execute(r"""
+        UPDATE lines SET did_normalized = NULLIF(
+            CASE WHEN length(d.digits) = 11 AND left(d.digits, 1) = '1'
+                 THEN substr(d.digits, 2) ELSE d.digits END, '')
+        FROM (SELECT id, regexp_replace(did, '\D', '', 'g') AS digits
+              FROM lines WHERE did IS NOT NULL) AS d
+        WHERE lines.id = d.id
+    """)
+
+
+def downgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if "ix_integration_payloads_unprocessed" in {
+        i["name"] for i in inspector.get_indexes("integration_payloads")
+    }:
+        op.drop_index("ix_integration_payloads_unprocessed", table_name="integration_payloads")
+    if "ix_lines_did_normalized" in {i["name"] for i in inspector.get_indexes("lines")}:
+        op.drop_index("ix_lines_did_normalized", table_name="lines")
+    if "did_normalized" in {c["name"] for c in inspector.get_columns("lines")}:
+        op.drop_column("lines", "did_normalized")
@@ -0,0 +1,70 @@
+"""Backfill ``Device.last_call_at`` and report parity.
+
+    python -m app.backfill_device_last_call [--tenant TENANT] [--inline]
+
+Enqueues the ``devices.last_call_backfill`` worker job (fleet-wide unless
+``--tenant``) and prints the current parity — devices whose column disagrees
+with ``MAX(call_records.started_at)``.  The job reports parity again after
+backfilling (``GET /api/jobs/{id}``).  A run already queued or running for
+the same scope is reused, not duplicated.
+
+``--inline`` runs the backfill in this process instead (no worker / Redis
+needed) and prints the handler's result.  Safe to re-run.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+from types import SimpleNamespace
+from typing import Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+logger = logging.getLogger("true911.backfill_device_last_call")
+
+JOB_TYPE = "devices.last_call_backfill"
+
+
+async def enqueue(db, tenant_id: Optional[str] = None) -> dict:
+    """Queue the backfill job and report the pre-backfill parity.  Commits."""
+    from app.services import call_activity, job_service
+
+    job = await job_service.create_and_enqueue(
+        db, job_type=JOB_TYPE, tenant_id=tenant_id,
+        payload={"tenant_id": tenant_id} if tenant_id else None,
+        idempotency_key=f"{JOB_TYPE}:{tenant_id or '*'}", max_attempts=1,
+    )
+    await db.commit()
+    report = await call_activity.parity(db, tenant_id)
+    return {"job_id": job.id, "job_status": job.status, "tenant_id": tenant_id, **report}
+
+
+async def run(tenant_id: Optional[str] = None, *, inline: bool = False) -> dict:
+    from app.database import AsyncSessionLocal
+    from app.services import call_activity
+
+    async with AsyncSessionLocal() as db:
+        if inline:
+            job = SimpleNamespace(payload={"tenant_id": tenant_id}, tenant_id=tenant_id)
+            return await call_activity.handle_backfill(db, job)
+        return await enqueue(db, tenant_id)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--tenant", help="backfill one tenant (default: fleet-wide)")
+    parser.add_argument("--inline", action="store_true",
+                        help="run the backfill here instead of enqueueing the worker job")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    summary = asyncio.run(run(args.tenant, inline=args.inline))
+    for k, v in summary.items():
+        print(f"  {k:12}: {v}")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,9 +12,25 @@ class Settings(BaseSettings):
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 480
     REFRESH_TOKEN_EXPIRE_DAYS: int = 30
+    # get_current_user caches the resolved user per (user, token, act-as
+    # tenant) for this long (services.principal_cache).  Changes made in
+    # this process invalidate immediately; other processes pick them up
+    # within the TTL.  0 = look the user up on every request.
+    AUTH_PRINCIPAL_CACHE_TTL_SECONDS: int = 30
     CORS_ORIGINS: str = "*"  # str — parsed into a list by cors_origin_list
     APP_MODE: str = "production"  # "demo" | "production" — default is production-safe
     REDIS_URL: str = ""  # redis://localhost:6379/0 — set in Render env
+    # ``python worker.py`` runtime.  "rq": the stock forking RQ Worker, one
+    # job at a time.  "async" (opt-in per deploy, see render.yaml): one
+    # process-wide event loop and DB pool, jobs popped from the RQ queues
+    # and run concurrently up to the per-queue limits below.
+    WORKER_RUNTIME: str = "rq"
+    WORKER_QUEUE_CONCURRENCY: str = "default=4,provisioning=2,polling=2"
+    WORKER_STATS_INTERVAL_SECONDS: int = 300  # per-job-type stats log line
+    # Outbound integration gateway overrides: "vendor=rate/concurrency,..."
+    # (requests per second / in flight), e.g. "verizon=5/4,zoho=2/2".
+    # Unlisted vendors keep app.integrations.gateway.POLICIES.
+    INTEGRATION_GATEWAY_LIMITS: str = ""
     INTEGRATION_WEBHOOK_SECRET: str = ""  # shared HMAC secret for Zoho/QB webhooks
     ZOHO_WEBHOOK_SECRET: str = ""  # static token for Zoho (falls back to INTEGRATION_WEBHOOK_SECRET)
     INTEGRATION_ALLOWED_SOURCES: str = "zoho,qb"  # comma-separated
@@ -38,6 +54,19 @@ class Settings(BaseSettings):
 
     # ── AI Support Assistant ─────────────────────────────────────
     ANTHROPIC_API_KEY: str = ""  # empty = rule-based fallback (no LLM calls)
+    # Diagnostics run concurrently, each on its own session.  A check
+    # slower than the per-check timeout — or still running at the overall
+    # deadline — reports "unknown" and the rest are returned as-is.
+    SUPPORT_DIAGNOSTIC_CHECK_TIMEOUT_SECONDS: float = 5.0
+    SUPPORT_DIAGNOSTIC_DEADLINE_SECONDS: float = 8.0
+    # Process-wide cap on diagnostic sessions open at once — kept below the
+    # engine's pool size (5) so concurrent support chats queue here instead
+    # of draining the pool the request handlers share.
+    SUPPORT_DIAGNOSTIC_MAX_SESSIONS: int = 3
+    # Completed results are reused for this long per (tenant, device,
+    # site, check) so repeated messages in one support session don't
+    # re-run identical checks.  0 disables the cache.
+    SUPPORT_DIAGNOSTIC_CACHE_TTL_SECONDS: int = 60
 
     # ── LLLM (Phase 1: read-only AI Health Summary) ───────────────
     # Master switch.  When "false" (default) every /api/llm route
@@ -62,6 +91,14 @@ class Settings(BaseSettings):
     LLLM_CACHE_TTL_SECONDS: int = 300
     # Default model identifier when the provider supports a choice.
     LLLM_DEFAULT_MODEL: str = "claude-sonnet-4-20250514"
+    # Override the provider endpoint URL.  "" (default) = the provider's
+    # public API.  Used to point the provider at a local fake for the
+    # latency harness (scripts/llm_stream_bench.py).
+    LLLM_PROVIDER_BASE_URL: str = ""
+    # Size of the process-wide pooled provider client.  Connections are
+    # kept alive between summaries so only the first call pays the TLS
+    # handshake.
+    LLLM_PROVIDER_MAX_CONNECTIONS: int = 10
 
     # ── T-Mobile Callback Ingest (MVP — AI Health Summary only) ──
     # When "false" (default) the T-Mobile PIT callback endpoints in
@@ -174,6 +211,24 @@ class Settings(BaseSettings):
     # pilot dataset, not special-cased in code.
     FEATURE_DEVICE_HEALTH: str = "false"
 
+    # ── Denormalized last call per device (migration 055) ───────────
+    # When "true" (default) the health loaders read Device.last_call_at,
+    # maintained at CDR ingestion, instead of aggregating
+    # MAX(call_records.started_at) over an IN-list of every device id.
+    # "false" falls back to the aggregate (rollback switch).
+    FEATURE_DEVICE_LAST_CALL_COLUMN: str = "true"
+
+    # ── Per-request DB instrumentation / metrics ────────────────────
+    # Every request log line carries its SQL statement count, DB time, rows
+    # and slowest-statement fingerprint (app.services.request_metrics).
+    # GET /metrics serves per-route histograms in the Prometheus text format
+    # to callers presenting "Authorization: Bearer <METRICS_TOKEN>"; empty
+    # (default) => /metrics is 404.  Dashboard-managed secret, never in git.
+    METRICS_TOKEN: str = ""
+    # N+1 detector: when > 0, one WARNING (true911.sql) per request that ran
+    # the same statement shape at least this many times.  0 (default) = off.
+    SQL_REPEAT_WARN_THRESHOLD: int = 0
+
     # ── Assurance Engine (MVP — read-only customer assurance label) ──
     # When "false" (default) the /api/assurance/* routes return 404 and the
     # platform behaves exactly as before.  When "true" the read-only Assurance
@@ -224,6 +279,22 @@ class Settings(BaseSettings):
     # buildings (approved + pending) so operators can validate before approval.
     CUSTOMER_PORTFOLIO_PREVIEW_PENDING: str = "false"
     CUSTOMER_PORTFOLIO_PREVIEW_TENANT_ALLOWLIST: str = ""
+    # Registry-mode reads are served from a precomputed per-tenant read model
+    # (services.customer.read_model): rebuilt when change versions move
+    # (incrementally, per affected building), TTL as the backstop for
+    # time-driven staleness, and stale-while-revalidate up to MAX_STALE while a
+    # background job refreshes it.  "false" = recompute every request (the
+    # pre-read-model behaviour) — a kill switch, no data change.
+    FEATURE_CUSTOMER_READ_MODEL: str = "true"
+    CUSTOMER_READ_MODEL_TTL_SECONDS: int = 300
+    CUSTOMER_READ_MODEL_MAX_STALE_SECONDS: int = 3600
+    CUSTOMER_READ_MODEL_REFRESH_DEBOUNCE_SECONDS: int = 60
+
+    # ── E911 gap worklist ─────────────────────────────────────────
+    # Cached per-tenant gap count for dashboards (0 = always recompute).
+    # Refreshed whenever the tenant's change versions move; the TTL covers
+    # writes that bypass the ORM.
+    E911_GAP_COUNT_TTL_SECONDS: int = 300
 
     # ── AI Customer Operations Center / Support Center ─────────────
     # Caller-facing Tier-1 support workflow: identifier lookup → SMS-OTP
@@ -469,6 +540,12 @@ class Settings(BaseSettings):
     # operations, live line registration status).  Not used by the
     # webhook / CDR ingestion path.
     TELNYX_API_KEY: str = ""
+    # When "true" the webhook only archives + enqueues; the worker's
+    # webhook.telnyx job drains up to TELNYX_INGEST_BATCH_SIZE unprocessed
+    # Telnyx payloads per run (one DID lookup, one INSERT per batch).  When
+    # "false" (default) each call.hangup is ingested inline in the webhook.
+    FEATURE_TELNYX_BATCH_INGEST: str = "false"
+    TELNYX_INGEST_BATCH_SIZE: int = 200
 
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
@@ -513,6 +590,27 @@ class Settings(BaseSettings):
         """True when origins list is effectively a wildcard."""
         return self.cors_origin_list == ["*"]
 
+    @cached_property
+    def worker_queue_concurrency(self) -> dict[str, int]:
+        """Parsed WORKER_QUEUE_CONCURRENCY (``queue=limit,...``), in order."""
+        out: dict[str, int] = {}
+        for part in self.WORKER_QUEUE_CONCURRENCY.split(","):
+            name, _, limit = part.partition("=")
+            if name.strip():
+                out[name.strip()] = max(1, int(limit or 1))
+        return out
+
+    @cached_property
+    def integration_gateway_limits(self) -> dict[str, tuple[float, int]]:
+        """Parsed INTEGRATION_GATEWAY_LIMITS (``vendor=rate/concurrency,...``)."""
+        out: dict[str, tuple[float, int]] = {}
+        for part in self.INTEGRATION_GATEWAY_LIMITS.split(","):
+            name, _, spec = part.partition("=")
+            if name.strip() and spec.strip():
+                rate, _, concurrency = spec.partition("/")
+                out[name.strip()] = (float(rate), max(1, int(concurrency or 1)))
+        return out
+
     @cached_property
     def internal_tenant_id_set(self) -> set[str]:
         """Parsed INTERNAL_TENANT_IDS, ready for membership checks."""
@@ -3,8 +3,32 @@ from sqlalchemy.orm import DeclarativeBase
 
 from app.config import settings
 
+
+def install_session_listeners() -> None:
+    """Register the ORM and engine listeners every process relies on —
+    change versions, stored device / site status, principal-cache
+    eviction and per-request statement metrics.  Idempotent.
+
+    Called on every session this module hands out, so API, worker, cron
+    and script processes are covered alike and no entry point installs
+    anything itself; sessions built elsewhere (e.g. a test's sync
+    ``Session``) need the modules' own ``install()``."""
+    from app.services import change_version, principal_cache, request_metrics, status_rollup
+
+    status_rollup.install()
+    change_version.install()
+    principal_cache.install()
+    request_metrics.install(engine.sync_engine)
+
+
+class _SessionFactory(async_sessionmaker):
+    def __call__(self, **local_kw) -> AsyncSession:
+        install_session_listeners()
+        return super().__call__(**local_kw)
+
+
 engine = create_async_engine(settings.database_url, echo=False)
-AsyncSessionLocal = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+AsyncSessionLocal = _SessionFactory(engine, class_=AsyncSession, expire_on_commit=False)
 
 
 class Base(DeclarativeBase):
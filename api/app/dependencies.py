@@ -10,12 +10,14 @@ from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.database import AsyncSessionLocal
 from app.models.audit_log_entry import AuditLogEntry
 from app.models.device import Device
 from app.models.tenant import Tenant
 from app.models.user import User
+from app.services import principal_cache
 from app.services.auth import decode_token
 from app.services.rbac import can as rbac_can, normalize_role
 
@@ -80,8 +82,6 @@ async def get_current_user(
     token_type = payload.get("type") if payload else None
     payload_sub = payload.get("sub") if payload else None
     payload_exp = payload.get("exp") if payload else None
-    payload_role = payload.get("role") if payload else None
-    payload_tenant = payload.get("tenant_id") if payload else None
 
     if token_type != "access":
         _auth_logger.warning(
@@ -100,12 +100,56 @@ async def get_current_user(
         )
         raise HTTPException(status.HTTP_401_UNAUTHORIZED, "Invalid or expired token")
 
+    # Repeat requests with the same token are served from the principal
+    # cache (services.principal_cache) — no user / tenant SELECT.
+    cache_key = principal_cache.cache_key(user_id, payload, x_act_as_tenant)
+    user = principal_cache.get(cache_key)
+    loaded = user is None
+    if loaded:
+        user = await _load_principal(
+            db, user_id, payload, x_act_as_tenant, cache_key,
+        )
+
+    # Always store the original tenant_id for audit purposes
+    user._original_tenant_id = user.tenant_id
+    # Phase 1 default-tenant guardrail uses this flag to suppress warnings
+    # when a SuperAdmin has explicitly impersonated some tenant.
+    user._is_impersonating = bool(x_act_as_tenant)
+
+    if x_act_as_tenant:
+        # Detach user from session so tenant_id override never flushes to DB
+        # (cache hits are already session-less).
+        if loaded:
+            db.expunge(user)
+        user.tenant_id = x_act_as_tenant
+
+    # Attach resolved identity to request.state so the request visibility
+    # middleware can include user_id / tenant_id in its per-request log line.
+    # tenant_id is the effective resolved value (post-impersonation), so the
+    # log reflects which tenant the request actually operated on.
+    request.state.user_id = str(user.id)
+    request.state.tenant_id = user.tenant_id
+
+    return user
+
+
+async def _load_principal(
+    db: AsyncSession,
+    user_id: uuid.UUID,
+    payload: dict,
+    x_act_as_tenant: str | None,
+    cache_key: principal_cache.Key,
+) -> User:
+    """Principal-cache miss: load and validate the user (and the act-as
+    target tenant), then cache it.  Raises the same 401/403/400s as before."""
+    generation = principal_cache.generation(user_id)
+
     # Decode succeeded — log a single INFO line so successful auth and
     # subsequent failures share a payload context in the same request.
     _auth_logger.info(
         "Auth: token decoded — sub=%s type=%s exp=%s payload_role=%r payload_tenant=%r",
-        payload_sub, token_type, _summarize_exp(payload_exp),
-        payload_role, payload_tenant,
+        payload.get("sub"), payload.get("type"), _summarize_exp(payload.get("exp")),
+        payload.get("role"), payload.get("tenant_id"),
     )
 
     result = await db.execute(select(User).where(User.id == user_id))
@@ -113,7 +157,7 @@ async def get_current_user(
     if not user:
         _auth_logger.warning(
             "Auth 401: reason=user_not_found  sub=%s  payload_tenant=%r",
-            payload_sub, payload_tenant,
+            payload.get("sub"), payload.get("tenant_id"),
         )
         raise HTTPException(status.HTTP_401_UNAUTHORIZED, "User not found or inactive")
     if not user.is_active:
@@ -124,14 +168,10 @@ async def get_current_user(
         )
         raise HTTPException(status.HTTP_401_UNAUTHORIZED, "User not found or inactive")
 
-    # Normalize role to canonical PascalCase (handles "superadmin" -> "SuperAdmin" etc.)
-    user.role = normalize_role(user.role)
-
-    # Always store the original tenant_id for audit purposes
-    user._original_tenant_id = user.tenant_id
-    # Phase 1 default-tenant guardrail uses this flag to suppress warnings
-    # when a SuperAdmin has explicitly impersonated some tenant.
-    user._is_impersonating = bool(x_act_as_tenant)
+    # Normalize role to canonical PascalCase (handles "superadmin" -> "SuperAdmin" etc.).
+    # Set as the loaded value, not a change: it must not flush back to the
+    # row (nor count as a User change and invalidate the principal cache).
+    set_committed_value(user, "role", normalize_role(user.role))
 
     if x_act_as_tenant:
         if user.role != "SuperAdmin":
@@ -148,17 +188,8 @@ async def get_current_user(
                 status.HTTP_400_BAD_REQUEST,
                 f"Tenant '{x_act_as_tenant}' does not exist",
             )
-        # Detach user from session so tenant_id override never flushes to DB
-        db.expunge(user)
-        user.tenant_id = x_act_as_tenant
-
-    # Attach resolved identity to request.state so the request visibility
-    # middleware can include user_id / tenant_id in its per-request log line.
-    # tenant_id is the effective resolved value (post-impersonation), so the
-    # log reflects which tenant the request actually operated on.
-    request.state.user_id = str(user.id)
-    request.state.tenant_id = user.tenant_id
 
+    principal_cache.put(cache_key, user, generation)
     return user
 
 
@@ -9,6 +9,8 @@ from typing import Any
 
 import httpx
 
+from app.integrations.gateway import gateway
+
 logger = logging.getLogger("true911.integrations")
 
 
@@ -26,7 +28,12 @@ class BaseProviderClient(ABC):
 
     Subclasses set ``provider_name`` and ``base_url`` and implement
     domain-specific methods.  Shared concerns (auth headers, timeouts,
-    idempotency keys, error mapping) live here.
+    idempotency keys, error mapping) live here; pooling, rate limits and
+    retries come from the provider's ``app.integrations.gateway``.
+
+    Retries follow the gateway's method-based default: a POST / PATCH that
+    may have reached the provider is not re-sent unless the call passes
+    ``retry=True`` — only for operations known to be safe to repeat.
     """
 
     provider_name: str = "base"
@@ -58,6 +65,7 @@ class BaseProviderClient(ABC):
         json: dict | None = None,
         params: dict | None = None,
         extra_headers: dict | None = None,
+        retry: bool | None = None,
     ) -> dict[str, Any]:
         url = f"{self.base_url.rstrip('/')}/{path.lstrip('/')}"
         headers = {
@@ -68,13 +76,15 @@ class BaseProviderClient(ABC):
         if extra_headers:
             headers.update(extra_headers)
 
-        async with httpx.AsyncClient(timeout=self._timeout) as client:
-            try:
-                resp = await client.request(method, url, json=json, params=params, headers=headers)
-            except httpx.TimeoutException:
-                raise ProviderError(self.provider_name, None, f"Timeout calling {method} {path}")
-            except httpx.RequestError as exc:
-                raise ProviderError(self.provider_name, None, str(exc))
+        try:
+            resp = await gateway(self.provider_name).request(
+                method, url, json=json, params=params, headers=headers,
+                timeout=self._timeout, retry=retry,
+            )
+        except httpx.TimeoutException:
+            raise ProviderError(self.provider_name, None, f"Timeout calling {method} {path}")
+        except httpx.RequestError as exc:
+            raise ProviderError(self.provider_name, None, str(exc))
 
         if resp.status_code >= 400:
             body = resp.text[:500]
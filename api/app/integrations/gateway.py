@@ -0,0 +1,313 @@
+"""Outbound integration gateway — one pooled, rate-limited client per vendor.
+
+Every carrier / CRM client sends its HTTP through the vendor's
+:class:`VendorGateway` instead of opening an ``httpx.AsyncClient`` per call:
+
+  * one long-lived connection pool per vendor (HTTP/2 when the vendor's
+    policy allows it and ``h2`` is installed);
+  * a token bucket (``rate_per_second`` / ``burst``) and a concurrency cap
+    (``max_concurrency`` requests in flight) per vendor;
+  * retries with exponential backoff + jitter.  A request that never
+    reached the vendor (connect error / pool timeout) or was refused with
+    429 is retried for any method; 502/503/504 and read errors only for
+    idempotent methods, or when the caller passes ``retry=True`` (e.g. an
+    OAuth token grant, or a POST carrying an idempotency key);
+  * per-vendor latency histograms (``app.services.latency``, named
+    ``gateway.<vendor>``) and request / error / retry / throttle counters.
+
+    from app.integrations.gateway import gateway
+
+    resp = await gateway("verizon").request("POST", url, json=body)
+
+The raw ``httpx.Response`` comes back — status handling stays with each
+client — and transport errors are re-raised once retries are exhausted, so
+callers keep their existing ``httpx`` exception handling.
+
+Per-vendor rate / concurrency can be overridden with
+``INTEGRATION_GATEWAY_LIMITS`` (``vendor=rate/concurrency,...``).  Tests
+swap a vendor's policy or transport with :func:`configure`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import email.utils
+import importlib.util
+import logging
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+import httpx
+
+from app.config import settings
+
+logger = logging.getLogger("true911.integrations.gateway")
+
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+_IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+_RETRY_ANY_METHOD_STATUSES = frozenset({429})
+_RETRY_IDEMPOTENT_STATUSES = frozenset({502, 503, 504})
+# The request never left this process — safe to re-send whatever the method.
+_UNSENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+@dataclass(frozen=True)
+class VendorPolicy:
+    rate_per_second: float = 10.0     # token-bucket refill; <= 0 disables
+    burst: int = 10                   # bucket capacity
+    max_concurrency: int = 8          # requests in flight (and pool size)
+    timeout: float = 30.0
+    connect_timeout: float = 10.0
+    http2: bool = False
+    retries: int = 2
+    backoff_base: float = 0.5         # seconds; doubles per attempt
+    backoff_max: float = 10.0
+
+
+POLICIES: dict[str, VendorPolicy] = {
+    "verizon": VendorPolicy(rate_per_second=10, burst=20, max_concurrency=8, http2=True),
+    # Every T-Mobile request carries a single-use PoP signature: never re-sent.
+    "tmobile": VendorPolicy(rate_per_second=5, burst=5, max_concurrency=4, retries=0),
+    "telnyx": VendorPolicy(rate_per_second=20, burst=20, max_concurrency=10, http2=True),
+    "vola": VendorPolicy(rate_per_second=5, burst=10, max_concurrency=4),
+    "zoho": VendorPolicy(rate_per_second=10, burst=10, max_concurrency=5, timeout=20.0),
+    # Nominatim usage policy: at most one request per second.
+    "nominatim": VendorPolicy(rate_per_second=1, burst=1, max_concurrency=1, timeout=10.0),
+}
+
+
+class TokenBucket:
+    """Classic token bucket; not thread-safe (one event loop at a time)."""
+
+    def __init__(self, rate: float, burst: int, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self._clock = clock
+        self._updated = clock()
+
+    def try_acquire(self) -> float:
+        """Take a token and return 0, or return the seconds until one is due."""
+        if self.rate <= 0:
+            return 0.0
+        now = self._clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    async def acquire(self) -> float:
+        """Wait for a token; returns the seconds spent waiting."""
+        waited = 0.0
+        while (delay := self.try_acquire()) > 0:
+            waited += delay
+            await asyncio.sleep(delay)
+        return waited
+
+
+def _retry_after(resp: httpx.Response) -> Optional[float]:
+    raw = resp.headers.get("Retry-After")
+    if not raw:
+        return None
+    try:
+        return max(0.0, float(raw))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(raw).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class VendorGateway:
+    """Pooled client + limits + retries + metrics for one vendor."""
+
+    def __init__(self, vendor: str, policy: VendorPolicy, *,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.vendor = vendor
+        self.policy = policy
+        self._transport = transport
+        self.bucket = TokenBucket(policy.rate_per_second, policy.burst)
+        self._client: Optional[httpx.AsyncClient] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.counters = {"requests": 0, "errors": 0, "retries": 0, "throttled": 0}
+        self.status_classes: dict[str, int] = {}
+
+    # ── Pool ─────────────────────────────────────────────────────
+
+    def client(self) -> httpx.AsyncClient:
+        """The vendor's pooled client for the running loop.  An AsyncClient
+        (and the concurrency semaphore) is bound to the loop that first used
+        it, so both are rebuilt if the loop changes (tests, or a worker that
+        runs each job under its own asyncio.run())."""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._loop is not loop:
+            p = self.policy
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(p.timeout, connect=p.connect_timeout),
+                limits=httpx.Limits(
+                    max_connections=p.max_concurrency,
+                    max_keepalive_connections=p.max_concurrency,
+                ),
+                http2=p.http2 and _HTTP2_AVAILABLE,
+                transport=self._transport,
+            )
+            self._slots = asyncio.Semaphore(p.max_concurrency)
+            self._loop = loop
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+        self._slots = None
+        self._loop = None
+
+    # ── Requests ─────────────────────────────────────────────────
+
+    def _backoff(self, attempt: int) -> float:
+        delay = min(self.policy.backoff_max, self.policy.backoff_base * (2 ** attempt))
+        return delay * (0.5 + random.random() / 2)
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        client: Optional[httpx.AsyncClient] = None,
+        retry: Optional[bool] = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """Send one request under the vendor's limits, retrying per policy.
+
+        ``client`` overrides the pooled client (e.g. one carrying event
+        hooks) while keeping the limits and metrics.  ``retry``: ``None`` —
+        policy default; ``True`` — treat the request as idempotent;
+        ``False`` — never retry."""
+        method = method.upper()
+        http = self.client()
+        if client is not None:
+            http = client
+        slots = self._slots
+        idempotent = retry is True or (retry is None and method in _IDEMPOTENT_METHODS)
+        attempts = 1 if retry is False else 1 + self.policy.retries
+
+        for attempt in range(attempts):
+            last = attempt + 1 == attempts
+            if await self.bucket.acquire():
+                self.counters["throttled"] += 1
+            async with slots:
+                self.counters["requests"] += 1
+                t0 = time.perf_counter()
+                try:
+                    resp = await http.request(method, url, **kwargs)
+                except httpx.TransportError as exc:
+                    self._observe(t0, None)
+                    if last or not (isinstance(exc, _UNSENT_ERRORS) or idempotent):
+                        raise
+                    delay = self._backoff(attempt)
+                    logger.info("%s %s %s failed (%s); retry %d in %.2fs",
+                                self.vendor, method, url, type(exc).__name__, attempt + 1, delay)
+                else:
+                    self._observe(t0, resp.status_code)
+                    retryable = resp.status_code in _RETRY_ANY_METHOD_STATUSES or (
+                        idempotent and resp.status_code in _RETRY_IDEMPOTENT_STATUSES
+                    )
+                    if last or not retryable:
+                        return resp
+                    delay = min(self.policy.backoff_max, _retry_after(resp) or self._backoff(attempt))
+                    await resp.aclose()
+                    logger.info("%s %s %s returned %d; retry %d in %.2fs",
+                                self.vendor, method, url, resp.status_code, attempt + 1, delay)
+            self.counters["retries"] += 1
+            await asyncio.sleep(delay)
+        raise AssertionError("unreachable")  # pragma: no cover
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def put(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("PUT", url, **kwargs)
+
+    # ── Metrics ──────────────────────────────────────────────────
+
+    def _observe(self, t0: float, status: Optional[int]) -> None:
+        from app.services.latency import histogram
+
+        histogram(f"gateway.{self.vendor}").observe((time.perf_counter() - t0) * 1000)
+        key = f"{status // 100}xx" if status is not None else "transport_error"
+        self.status_classes[key] = self.status_classes.get(key, 0) + 1
+        if status is None or status >= 500:
+            self.counters["errors"] += 1
+
+    def stats(self) -> dict[str, Any]:
+        from app.services.latency import histogram
+
+        h = histogram(f"gateway.{self.vendor}").snapshot()
+        return {
+            "vendor": self.vendor,
+            **self.counters,
+            "status": dict(sorted(self.status_classes.items())),
+            "p50_ms": h["p50_ms"],
+            "p95_ms": h["p95_ms"],
+            "rate_per_second": self.policy.rate_per_second,
+            "max_concurrency": self.policy.max_concurrency,
+            "http2": self.policy.http2 and _HTTP2_AVAILABLE,
+        }
+
+
+# ── Registry ─────────────────────────────────────────────────────
+
+_gateways: dict[str, VendorGateway] = {}
+
+
+def _policy_for(vendor: str) -> VendorPolicy:
+    policy = POLICIES.get(vendor, VendorPolicy())
+    override = settings.integration_gateway_limits.get(vendor)
+    if override:
+        rate, concurrency = override
+        policy = dataclasses.replace(policy, rate_per_second=rate, max_concurrency=concurrency)
+    return policy
+
+
+def gateway(vendor: str) -> VendorGateway:
+    """Get-or-create the process-wide gateway for *vendor*."""
+    gw = _gateways.get(vendor)
+    if gw is None:
+        gw = _gateways.setdefault(vendor, VendorGateway(vendor, _policy_for(vendor)))
+    return gw
+
+
+def configure(vendor: str, policy: Optional[VendorPolicy] = None, *,
+              transport: Optional[httpx.AsyncBaseTransport] = None) -> VendorGateway:
+    """Replace *vendor*'s gateway (new policy and/or transport).  The old
+    pool is dropped, not closed — call :func:`aclose_all` first from async
+    code that cares."""
+    gw = VendorGateway(vendor, policy or _policy_for(vendor), transport=transport)
+    _gateways[vendor] = gw
+    return gw
+
+
+def reset() -> None:
+    """Forget every gateway (tests)."""
+    _gateways.clear()
+
+
+async def aclose_all() -> None:
+    """Close every vendor pool.  Called from app shutdown."""
+    for gw in list(_gateways.values()):
+        await gw.aclose()
+
+
+def stats() -> list[dict[str, Any]]:
+    return [gw.stats() for _vendor, gw in sorted(_gateways.items())]
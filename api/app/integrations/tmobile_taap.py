@@ -31,6 +31,7 @@ import httpx
 from jose import jwt as jose_jwt
 
 from app.config import settings
+from app.integrations.gateway import gateway
 
 from app.integrations import tmobile_operations as OPS  # noqa: E402
 from app.integrations.tmobile_operations import (  # noqa: E402
@@ -481,7 +482,8 @@ class TMobileTAAPClient:
         self._id_token: str | None = None
         self._token_expires_at: float = 0.0
 
-        # Shared HTTP client
+        # Optional dedicated HTTP client (e.g. one carrying event hooks);
+        # otherwise the pooled "tmobile" integration gateway client is used.
         self._http: httpx.AsyncClient | None = None
 
     @property
@@ -509,9 +511,9 @@ class TMobileTAAPClient:
         return self.activation_path or OPS.get_operation("activate_subscriber").path
 
     async def _client(self) -> httpx.AsyncClient:
-        if self._http is None or self._http.is_closed:
-            self._http = httpx.AsyncClient(timeout=30.0)
-        return self._http
+        if self._http is not None and not self._http.is_closed:
+            return self._http
+        return gateway("tmobile").client()
 
     async def close(self) -> None:
         if self._http and not self._http.is_closed:
@@ -662,8 +664,11 @@ class TMobileTAAPClient:
         client = await self._client()
         logger.info("T-Mobile TAAP: requesting access token from %s", self.token_url)
 
-        resp = await client.post(
+        # Sent through the gateway for its rate limit / metrics; the policy
+        # never retries (each PoP token is single-use).
+        resp = await gateway("tmobile").post(
             self.token_url,
+            client=client,
             content=body_str,
             headers=headers,
         )
@@ -800,8 +805,9 @@ class TMobileTAAPClient:
         )
 
         try:
-            resp = await client.request(
+            resp = await gateway("tmobile").request(
                 method.upper(), url,
+                client=client,
                 content=body_str,
                 params=params,
                 headers=headers,
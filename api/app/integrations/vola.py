@@ -17,7 +17,7 @@ import os
 import time
 from typing import Any
 
-import httpx
+from app.integrations.gateway import VendorGateway, gateway
 
 logger = logging.getLogger("true911.integrations.vola")
 
@@ -69,21 +69,13 @@ HARDCODED_DANGEROUS_PREFIXES: list[str] = [
 
 # ── HTTP helpers ────────────────────────────────────────────────────────────
 
-_http: httpx.AsyncClient | None = None
-
-
-async def _client() -> httpx.AsyncClient:
-    global _http
-    if _http is None or _http.is_closed:
-        _http = httpx.AsyncClient(timeout=30.0)
-    return _http
+def _gateway() -> VendorGateway:
+    """Pooled, rate-limited "vola" client (app.integrations.gateway)."""
+    return gateway("vola")
 
 
 async def close_client() -> None:
-    global _http
-    if _http and not _http.is_closed:
-        await _http.aclose()
-        _http = None
+    await _gateway().aclose()
 
 
 class VolaClient:
@@ -138,7 +130,6 @@ class VolaClient:
         VOLA Cloud requires ``"token": "<accessToken>"`` in the request body
         for all authenticated endpoints.
         """
-        client = await _client()
         token = await self.get_access_token()
         url = self._build_url(path)
 
@@ -148,7 +139,7 @@ class VolaClient:
         if VOLA_DEBUG_FETCH:
             logger.info("VOLA_DEBUG POST %s  payload_keys=%s", url, list(payload.keys()))
 
-        resp = await client.post(url, json=body, headers={"Content-Type": "application/json"})
+        resp = await _gateway().post(url, json=body, headers={"Content-Type": "application/json"})
 
         if VOLA_DEBUG_FETCH:
             logger.info("VOLA_DEBUG response status=%s body_preview=%s", resp.status_code, resp.text[:500])
@@ -168,7 +159,7 @@ class VolaClient:
             self._invalidate_token()
             token = await self.get_access_token()
             body["token"] = token
-            resp = await client.post(url, json=body, headers={"Content-Type": "application/json"})
+            resp = await _gateway().post(url, json=body, headers={"Content-Type": "application/json"})
 
         resp.raise_for_status()
         return resp.json()
@@ -183,12 +174,13 @@ class VolaClient:
         if not self.email or not self.password:
             raise RuntimeError("VOLA_EMAIL and VOLA_PASSWORD must be set")
 
-        client = await _client()
         url = self._build_url("/user-mgmt-api/get-access-token")
         payload = {"email": self.email, "password": self.password}
 
         logger.info("Authenticating as %s against %s", self.email, self.base_url)
-        resp = await client.post(url, json=payload, headers={"Content-Type": "application/json"})
+        resp = await _gateway().post(
+            url, json=payload, headers={"Content-Type": "application/json"}, retry=True,
+        )
         resp.raise_for_status()
         body = resp.json()
 
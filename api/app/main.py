@@ -9,7 +9,8 @@ from fastapi.responses import JSONResponse
 from .config import settings
 from .bootstrap import ensure_bootstrap_admin
 from .middleware import RequestVisibilityMiddleware, TmobileCallbackAuditMiddleware
-from .routers import auth, sites, telemetry, audits, incidents, notifications, e911, actions, devices, lines, recordings, events, providers, heartbeat, hardware_models, admin, sims, jobs, webhooks, integration_webhooks, command, command_notifications, command_reports, command_vendors, command_verification, command_templates, command_contracts, command_network, command_testing, command_autonomous, command_site_import, command_device_assignment, carrier_verizon, customers, service_units, provisioning, zoho_crm, zoho_review, vola, deployments, line_intelligence, subscriber_import, public, support, tmobile_callback, health, registrations, onboarding_review, calls, llm, device_health, assurance, customer, ops_center, service_classification
+from .services import principal_cache as _principal_cache
+from .routers import auth, sites, telemetry, audits, incidents, notifications, e911, actions, devices, lines, recordings, events, providers, heartbeat, hardware_models, admin, sims, jobs, webhooks, integration_webhooks, command, command_notifications, command_reports, command_vendors, command_verification, command_templates, command_contracts, command_network, command_testing, command_autonomous, command_site_import, command_device_assignment, carrier_verizon, customers, service_units, provisioning, zoho_crm, zoho_review, vola, deployments, line_intelligence, subscriber_import, public, support, tmobile_callback, health, registrations, onboarding_review, calls, llm, device_health, assurance, customer, ops_center, service_classification, metrics
 
 # Configure app-level logging so INFO emits to Render's stdout stream.
 # Uvicorn manages its own access/error loggers; this sets the level on
@@ -80,6 +81,15 @@ async def startup():
     else:
         await ensure_bootstrap_admin()
 
+@app.on_event("shutdown")
+async def shutdown():
+    # Release the pooled LLM provider / integration gateway connections.
+    from .services.llm.providers.anthropic_provider import aclose_client
+    from .integrations import gateway as integration_gateway
+    await aclose_client()
+    await integration_gateway.aclose_all()
+
+
 # CORS — when CORS_ORIGINS is "*" (the default), we use allow_origin_regex
 # to match any origin.  This lets Starlette echo the actual origin back
 # (instead of "*"), which is required for credentialed requests (requests
@@ -196,6 +206,7 @@ app.include_router(public.router,              prefix="/api/public",           t
 app.include_router(support.router,            prefix="/api/support",          tags=["support"])
 app.include_router(tmobile_callback.router,   prefix="/tmobile/wholesale",    tags=["tmobile-callback"])
 app.include_router(health.router,             prefix="/api",                  tags=["health"])
+app.include_router(metrics.router,                                            tags=["metrics"])
 app.include_router(registrations.router,      prefix="/api/registrations",    tags=["registrations"])
 app.include_router(onboarding_review.router,  prefix="/api/onboarding-reviews", tags=["onboarding-review"])
 # Phase 1 LLLM — internal-only AI Health Summary.  Routes self-gate
@@ -265,6 +276,7 @@ async def health_auth():
         "access_token_ttl_minutes": settings.ACCESS_TOKEN_EXPIRE_MINUTES,
         "refresh_token_ttl_days": settings.REFRESH_TOKEN_EXPIRE_DAYS,
         "using_default_secret": _is_default_secret(),
+        "principal_cache": _principal_cache.stats(),
     }
 
 
@@ -13,6 +13,7 @@ from starlette.requests import Request
 from starlette.responses import Response
 
 from .config import settings
+from .services import request_metrics
 
 logger = logging.getLogger("true911.request")
 
@@ -29,40 +30,57 @@ class RequestVisibilityMiddleware(BaseHTTPMiddleware):
     - Preserves X-Request-ID from the incoming request when supplied;
       otherwise generates a new uuid4 hex.
     - Sets X-Request-ID on the response.
-    - Logs method, path, status_code, duration_ms, and request_id at INFO.
+    - Logs method, path, status_code, duration_ms, and request_id at INFO,
+      plus the request's database work: statement count, DB time, rows and
+      the slowest statement's fingerprint (app.services.request_metrics).
+    - Records duration / statements / DB time in the per-route histograms
+      served by GET /metrics, and — with SQL_REPEAT_WARN_THRESHOLD > 0 —
+      warns about statement shapes repeated within the request (N+1).
 
     Deliberately omits headers, cookies, query strings, and request bodies so
-    tokens, passwords, and PII never enter the log stream.
+    tokens, passwords, and PII never enter the log stream.  Statements are
+    fingerprinted, never logged with their parameters.
     """
 
     async def dispatch(self, request: Request, call_next):
         request_id = request.headers.get(REQUEST_ID_HEADER) or uuid.uuid4().hex
         request.state.request_id = request_id
 
+        repeat_threshold = settings.SQL_REPEAT_WARN_THRESHOLD
+        db, token = request_metrics.begin(track_shapes=repeat_threshold > 0)
         start = time.perf_counter()
         try:
             response: Response = await call_next(request)
         except Exception:
             duration_ms = (time.perf_counter() - start) * 1000
+            request_metrics.observe(request.method, request_metrics.route_label(request.scope),
+                                    duration_ms, db)
             # request.state may have user_id/tenant_id if get_current_user
             # ran successfully before the failure; otherwise both are None.
             logger.exception(
                 "request_failed method=%s path=%s duration_ms=%.2f request_id=%s "
-                "user_id=%s tenant_id=%s",
+                "user_id=%s tenant_id=%s db_statements=%d db_ms=%.2f",
                 request.method,
                 request.url.path,
                 duration_ms,
                 request_id,
                 getattr(request.state, "user_id", None),
                 getattr(request.state, "tenant_id", None),
+                db.statements,
+                db.db_ms,
             )
             raise
+        finally:
+            request_metrics.end(token)
 
         duration_ms = (time.perf_counter() - start) * 1000
+        route = request_metrics.route_label(request.scope)
+        request_metrics.observe(request.method, route, duration_ms, db)
         response.headers[REQUEST_ID_HEADER] = request_id
         logger.info(
             "request method=%s path=%s status_code=%d duration_ms=%.2f request_id=%s "
-            "user_id=%s tenant_id=%s",
+            "user_id=%s tenant_id=%s db_statements=%d db_ms=%.2f db_rows=%d "
+            "db_slowest=%s db_slowest_ms=%.2f",
             request.method,
             request.url.path,
             response.status_code,
@@ -70,7 +88,17 @@ class RequestVisibilityMiddleware(BaseHTTPMiddleware):
             request_id,
             getattr(request.state, "user_id", None),
             getattr(request.state, "tenant_id", None),
+            db.statements,
+            db.db_ms,
+            db.rows,
+            db.slowest,
+            db.slowest_ms,
         )
+        for fp, count in db.repeated(repeat_threshold):
+            request_metrics.sql_logger.warning(
+                "sql_repeated fp=%s count=%d method=%s route=%s request_id=%s",
+                fp, count, request.method, route, request_id,
+            )
         return response
 
 
@@ -19,7 +19,7 @@ from app.models.integration_payload import IntegrationPayload
 from app.models.sim import Sim
 from app.models.device_sim import DeviceSim
 from app.models.sim_event import SimEvent
-from app.models.sim_usage_daily import SimUsageDaily
+from app.models.sim_usage_daily import SimUsageDaily, SimUsageMonthly
 from app.models.job import Job
 from app.models.integration_event import IntegrationEvent
 from app.models.customer import Customer
@@ -29,6 +29,7 @@ from app.models.external_subscription_map import ExternalSubscriptionMap
 from app.models.external_record_map import ExternalRecordMap
 from app.models.zoho_subscription_record import ZohoSubscriptionRecord
 from app.models.zoho_payload_observation import ZohoPayloadObservation
+from app.models.zoho_sync_state import ZohoSyncState
 from app.models.reconciliation_snapshot import ReconciliationSnapshot
 from app.models.notification import CommandNotification
 from app.models.escalation_rule import EscalationRule
@@ -48,6 +49,8 @@ from app.models.autonomous_action import AutonomousAction
 from app.models.operational_digest import OperationalDigest
 from app.models.service_unit import ServiceUnit
 from app.models.provisioning_queue import ProvisioningQueueItem
+from app.models.provisioning_scan_state import ProvisioningScanState
+from app.models.portfolio_fusion import PortfolioFusionRecord, PortfolioFusionTwin
 from app.models.line_intelligence_event import LineIntelligenceEvent
 from app.models.port_state import PortState
 from app.models.import_batch import ImportBatch
@@ -60,6 +63,8 @@ from app.models.registration_status_event import RegistrationStatusEvent
 from app.models.onboarding_review import OnboardingReview
 from app.models.llm_audit import LLMAuditLog
 from app.models.llm_cache import LLMSummaryCache
+from app.models.change_version import ChangeVersion
+from app.models.customer_read_model import CustomerPortfolioBuilding, CustomerPortfolioReadModel
 from app.models.ops_center import AssetIdentity, OpsSupportSession, OpsOtpChallenge, OpsSessionEvent
 from app.models.ops_center_intelligence import OpsEscalationQueue, OpsKnowledgeArticle, OpsPlaybook, OpsResolutionPattern
 
@@ -87,6 +92,7 @@ __all__ = [
     "DeviceSim",
     "SimEvent",
     "SimUsageDaily",
+    "SimUsageMonthly",
     "Job",
     "IntegrationEvent",
     "Customer",
@@ -96,6 +102,7 @@ __all__ = [
     "ExternalRecordMap",
     "ZohoSubscriptionRecord",
     "ZohoPayloadObservation",
+    "ZohoSyncState",
     "ReconciliationSnapshot",
     "CommandNotification",
     "EscalationRule",
@@ -115,6 +122,9 @@ __all__ = [
     "OperationalDigest",
     "ServiceUnit",
     "ProvisioningQueueItem",
+    "ProvisioningScanState",
+    "PortfolioFusionRecord",
+    "PortfolioFusionTwin",
     "LineIntelligenceEvent",
     "PortState",
     "ImportBatch",
@@ -132,6 +142,9 @@ __all__ = [
     "OnboardingReview",
     "LLMAuditLog",
     "LLMSummaryCache",
+    "ChangeVersion",
+    "CustomerPortfolioReadModel",
+    "CustomerPortfolioBuilding",
     "AssetIdentity",
     "OpsSupportSession",
     "OpsOtpChallenge",
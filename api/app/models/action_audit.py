@@ -6,6 +6,10 @@ from sqlalchemy.orm import Mapped, mapped_column
 
 from app.database import Base
 
+# action_type of a manual service-classification override (Phase 8).
+# Overrides live as append-only audit records — logging is inherent.
+SERVICE_CLASSIFICATION_OVERRIDE = "service_classification_override"
+
 
 class ActionAudit(Base):
     __tablename__ = "action_audits"
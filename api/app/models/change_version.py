@@ -0,0 +1,35 @@
+"""Per-tenant / per-site monotonic change versions.
+
+One row per ``(tenant_id, scope_key)`` holding a counter that is bumped
+whenever something a health summary depends on changes — a device or
+site edit, an incident opened/acknowledged/closed, or a heartbeat that
+flips a device between stale and live.  ``scope_key`` is ``"*"`` for
+the tenant-wide (fleet) counter, ``"@registry"`` for Portfolio Registry
+rows, and the business ``site_id`` for a per-site counter.
+
+Readers only ever need ONE primary-key lookup to know whether anything
+changed, which is what lets the LLLM summary cache answer a hit without
+touching the fleet tables.  The counters are maintained by the flush
+listener in :mod:`app.services.change_version`; nothing writes them by
+hand.
+"""
+
+from sqlalchemy import BigInteger, Column, DateTime, String
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+
+class ChangeVersion(Base):
+    __tablename__ = "change_versions"
+
+    tenant_id = Column(String(100), primary_key=True)
+    # "*" = tenant-wide counter; "@registry" = Portfolio Registry; otherwise Site.site_id
+    scope_key = Column(String(100), primary_key=True)
+
+    version = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
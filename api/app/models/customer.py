@@ -22,7 +22,7 @@ class Customer(Base):
     status: Mapped[str] = mapped_column(String(30), default="active")
 
     # ── Zoho CRM linkage ─────────────────────────────────────────
-    zoho_account_id: Mapped[Optional[str]] = mapped_column(String(50), nullable=True, index=True)
+    zoho_account_id: Mapped[Optional[str]] = mapped_column(String(50), nullable=True, index=True, unique=True)
     zoho_contact_id: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
     zoho_deal_id: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
     zoho_sync_status: Mapped[Optional[str]] = mapped_column(String(30), nullable=True)  # synced | error | pending
@@ -0,0 +1,68 @@
+"""Precomputed customer portfolio read model (registry mode).
+
+Two tables:
+
+  * ``customer_portfolio_read_models`` — one header row per tenant: the
+    change versions it was built from, a config key (the visibility /
+    preview flags in force), the portfolio-wide aggregates (dashboard,
+    summary, health, services summary) and its TTL.
+  * ``customer_portfolio_buildings`` — one row per visible building
+    holding the serialized building record plus the columns paging,
+    filtering and search need (``position``, ``status``,
+    ``search_text``), so a page or a detail view reads O(page) rows.
+
+Derived data only — it can be dropped at any time and is rebuilt by
+:mod:`app.services.customer.read_model` on the next request.
+"""
+
+from sqlalchemy import Column, DateTime, Index, Integer, String, Text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+
+class CustomerPortfolioReadModel(Base):
+    __tablename__ = "customer_portfolio_read_models"
+
+    tenant_id = Column(String(100), primary_key=True)
+    # sha256 of the visibility / preview flags the rows were built under
+    config_key = Column(String(64), nullable=False)
+    # {scope_key: version} from change_versions at build time
+    versions = Column(JSONB, nullable=False)
+    # {"company", "dashboard", "summary", "health", "services_summary"}
+    aggregates = Column(JSONB, nullable=False)
+    building_count = Column(Integer, nullable=False, default=0)
+
+    built_at = Column(DateTime(timezone=True), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+    # set when a background refresh is enqueued; debounces stale reads
+    refresh_requested_at = Column(DateTime(timezone=True), nullable=True)
+    updated_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+
+class CustomerPortfolioBuilding(Base):
+    __tablename__ = "customer_portfolio_buildings"
+
+    tenant_id = Column(String(100), primary_key=True)
+    # PortfolioBuilding.id
+    building_id = Column(Integer, primary_key=True)
+
+    position = Column(Integer, nullable=False)
+    # customer protection label ("Protected", "Attention Needed", ...)
+    status = Column(String(40), nullable=True)
+    # lower-cased haystack for the customer search box
+    search_text = Column(Text, nullable=False, default="")
+    # linked Site.site_id list — which site changes invalidate this row
+    site_ids = Column(JSONB, nullable=False)
+    record = Column(JSONB, nullable=False)
+
+    __table_args__ = (
+        Index("ix_customer_portfolio_buildings_tenant_position", "tenant_id", "position"),
+        Index("ix_customer_portfolio_buildings_tenant_status", "tenant_id", "status"),
+    )
@@ -21,7 +21,7 @@ class Device(Base):
     serial_number: Mapped[Optional[str]] = mapped_column(String(100), nullable=True, index=True)
     mac_address: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
     imei: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
-    iccid: Mapped[Optional[str]] = mapped_column(String(30), nullable=True)
+    iccid: Mapped[Optional[str]] = mapped_column(String(30), nullable=True, index=True)
     msisdn: Mapped[Optional[str]] = mapped_column(String(20), nullable=True)
     firmware_version: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
     container_version: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
@@ -54,6 +54,13 @@ class Device(Base):
     vola_org_id: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
     vola_last_sync: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
     vola_last_task_id: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    # Stored liveness / health (migration 061), maintained on flush and by the
+    # deadline sweep — see app.services.status_rollup
+    computed_status: Mapped[Optional[str]] = mapped_column(String(30), nullable=True)
+    health_status: Mapped[Optional[str]] = mapped_column(String(20), nullable=True)
+    status_due_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True, index=True)
+    # MAX(call_records.started_at), maintained at CDR ingestion (migration 055)
+    last_call_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
     # Subscriber import fields
     reconciliation_status: Mapped[Optional[str]] = mapped_column(String(30), nullable=True, server_default="imported_unverified")
     import_batch_id: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
@@ -2,9 +2,10 @@ from datetime import datetime
 from typing import Optional
 
 from sqlalchemy import DateTime, ForeignKey, Integer, String, Text, func
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.orm import Mapped, mapped_column, validates
 
 from app.database import Base
+from app.utils.phone import normalize_phone
 
 
 class Line(Base):
@@ -18,6 +19,9 @@ class Line(Base):
     port_index: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)  # FXS port on the ATA (e.g. 1 or 2)
     provider: Mapped[str] = mapped_column(String(50))  # telnyx, tmobile, bandwidth, other
     did: Mapped[Optional[str]] = mapped_column(String(30), nullable=True)  # phone number / DID
+    # Digits of ``did`` (NANP: trailing 10) — set whenever ``did`` is assigned,
+    # so CDR ingestion matches "+1 (856) 308-1391" to "8563081391" by index.
+    did_normalized: Mapped[Optional[str]] = mapped_column(String(30), nullable=True, index=True)
     sip_uri: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     protocol: Mapped[str] = mapped_column(String(20), default="SIP")  # SIP, POTS, cellular
     status: Mapped[str] = mapped_column(String(30), default="provisioning")  # active, provisioning, suspended, disconnected
@@ -39,3 +43,8 @@ class Line(Base):
     qb_description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    @validates("did")
+    def _set_did_normalized(self, _key, value):
+        self.did_normalized = normalize_phone(value or "") or None
+        return value
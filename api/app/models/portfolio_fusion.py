@@ -0,0 +1,62 @@
+"""Portfolio Fusion store — the persisted state of incremental fusion runs.
+
+``app.services.portfolio_fusion`` keeps the source records it fused last time
+(by content hash) and the Building Digital Twin built for each cluster, so a
+run only re-clusters and rebuilds the buildings whose source records changed.
+
+  * ``PortfolioFusionRecord`` — one adapted source record (Zoho row, Napco
+    radio, Genesis modem, True911 site): its content-hash key, join keys and
+    the cluster it belongs to.
+  * ``PortfolioFusionTwin``   — the twin built for one cluster, before the
+    portfolio-wide passes (building numbering, shared-address duplicates,
+    registry reconciliation) that every run re-applies.
+
+Derived data only — never a source of truth and never touched by the
+approval workflow; deleting a tenant's rows just makes the next run a full
+one.  Twins are stored as JSON text (like ``PortfolioReviewItem.payload``)
+so reports keep their key order.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, String, Text, UniqueConstraint, func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class PortfolioFusionRecord(Base):
+    __tablename__ = "portfolio_fusion_records"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    tenant_id: Mapped[str] = mapped_column(String(100), index=True, nullable=False)
+    # "<sha256 of the record>:<n>" — n disambiguates identical records
+    record_key: Mapped[str] = mapped_column(String(80), nullable=False)
+    source: Mapped[str] = mapped_column(String(20), nullable=False)
+    join_keys: Mapped[list] = mapped_column(JSONB, nullable=False)  # ["store|177", "dev|…", …]
+    cluster_key: Mapped[str] = mapped_column(String(64), index=True, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("tenant_id", "record_key", name="uq_portfolio_fusion_record"),
+    )
+
+
+class PortfolioFusionTwin(Base):
+    __tablename__ = "portfolio_fusion_twins"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    tenant_id: Mapped[str] = mapped_column(String(100), index=True, nullable=False)
+    # sha1 of the ordered member record keys — changes whenever membership does
+    cluster_key: Mapped[str] = mapped_column(String(64), nullable=False)
+    member_keys: Mapped[list] = mapped_column(JSONB, nullable=False)
+    twin: Mapped[str] = mapped_column(Text, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("tenant_id", "cluster_key", name="uq_portfolio_fusion_twin"),
+    )
@@ -0,0 +1,23 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import DateTime, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class ProvisioningScanState(Base):
+    """Watermark for incremental provisioning scans — one row per scope.
+
+    ``last_scanned_at`` is the start time of the last scan that completed;
+    an incremental scan only looks at SIMs / devices / lines updated since
+    then.  ``scope`` is the scanned tenant (``*`` for a superadmin scan).
+    """
+    __tablename__ = "provisioning_scan_state"
+
+    scope: Mapped[str] = mapped_column(String(100), primary_key=True)
+    last_scanned_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
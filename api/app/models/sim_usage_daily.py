@@ -1,6 +1,6 @@
 from datetime import date, datetime
 
-from sqlalchemy import BigInteger, Date, DateTime, ForeignKey, Integer, func
+from sqlalchemy import BigInteger, Date, DateTime, ForeignKey, Integer, String, UniqueConstraint, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.database import Base
@@ -9,6 +9,9 @@ from app.database import Base
 class SimUsageDaily(Base):
     """Daily data usage aggregates per SIM — populated by polling jobs."""
     __tablename__ = "sim_usage_daily"
+    __table_args__ = (
+        UniqueConstraint("sim_id", "usage_date", name="uq_sim_usage_daily_date"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     sim_id: Mapped[int] = mapped_column(ForeignKey("sims.id"), index=True)
@@ -17,3 +20,28 @@ class SimUsageDaily(Base):
     bytes_down: Mapped[int] = mapped_column(BigInteger, default=0)
     sms_count: Mapped[int] = mapped_column(Integer, default=0)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+
+class SimUsageMonthly(Base):
+    """Per-tenant, per-carrier monthly usage rollup of ``sim_usage_daily``.
+
+    Rebuilt for the affected months each time usage is polled
+    (``app.services.usage_polling``) so usage dashboards read one row per
+    tenant/carrier/month instead of aggregating daily rows.
+    """
+    __tablename__ = "sim_usage_monthly"
+    __table_args__ = (
+        UniqueConstraint("tenant_id", "carrier", "month", name="uq_sim_usage_monthly"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    tenant_id: Mapped[str] = mapped_column(String(100), index=True)
+    carrier: Mapped[str] = mapped_column(String(50))
+    month: Mapped[date] = mapped_column(Date)  # first day of the month
+    sim_count: Mapped[int] = mapped_column(Integer, default=0)
+    bytes_up: Mapped[int] = mapped_column(BigInteger, default=0)
+    bytes_down: Mapped[int] = mapped_column(BigInteger, default=0)
+    sms_count: Mapped[int] = mapped_column(Integer, default=0)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
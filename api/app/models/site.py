@@ -59,6 +59,10 @@ class Site(Base):
     template_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     building_type: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
     onboarding_status: Mapped[str] = mapped_column(String(50), server_default="active")
+    # Rollup of the devices' stored statuses (migration 061) — see
+    # app.services.status_rollup
+    computed_status: Mapped[Optional[str]] = mapped_column(String(30), nullable=True)
+    health_status: Mapped[Optional[str]] = mapped_column(String(20), nullable=True)
     # Address enrichment columns
     address_source: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
     e911_status: Mapped[Optional[str]] = mapped_column(String(30), nullable=True)
@@ -77,4 +81,6 @@ class Site(Base):
     __table_args__ = (
         Index("ix_sites_customer_id", "customer_id"),
         Index("ix_sites_tenant_customer", "tenant_id", "customer_id"),
+        Index("ix_sites_tenant_health", "tenant_id", "health_status"),
+        Index("ix_sites_tenant_computed", "tenant_id", "computed_status"),
     )
@@ -0,0 +1,25 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import DateTime, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class ZohoSyncState(Base):
+    """Watermark for incremental Zoho CRM syncs — one row per module/scope.
+
+    ``last_synced_at`` is the start time of the last sync that completed;
+    the next incremental run sends it as ``If-Modified-Since`` so Zoho only
+    returns records changed since then.  ``scope`` is the tenant the module
+    was synced into (``*`` for syncs that are not tenant-scoped).
+    """
+    __tablename__ = "zoho_sync_state"
+
+    module: Mapped[str] = mapped_column(String(50), primary_key=True)
+    scope: Mapped[str] = mapped_column(String(100), primary_key=True)
+    last_synced_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
@@ -0,0 +1,53 @@
+"""Daily carrier usage poll → sim_usage_daily / sim_usage_monthly.
+
+    # yesterday (UTC), Verizon
+    python -m app.poll_sim_usage
+
+    # a specific day / carrier / tenant
+    USAGE_DATE=2026-10-01 USAGE_CARRIER=verizon USAGE_TENANT=acme python -m app.poll_sim_usage
+
+Runs :mod:`app.services.usage_polling` in-process (the same code as the
+``sim.poll_usage`` worker job).  Re-running a day is safe: daily rows are
+upserted on (sim_id, usage_date) and the monthly rollup is recomputed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import sys
+from datetime import date
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+logger = logging.getLogger("true911.poll_sim_usage")
+
+
+async def run(carrier: str, usage_date: date, tenant_id: str | None) -> dict:
+    from app.database import AsyncSessionLocal
+    from app.models.job import Job
+    from app.services.usage_polling import handle_poll_usage
+
+    job = Job(job_type="sim.poll_usage", tenant_id=tenant_id,
+              payload={"carrier": carrier, "usage_date": usage_date.isoformat()})
+    async with AsyncSessionLocal() as db:
+        return await handle_poll_usage(db, job)
+
+
+def main() -> None:
+    from app.services.usage_polling import default_usage_date
+
+    logging.basicConfig(level=logging.INFO)
+    carrier = os.environ.get("USAGE_CARRIER") or "verizon"
+    raw_date = os.environ.get("USAGE_DATE")
+    usage_date = date.fromisoformat(raw_date) if raw_date else default_usage_date()
+    tenant_id = os.environ.get("USAGE_TENANT") or None
+
+    summary = asyncio.run(run(carrier, usage_date, tenant_id))
+    for k, v in summary.items():
+        print(f"  {k:12}: {v}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from pydantic import BaseModel
 from sqlalchemy import select, desc
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -8,7 +8,7 @@ from ..models.e911_change_log import E911ChangeLog
 from ..models.user import User
 from ..schemas.e911_change_log import E911ChangeLogOut, E911ChangeLogCreate
 from ..services import e911_review
-from ..services.e911_gaps import list_e911_gaps
+from ..services.e911_gaps import gap_count, list_e911_gaps
 
 router = APIRouter(prefix="/e911-changes", tags=["e911"])
 
@@ -65,15 +65,32 @@ async def reject_e911_review(
 
 @router.get("/gaps", dependencies=[Depends(require_permission("UPDATE_E911"))])
 async def e911_gaps(
+    limit: int | None = Query(None, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ) -> dict:
     """Internal E911 correction worklist — every location in the caller's tenant
     whose emergency record is incomplete or not yet verified.  Read-only; drives
     the fix-before-verify loop so the customer E911 axis stays honest even while
-    the operational axis is shown green in preview."""
-    gaps = await list_e911_gaps(db, current_user.tenant_id)
-    return {"tenant_id": current_user.tenant_id, "gap_count": len(gaps), "gaps": gaps}
+    the operational axis is shown green in preview.  ``gap_count`` is the full
+    worklist size; ``limit``/``offset`` page through it in SQL (ordered by
+    site name)."""
+    page = await list_e911_gaps(db, current_user.tenant_id, limit=limit, offset=offset)
+    return {"tenant_id": current_user.tenant_id,
+            "gap_count": await gap_count(db, current_user.tenant_id),
+            "offset": offset, "limit": limit, "gaps": page}
+
+
+@router.get("/gaps/count", dependencies=[Depends(require_permission("UPDATE_E911"))])
+async def e911_gap_count(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> dict:
+    """Size of the E911 worklist for dashboards — cached per tenant until
+    its change versions move, so polling it stays cheap."""
+    return {"tenant_id": current_user.tenant_id,
+            "gap_count": await gap_count(db, current_user.tenant_id)}
 
 
 @router.get("", response_model=list[E911ChangeLogOut])
@@ -16,6 +16,7 @@ import hashlib
 import json
 import logging
 from datetime import datetime, timezone
+from typing import Literal
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from sqlalchemy import desc, func, select
@@ -218,16 +219,18 @@ async def get_latest_reconciliation(
 
 @router.post("/reconciliation/run", status_code=202)
 async def run_reconciliation(
+    mode: Literal["full", "diff"] = Query("full"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_permission("RUN_RECONCILIATION")),
 ):
-    """Trigger a reconciliation job."""
+    """Trigger a reconciliation job.  ``mode=diff`` only recomputes
+    subscriptions changed since the latest snapshot."""
     job = await job_service.create_and_enqueue(
         db,
         job_type="integration.reconcile",
         queue="default",
         tenant_id=current_user.tenant_id,
-        payload={"org_id": current_user.tenant_id, "triggered_by": current_user.email},
+        payload={"org_id": current_user.tenant_id, "triggered_by": current_user.email, "mode": mode},
         idempotency_key=f"reconcile.{current_user.tenant_id}.{int(datetime.now(timezone.utc).timestamp())}",
     )
     await db.commit()
@@ -23,12 +23,15 @@ governance question stays answerable).
 
 from __future__ import annotations
 
+import json
 from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
+from app.database import AsyncSessionLocal
 from app.dependencies import (
     get_current_user,
     get_db,
@@ -37,7 +40,7 @@ from app.dependencies import (
 )
 from app.models.user import User
 from app.schemas.llm import HealthSummaryResponse
-from app.services.llm import generate_health_summary
+from app.services.llm import generate_health_summary, stream_health_summary
 
 router = APIRouter()
 
@@ -149,3 +152,58 @@ async def refresh_health_summary(
         force_refresh=True,
     )
     return HealthSummaryResponse.model_validate(payload)
+
+
+@router.get("/health-summary/stream")
+async def stream_health_summary_sse(
+    scope: str = Query("fleet"),
+    scope_id: Optional[str] = Query(None, max_length=100),
+    force_refresh: bool = Query(False),
+    current_user: User = Depends(require_permission("VIEW_AI_SUMMARY")),
+) -> StreamingResponse:
+    """Server-sent-event variant of GET /health-summary.
+
+    Emits ``event: delta`` frames with provider text as it is generated
+    (PII-redacted and injection-checked before emission), then exactly
+    one ``event: summary`` frame carrying the same HealthSummaryResponse
+    the GET endpoint returns.  The UI should show the deltas as a draft
+    and replace them with the summary frame.  Cache hits and fallbacks
+    emit the summary frame alone.
+
+    The stream body runs after the request's dependencies have been
+    torn down, so it opens its own session rather than using get_db.
+    """
+    _require_feature()
+    _require_internal_context(current_user)
+
+    if scope not in {"fleet", "site", "device"}:
+        raise HTTPException(
+            status.HTTP_422_UNPROCESSABLE_ENTITY,
+            "scope must be one of: fleet, site, device",
+        )
+    if scope == "site" and not scope_id:
+        raise HTTPException(
+            status.HTTP_422_UNPROCESSABLE_ENTITY,
+            "scope_id is required when scope='site'",
+        )
+
+    async def _frames():
+        async with AsyncSessionLocal() as db:
+            async for event, data in stream_health_summary(
+                db=db,
+                user=current_user,
+                scope=scope,
+                scope_id=scope_id,
+                force_refresh=force_refresh,
+            ):
+                if event == "summary":
+                    data = HealthSummaryResponse.model_validate(data).model_dump(mode="json")
+                yield f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+    return StreamingResponse(
+        _frames(),
+        media_type="text/event-stream",
+        # Disable proxy buffering so deltas reach the browser as they
+        # are produced.
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,35 @@
+"""Prometheus scrape endpoint.
+
+GET /metrics — per-route request duration / SQL statement / DB time
+histograms, the named in-process latency histograms and the integration
+gateway counters, in the Prometheus text format (see
+``app.services.request_metrics``).  This worker process only.
+
+Guarded by a bearer token (``METRICS_TOKEN``) rather than a user session so
+a scraper needs no login; with no token configured the route is 404.
+"""
+
+from __future__ import annotations
+
+import hmac
+
+from fastapi import APIRouter, Header, HTTPException, status
+from fastapi.responses import PlainTextResponse
+
+from ..config import settings
+from ..services import request_metrics
+
+router = APIRouter()
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics(authorization: str | None = Header(None)):
+    expected = settings.METRICS_TOKEN.strip()
+    if not expected:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, "Not Found")
+    scheme, _, supplied = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(supplied.strip(), expected):
+        raise HTTPException(status.HTTP_401_UNAUTHORIZED, "Invalid metrics token")
+    return PlainTextResponse(request_metrics.render_prometheus(), media_type=CONTENT_TYPE)
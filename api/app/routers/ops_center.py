@@ -60,6 +60,7 @@ from app.schemas.ops_center import (
     VerifyOtpResponse,
 )
 from app.services.audit_logger import log_audit
+from app.services.latency import histogram
 from app.services.ops_center import lookup as lookup_svc
 from app.services.ops_center import sessions as session_svc
 from app.services.ops_center import triage as triage_svc
@@ -221,6 +222,16 @@ async def lookup_asset(
     )
 
 
+@router.get("/lookup-latency")
+async def lookup_latency(current_user: User = Depends(require_permission("OPS_CENTER_VIEW"))):
+    """In-process latency histogram of asset lookups (this worker only).
+    Platform operators only — it describes the whole deployment."""
+    _require_feature()
+    if not is_platform_user(current_user):
+        raise HTTPException(status.HTTP_403_FORBIDDEN, "Platform operators only")
+    return histogram(lookup_svc.LOOKUP_HISTOGRAM).snapshot()
+
+
 # ── session lifecycle ────────────────────────────────────────────────
 
 @router.post("/session", response_model=SessionDetail, status_code=201)
@@ -142,6 +142,7 @@ async def queue_summary(
     dependencies=[Depends(require_permission("MANAGE_PROVISIONING"))],
 )
 async def scan_queue(
+    incremental: bool = Query(False, description="Only rows updated since the last scan"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -151,6 +152,7 @@ async def scan_queue(
         tenant_id=current_user.tenant_id,
         initiated_by=current_user.email,
         is_superadmin=_is_superadmin(current_user),
+        incremental=incremental,
     )
 
     audit = AuditLogEntry(
@@ -161,7 +163,8 @@ async def scan_queue(
         actor=current_user.email,
         target_type="provisioning_queue",
         summary=f"Provisioning scan by {current_user.email} — {result.get('created', 0)} new, {result.get('skipped', 0)} skipped",
-        detail_json=json.dumps({"created": result.get("created", 0), "skipped": result.get("skipped", 0)}),
+        detail_json=json.dumps({"created": result.get("created", 0), "skipped": result.get("skipped", 0),
+                                 "incremental": result.get("incremental", False)}),
     )
     db.add(audit)
     await db.commit()
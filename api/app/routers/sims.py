@@ -16,7 +16,7 @@ from app.models.sim import Sim
 from app.models.user import User
 from app.routers.helpers import apply_sort
 from app.models.site import Site
-from app.schemas.sim import SimActionOut, SimAssign, SimBulkSiteAssign, SimCreate, SimManualAssign, SimOut, SimUpdate
+from app.schemas.sim import SimActionOut, SimAssign, SimBulkAction, SimBulkActionOut, SimBulkSiteAssign, SimCreate, SimManualAssign, SimOut, SimUpdate
 
 logger = logging.getLogger("true911.sims")
 
@@ -627,6 +627,33 @@ async def resume_sim(
     return await _direct_sim_action(db, pk, "resume", current_user)
 
 
+@router.post(
+    "/bulk-action",
+    response_model=SimBulkActionOut,
+    dependencies=[Depends(require_permission("MANAGE_SIMS"))],
+)
+async def bulk_sim_action(
+    body: SimBulkAction,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Queue activate / suspend / resume for many SIMs (carrier write ops only)."""
+    if body.action not in _ACTION_TARGET_STATUS:
+        raise HTTPException(status.HTTP_422_UNPROCESSABLE_ENTITY, f"Unknown action '{body.action}'")
+    if not _carrier_write_enabled():
+        raise HTTPException(
+            status.HTTP_409_CONFLICT,
+            "Bulk SIM actions are queued carrier operations — FEATURE_CARRIER_WRITE_OPS is off",
+        )
+    from app.services.sim_service import enqueue_sim_actions
+    queued, skipped = await enqueue_sim_actions(db, body.sim_ids, body.action, current_user)
+    logger.info(
+        "Bulk SIM %s: %d queued, %d skipped, user=%s",
+        body.action, len(queued), len(skipped), current_user.email,
+    )
+    return SimBulkActionOut(queued=queued, skipped=skipped)
+
+
 # ── Bulk Site Assignment ──────────────────────────────────────────
 
 @router.post(
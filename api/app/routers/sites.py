@@ -3,7 +3,7 @@ import logging
 import uuid
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
-from sqlalchemy import func, select
+from sqlalchemy import case, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.dependencies import (
@@ -25,7 +25,6 @@ from app.services.continuity import (
     compute_device_computed_status,
     compute_site_computed_status,
 )
-from app.services.health_scoring import compute_device_health, compute_site_health
 from app.services.geocoding import geocode_address, has_valid_coords
 from app.services.site_customer_resolution import (
     CustomerNotFoundError,
@@ -64,6 +63,14 @@ _DATAENTRY_ALLOWED_FIELDS = frozenset({
 })
 
 
+# ?sort=health orders by severity rather than by the status string.
+_HEALTH_SEVERITY = case(
+    {"critical": 0, "warning": 1, "unknown": 2, "healthy": 3},
+    value=Site.health_status,
+    else_=4,
+)
+
+
 async def _site_out(site: Site, db: AsyncSession) -> SiteOut:
     """Build SiteOut with computed_status derived from its devices."""
     out = SiteOut.model_validate(site)
@@ -95,9 +102,14 @@ async def list_sites(
     carrier: str | None = None,
     kit_type: str | None = None,
     e911_state: str | None = None,
+    health: str | None = Query(None, description="health_status, e.g. critical"),
+    computed_status: str | None = Query(None, description="computed_status, e.g. Not Connected"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
+    # health / computed_status are the stored rollups
+    # (app.services.status_rollup): rows are filtered, sorted and returned
+    # with the same values; the per-minute health sweep bounds their lag.
     q = select(Site).where(Site.tenant_id == current_user.tenant_id)
     if site_id:
         q = q.where(Site.site_id == site_id)
@@ -109,43 +121,20 @@ async def list_sites(
         q = q.where(Site.kit_type == kit_type)
     if e911_state:
         q = q.where(Site.e911_state == e911_state)
-    q = apply_sort(q, Site, sort)
+    if health:
+        q = q.where(Site.health_status == health)
+    if computed_status:
+        q = q.where(Site.computed_status == computed_status)
+    if sort and sort.lstrip("-") == "health":
+        # worst first; "-health" puts healthy sites first
+        q = q.order_by(_HEALTH_SEVERITY.desc() if sort.startswith("-") else _HEALTH_SEVERITY)
+    else:
+        q = apply_sort(q, Site, sort)
     q = q.limit(limit)
     result = await db.execute(q)
     sites = result.scalars().all()
 
-    # Batch-load all devices for the tenant to avoid N+1 queries
-    dev_result = await db.execute(
-        select(Device).where(Device.tenant_id == current_user.tenant_id)
-    )
-    all_devices = dev_result.scalars().all()
-    devices_by_site: dict[str, list[Device]] = {}
-    for d in all_devices:
-        if d.site_id:
-            devices_by_site.setdefault(d.site_id, []).append(d)
-
-    out = []
-    for site in sites:
-        site_out = SiteOut.model_validate(site)
-        site_devices = devices_by_site.get(site.site_id, [])
-        device_statuses = [
-            compute_device_computed_status(d.last_heartbeat, d.heartbeat_interval)
-            for d in site_devices
-        ]
-        site_out.computed_status = compute_site_computed_status(device_statuses)
-        device_healths = [
-            compute_device_health(
-                last_heartbeat=d.last_heartbeat,
-                heartbeat_interval=d.heartbeat_interval,
-                network_status=d.network_status,
-                last_network_event=d.last_network_event,
-                device_status=d.status,
-            )
-            for d in site_devices
-        ]
-        site_out.health_status = compute_site_health(device_healths)
-        out.append(site_out)
-    return out
+    return [SiteOut.model_validate(site) for site in sites]
 
 
 @router.get(
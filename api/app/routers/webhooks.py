@@ -16,6 +16,7 @@ from app.schemas.webhook import WebhookAck
 from app.services import job_service
 from app.services.telnyx_service import (
     TelnyxSignatureError,
+    batch_ingest_enabled,
     ingest_call_event,
     verify_webhook_signature,
 )
@@ -76,7 +77,8 @@ async def telnyx_webhook(request: Request, db: AsyncSession = Depends(get_db)):
     Verifies the Telnyx Ed25519 signature when ``TELNYX_PUBLIC_KEY`` is
     configured (config-gated — with no key set this behaves exactly as
     before Phase 3), archives the raw payload, and best-effort ingests
-    ``call.hangup`` events into the ``call_records`` (CDR) table.
+    ``call.hangup`` events into the ``call_records`` (CDR) table — inline,
+    or in the worker's batch drain when ``FEATURE_TELNYX_BATCH_INGEST`` is on.
     """
     raw = await request.body()
 
@@ -91,6 +93,8 @@ async def telnyx_webhook(request: Request, db: AsyncSession = Depends(get_db)):
         raise HTTPException(status.HTTP_401_UNAUTHORIZED, "Invalid Telnyx signature")
 
     ack = await _ingest_webhook("telnyx", request, db)
+    if batch_ingest_enabled():
+        return ack
 
     # Best-effort CDR ingestion — never fail the webhook (Telnyx retries).
     try:
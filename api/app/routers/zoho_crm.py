@@ -1,6 +1,9 @@
 """Zoho CRM integration endpoints — sync accounts, contacts, push status."""
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.dependencies import get_current_user, get_db, require_permission
@@ -24,12 +27,16 @@ async def zoho_config(current_user: User = Depends(get_current_user)):
     dependencies=[Depends(require_permission("MANAGE_INTEGRATIONS"))],
 )
 async def sync_accounts(
+    incremental: bool = Query(False, description="Only records modified since the last completed sync"),
+    modified_since: Optional[datetime] = Query(None, description="Override the incremental watermark"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     """Pull Zoho CRM Accounts → upsert as True911 Customers."""
     try:
-        return await zoho_crm.sync_accounts(db, current_user.tenant_id)
+        return await zoho_crm.sync_accounts(
+            db, current_user.tenant_id, incremental=incremental, modified_since=modified_since,
+        )
     except zoho_crm.ZohoCRMError as e:
         raise HTTPException(status.HTTP_502_BAD_GATEWAY, str(e))
 
@@ -39,12 +46,14 @@ async def sync_accounts(
     dependencies=[Depends(require_permission("MANAGE_INTEGRATIONS"))],
 )
 async def sync_contacts(
+    incremental: bool = Query(False, description="Only records modified since the last completed sync"),
+    modified_since: Optional[datetime] = Query(None, description="Override the incremental watermark"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     """Pull Zoho CRM Contacts → update primary contacts on Customers."""
     try:
-        return await zoho_crm.sync_contacts(db)
+        return await zoho_crm.sync_contacts(db, incremental=incremental, modified_since=modified_since)
     except zoho_crm.ZohoCRMError as e:
         raise HTTPException(status.HTTP_502_BAD_GATEWAY, str(e))
 
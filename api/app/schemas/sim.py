@@ -90,3 +90,13 @@ class SimActionOut(BaseModel):
     action: str
     job_id: Optional[int] = None
     message: str
+
+
+class SimBulkAction(BaseModel):
+    sim_ids: list[int]
+    action: str  # activate | suspend | resume
+
+
+class SimBulkActionOut(BaseModel):
+    queued: list[SimActionOut]
+    skipped: list[dict]
@@ -10,13 +10,24 @@ normalizer). Lifecycle columns that may not exist on a given deployment
 (``sites.lifecycle_status``) are read with ``getattr`` so the loader survives a
 pre-migration / pre-PR#70 environment without crashing — absent lifecycle is
 left ``None`` and the engine treats it conservatively.
+
+Two entry points share one pure assembler (:func:`assemble_site_signals`):
+
+  * :func:`load_site_assurance_signals` — one site, ~6 bounded queries.
+  * :func:`load_tenant_assurance_snapshot` — every site in the tenant in a
+    FIXED number of queries (sites, devices, CDR aggregate, service units,
+    lines, and one windowed "latest test" query per test source), grouped
+    by site in memory.  Portfolio-wide readers use this; the per-site
+    loader stays for single-site endpoints.
 """
 
 from __future__ import annotations
 
+from collections import defaultdict
+from dataclasses import dataclass, field
 from typing import Optional
 
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.device import Device
@@ -32,7 +43,11 @@ from app.services.assurance.signals import (
     ServiceUnitSignal,
     TestRecord,
 )
-from app.services.health import compute_device_state, load_signals_for_site
+from app.services.health import (
+    compute_device_state,
+    load_signals_for_devices,
+    load_signals_for_site,
+)
 
 _INACTIVE_DEVICE_STATUSES = frozenset({
     "inactive", "decommissioned", "retired", "deactivated", "suspended", "cancelled", "canceled",
@@ -66,6 +81,42 @@ async def load_site_assurance_signals(
         )
     ).scalars().all()
 
+    # Service units.
+    units = (
+        await db.execute(
+            select(ServiceUnit).where(
+                ServiceUnit.tenant_id == tenant_id, ServiceUnit.site_id == site_id
+            )
+        )
+    ).scalars().all()
+
+    # Lines.
+    lines = (
+        await db.execute(
+            select(Line).where(Line.tenant_id == tenant_id, Line.site_id == site_id)
+        )
+    ).scalars().all()
+
+    last_test = await _load_last_test(db, tenant_id, site_id)
+
+    return assemble_site_signals(
+        tenant_id, site,
+        devices=devices, health_by_device=health_by_device,
+        units=units, lines=lines, last_test=last_test,
+    )
+
+
+def assemble_site_signals(
+    tenant_id: str,
+    site: Site,
+    *,
+    devices,
+    health_by_device: dict,
+    units,
+    lines,
+    last_test: Optional[TestRecord],
+) -> AssuranceSignals:
+    """Pure: build one site's AssuranceSignals from already-loaded rows."""
     device_signals = []
     active_device_ids: set[str] = set()
     for d in devices:
@@ -84,14 +135,6 @@ async def load_site_assurance_signals(
         if (d.status or "active").strip().lower() not in _INACTIVE_DEVICE_STATUSES:
             active_device_ids.add(d.device_id)
 
-    # Service units.
-    units = (
-        await db.execute(
-            select(ServiceUnit).where(
-                ServiceUnit.tenant_id == tenant_id, ServiceUnit.site_id == site_id
-            )
-        )
-    ).scalars().all()
     unit_signals = tuple(
         ServiceUnitSignal(
             unit_id=u.unit_id, unit_name=u.unit_name, unit_type=u.unit_type,
@@ -100,23 +143,14 @@ async def load_site_assurance_signals(
         )
         for u in units
     )
-
-    # Lines.
-    lines = (
-        await db.execute(
-            select(Line).where(Line.tenant_id == tenant_id, Line.site_id == site_id)
-        )
-    ).scalars().all()
     line_signals = tuple(
         LineSignal(line_id=ln.line_id, status=(ln.status or "active"), e911_status=ln.e911_status)
         for ln in lines
     )
 
-    last_test = await _load_last_test(db, tenant_id, site_id)
-
     return AssuranceSignals(
         tenant_id=tenant_id,
-        site_id=site_id,
+        site_id=site.site_id,
         site_name=site.site_name,
         customer_name=site.customer_name,
         site_lifecycle_status=getattr(site, "lifecycle_status", None),  # defensive (pre-PR#70)
@@ -181,3 +215,119 @@ async def _load_last_test(
         return None
     # Most recent wins; stable sort keeps verification_tasks ahead of command_testing on a tie.
     return max(candidates, key=lambda t: t.at)
+
+
+# ── Tenant-wide bulk load ────────────────────────────────────────────
+
+
+@dataclass
+class TenantAssuranceSnapshot:
+    """Every site in a tenant with its rows grouped by ``site_id``.
+
+    The raw rows are kept alongside the signals so callers that render
+    more than the assurance label (services, equipment, phone numbers)
+    never go back to the database per site.
+    """
+
+    tenant_id: str
+    sites: list = field(default_factory=list)
+    devices_by_site: dict = field(default_factory=dict)
+    units_by_site: dict = field(default_factory=dict)
+    lines_by_site: dict = field(default_factory=dict)
+    signals_by_site: dict = field(default_factory=dict)
+
+
+def _group_by_site(rows) -> dict:
+    out: dict = defaultdict(list)
+    for r in rows:
+        if r.site_id:
+            out[r.site_id].append(r)
+    return dict(out)
+
+
+def _scoped(model, tenant_id: str, site_ids):
+    q = select(model).where(model.tenant_id == tenant_id)
+    if site_ids is not None:
+        q = q.where(model.site_id.in_(site_ids))
+    return q
+
+
+async def load_tenant_assurance_snapshot(
+    db: AsyncSession, tenant_id: str, *, site_ids: Optional[set[str]] = None
+) -> TenantAssuranceSnapshot:
+    """AssuranceSignals for every site in the tenant — constant round-trips.
+
+    Seven queries no matter how many sites, devices or units the tenant
+    has.  ``site_ids`` narrows every query to those sites (incremental
+    rebuilds); it never widens past the tenant.  Read-only; every query
+    is tenant-scoped first.
+    """
+    if site_ids is not None and not site_ids:
+        return TenantAssuranceSnapshot(tenant_id=tenant_id)
+    ids = sorted(site_ids) if site_ids is not None else None
+    sites = (await db.execute(_scoped(Site, tenant_id, ids))).scalars().all()
+    snap = TenantAssuranceSnapshot(tenant_id=tenant_id, sites=list(sites))
+    if not sites:
+        return snap
+
+    devices = (await db.execute(_scoped(Device, tenant_id, ids))).scalars().all()
+    health_by_device = await load_signals_for_devices(db, tenant_id, devices)
+    units = (await db.execute(_scoped(ServiceUnit, tenant_id, ids))).scalars().all()
+    lines = (await db.execute(_scoped(Line, tenant_id, ids))).scalars().all()
+    last_tests = await _load_last_tests_for_tenant(db, tenant_id, ids)
+
+    snap.devices_by_site = _group_by_site(devices)
+    snap.units_by_site = _group_by_site(units)
+    snap.lines_by_site = _group_by_site(lines)
+    for site in sites:
+        sid = site.site_id
+        snap.signals_by_site[sid] = assemble_site_signals(
+            tenant_id, site,
+            devices=snap.devices_by_site.get(sid, []),
+            health_by_device=health_by_device,
+            units=snap.units_by_site.get(sid, []),
+            lines=snap.lines_by_site.get(sid, []),
+            last_test=last_tests.get(sid),
+        )
+    return snap
+
+
+def _latest_per_site(model, status_col, tenant_id: str, site_ids):
+    """Newest pass/fail row per site for one test source (window query)."""
+    ranked = (
+        select(
+            model.site_id.label("site_id"),
+            model.completed_at.label("completed_at"),
+            status_col.label("result"),
+            func.row_number().over(
+                partition_by=model.site_id,
+                order_by=model.completed_at.desc(),
+            ).label("rn"),
+        )
+        .where(
+            model.tenant_id == tenant_id,
+            status_col.in_(("pass", "fail")),
+            model.completed_at.is_not(None),
+            *([model.site_id.in_(site_ids)] if site_ids is not None else []),
+        )
+        .subquery()
+    )
+    return select(ranked.c.site_id, ranked.c.completed_at, ranked.c.result).where(ranked.c.rn == 1)
+
+
+async def _load_last_tests_for_tenant(
+    db: AsyncSession, tenant_id: str, site_ids=None
+) -> dict[str, TestRecord]:
+    """Bulk form of :func:`_load_last_test` — same source priority and tie rule."""
+    candidates: dict[str, list[TestRecord]] = defaultdict(list)
+    for model, status_col, source in (
+        (VerificationTask, VerificationTask.result, "verification_tasks"),
+        (InfraTestResult, InfraTestResult.status, "command_testing"),
+    ):
+        for row in (await db.execute(_latest_per_site(model, status_col, tenant_id, site_ids))).all():
+            if row.site_id:
+                candidates[row.site_id].append(
+                    TestRecord(at=row.completed_at, result=row.result, source=source)
+                )
+    # max() keeps the first of equal keys, so verification_tasks wins a tie.
+    return {sid: max(recs, key=lambda t: t.at) for sid, recs in candidates.items()}
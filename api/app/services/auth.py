@@ -42,15 +42,17 @@ def verify_password(password: str, hashed: str) -> bool:
 
 
 def create_access_token(user_id: uuid.UUID, tenant_id: str, role: str) -> str:
-    expire = datetime.now(timezone.utc) + timedelta(
-        minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
-    )
+    now = datetime.now(timezone.utc)
+    expire = now + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     payload = {
         "sub": str(user_id),
         "tenant_id": tenant_id,
         "role": role,
+        "iat": now,
         "exp": expire,
         "type": "access",
+        # Token identity for the principal cache key.
+        "jti": uuid.uuid4().hex,
     }
     return jwt.encode(payload, settings.JWT_SECRET, algorithm=settings.JWT_ALGORITHM)
 
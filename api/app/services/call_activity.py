@@ -0,0 +1,140 @@
+"""Denormalized per-device call activity — ``Device.last_call_at``.
+
+The health loaders need the most recent call per device (the Telnyx CDR
+liveness channel).  Aggregating ``MAX(call_records.started_at)`` with an
+``IN`` list of every device id in the tenant grows with the fleet, so the
+value is kept on the device row instead:
+
+  * :func:`record_calls` — called once per CDR batch at ingestion; locks
+    and loads the batch's devices in one statement and only ever moves the
+    timestamp forward (out-of-order or retried webhooks are harmless).
+  * :func:`backfill` — one set-based ``UPDATE`` from the aggregate, per
+    tenant or fleet-wide (the migration runs the same statement).
+  * :func:`parity` — compares the column with the aggregate; the
+    ``devices.last_call_backfill`` job reports it after backfilling
+    (``python -m app.backfill_device_last_call`` enqueues the job).
+
+``FEATURE_DEVICE_LAST_CALL_COLUMN=false`` makes the loaders fall back to
+the aggregate (:func:`use_column`).
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timezone
+from typing import Any, Iterable, Optional
+
+from sqlalchemy import and_, exists, func, or_, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.call_record import CallRecord
+from app.models.device import Device
+from app.models.job import Job
+
+logger = logging.getLogger("true911.call_activity")
+
+
+def use_column() -> bool:
+    return settings.FEATURE_DEVICE_LAST_CALL_COLUMN == "true"
+
+
+async def record_calls(
+    db: AsyncSession, calls: Iterable[tuple[str, Optional[str], Optional[datetime]]]
+) -> int:
+    """Advance ``last_call_at`` for the devices a batch of CDRs matched.
+
+    *calls* is ``(tenant_id, device_id, started_at)`` per CDR; rows with no
+    device or start time are skipped.  Every device in the batch is loaded
+    ``FOR UPDATE`` in one statement (id order, so concurrent batches lock
+    alike), and only ever moved forward.  Does not commit.  Returns the
+    number of devices advanced."""
+    latest: dict[tuple[str, str], datetime] = {}
+    for tenant_id, device_id, started_at in calls:
+        if not device_id or started_at is None:
+            continue
+        key = (tenant_id, device_id)
+        if key not in latest or started_at > latest[key]:
+            latest[key] = started_at
+    if not latest:
+        return 0
+    devices = (await db.scalars(
+        select(Device)
+        .where(tuple_(Device.tenant_id, Device.device_id).in_(list(latest)))
+        .order_by(Device.id)
+        .with_for_update()
+    )).all()
+    advanced = 0
+    for device in devices:
+        started_at = latest[(device.tenant_id, device.device_id)]
+        if device.last_call_at is None or _aware(device.last_call_at) < _aware(started_at):
+            device.last_call_at = started_at
+            advanced += 1
+    return advanced
+
+
+def _aware(ts: datetime) -> datetime:
+    return ts if ts.tzinfo else ts.replace(tzinfo=timezone.utc)
+
+
+def _last_call_subquery():
+    return (
+        select(func.max(CallRecord.started_at))
+        .where(
+            CallRecord.tenant_id == Device.tenant_id,
+            CallRecord.device_id == Device.device_id,
+        )
+        .scalar_subquery()
+    )
+
+
+async def backfill(db: AsyncSession, tenant_id: Optional[str] = None) -> int:
+    """Set ``last_call_at`` from the aggregate for every device that has calls
+    or a stored value (one statement; a device whose calls were all deleted
+    goes back to NULL).  Returns the number of device rows updated."""
+    has_calls = exists().where(
+        CallRecord.tenant_id == Device.tenant_id,
+        CallRecord.device_id == Device.device_id,
+        CallRecord.started_at.is_not(None),
+    )
+    q = (
+        update(Device)
+        .where(or_(has_calls, Device.last_call_at.is_not(None)))
+        .values(last_call_at=_last_call_subquery())
+        .execution_options(synchronize_session=False)
+    )
+    if tenant_id is not None:
+        q = q.where(Device.tenant_id == tenant_id)
+    result = await db.execute(q)
+    return result.rowcount or 0
+
+
+async def parity(db: AsyncSession, tenant_id: Optional[str] = None, *, sample: int = 20) -> dict:
+    """Devices whose column disagrees with the aggregate (count + a sample)."""
+    agg = _last_call_subquery()
+    mismatch = or_(
+        and_(Device.last_call_at.is_(None), agg.is_not(None)),
+        and_(Device.last_call_at.is_not(None), agg.is_(None)),
+        Device.last_call_at != agg,
+    )
+    q = select(Device.tenant_id, Device.device_id).where(mismatch)
+    if tenant_id is not None:
+        q = q.where(Device.tenant_id == tenant_id)
+    rows = (await db.execute(q.order_by(Device.tenant_id, Device.device_id))).all()
+    return {
+        "mismatched": len(rows),
+        "sample": [{"tenant_id": r.tenant_id, "device_id": r.device_id} for r in rows[:sample]],
+    }
+
+
+async def handle_backfill(db: AsyncSession, job: Job) -> dict[str, Any]:
+    """Worker handler for ``devices.last_call_backfill`` (payload ``tenant_id``
+    optional — fleet-wide when absent)."""
+    tenant_id = (job.payload or {}).get("tenant_id") or job.tenant_id
+    updated = await backfill(db, tenant_id)
+    await db.commit()
+    report = await parity(db, tenant_id)
+    if report["mismatched"]:
+        logger.warning("last_call_at parity: %d device(s) still differ (tenant=%s)",
+                       report["mismatched"], tenant_id or "*")
+    return {"tenant_id": tenant_id, "updated": updated, **report}
@@ -0,0 +1,314 @@
+"""Per-tenant / per-site change versions — a one-query "did anything change?".
+
+Consumers that cache derived views (the LLLM health-summary cache and
+the customer portfolio read model) need a cheap fingerprint of the
+underlying data.  Recomputing the data to hash it defeats the cache, so
+instead every write that can change a derived view bumps a monotonic
+counter in ``change_versions``:
+
+  * the tenant-wide counter (``scope_key="*"``) — fleet scope
+  * the per-site counter (``scope_key=<site_id>``) — site scope
+  * the registry counter (``scope_key="@registry"``) — Portfolio
+    Registry buildings / device mappings, which have no site
+  * the unsited counter (``scope_key="@unsited"``) — service units,
+    lines and test results that are not attached to a site
+
+Reading one counter is a single primary-key lookup
+(:func:`read_version`); :func:`read_versions` returns every counter of
+a tenant in one query.
+
+What bumps a counter is decided in ONE place — the ``before_flush``
+listener below — so no router or service has to remember to call
+anything.  Rules:
+
+  * Site / Device / Incident / ServiceUnit / Line / test result rows
+    inserted or deleted → bump.  Service-classification override audit
+    rows count too; every other ``ActionAudit`` row is ignored.
+  * Any column change on those rows → bump, EXCEPT the liveness
+    timestamps (heartbeat, carrier event, VOLA sync) that every
+    heartbeat touches.  Those bump only on a status transition: the
+    previous observation was missing, or older than
+    ``STALE_TRANSITION_SECONDS`` before the new one (stale → live).
+  * Moving a device/incident between sites or tenants bumps both the
+    old and the new scope.
+  * Service units, lines and test results are endpoint detail: they bump
+    only their site's counter (or ``@unsited``), never the fleet counter,
+    so a line edit does not invalidate every tenant-level summary.
+
+A device's ``last_call_at`` (advanced on every CDR) never bumps at all.
+Live → stale transitions are time-driven and have no write to hook;
+consumers fold a coarse time bucket or a TTL into their fingerprint for that
+(see :func:`app.services.llm.context.fingerprint_inputs_for_version`).  The
+health-status sweep (:mod:`app.services.status_rollup`) does write a
+device's stored ``computed_status`` / ``health_status`` when one lapses,
+which bumps like any other column change — within the sweep interval.
+Writes that bypass the ORM unit of work are not observed — the cache
+TTL remains the backstop for those.
+
+:func:`install` registers the listener; it is idempotent and runs for
+every session ``app.database.AsyncSessionLocal`` hands out.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Iterable, Optional
+
+from sqlalchemy import event, func, inspect as sa_inspect, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.action_audit import SERVICE_CLASSIFICATION_OVERRIDE, ActionAudit
+from app.models.change_version import ChangeVersion
+from app.models.device import Device
+from app.models.incident import Incident
+from app.models.infra_test_result import InfraTestResult
+from app.models.line import Line
+from app.models.portfolio_registry import PortfolioBuilding, PortfolioDeviceMapping
+from app.models.service_unit import ServiceUnit
+from app.models.site import Site
+from app.models.verification_task import VerificationTask
+
+TENANT_SCOPE = "*"
+REGISTRY_SCOPE = "@registry"
+UNSITED_SCOPE = "@unsited"
+
+# A liveness timestamp that jumps by more than this is a stale → live
+# transition.  Matches ``STALE_DEVICE_SECONDS`` in
+# ``app/services/llm/context.py`` (and the health normalizer's
+# ``STALE_OBSERVATION_SECONDS``) — kept local so this module does not
+# widen the governed import surface of ``app.services.health``.
+STALE_TRANSITION_SECONDS = 300
+
+# Liveness timestamps refreshed by every heartbeat / telemetry poll.  A
+# change here only counts when it is a stale → live transition.
+_LIVENESS_COLUMNS: dict[type, frozenset[str]] = {
+    Device: frozenset({"last_heartbeat", "last_network_event", "vola_last_sync"}),
+    Site: frozenset({"last_device_heartbeat", "last_checkin"}),
+    Incident: frozenset(),
+    ServiceUnit: frozenset(),
+    Line: frozenset(),
+    VerificationTask: frozenset(),
+    InfraTestResult: frozenset(),
+    ActionAudit: frozenset(),
+    PortfolioBuilding: frozenset(),
+    PortfolioDeviceMapping: frozenset(),
+}
+
+# Bookkeeping columns that never change what a summary says.
+_IGNORED_COLUMNS: dict[type, frozenset[str]] = {
+    # last_call_at moves on nearly every CDR; with calls minutes apart most
+    # would read as stale -> live and churn every tenant / site cache.
+    Device: frozenset({"updated_at", "telemetry_source", "vola_last_task_id", "status_due_at",
+                       "last_call_at"}),
+    Site: frozenset({"updated_at", "heartbeat_next_due", "last_portal_sync", "signal_dbm",
+                     "computed_status", "health_status"}),
+    Incident: frozenset({"updated_at"}),
+    ServiceUnit: frozenset({"updated_at"}),
+    Line: frozenset({"updated_at"}),
+    VerificationTask: frozenset({"updated_at"}),
+    InfraTestResult: frozenset(),
+    ActionAudit: frozenset(),
+    PortfolioBuilding: frozenset({"updated_at"}),
+    PortfolioDeviceMapping: frozenset(),
+}
+
+# Rows with no site of their own bump one dedicated tenant scope instead
+# of the fleet counter (a registry edit says nothing about fleet health).
+_DEDICATED_SCOPE: dict[type, str] = {
+    PortfolioBuilding: REGISTRY_SCOPE,
+    PortfolioDeviceMapping: REGISTRY_SCOPE,
+}
+
+# Endpoint detail: bumps its site only (UNSITED_SCOPE when it has none).
+_SITE_ONLY = (ServiceUnit, Line, InfraTestResult)
+
+_TRACKED = tuple(_LIVENESS_COLUMNS)
+
+
+def is_site_scope(scope_key: str) -> bool:
+    """True for a per-site counter (not ``*`` or an ``@`` scope)."""
+    return scope_key != TENANT_SCOPE and not scope_key.startswith("@")
+
+
+def _is_tracked(obj) -> bool:
+    if not isinstance(obj, _TRACKED):
+        return False
+    if isinstance(obj, ActionAudit):
+        return obj.action_type == SERVICE_CLASSIFICATION_OVERRIDE
+    return True
+
+
+# ─── Reads ──────────────────────────────────────────────────────────
+
+
+async def read_version(
+    db: AsyncSession, tenant_id: str, site_id: Optional[str] = None
+) -> int:
+    """Return the current counter for a tenant (or one of its sites).
+
+    One primary-key lookup.  A missing row reads as 0 — nothing has
+    changed since the table was created.
+    """
+    scope_key = site_id or TENANT_SCOPE
+    q = select(ChangeVersion.version).where(
+        ChangeVersion.tenant_id == tenant_id,
+        ChangeVersion.scope_key == scope_key,
+    )
+    value = (await db.execute(q)).scalar_one_or_none()
+    return int(value or 0)
+
+
+async def read_versions(db: AsyncSession, tenant_id: str) -> dict[str, int]:
+    """Every counter of a tenant as ``{scope_key: version}`` — one query."""
+    q = select(ChangeVersion.scope_key, ChangeVersion.version).where(
+        ChangeVersion.tenant_id == tenant_id
+    )
+    return {row.scope_key: int(row.version) for row in (await db.execute(q)).all()}
+
+
+async def read_version_total(db: AsyncSession, tenant_id: str) -> int:
+    """Sum of every counter of a tenant — one aggregate query.  Counters
+    only ever increase, so the sum moves whenever any scope is bumped."""
+    q = select(func.coalesce(func.sum(ChangeVersion.version), 0)).where(
+        ChangeVersion.tenant_id == tenant_id
+    )
+    return int((await db.execute(q)).scalar_one())
+
+
+# ─── Change detection (pure) ────────────────────────────────────────
+
+
+def is_liveness_transition(old: Optional[datetime], new: Optional[datetime]) -> bool:
+    """True when moving ``old`` → ``new`` flips a stale observation live.
+
+    Clearing the timestamp (``new is None``) also counts: the row goes
+    from observed to never-observed.
+    """
+    if new is None:
+        return old is not None
+    if old is None:
+        return True
+    try:
+        gap = (new - old).total_seconds()
+    except TypeError:
+        # naive vs aware — compare as UTC
+        gap = (new.replace(tzinfo=None) - old.replace(tzinfo=None)).total_seconds()
+    return gap > STALE_TRANSITION_SECONDS
+
+
+def _history_values(obj, attr: str) -> tuple[list, list]:
+    """Return (old_values, new_values) for one attribute of a dirty row."""
+    hist = sa_inspect(obj).attrs[attr].history
+    return list(hist.deleted or ()), list(hist.added or ())
+
+
+def _scopes_for_row(
+    obj, *, tenant_ids: Iterable, site_ids: Iterable
+) -> set[tuple[str, str]]:
+    scopes: set[tuple[str, str]] = set()
+    dedicated = _DEDICATED_SCOPE.get(type(obj))
+    sites = [site_id for site_id in site_ids if site_id]
+    for tenant_id in tenant_ids:
+        if not tenant_id:
+            continue
+        if dedicated is not None:
+            scopes.add((tenant_id, dedicated))
+            continue
+        if isinstance(obj, _SITE_ONLY):
+            scopes.update((tenant_id, k) for k in sites or [UNSITED_SCOPE])
+            continue
+        scopes.add((tenant_id, TENANT_SCOPE))
+        scopes.update((tenant_id, site_id) for site_id in sites)
+    return scopes
+
+
+def _current_keys(obj) -> tuple[list, list]:
+    return [getattr(obj, "tenant_id", None)], [getattr(obj, "site_id", None)]
+
+
+def _dirty_row_changed(obj) -> bool:
+    """Does this dirty row carry a change a summary can observe?"""
+    cls = type(obj)
+    liveness = _LIVENESS_COLUMNS[cls]
+    ignored = _IGNORED_COLUMNS[cls]
+    state = sa_inspect(obj)
+    for attr in state.mapper.column_attrs:
+        key = attr.key
+        if key in ignored:
+            continue
+        hist = state.attrs[key].history
+        if not hist.has_changes():
+            continue
+        if key in liveness:
+            old = hist.deleted[0] if hist.deleted else None
+            new = hist.added[0] if hist.added else None
+            if is_liveness_transition(old, new):
+                return True
+            continue
+        return True
+    return False
+
+
+def collect_changed_scopes(session: Session) -> set[tuple[str, str]]:
+    """Return every ``(tenant_id, scope_key)`` the pending flush affects."""
+    scopes: set[tuple[str, str]] = set()
+
+    for obj in list(session.new) + list(session.deleted):
+        if _is_tracked(obj):
+            tenants, sites = _current_keys(obj)
+            scopes |= _scopes_for_row(obj, tenant_ids=tenants, site_ids=sites)
+
+    for obj in session.dirty:
+        if not _is_tracked(obj):
+            continue
+        if not session.is_modified(obj, include_collections=False):
+            continue
+        if not _dirty_row_changed(obj):
+            continue
+        tenants, sites = _current_keys(obj)
+        # Re-parenting bumps the scope the row is leaving as well.
+        old_tenants, _ = _history_values(obj, "tenant_id")
+        old_sites = _history_values(obj, "site_id")[0] if hasattr(obj, "site_id") else []
+        scopes |= _scopes_for_row(
+            obj,
+            tenant_ids=tenants + old_tenants,
+            site_ids=sites + old_sites,
+        )
+
+    return scopes
+
+
+# ─── Writes ─────────────────────────────────────────────────────────
+
+
+def _bump_statement(dialect_name: str, scopes: Iterable[tuple[str, str]]):
+    """One multi-row upsert: insert at 1, or increment an existing row."""
+    insert_fn = sqlite_insert if dialect_name == "sqlite" else pg_insert
+    table = ChangeVersion.__table__
+    # Sorted so concurrent flushes take row locks in the same order.
+    rows = [
+        {"tenant_id": t, "scope_key": k, "version": 1}
+        for t, k in sorted(scopes)
+    ]
+    stmt = insert_fn(table).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=["tenant_id", "scope_key"],
+        set_={"version": table.c.version + 1, "updated_at": func.now()},
+    )
+
+
+def _before_flush(session: Session, flush_context, instances) -> None:
+    scopes = collect_changed_scopes(session)
+    if not scopes:
+        return
+    conn = session.connection()
+    conn.execute(_bump_statement(conn.dialect.name, scopes))
+
+
+def install() -> None:
+    """Register the flush listener on every ORM Session.  Idempotent."""
+    if not event.contains(Session, "before_flush", _before_flush):
+        event.listen(Session, "before_flush", _before_flush)
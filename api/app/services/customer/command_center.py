@@ -12,13 +12,14 @@ signals become "unknown", which lowers health confidence).
 
 from __future__ import annotations
 
-from sqlalchemy import func, or_, select
+from sqlalchemy import func, select, union_all
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.device import Device
 from app.models.line import Line
 from app.models.service_unit import ServiceUnit
 from app.models.site import Site
+from app.services import text_search as ts
 from app.services.assurance import compute_site_assurance
 from app.services.assurance.loader import load_site_assurance_signals
 from app.services.customer import contributions as contrib
@@ -134,18 +135,10 @@ async def load_e911_history_all(db: AsyncSession, tenant_id: str):
 
 
 # ── Service intelligence: inferred Life-Safety services (Phase 1-7) ──
-async def load_overrides(db: AsyncSession, tenant_id: str, site_id: str) -> dict:
-    """Current manual service-classification overrides for a site — read from the
-    append-only ActionAudit log (latest per device wins).  {device_id: service_type}."""
+def _latest_overrides(rows) -> dict:
+    """{device_id: service_type} from override audit rows in id-desc order."""
     import json
 
-    from app.models.action_audit import ActionAudit
-    rows = (await db.execute(
-        select(ActionAudit).where(
-            ActionAudit.tenant_id == tenant_id,
-            ActionAudit.site_id == site_id,
-            ActionAudit.action_type == si.OVERRIDE_ACTION,
-        ).order_by(ActionAudit.id.desc()))).scalars().all()
     out: dict = {}
     for r in rows:
         try:
@@ -158,6 +151,37 @@ async def load_overrides(db: AsyncSession, tenant_id: str, site_id: str) -> dict
     return out
 
 
+async def load_overrides(db: AsyncSession, tenant_id: str, site_id: str) -> dict:
+    """Current manual service-classification overrides for a site — read from the
+    append-only ActionAudit log (latest per device wins).  {device_id: service_type}."""
+    from app.models.action_audit import ActionAudit
+    rows = (await db.execute(
+        select(ActionAudit).where(
+            ActionAudit.tenant_id == tenant_id,
+            ActionAudit.site_id == site_id,
+            ActionAudit.action_type == si.OVERRIDE_ACTION,
+        ).order_by(ActionAudit.id.desc()))).scalars().all()
+    return _latest_overrides(rows)
+
+
+async def load_overrides_for_tenant(db: AsyncSession, tenant_id: str, *, site_ids=None) -> dict:
+    """Tenant-wide form of :func:`load_overrides` in ONE query (optionally
+    narrowed to ``site_ids``).  {site_id: {device_id: service_type}}."""
+    from app.models.action_audit import ActionAudit
+    q = select(ActionAudit).where(
+        ActionAudit.tenant_id == tenant_id,
+        ActionAudit.action_type == si.OVERRIDE_ACTION,
+    )
+    if site_ids is not None:
+        q = q.where(ActionAudit.site_id.in_(sorted(site_ids)))
+    rows = (await db.execute(q.order_by(ActionAudit.id.desc()))).scalars().all()
+    by_site: dict = {}
+    for r in rows:
+        if r.site_id:
+            by_site.setdefault(r.site_id, []).append(r)
+    return {sid: _latest_overrides(site_rows) for sid, site_rows in by_site.items()}
+
+
 def _service_status(svc: dict, preview: bool, now) -> dict:
     """Service health (Phase 3) derived from the service's supporting equipment
     (never a raw device count).  Preview greens the operational axis."""
@@ -196,7 +220,22 @@ async def _build_location_services(db, tenant_id, site, now) -> list[dict]:
     lines = (await db.execute(
         select(Line).where(Line.tenant_id == tenant_id, Line.site_id == site.site_id))).scalars().all()
     overrides = await load_overrides(db, tenant_id, site.site_id)
+    return _assemble_location_services(units, devices, lines, overrides, device_by_id, preview, now)
+
+
+def services_from_snapshot(snapshot, site, now) -> list[dict]:
+    """Same cards as :func:`_build_location_services`, from a
+    ``portfolio.PortfolioSnapshot`` — no queries."""
+    sid = site.site_id
+    a = snapshot.assurance
+    return _assemble_location_services(
+        a.units_by_site.get(sid, []), a.devices_by_site.get(sid, []), a.lines_by_site.get(sid, []),
+        snapshot.overrides.get(sid, {}), snapshot.device_assurance.get(sid, {}),
+        snapshot.preview, now)
 
+
+def _assemble_location_services(units, devices, lines, overrides, device_by_id, preview, now) -> list[dict]:
+    """Pure: infer + assemble a site's service cards from its loaded rows."""
     unit_by_device = {u.device_id: u for u in units if u.device_id}
     line_by_device = {ln.device_id: ln for ln in lines if ln.device_id}
     line_did_by_id = {ln.line_id: ln.did for ln in lines}
@@ -363,49 +402,36 @@ async def load_location_timeline(db: AsyncSession, tenant_id: str, location_ref:
 async def search_portfolio(db: AsyncSession, tenant_id: str, q: str, now):
     """Search a tenant's portfolio by store name/number, city, state, phone
     number, service type, and equipment/service label — returns matching
-    LOCATIONS (customer-safe).  Tenant-scoped; empty query -> empty."""
+    LOCATIONS (customer-safe), best match first (exact, then prefix, then
+    word-prefix, then substring; ties by name).  One statement; on Postgres
+    every searched column is covered by a trigram index (migration 054).
+    Tenant-scoped; empty query -> empty."""
     q = (q or "").strip()
-    if not q:
-        return {"query": q, "results": []}
-    like = f"%{q.lower()}%"
-    site_ids: set[str] = set()
-
-    # Sites by name / city / state / store id
-    for (sid,) in (await db.execute(
-        select(Site.site_id).where(
-            Site.tenant_id == tenant_id,
-            or_(func.lower(Site.site_name).like(like),
-                func.lower(Site.e911_city).like(like),
-                func.lower(Site.e911_state).like(like),
-                func.lower(Site.site_id).like(like))))).all():
-        site_ids.add(sid)
-    # Service units by type / name / where
-    for (sid,) in (await db.execute(
-        select(ServiceUnit.site_id).where(
-            ServiceUnit.tenant_id == tenant_id,
-            or_(func.lower(ServiceUnit.unit_type).like(like),
-                func.lower(ServiceUnit.unit_name).like(like),
-                func.lower(ServiceUnit.location_description).like(like))))).all():
-        if sid:
-            site_ids.add(sid)
-    # Devices by phone number (msisdn)
-    for (sid,) in (await db.execute(
-        select(Device.site_id).where(
-            Device.tenant_id == tenant_id, func.lower(Device.msisdn).like(like)))).all():
-        if sid:
-            site_ids.add(sid)
-    # Lines by DID (phone number)
-    for (sid,) in (await db.execute(
-        select(Line.site_id).where(
-            Line.tenant_id == tenant_id, func.lower(Line.did).like(like)))).all():
-        if sid:
-            site_ids.add(sid)
-
-    if not site_ids:
+    ql = ts.normalize_query(q)
+    if not ql:
         return {"query": q, "results": []}
-    sites = (await db.execute(
-        select(Site).where(Site.tenant_id == tenant_id, Site.site_id.in_(site_ids))
-        .order_by(Site.site_name).limit(_SEARCH_MAX))).scalars().all()
+
+    def _hits(model, col, site_col):
+        return (select(site_col.label("site_id"), ts.match_rank(col, ql).label("rank"))
+                .where(model.tenant_id == tenant_id, site_col.is_not(None), ts.contains(col, ql)))
+
+    hits = union_all(
+        # Sites by name / city / state / store id
+        *(_hits(Site, col, Site.site_id)
+          for col in (Site.site_name, Site.e911_city, Site.e911_state, Site.site_id)),
+        # Service units by type / name / where
+        *(_hits(ServiceUnit, col, ServiceUnit.site_id)
+          for col in (ServiceUnit.unit_type, ServiceUnit.unit_name, ServiceUnit.location_description)),
+        # Devices by phone number (msisdn), lines by DID
+        _hits(Device, Device.msisdn, Device.site_id),
+        _hits(Line, Line.did, Line.site_id),
+    ).subquery()
+    best = (select(hits.c.site_id, func.min(hits.c.rank).label("rank"))
+            .group_by(hits.c.site_id).subquery())
+    sites = [s for s, _rank in (await db.execute(
+        select(Site, best.c.rank).join(best, best.c.site_id == Site.site_id)
+        .where(Site.tenant_id == tenant_id)
+        .order_by(best.c.rank, Site.site_name).limit(_SEARCH_MAX))).all()]
     results = [{
         "location_ref": cs.encode_ref("loc", s.id),
         "location": s.site_name,
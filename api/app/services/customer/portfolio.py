@@ -8,14 +8,18 @@ raw model fields — all customer-facing shaping happens in ``serialize.py``.
 
 Reused by GET /api/customer/dashboard and /locations[/{ref}].
 
-NOTE (perf): assurance is computed per site via ``load_site_assurance_signals``
-(~6 bounded queries/site).  At RH scale (42 sites) a portfolio read is ~250
-queries.  A batched loader / assurance snapshot is the planned optimization
-(docs/ASSURANCE_ENGINE.md) — out of scope for PR-C2.
+Portfolio-wide reads go through :func:`load_portfolio_snapshot`, which loads
+sites, devices, service units, lines, tests, health signals and service
+overrides for the WHOLE tenant in a fixed number of queries
+(``load_tenant_assurance_snapshot`` + one override query) and computes every
+site's assurance in memory.  Single-location endpoints still use the per-site
+``load_site_assurance_signals``.
 """
 
 from __future__ import annotations
 
+from dataclasses import dataclass, field
+
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -27,7 +31,11 @@ from app.models.service_unit import ServiceUnit
 from app.models.site import Site
 from app.models.tenant import Tenant
 from app.services.assurance import compute_site_assurance, reason_codes as rc
-from app.services.assurance.loader import load_site_assurance_signals
+from app.services.assurance.loader import (
+    TenantAssuranceSnapshot,
+    load_site_assurance_signals,
+    load_tenant_assurance_snapshot,
+)
 from app.services.assurance.signals import AssuranceLabel
 from app.services.customer.preview import preview_enabled, preview_protection
 from app.services.customer.refs import decode_ref
@@ -140,26 +148,71 @@ def _unknown(now) -> dict:
     return status_object("Unknown", as_of=now.isoformat(), reason="Status cannot be confirmed yet")
 
 
+@dataclass
+class PortfolioSnapshot:
+    """A tenant's whole portfolio, loaded once and assembled in memory.
+
+    ``portfolio`` is the ``load_portfolio`` shape; ``device_assurance`` maps
+    ``site_id -> {device_id: DeviceAssurance}`` (empty under preview) and
+    ``overrides`` maps ``site_id -> {device_id: service_type}`` — everything
+    ``command_center.services_from_snapshot`` needs to build service cards
+    without a query per site.
+    """
+
+    tenant_id: str
+    preview: bool
+    assurance: TenantAssuranceSnapshot
+    portfolio: list = field(default_factory=list)
+    device_assurance: dict = field(default_factory=dict)
+    overrides: dict = field(default_factory=dict)
+
+
+async def load_portfolio_snapshot(
+    db: AsyncSession, tenant_id: str, now, *, with_overrides: bool = True, site_ids=None
+) -> PortfolioSnapshot:
+    """Load and assemble the whole tenant portfolio in constant round-trips.
+
+    Query count is independent of site / device / unit counts.  Preview mode
+    still loads the rows (services are rendered from them) but skips the
+    assurance computation, exactly like the per-site path.  Pass
+    ``with_overrides=False`` when no service cards will be built, and
+    ``site_ids`` to load only those sites (incremental read-model rebuilds)."""
+    from app.services.customer.command_center import load_overrides_for_tenant
+
+    preview = preview_enabled(tenant_id)
+    assurance = await load_tenant_assurance_snapshot(db, tenant_id, site_ids=site_ids)
+    snap = PortfolioSnapshot(tenant_id=tenant_id, preview=preview, assurance=assurance)
+    if with_overrides and assurance.sites:
+        snap.overrides = await load_overrides_for_tenant(db, tenant_id, site_ids=site_ids)
+    for site in assurance.sites:
+        if preview:
+            snap.portfolio.append((site, preview_protection(now)))
+            continue
+        signals = assurance.signals_by_site.get(site.site_id)
+        if signals is None:
+            snap.portfolio.append((site, _unknown(now)))
+            continue
+        result = compute_site_assurance(signals, now=now)
+        snap.device_assurance[site.site_id] = {d.device_id: d for d in result.devices}
+        snap.portfolio.append((site, _protection_from_result(result, signals, now)))
+    return snap
+
+
 async def load_portfolio(db: AsyncSession, tenant_id: str, now) -> list[tuple[Site, dict]]:
     """Return (Site, protection StatusObject) for every site in the tenant.
 
     When preview is enabled for the tenant (RH go-live login preview), the
     operational protection is forced to Active/Protected — see
     ``services.customer.preview``.  The E911 axis is untouched (its own
-    endpoint reads real stored data)."""
-    preview = preview_enabled(tenant_id)
-    sites = (await db.execute(
-        select(Site).where(Site.tenant_id == tenant_id)
-    )).scalars().all()
-    out: list[tuple[Site, dict]] = []
-    for site in sites:
-        if preview:
-            out.append((site, preview_protection(now)))
-            continue
-        signals = await load_site_assurance_signals(db, tenant_id, site.site_id)
-        protection = protection_from_assurance(signals, now) if signals is not None else _unknown(now)
-        out.append((site, protection))
-    return out
+    endpoint reads real stored data).  Otherwise assurance comes from the
+    bulk :func:`load_portfolio_snapshot` (constant query count)."""
+    if preview_enabled(tenant_id):
+        sites = (await db.execute(
+            select(Site).where(Site.tenant_id == tenant_id)
+        )).scalars().all()
+        return [(site, preview_protection(now)) for site in sites]
+    snap = await load_portfolio_snapshot(db, tenant_id, now, with_overrides=False)
+    return snap.portfolio
 
 
 async def resolve_location(db: AsyncSession, tenant_id: str, location_ref: str, now):
@@ -351,8 +404,8 @@ async def _resolve_building_primary_site(db: AsyncSession, tenant_id: str, build
         return None
     sites = (await db.execute(select(Site).where(Site.tenant_id == tenant_id))).scalars().all()
     # reuse the read-model linkage (no assurance needed here — just identity)
-    _si, by_store, by_addr, dev_site = await prv._link_indexes(db, tenant_id, [(s, None) for s in sites])
-    site_ids = prv._resolve_building_site_ids(b, by_store, by_addr, dev_site)
+    _si, by_store, by_addr, dev_by_building = await prv._link_indexes(db, tenant_id, [(s, None) for s in sites])
+    site_ids = prv._resolve_building_site_ids(b, by_store, by_addr, dev_by_building)
     for site in sites:
         if site.site_id in site_ids:
             return site
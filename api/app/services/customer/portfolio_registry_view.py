@@ -28,6 +28,7 @@ Sites, never marks E911 verified, never fabricates data.
 from __future__ import annotations
 
 import logging
+import re
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -70,7 +71,8 @@ def _include_pending(tenant_id) -> bool:
 async def _visible_building_rows(db, tenant_id):
     from app.models.portfolio_registry import PortfolioBuilding
     rows = (await db.execute(
-        select(PortfolioBuilding).where(PortfolioBuilding.tenant_id == tenant_id))).scalars().all()
+        select(PortfolioBuilding).where(PortfolioBuilding.tenant_id == tenant_id)
+        .order_by(PortfolioBuilding.id))).scalars().all()
     include_pending = _include_pending(tenant_id)
     out = []
     for b in rows:
@@ -86,6 +88,16 @@ async def _link_indexes(db, tenant_id, sites_portfolio):
     from store#/address, all tenant-scoped and read-only."""
     from app.models.portfolio_registry import PortfolioDeviceMapping
 
+    mappings = (await db.execute(
+        select(PortfolioDeviceMapping).where(
+            PortfolioDeviceMapping.tenant_id == tenant_id))).scalars().all()
+    return build_link_indexes(sites_portfolio, mappings)
+
+
+def build_link_indexes(sites_portfolio, mappings):
+    """``(site_by_id, by_store, by_addr, dev_by_building)`` — every index keyed the
+    way ``_resolve_building_site_ids`` looks it up, so linking all buildings is
+    O(buildings + sites + mappings).  Pure."""
     site_by_id, by_store, by_addr = {}, {}, {}
     for site, protection in sites_portfolio:
         site_by_id[site.site_id] = (site, protection)
@@ -96,33 +108,39 @@ async def _link_indexes(db, tenant_id, sites_portfolio):
         if a:
             by_addr.setdefault(a, []).append(site.site_id)
 
-    dev_site = {}      # normalized true911_device value -> site_id (identity mapping)
-    for m in (await db.execute(
-        select(PortfolioDeviceMapping).where(
-            PortfolioDeviceMapping.tenant_id == tenant_id))).scalars().all():
+    # One identity per normalized true911_device value (last mapping wins), then
+    # grouped by the building it names.
+    dev_site = {}
+    for m in mappings:
         if m.active and m.kind == "true911_device":
             dev_site[m.value_normalized] = (m.building_id, m.value)
-    return site_by_id, by_store, by_addr, dev_site
+    dev_by_building = {}
+    for bid, raw in dev_site.values():
+        dev_by_building.setdefault(bid, []).append(raw)
+    return site_by_id, by_store, by_addr, dev_by_building
+
+
+_NON_ALNUM_LOWER = re.compile(r"[^a-z0-9]+")
+_NON_ALNUM = re.compile(r"[^A-Za-z0-9]")
+_STORE_HASH = re.compile(r"#\s*0*(\d{1,4})\b")
+_STORE_RH = re.compile(r"\brh\b[\s\-#]*0*(\d{1,4})")
 
 
 def cs_norm_addr(site) -> str:
-    import re
-    return re.sub(r"[^a-z0-9]+", " ",
-                  f"{site.e911_street or ''} {site.e911_city or ''} {site.e911_state or ''}".lower()).strip()
+    return _NON_ALNUM_LOWER.sub(
+        " ", f"{site.e911_street or ''} {site.e911_city or ''} {site.e911_state or ''}".lower()).strip()
 
 
 def _site_store_number(name) -> str | None:
-    import re
-    m = re.search(r"#\s*0*(\d{1,4})\b", name or "")
+    m = _STORE_HASH.search(name or "")
     if m:
         return m.group(1)
-    m = re.search(r"\brh\b[\s\-#]*0*(\d{1,4})", (name or "").lower())
+    m = _STORE_RH.search((name or "").lower())
     return m.group(1) if m else None
 
 
 def _norm_id(v) -> str:
-    import re
-    return re.sub(r"[^A-Za-z0-9]", "", str(v or "")).upper()
+    return _NON_ALNUM.sub("", str(v or "")).upper()
 
 
 def _combine_protection(protections, now):
@@ -144,22 +162,34 @@ async def load_customer_buildings(db: AsyncSession, tenant_id: str, now):
                     "buildings — falling back to legacy Site path (internal only).", tenant_id)
         return None
 
-    sites_portfolio = await cportfolio.load_portfolio(db, tenant_id, now)
-    site_by_id, by_store, by_addr, dev_site = await _link_indexes(db, tenant_id, sites_portfolio)
+    # One bulk load for the whole tenant; every building below is assembled
+    # in memory from it (query count does not grow with sites or buildings).
+    snapshot = await cportfolio.load_portfolio_snapshot(db, tenant_id, now)
+    links = await link_buildings(db, tenant_id, rows, snapshot.portfolio)
+    return build_records(snapshot, links, now)
+
+
+async def link_buildings(db, tenant_id, rows, sites_portfolio) -> list:
+    """[(building, pending, {site_id, ...})] — each visible building with the ids
+    of the True911 sites it links to (only ids present in ``sites_portfolio``)."""
+    site_by_id, by_store, by_addr, dev_by_building = await _link_indexes(db, tenant_id, sites_portfolio)
+    return [(b, pending, {sid for sid in _resolve_building_site_ids(b, by_store, by_addr, dev_by_building)
+                          if sid in site_by_id})
+            for b, pending in rows]
+
 
-    records = []
-    for b, pending in rows:
-        site_ids = _resolve_building_site_ids(b, by_store, by_addr, dev_site)
-        linked = [site_by_id[sid] for sid in site_ids if sid in site_by_id]
-        records.append(await _aggregate_building(db, tenant_id, b, pending, linked, now))
-    return records
+def build_records(snapshot, links, now) -> list[dict]:
+    """Aggregate linked buildings from a portfolio snapshot.  Sites missing from
+    the snapshot (a site-filtered load) are skipped, so callers pass a snapshot
+    that covers every linked site."""
+    site_by_id = {s.site_id: (s, p) for s, p in snapshot.portfolio}
+    return [_aggregate_building(snapshot, b, pending,
+                                [site_by_id[sid] for sid in site_ids if sid in site_by_id], now)
+            for b, pending, site_ids in links]
 
 
-def _resolve_building_site_ids(b, by_store, by_addr, dev_site) -> set:
-    ids = set()
-    for norm_val, (bid, raw) in dev_site.items():
-        if bid == b.id:
-            ids.add(raw)                        # true911_device mapping names the site_id
+def _resolve_building_site_ids(b, by_store, by_addr, dev_by_building) -> set:
+    ids = set(dev_by_building.get(b.id, ()))   # true911_device mappings name the site_id
     if b.store_number:
         ids.update(by_store.get(str(b.store_number), []))
     a = _norm_addr_parts(b.address, b.city, b.state)
@@ -169,20 +199,20 @@ def _resolve_building_site_ids(b, by_store, by_addr, dev_site) -> set:
 
 
 def _norm_addr_parts(street, city, state) -> str:
-    import re
-    return re.sub(r"[^a-z0-9]+", " ", f"{street or ''} {city or ''} {state or ''}".lower()).strip()
+    return _NON_ALNUM_LOWER.sub(" ", f"{street or ''} {city or ''} {state or ''}".lower()).strip()
 
 
-async def _aggregate_building(db, tenant_id, b, pending, linked, now) -> dict:
+def _aggregate_building(snapshot, b, pending, linked, now) -> dict:
     """Derive the customer-safe facts for one canonical building from its linked
-    True911 sites (reusing the service-inference + assurance logic)."""
+    True911 sites (reusing the service-inference + assurance logic).  Pure — the
+    rows come from the portfolio snapshot."""
     protections = [p for _s, p in linked]
     protection = _combine_protection(protections, now)
 
     services, equipment_count, phones = [], 0, set()
     e911_verified_sites, e911_any = 0, 0
     for site, _p in linked:
-        svcs = await cc._build_location_services(db, tenant_id, site, now)
+        svcs = cc.services_from_snapshot(snapshot, site, now)
         services.extend(svcs)
         for svc in svcs:
             equipment_count += svc.get("equipment_count", 0) or 0
@@ -0,0 +1,412 @@
+"""Precomputed customer portfolio read model (registry mode) — O(page) reads.
+
+Every registry-mode customer endpoint used to rebuild the whole building list
+(``portfolio_registry_view.load_customer_buildings``) and then filter it in
+Python.  This module keeps that list precomputed per tenant in Postgres
+(``models.customer_read_model``): one header row with the portfolio aggregates,
+one serialized record per building.  Paging, search and detail views read only
+the rows they return; dashboard / summary / health read the header.
+
+Freshness (checked on every read, two cheap queries — all change versions of
+the tenant, and the header by primary key):
+
+  * **Change versions** (``services.change_version``) say WHICH sites changed
+    since the build.  Only the buildings linked to those sites (before or after
+    the change) are rebuilt, synchronously, from a site-filtered portfolio
+    snapshot — the customer sees their own edit on the next read.
+  * A registry change, a flag change that alters visibility / preview
+    (``config_key``), or a change that cannot be attributed to a site forces a
+    synchronous full rebuild.
+  * **TTL** (``CUSTOMER_READ_MODEL_TTL_SECONDS``) is the backstop for
+    time-driven staleness (a device going quiet writes nothing).  An expired
+    model is served **stale-while-revalidate** for up to
+    ``CUSTOMER_READ_MODEL_MAX_STALE_SECONDS`` while a background job
+    (``customer.portfolio_refresh``, debounced) rebuilds it; past that the read
+    rebuilds synchronously.
+
+``FEATURE_CUSTOMER_READ_MODEL=false`` recomputes every request in memory (the
+previous behaviour) through the same serving functions.
+
+STRICTLY derived data: never writes the registry or any source table.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.customer_read_model import CustomerPortfolioBuilding, CustomerPortfolioReadModel
+from app.models.site import Site
+from app.services import change_version as cv
+from app.services.customer import portfolio as cportfolio
+from app.services.customer import portfolio_registry_view as prv
+from app.services.customer import serialize as cs
+from app.services.customer.preview import preview_enabled
+from app.services.customer.refs import decode_ref
+
+logger = logging.getLogger("true911.customer.read_model")
+
+REFRESH_JOB_TYPE = "customer.portfolio_refresh"
+
+_FIELD_SEP = "\x1f"
+
+
+def enabled() -> bool:
+    return settings.FEATURE_CUSTOMER_READ_MODEL == "true"
+
+
+@dataclass
+class ReadModel:
+    """What a registry-mode endpoint reads.  ``records`` is set only when the
+    read model is disabled (everything is in memory, nothing is stored)."""
+
+    tenant_id: str
+    aggregates: dict
+    building_count: int
+    built_at: datetime
+    stale: bool = False
+    records: Optional[list] = None
+
+
+# ── pure helpers ─────────────────────────────────────────────────────
+def _json_default(o):
+    return o.isoformat() if hasattr(o, "isoformat") else str(o)
+
+
+def _jsonable(obj):
+    """Exactly what the API would have emitted for ``obj``."""
+    return json.loads(json.dumps(obj, default=_json_default))
+
+
+def _config_key(tenant_id: str) -> str:
+    """Flags that change WHICH buildings are visible or how they render."""
+    raw = json.dumps({"pending": prv._include_pending(tenant_id),
+                      "preview": preview_enabled(tenant_id)}, sort_keys=True)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def search_text(record: dict) -> str:
+    """Haystack equivalent to ``portfolio_registry_view._matches``: the building
+    fields joined by spaces, then each service name and phone number."""
+    hay = " ".join(str(x or "").lower() for x in (
+        record.get("canonical_name"),
+        cs.building_display_name(record.get("canonical_name"), record.get("store_number"),
+                                 record.get("city"), record.get("site_type")),
+        record.get("store_number"), record.get("city"), record.get("state")))
+    parts = [hay]
+    for s in record.get("services", []):
+        parts.append((s.get("service") or "").lower())
+        parts.extend((p or "").lower() for p in (s.get("phone_numbers") or []))
+    return _FIELD_SEP.join(parts)
+
+
+def _aggregates(records: list[dict], company, now) -> dict:
+    return _jsonable({
+        "company": company,
+        "dashboard": prv.dashboard(records, company, now),
+        "summary": prv.summary(records, company, now),
+        "health": prv.health(records),
+        "services_summary": prv.services_summary(records),
+    })
+
+
+def _aware(dt: datetime) -> datetime:
+    return dt if dt.tzinfo is not None else dt.replace(tzinfo=timezone.utc)
+
+
+@dataclass
+class _Plan:
+    full: bool                  # structural change -> rebuild everything now
+    changed_sites: set
+    expired: bool               # TTL passed (time-driven staleness)
+
+
+def plan(header, versions: dict, config_key: str, now) -> _Plan:
+    """Decide what a read must do.  Pure."""
+    if header is None or header.config_key != config_key:
+        return _Plan(full=True, changed_sites=set(), expired=True)
+    old = header.versions or {}
+    changed = {k for k in set(old) | set(versions) if old.get(k, 0) != versions.get(k, 0)}
+    sites = {k for k in changed if cv.is_site_scope(k)}
+    # A tenant-scope bump with no site bump is a change we can't attribute.
+    full = (cv.REGISTRY_SCOPE in changed or cv.UNSITED_SCOPE in changed
+            or (cv.TENANT_SCOPE in changed and not sites))
+    expired = _aware(header.expires_at) <= now
+    return _Plan(full=full, changed_sites=sites, expired=expired)
+
+
+# ── storage ──────────────────────────────────────────────────────────
+async def _load_header(db: AsyncSession, tenant_id: str):
+    return (await db.execute(
+        select(CustomerPortfolioReadModel).where(CustomerPortfolioReadModel.tenant_id == tenant_id)
+    )).scalar_one_or_none()
+
+
+def _upsert_buildings(dialect_name: str, rows: list[dict]):
+    insert_fn = sqlite_insert if dialect_name == "sqlite" else pg_insert
+    stmt = insert_fn(CustomerPortfolioBuilding).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=["tenant_id", "building_id"],
+        set_={c: stmt.excluded[c] for c in ("position", "status", "search_text", "site_ids", "record")},
+    )
+
+
+def _upsert_header(dialect_name: str, values: dict):
+    insert_fn = sqlite_insert if dialect_name == "sqlite" else pg_insert
+    stmt = insert_fn(CustomerPortfolioReadModel).values(**values)
+    return stmt.on_conflict_do_update(
+        index_elements=["tenant_id"],
+        set_={**{c: stmt.excluded[c] for c in values if c != "tenant_id"}, "updated_at": func.now()},
+    )
+
+
+def _building_row(tenant_id: str, position: int, record: dict) -> dict:
+    record = _jsonable(record)
+    return {
+        "tenant_id": tenant_id,
+        "building_id": record["id"],
+        "position": position,
+        "status": (record.get("protection") or {}).get("status"),
+        "search_text": search_text(record),
+        "site_ids": sorted(record.get("_site_ids") or []),
+        "record": record,
+    }
+
+
+async def _write(db: AsyncSession, tenant_id: str, header, *, rows: list[dict], keep_ids,
+                 versions: dict, config_key: str, aggregates: dict, building_count: int,
+                 now, full: bool):
+    """Persist rebuilt building rows + the header, then commit.  ``keep_ids``
+    (full rebuilds only) is every building that should remain."""
+    dialect_name = db.get_bind().dialect.name
+    if rows:
+        await db.execute(_upsert_buildings(dialect_name, rows))
+    if keep_ids is not None:
+        q = delete(CustomerPortfolioBuilding).where(CustomerPortfolioBuilding.tenant_id == tenant_id)
+        if keep_ids:
+            q = q.where(CustomerPortfolioBuilding.building_id.not_in(sorted(keep_ids)))
+        await db.execute(q)
+    values = {"config_key": config_key, "versions": versions, "aggregates": aggregates,
+              "building_count": building_count}
+    if full:
+        # Only a full rebuild refreshes time-driven state for every building.
+        values.update(built_at=now, refresh_requested_at=None,
+                      expires_at=now + timedelta(seconds=settings.CUSTOMER_READ_MODEL_TTL_SECONDS))
+    if header is None:
+        # A cold tenant: the portal's parallel first reads all get here, so
+        # upsert rather than race each other on the primary key.
+        await db.execute(_upsert_header(dialect_name, {"tenant_id": tenant_id, **values}))
+        await db.commit()
+        return await _load_header(db, tenant_id)
+    for column, value in values.items():
+        setattr(header, column, value)
+    await db.commit()
+    return header
+
+
+# ── rebuilds ─────────────────────────────────────────────────────────
+async def _rebuild_full(db: AsyncSession, tenant_id: str, now, header, versions, config_key):
+    rows = await prv._visible_building_rows(db, tenant_id)
+    records: list[dict] = []
+    if rows:
+        snapshot = await cportfolio.load_portfolio_snapshot(db, tenant_id, now)
+        links = await prv.link_buildings(db, tenant_id, rows, snapshot.portfolio)
+        records = prv.build_records(snapshot, links, now)
+    else:
+        logger.info("read_model: tenant=%s registry mode ON but 0 visible buildings — "
+                    "legacy Site path (internal only).", tenant_id)
+    company = await cportfolio.company_name(db, tenant_id)
+    building_rows = [_building_row(tenant_id, i, r) for i, r in enumerate(records)]
+    header = await _write(
+        db, tenant_id, header, rows=building_rows, keep_ids={r["building_id"] for r in building_rows},
+        versions=versions, config_key=config_key, aggregates=_aggregates(records, company, now),
+        building_count=len(records), now=now, full=True)
+    logger.info("read_model: tenant=%s full rebuild, %d buildings", tenant_id, len(records))
+    return header
+
+
+async def _rebuild_sites(db: AsyncSession, tenant_id: str, now, header, versions, config_key,
+                         changed_sites: set):
+    """Rebuild only the buildings linked (before or after) to ``changed_sites``."""
+    rows = await prv._visible_building_rows(db, tenant_id)
+    sites = (await db.execute(select(Site).where(Site.tenant_id == tenant_id))).scalars().all()
+    links = await prv.link_buildings(db, tenant_id, rows, [(s, None) for s in sites])
+    stored = {r.building_id: (r.position, set(r.site_ids or ())) for r in (await db.execute(
+        select(CustomerPortfolioBuilding.building_id, CustomerPortfolioBuilding.position,
+               CustomerPortfolioBuilding.site_ids)
+        .where(CustomerPortfolioBuilding.tenant_id == tenant_id))).all()}
+    if {b.id for b, _p in rows} != set(stored):
+        # Visibility moved without a registry bump (e.g. an untracked write).
+        return await _rebuild_full(db, tenant_id, now, header, versions, config_key)
+
+    affected = [(b, pending, ids) for b, pending, ids in links
+                if ids & changed_sites or stored[b.id][1] & changed_sites]
+    building_rows = []
+    if affected:
+        needed = set().union(*(ids for _b, _p, ids in affected))
+        snapshot = await cportfolio.load_portfolio_snapshot(db, tenant_id, now, site_ids=needed)
+        for record in prv.build_records(snapshot, affected, now):
+            building_rows.append(_building_row(tenant_id, stored[record["id"]][0], record))
+        await db.execute(_upsert_buildings(db.get_bind().dialect.name, building_rows))
+
+    records = [r.record for r in (await db.execute(
+        select(CustomerPortfolioBuilding.record)
+        .where(CustomerPortfolioBuilding.tenant_id == tenant_id)
+        .order_by(CustomerPortfolioBuilding.position))).all()]
+    company = (header.aggregates or {}).get("company")
+    header = await _write(
+        db, tenant_id, header, rows=[], keep_ids=None, versions=versions, config_key=config_key,
+        aggregates=_aggregates(records, company, now), building_count=len(records),
+        now=now, full=False)
+    logger.info("read_model: tenant=%s incremental rebuild, %d sites -> %d buildings",
+                tenant_id, len(changed_sites), len(building_rows))
+    return header
+
+
+async def refresh(db: AsyncSession, tenant_id: str, now=None) -> dict:
+    """Bring the tenant's read model up to date (full if expired/structural,
+    else incremental, else nothing).  Used by the background job."""
+    now = now or datetime.now(timezone.utc)
+    versions = await cv.read_versions(db, tenant_id)
+    header = await _load_header(db, tenant_id)
+    config_key = _config_key(tenant_id)
+    p = plan(header, versions, config_key, now)
+    if p.full or p.expired:
+        header = await _rebuild_full(db, tenant_id, now, header, versions, config_key)
+        return {"tenant_id": tenant_id, "mode": "full", "buildings": header.building_count}
+    if p.changed_sites:
+        header = await _rebuild_sites(db, tenant_id, now, header, versions, config_key, p.changed_sites)
+        return {"tenant_id": tenant_id, "mode": "incremental", "buildings": header.building_count}
+    return {"tenant_id": tenant_id, "mode": "noop", "buildings": header.building_count}
+
+
+async def _request_refresh(db: AsyncSession, header, now) -> None:
+    """Enqueue ONE background full refresh per debounce window."""
+    from app.services import job_service
+
+    requested = header.refresh_requested_at
+    debounce = timedelta(seconds=settings.CUSTOMER_READ_MODEL_REFRESH_DEBOUNCE_SECONDS)
+    if requested is not None and now - _aware(requested) < debounce:
+        return
+    col = CustomerPortfolioReadModel.refresh_requested_at
+    claimed = await db.execute(
+        update(CustomerPortfolioReadModel)
+        .where(CustomerPortfolioReadModel.tenant_id == header.tenant_id,
+               col.is_(None) if requested is None else col == requested)
+        .values(refresh_requested_at=now)
+        .execution_options(synchronize_session=False)
+    )
+    if not claimed.rowcount:
+        return      # another request claimed this window
+    await job_service.create_and_enqueue(db, job_type=REFRESH_JOB_TYPE, tenant_id=header.tenant_id)
+    await db.commit()
+
+
+async def handle_refresh(db: AsyncSession, job) -> dict:
+    """Worker handler for ``customer.portfolio_refresh``."""
+    return await refresh(db, job.tenant_id)
+
+
+# ── reads ────────────────────────────────────────────────────────────
+async def get_read_model(db: AsyncSession, tenant_id: str, now) -> Optional[ReadModel]:
+    """The tenant's registry read model, or ``None`` → legacy Site path
+    (registry mode off, or no visible buildings)."""
+    if not prv.registry_mode_enabled(tenant_id):
+        return None
+    if not enabled():
+        records = await prv.load_customer_buildings(db, tenant_id, now)
+        if records is None:
+            return None
+        company = await cportfolio.company_name(db, tenant_id)
+        return ReadModel(tenant_id=tenant_id, aggregates=_aggregates(records, company, now),
+                         building_count=len(records), built_at=now,
+                         records=_jsonable(records))
+
+    versions = await cv.read_versions(db, tenant_id)
+    header = await _load_header(db, tenant_id)
+    config_key = _config_key(tenant_id)
+    p = plan(header, versions, config_key, now)
+    max_stale = timedelta(seconds=settings.CUSTOMER_READ_MODEL_MAX_STALE_SECONDS)
+    stale = False
+    if p.full or (p.expired and now - _aware(header.built_at) > max_stale):
+        header = await _rebuild_full(db, tenant_id, now, header, versions, config_key)
+    else:
+        if p.changed_sites:
+            header = await _rebuild_sites(db, tenant_id, now, header, versions, config_key,
+                                          p.changed_sites)
+        if p.expired:
+            stale = True
+            await _request_refresh(db, header, now)
+    if not header.building_count:
+        return None
+    return ReadModel(tenant_id=tenant_id, aggregates=header.aggregates,
+                     building_count=header.building_count, built_at=_aware(header.built_at),
+                     stale=stale)
+
+
+def _page_query(tenant_id: str, status_filter, q):
+    where = [CustomerPortfolioBuilding.tenant_id == tenant_id]
+    if status_filter:
+        where.append(CustomerPortfolioBuilding.status == status_filter)
+    if q:
+        where.append(CustomerPortfolioBuilding.search_text.contains(q.lower(), autoescape=True))
+    return where
+
+
+async def locations_page(db: AsyncSession, rm: ReadModel, *, status_filter=None, q=None,
+                         page=1, page_size=25) -> dict:
+    """Same shape as ``portfolio_registry_view.locations_page`` — reads one page."""
+    if rm.records is not None:
+        return prv.locations_page(rm.records, status_filter=status_filter, q=q,
+                                  page=page, page_size=page_size)
+    where = _page_query(rm.tenant_id, status_filter, q)
+    total = int((await db.execute(
+        select(func.count()).select_from(CustomerPortfolioBuilding).where(*where))).scalar() or 0)
+    records = (await db.execute(
+        select(CustomerPortfolioBuilding.record).where(*where)
+        .order_by(CustomerPortfolioBuilding.position)
+        .offset((page - 1) * page_size).limit(page_size))).scalars().all()
+    return {"total": total, "page": page, "page_size": page_size,
+            "items": [cs.portfolio_building_summary(r) for r in records]}
+
+
+async def search(db: AsyncSession, rm: ReadModel, q) -> dict:
+    """Same shape as ``portfolio_registry_view.search``."""
+    if rm.records is not None:
+        return prv.search(rm.records, q)
+    q = (q or "").strip()
+    if not q:
+        return {"query": q, "results": []}
+    records = (await db.execute(
+        select(CustomerPortfolioBuilding.record).where(*_page_query(rm.tenant_id, None, q))
+        .order_by(CustomerPortfolioBuilding.position))).scalars().all()
+    return {"query": q, "results": [cs.portfolio_building_summary(r) for r in records]}
+
+
+async def building_records(db: AsyncSession, rm: ReadModel, building_ref: str) -> list[dict]:
+    """``[record]`` for a building ref (``[]`` when unknown / forged) — shaped for
+    ``portfolio_registry_view.building_detail`` / ``location_health_detail``."""
+    if rm.records is not None:
+        return rm.records
+    raw = decode_ref("bldg", building_ref)
+    if raw is None:
+        return []
+    try:
+        bid = int(raw)
+    except (TypeError, ValueError):
+        return []
+    record = (await db.execute(
+        select(CustomerPortfolioBuilding.record).where(
+            CustomerPortfolioBuilding.tenant_id == rm.tenant_id,
+            CustomerPortfolioBuilding.building_id == bid))).scalar_one_or_none()
+    return [record] if record is not None else []
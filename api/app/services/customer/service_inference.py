@@ -15,6 +15,8 @@ from __future__ import annotations
 
 from typing import Iterable, Optional
 
+from app.models.action_audit import SERVICE_CLASSIFICATION_OVERRIDE
+
 # The Life-Safety service catalog (Phase 1).  These are the ONLY service types.
 SERVICE_TYPES = (
     "Fire Alarm", "Elevator", "Area of Refuge", "Emergency Phone",
@@ -26,7 +28,7 @@ CONFIDENCE_ORDER = {"Confirmed": 3, "High": 2, "Medium": 1, "Low": 0}
 
 # ActionAudit.action_type used to persist + log a manual classification override
 # (Phase 8).  Overrides live as append-only audit records — logging is inherent.
-OVERRIDE_ACTION = "service_classification_override"
+OVERRIDE_ACTION = SERVICE_CLASSIFICATION_OVERRIDE
 OVERRIDE_OPERATIONS = ("approve", "override", "merge", "split")
 
 # Ordered classification rules (first match wins).  Each rule: (patterns,
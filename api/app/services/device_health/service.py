@@ -25,6 +25,7 @@ from app.models.device import Device
 from app.models.service_unit import ServiceUnit
 from app.models.sim import Sim
 from app.models.site import Site
+from app.services import call_activity
 from app.services.device_health.classifier import classify
 from app.services.device_health.models import DeviceHealth
 from app.services.device_health.recommended_action import recommend
@@ -65,14 +66,18 @@ async def _latest_telemetry_by_device(
 
 
 async def _last_call_by_device(
-    db: AsyncSession, tenant_id: str, device_ids: list[str]
+    db: AsyncSession, tenant_id: str, devices
 ) -> dict[str, datetime]:
-    if not device_ids:
+    """Off ``Device.last_call_at``; the CDR aggregate only when that column
+    is switched off (``FEATURE_DEVICE_LAST_CALL_COLUMN=false``)."""
+    if not devices:
         return {}
+    if call_activity.use_column():
+        return {d.device_id: d.last_call_at for d in devices if d.last_call_at is not None}
     q = (
         select(CallRecord.device_id, func.max(CallRecord.started_at).label("last_call"))
         .where(CallRecord.tenant_id == tenant_id)
-        .where(CallRecord.device_id.in_(device_ids))
+        .where(CallRecord.device_id.in_([d.device_id for d in devices]))
         .where(CallRecord.started_at.is_not(None))
         .group_by(CallRecord.device_id)
     )
@@ -115,7 +120,7 @@ async def build_device_health(
     sim_by_iccid = {s.iccid: s for s in sims if s.iccid}
 
     telemetry = await _latest_telemetry_by_device(db, tenant_id, device_ids)
-    last_call = await _last_call_by_device(db, tenant_id, device_ids)
+    last_call = await _last_call_by_device(db, tenant_id, devices)
 
     results: list[DeviceHealth] = []
     for d in devices:
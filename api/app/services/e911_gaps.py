@@ -16,19 +16,34 @@ Gap taxonomy (per site):
   * per emergency endpoint (ServiceUnit): ``service_type`` (no unit_type),
     ``location`` (no floor and no location_description), ``callback_number``
     (no linked line/device number).
+
+The same taxonomy is also expressed in SQL (:func:`_site_has_gap`), so a page
+of the worklist is one site query filtered, ordered and LIMIT/OFFSET-ed in
+the database plus one query for that page's units and their callback numbers
+(outer-joined from Line / Device); :func:`compute_site_e911_gaps` then runs
+in memory on the page only.  :func:`gap_count` serves dashboards a
+per-tenant count cached against the tenant's change versions
+(``app.services.change_version``): any ORM write to a site, unit, line or
+device — from any process — moves them and the next call recomputes.
+``E911_GAP_COUNT_TTL_SECONDS`` bounds the entry for writes that bypass the
+ORM.
 """
 
 from __future__ import annotations
 
-from typing import Iterable, Optional
+import time
+from collections import defaultdict
+from typing import Callable, Iterable, Optional
 
-from sqlalchemy import select
+from sqlalchemy import and_, func, not_, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
 from app.models.device import Device
 from app.models.line import Line
 from app.models.service_unit import ServiceUnit
 from app.models.site import Site
+from app.services import change_version
 
 _E911_VERIFIED = {"validated", "verified"}
 
@@ -74,42 +89,116 @@ def compute_site_e911_gaps(site, units_with_callbacks: Iterable[tuple]) -> Optio
     }
 
 
-async def _callback_for_unit(db: AsyncSession, tenant_id: str, unit) -> Optional[str]:
-    """Resolve a unit's callback number from its linked line/device (tenant-
-    scoped, real stored data)."""
-    if unit.line_id:
-        did = (await db.execute(
-            select(Line.did).where(Line.line_id == unit.line_id, Line.tenant_id == tenant_id)
-        )).scalar_one_or_none()
-        if did:
-            return did
-    if unit.device_id:
-        return (await db.execute(
-            select(Device.msisdn).where(
-                Device.device_id == unit.device_id, Device.tenant_id == tenant_id
-            )
-        )).scalar_one_or_none()
-    return None
-
-
-async def list_e911_gaps(db: AsyncSession, tenant_id: str) -> list[dict]:
+def _blank(column):
+    """SQL twin of Python falsiness for a nullable string column."""
+    return func.coalesce(column, "") == ""
+
+
+def _site_has_gap():
+    """WHERE clause (correlated to :class:`Site`) matching exactly the sites
+    :func:`compute_site_e911_gaps` returns a record for."""
+    verified = func.lower(func.coalesce(Site.e911_status, "")).in_(sorted(_E911_VERIFIED))
+    endpoint_gap = (
+        select(ServiceUnit.id)
+        .outerjoin(Line, and_(Line.line_id == ServiceUnit.line_id,
+                              Line.tenant_id == ServiceUnit.tenant_id))
+        .outerjoin(Device, and_(Device.device_id == ServiceUnit.device_id,
+                                Device.tenant_id == ServiceUnit.tenant_id))
+        .where(
+            ServiceUnit.tenant_id == Site.tenant_id,
+            ServiceUnit.site_id == Site.site_id,
+            or_(
+                _blank(ServiceUnit.unit_type),
+                and_(_blank(ServiceUnit.floor), _blank(ServiceUnit.location_description)),
+                and_(_blank(Line.did), _blank(Device.msisdn)),
+            ),
+        )
+        .exists()
+    )
+    return or_(
+        _blank(Site.e911_street), _blank(Site.e911_city),
+        _blank(Site.e911_state), _blank(Site.e911_zip),
+        not_(verified),
+        endpoint_gap,
+    )
+
+
+async def _units_with_callbacks(
+    db: AsyncSession, tenant_id: str, site_ids: Iterable[str],
+) -> dict[str, list[tuple]]:
+    """The units of ``site_ids`` with their callback numbers, grouped by site.
+
+    The callback is the linked line's DID, else the linked device's MSISDN
+    (both tenant-scoped, real stored data).  ``line_id`` / ``device_id`` are
+    unique, so the outer joins never fan a unit out."""
+    rows = (await db.execute(
+        select(ServiceUnit, Line.did, Device.msisdn)
+        .outerjoin(Line, and_(Line.line_id == ServiceUnit.line_id, Line.tenant_id == tenant_id))
+        .outerjoin(Device, and_(Device.device_id == ServiceUnit.device_id,
+                                Device.tenant_id == tenant_id))
+        .where(ServiceUnit.tenant_id == tenant_id, ServiceUnit.site_id.in_(list(site_ids)))
+        .order_by(ServiceUnit.id)
+    )).all()
+    by_site: dict[str, list[tuple]] = defaultdict(list)
+    for unit, did, msisdn in rows:
+        by_site[unit.site_id].append((unit, did or msisdn or None))
+    return by_site
+
+
+async def list_e911_gaps(
+    db: AsyncSession, tenant_id: str, *, limit: Optional[int] = None, offset: int = 0,
+) -> list[dict]:
     """Return the E911 correction worklist for a tenant — every site with
-    missing or unverified emergency data (complete+verified sites are omitted).
+    missing or unverified emergency data (complete+verified sites are omitted),
+    ordered by site name.  ``limit`` / ``offset`` page it in SQL.
     Read-only; tenant-scoped."""
-    sites = (await db.execute(
-        select(Site).where(Site.tenant_id == tenant_id).order_by(Site.site_name)
-    )).scalars().all()
+    q = (
+        select(Site)
+        .where(Site.tenant_id == tenant_id, _site_has_gap())
+        .order_by(Site.site_name, Site.id)
+        .offset(offset)
+    )
+    if limit is not None:
+        q = q.limit(limit)
+    sites = (await db.execute(q)).scalars().all()
+    if not sites:
+        return []
+    units = await _units_with_callbacks(db, tenant_id, (site.site_id for site in sites))
     out: list[dict] = []
     for site in sites:
-        units = (await db.execute(
-            select(ServiceUnit).where(
-                ServiceUnit.tenant_id == tenant_id, ServiceUnit.site_id == site.site_id
-            )
-        )).scalars().all()
-        units_with_callbacks = [
-            (unit, await _callback_for_unit(db, tenant_id, unit)) for unit in units
-        ]
-        gap = compute_site_e911_gaps(site, units_with_callbacks)
+        gap = compute_site_e911_gaps(site, units.get(site.site_id, ()))
         if gap is not None:
             out.append(gap)
     return out
+
+
+# ── Cached per-tenant count (dashboards) ─────────────────────────────
+
+_clock: Callable[[], float] = time.monotonic
+# tenant_id -> (change-version total, expires_at, count)
+_counts: dict[str, tuple[int, float, int]] = {}
+
+
+async def gap_count(db: AsyncSession, tenant_id: str) -> int:
+    """Number of sites on the tenant's worklist.  Cached per tenant while
+    its change versions stand still (one aggregate read per call)."""
+    version = await change_version.read_version_total(db, tenant_id)
+    entry = _counts.get(tenant_id)
+    if entry is not None and entry[0] == version and entry[1] > _clock():
+        return entry[2]
+    count = (await db.execute(
+        select(func.count()).select_from(Site)
+        .where(Site.tenant_id == tenant_id, _site_has_gap())
+    )).scalar_one()
+    ttl = max(0, int(settings.E911_GAP_COUNT_TTL_SECONDS))
+    if ttl:
+        _counts[tenant_id] = (version, _clock() + ttl, count)
+    return count
+
+
+def invalidate(tenant_id: Optional[str] = None) -> None:
+    """Drop the cached count for one tenant (or all)."""
+    if tenant_id is None:
+        _counts.clear()
+    else:
+        _counts.pop(tenant_id, None)
@@ -5,21 +5,20 @@ Supports international addresses with multiple fallback strategies:
 2. Free-form full address
 3. City + state/province + country only
 4. City + country only
+
+Requests go through the "nominatim" integration gateway, whose policy
+enforces Nominatim's one-request-per-second limit across the process.
 """
 
-import asyncio
 import logging
 import re
-import time
 
-import httpx
+from app.integrations.gateway import gateway
 
 logger = logging.getLogger(__name__)
 
 # In-memory cache: normalized address → (lat, lng) or None
 _cache: dict[str, tuple[float, float] | None] = {}
-_rate_lock = asyncio.Lock()
-_last_request_time: float = 0.0
 
 # US state abbreviations → full names (for better Nominatim matching)
 _US_STATES = {
@@ -208,22 +207,13 @@ def _build_query_strategies(
     return strategies
 
 
-async def _nominatim_query(client: httpx.AsyncClient, params: dict) -> tuple[float, float] | None:
+async def _nominatim_query(params: dict) -> tuple[float, float] | None:
     """Execute a single Nominatim query and return (lat, lng) or None."""
-    global _last_request_time
-
-    # Enforce 1 request/sec spacing
-    now = time.monotonic()
-    elapsed = now - _last_request_time
-    if elapsed < 1.0:
-        await asyncio.sleep(1.0 - elapsed)
-
-    resp = await client.get(
+    resp = await gateway("nominatim").get(
         "https://nominatim.openstreetmap.org/search",
         params=params,
         headers={"User-Agent": "True911-Portal/1.0"},
     )
-    _last_request_time = time.monotonic()
     resp.raise_for_status()
     data = resp.json()
     if data:
@@ -259,26 +249,24 @@ async def geocode_address(
     if not strategies:
         return None
 
-    async with _rate_lock:
-        try:
-            async with httpx.AsyncClient(timeout=10) as client:
-                for i, params in enumerate(strategies):
-                    query_desc = params.get("q") or f"structured:{params.get('street','')},{params.get('city','')}"
-                    try:
-                        result = await _nominatim_query(client, params)
-                        if result:
-                            logger.info("Geocoded %r (strategy %d) → %s", query_desc, i + 1, result)
-                            _cache[cache_key] = result
-                            return result
-                        logger.debug("Strategy %d returned no results for %r", i + 1, query_desc)
-                    except Exception:
-                        logger.warning("Strategy %d failed for %r", i + 1, query_desc, exc_info=True)
-                        continue
-
-                # All strategies exhausted
-                logger.warning("All geocode strategies failed for %r", cache_key)
-                _cache[cache_key] = None
-                return None
-        except Exception:
-            logger.exception("Geocode failed for %r", cache_key)
-            return None
+    try:
+        for i, params in enumerate(strategies):
+            query_desc = params.get("q") or f"structured:{params.get('street','')},{params.get('city','')}"
+            try:
+                result = await _nominatim_query(params)
+                if result:
+                    logger.info("Geocoded %r (strategy %d) → %s", query_desc, i + 1, result)
+                    _cache[cache_key] = result
+                    return result
+                logger.debug("Strategy %d returned no results for %r", i + 1, query_desc)
+            except Exception:
+                logger.warning("Strategy %d failed for %r", i + 1, query_desc, exc_info=True)
+                continue
+
+        # All strategies exhausted
+        logger.warning("All geocode strategies failed for %r", cache_key)
+        _cache[cache_key] = None
+        return None
+    except Exception:
+        logger.exception("Geocode failed for %r", cache_key)
+        return None
@@ -19,6 +19,7 @@ from app.services.health.normalizer import (
 )
 from app.services.health.signals import HealthSignals
 from app.services.health.signals_loader import (
+    load_signals_for_devices,
     load_signals_for_site,
     load_signals_for_tenant,
 )
@@ -33,6 +34,7 @@ __all__ = [
     "HealthSignals",
     "compute_device_state",
     "compute_site_state",
+    "load_signals_for_devices",
     "load_signals_for_site",
     "load_signals_for_tenant",
 ]
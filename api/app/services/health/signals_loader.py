@@ -17,8 +17,10 @@ Fields read off Device:
   * network_status                (degradation indicator)
   * last_network_event            (Verizon poll channel)
   * vola_last_sync                (Inseego TR-069 channel)
+  * last_call_at                  (Telnyx CDR channel, maintained at
+                                   CDR ingestion — migration 055)
 
-External sources read:
+External sources read only when ``FEATURE_DEVICE_LAST_CALL_COLUMN`` is off:
   * MAX(call_records.started_at) per device  (Telnyx CDR channel)
 
 Defensive getattr is used for ``last_network_event`` and
@@ -29,6 +31,7 @@ that channel instead.
 
 from __future__ import annotations
 
+from datetime import datetime
 from typing import Dict, Optional
 
 from sqlalchemy import func, select
@@ -36,18 +39,53 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.call_record import CallRecord
 from app.models.device import Device
+from app.services import call_activity
 from app.services.health.signals import HealthSignals
 
 
+async def _last_call_by_device(
+    db: AsyncSession,
+    tenant_id: str,
+    devices,
+    *,
+    site_id: Optional[str] = None,
+) -> Dict[str, Optional[datetime]]:
+    """Most recent call per device.
+
+    Reads ``Device.last_call_at`` (maintained at CDR ingestion — no
+    query).  With ``FEATURE_DEVICE_LAST_CALL_COLUMN=false`` it falls back
+    to ``MAX(call_records.started_at)`` over the device ids, scoped by
+    tenant (and by ``site_id`` when given).  Only call records that
+    matched a device on ingestion are counted — unmatched CDRs have
+    device_id NULL and are correctly ignored.
+    """
+    if call_activity.use_column():
+        return {d.device_id: getattr(d, "last_call_at", None) for d in devices}
+
+    last_call_q = (
+        select(
+            CallRecord.device_id,
+            func.max(CallRecord.started_at).label("last_call"),
+        )
+        .where(CallRecord.tenant_id == tenant_id)
+        .where(CallRecord.device_id.in_([d.device_id for d in devices]))
+        .where(CallRecord.started_at.is_not(None))
+        .group_by(CallRecord.device_id)
+    )
+    if site_id is not None:
+        last_call_q = last_call_q.where(CallRecord.site_id == site_id)
+    return {row.device_id: row.last_call for row in (await db.execute(last_call_q)).all()}
+
+
 async def load_signals_for_tenant(
     db: AsyncSession,
     tenant_id: str,
 ) -> Dict[str, HealthSignals]:
     """Return a ``{device_id: HealthSignals}`` map for every device in ``tenant_id``.
 
-    Two queries total — one for devices, one aggregate for the most
-    recent Telnyx CDR per device.  Returns an empty dict when the
-    tenant has no devices.
+    One device scan (plus the CDR aggregate only when the
+    ``last_call_at`` column is switched off).  Returns an empty dict
+    when the tenant has no devices.
 
     Tenant isolation is enforced by every ``where(... == tenant_id)``
     clause in this function.  Callers MUST NOT pass a tenant_id from
@@ -58,29 +96,29 @@ async def load_signals_for_tenant(
     # 1) Load all devices for the tenant in one query.
     devices_q = select(Device).where(Device.tenant_id == tenant_id)
     devices = (await db.execute(devices_q)).scalars().all()
+    return await load_signals_for_devices(db, tenant_id, devices)
+
+
+async def load_signals_for_devices(
+    db: AsyncSession,
+    tenant_id: str,
+    devices,
+) -> Dict[str, HealthSignals]:
+    """Same shape as :func:`load_signals_for_tenant`, for Device rows the
+    caller already loaded.
+
+    No query at all by default (the CDR channel is read off the rows);
+    one aggregate with the column switched off — lets a bulk reader that
+    needs the Device rows anyway (the customer portfolio loader) avoid
+    selecting them twice.
+    ``devices`` MUST all belong to ``tenant_id``.
+    """
     if not devices:
         return {}
 
-    device_ids = [d.device_id for d in devices]
-
-    # 2) MAX(call_records.started_at) per device, scoped by tenant.
-    #    Only call records that successfully matched a device on
-    #    ingestion are counted — unmatched CDRs have device_id NULL
-    #    and are correctly ignored.  The join key is the string
-    #    device business-id, matching how Telnyx ingestion populates
-    #    call_records.device_id.
-    last_call_q = (
-        select(
-            CallRecord.device_id,
-            func.max(CallRecord.started_at).label("last_call"),
-        )
-        .where(CallRecord.tenant_id == tenant_id)
-        .where(CallRecord.device_id.in_(device_ids))
-        .where(CallRecord.started_at.is_not(None))
-        .group_by(CallRecord.device_id)
-    )
-    last_call_rows = (await db.execute(last_call_q)).all()
-    last_call_by_device = {row.device_id: row.last_call for row in last_call_rows}
+    # 2) Most recent Telnyx CDR per device — off the device row itself
+    #    (Device.last_call_at) unless the column is switched off.
+    last_call_by_device = await _last_call_by_device(db, tenant_id, devices)
 
     # 3) Compose HealthSignals per device.  Defensive getattr for
     #    columns added in later migrations so the loader survives
@@ -125,21 +163,7 @@ async def load_signals_for_site(
     if not devices:
         return {}
 
-    device_ids = [d.device_id for d in devices]
-
-    last_call_q = (
-        select(
-            CallRecord.device_id,
-            func.max(CallRecord.started_at).label("last_call"),
-        )
-        .where(CallRecord.tenant_id == tenant_id)
-        .where(CallRecord.site_id == site_id)
-        .where(CallRecord.device_id.in_(device_ids))
-        .where(CallRecord.started_at.is_not(None))
-        .group_by(CallRecord.device_id)
-    )
-    last_call_rows = (await db.execute(last_call_q)).all()
-    last_call_by_device = {row.device_id: row.last_call for row in last_call_rows}
+    last_call_by_device = await _last_call_by_device(db, tenant_id, devices, site_id=site_id)
 
     result: Dict[str, HealthSignals] = {}
     for d in devices:
@@ -11,6 +11,8 @@ from __future__ import annotations
 
 import csv
 import io
+import itertools
+from typing import Iterator
 
 from app.services.inventory_reconciliation.adapters import base
 from app.services.inventory_reconciliation.models import VendorRecord
@@ -26,8 +28,10 @@ def parse_text(text: str) -> list[VendorRecord]:
     lines = [ln for ln in text.splitlines() if ln.strip()]
     if not lines:
         return []
-    reader = csv.DictReader(io.StringIO(text), delimiter=_delimiter(lines[0]))
-    out: list[VendorRecord] = []
+    return list(_records(csv.DictReader(io.StringIO(text), delimiter=_delimiter(lines[0]))))
+
+
+def _records(reader) -> Iterator[VendorRecord]:
     for row in reader:
         norm = {(k or "").strip().lower().replace(" ", ""): (v or "").strip() for k, v in row.items()}
         radio = norm.get("radionumber") or None
@@ -35,7 +39,7 @@ def parse_text(text: str) -> list[VendorRecord]:
         subscriber = norm.get("subscribername") or None
         if not (radio or iccid):
             continue
-        out.append(VendorRecord(
+        yield VendorRecord(
             vendor=VENDOR,
             radio_number=radio,
             iccid=iccid,
@@ -43,8 +47,7 @@ def parse_text(text: str) -> list[VendorRecord]:
             customer_hint=None,             # derived generically by the engine
             site_hint=subscriber,           # NAPCO subscriber name doubles as the site label
             raw={"sim_status": norm.get("simstatus") or None},  # non-sensitive only
-        ))
-    return out
+        )
 
 
 def parse_xlsx(path: str) -> list[VendorRecord]:
@@ -70,6 +73,23 @@ def parse(path: str) -> list[VendorRecord]:
         return parse_text(fh.read())
 
 
+def iter_parse(path: str) -> Iterator[VendorRecord]:
+    """Like :func:`parse`, but reads a text export row by row (the delimiter is
+    sniffed from the first non-blank line).  ``.xlsx`` is parsed whole."""
+    if path.lower().endswith(".xlsx"):
+        yield from parse_xlsx(path)
+        return
+    with open(path, "r", encoding="utf-8-sig", newline="") as fh:
+        first = ""
+        for first in fh:
+            if first.strip():
+                break
+        if not first.strip():
+            return
+        rest = itertools.chain([first], fh)
+        yield from _records(csv.DictReader(rest, delimiter=_delimiter(first)))
+
+
 class NapcoAdapter:
     vendor = VENDOR
 
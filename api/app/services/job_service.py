@@ -4,10 +4,12 @@ from __future__ import annotations
 
 import logging
 import random
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from typing import Any
 
-from sqlalchemy import select
+from sqlalchemy import func, insert, select, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.job import Job
@@ -15,12 +17,111 @@ from app.models.job import Job
 logger = logging.getLogger("true911.jobs")
 
 
+_MAX_BACKOFF_SECONDS = 300.0
+
+
 def _backoff_seconds(attempt: int) -> float:
     """Exponential backoff: min(10 * 2^attempt + jitter, 300s)."""
-    delay = min(10 * (2 ** attempt) + random.uniform(0, 5), 300.0)
+    delay = min(10 * (2 ** attempt) + random.uniform(0, 5), _MAX_BACKOFF_SECONDS)
     return delay
 
 
+# What RQ calls for every job — see _enqueue_rq for why this exact form.
+_DISPATCH_FUNC = "worker.dispatch"
+_JOB_TIMEOUT_SECONDS = 300
+
+# In-flight states: at most one job per idempotency key may be in one of
+# these — enforced by the partial unique index ``ux_jobs_active_idempotency_key``
+# (migration 056), which the inserts below use as their ON CONFLICT arbiter.
+_ACTIVE_STATUSES = ("queued", "running")
+_ACTIVE_PREDICATE = text("status IN ('queued', 'running')")
+
+# A live job has started (or been created, or re-queued by mark_failed)
+# within one timeout plus the longest retry backoff; an in-flight row older
+# than this never reached Redis or was orphaned by a worker restart.  It is
+# marked failed before inserting, so it releases its key.
+_DEDUP_WINDOW = timedelta(seconds=_JOB_TIMEOUT_SECONDS + _MAX_BACKOFF_SECONDS)
+
+# ON CONFLICT rounds before giving up: a conflicting job can finish between
+# the insert and the re-read, which frees its key for the next round.
+_INSERT_ROUNDS = 3
+
+
+async def _active_jobs_by_key(db: AsyncSession, keys: set[str]) -> dict[str, Job]:
+    if not keys:
+        return {}
+    result = await db.execute(
+        select(Job).where(Job.idempotency_key.in_(keys), Job.status.in_(_ACTIVE_STATUSES))
+    )
+    return {job.idempotency_key: job for job in result.scalars()}
+
+
+async def _reclaim_stale(db: AsyncSession, keys: set[str]) -> None:
+    """Mark in-flight jobs for *keys* older than ``_DEDUP_WINDOW`` failed."""
+    if not keys:
+        return
+    cutoff = datetime.now(timezone.utc) - _DEDUP_WINDOW
+    await db.execute(
+        update(Job)
+        .where(
+            Job.idempotency_key.in_(keys),
+            Job.status.in_(_ACTIVE_STATUSES),
+            func.coalesce(Job.started_at, Job.created_at) <= cutoff,
+        )
+        .values(status="failed", completed_at=func.now(),
+                error=f"Abandoned: still queued/running after {_DEDUP_WINDOW.total_seconds():.0f}s")
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _job_row(spec: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "job_type": spec["job_type"],
+        "queue": spec.get("queue", "default"),
+        "status": "queued",
+        "tenant_id": spec.get("tenant_id"),
+        "payload": spec.get("payload"),
+        "idempotency_key": spec.get("idempotency_key"),
+        "attempt": 0,
+        "max_attempts": spec.get("max_attempts", 3),
+    }
+
+
+async def _insert_jobs(db: AsyncSession, rows: list[dict[str, Any]]) -> tuple[list[Job], list[Job]]:
+    """Insert *rows* (distinct keys).  Returns ``(jobs, created)``: one Job
+    per row, in order — the in-flight job already holding its key where the
+    insert conflicted — and the newly created subset."""
+    created: list[Job] = []
+    plain = [r for r in rows if not r["idempotency_key"]]
+    if plain:
+        stmt = insert(Job).returning(Job, sort_by_parameter_order=True)
+        created = list((await db.scalars(stmt, plain)).all())
+
+    by_key: dict[str, Job] = {}
+    pending = [r for r in rows if r["idempotency_key"]]
+    insert_fn = sqlite_insert if db.get_bind().dialect.name == "sqlite" else pg_insert
+    for _ in range(_INSERT_ROUNDS):
+        if not pending:
+            break
+        stmt = (
+            insert_fn(Job)
+            .on_conflict_do_nothing(index_elements=["idempotency_key"], index_where=_ACTIVE_PREDICATE)
+            .returning(Job)
+        )
+        for job in (await db.scalars(stmt, pending)).all():
+            by_key[job.idempotency_key] = job
+            created.append(job)
+        missing = {r["idempotency_key"] for r in pending} - by_key.keys()
+        by_key.update(await _active_jobs_by_key(db, missing))
+        pending = [r for r in pending if r["idempotency_key"] not in by_key]
+    if pending:
+        raise RuntimeError(f"Could not create or find in-flight jobs for {len(pending)} key(s)")
+
+    fresh = iter(created[:len(plain)])
+    jobs = [by_key[r["idempotency_key"]] if r["idempotency_key"] else next(fresh) for r in rows]
+    return jobs, created
+
+
 async def create_and_enqueue(
     db: AsyncSession,
     *,
@@ -35,18 +136,21 @@ async def create_and_enqueue(
 
     If Redis/RQ is unavailable the job row is still created with status='queued'
     so it can be picked up by a future sweep or manual retry.
+
+    When *idempotency_key* matches a job that is still queued or running,
+    that job is returned instead and nothing new is enqueued.  Jobs that
+    have sat queued or running past ``_DEDUP_WINDOW`` are marked failed
+    first and do not count.
     """
-    job = Job(
-        job_type=job_type,
-        queue=queue,
-        status="queued",
-        tenant_id=tenant_id,
-        payload=payload,
-        idempotency_key=idempotency_key,
-        max_attempts=max_attempts,
-    )
-    db.add(job)
-    await db.flush()  # get job.id
+    if idempotency_key:
+        await _reclaim_stale(db, {idempotency_key})
+    [job], created = await _insert_jobs(db, [_job_row({
+        "job_type": job_type, "queue": queue, "tenant_id": tenant_id, "payload": payload,
+        "idempotency_key": idempotency_key, "max_attempts": max_attempts,
+    })])
+    if not created:
+        logger.info("Job %s already in flight for %s", job.id, idempotency_key)
+        return job
 
     # Try to enqueue to RQ (graceful degradation if Redis is down)
     try:
@@ -57,6 +161,85 @@ async def create_and_enqueue(
     return job
 
 
+async def create_and_enqueue_many(
+    db: AsyncSession,
+    specs: list[dict[str, Any]],
+) -> list[Job]:
+    """Bulk :func:`create_and_enqueue`.
+
+    Each spec takes the same keyword arguments as ``create_and_enqueue``.
+    Jobs are de-duplicated by ``idempotency_key`` — against each other and,
+    through the unique index, against jobs still queued or running — then
+    inserted with one ``INSERT ... RETURNING`` per kind (keyed / unkeyed)
+    and enqueued to RQ in one Redis pipeline.
+
+    Returns one Job per spec, in order (the existing job for a duplicate).
+    """
+    if not specs:
+        return []
+    keys = {s["idempotency_key"] for s in specs if s.get("idempotency_key")}
+    await _reclaim_stale(db, keys)
+
+    rows: list[dict[str, Any]] = []
+    seen: set[str] = set()
+    for spec in specs:
+        key = spec.get("idempotency_key")
+        if key and key in seen:
+            continue
+        if key:
+            seen.add(key)
+        rows.append(_job_row(spec))
+
+    jobs, created = await _insert_jobs(db, rows)
+    if created:
+        try:
+            _enqueue_rq_many(created)
+        except Exception:
+            logger.info("Redis unavailable — %d jobs created but not enqueued", len(created))
+
+    by_key = {job.idempotency_key: job for job in jobs if job.idempotency_key}
+    plain = iter(job for job in jobs if not job.idempotency_key)
+    return [by_key[s["idempotency_key"]] if s.get("idempotency_key") else next(plain)
+            for s in specs]
+
+
+# ── Redis / RQ transport ──────────────────────────────────────────
+
+_redis_conn = None
+_redis_conn_url: str | None = None
+_rq_queues: dict[str, Any] = {}
+
+
+def _rq_queue(name: str):
+    """The RQ Queue for *name* on a process-wide pooled Redis connection
+    (``None`` when REDIS_URL is unset).  Raises ImportError without redis/rq."""
+    global _redis_conn, _redis_conn_url
+    from redis import Redis
+    from rq import Queue as RqQueue
+
+    from app.config import settings
+    redis_url = getattr(settings, "REDIS_URL", None)
+    if not redis_url:
+        return None
+    if _redis_conn is None or _redis_conn_url != redis_url:
+        # redis-py clients are thread-safe and pool their connections.
+        _redis_conn = Redis.from_url(redis_url)
+        _redis_conn_url = redis_url
+        _rq_queues.clear()
+    q = _rq_queues.get(name)
+    if q is None:
+        q = _rq_queues[name] = RqQueue(name, connection=_redis_conn)
+    return q
+
+
+def _reset_rq_connection() -> None:
+    """Drop the pooled connection and queues (tests / after fork)."""
+    global _redis_conn, _redis_conn_url
+    _redis_conn = None
+    _redis_conn_url = None
+    _rq_queues.clear()
+
+
 def _enqueue_rq(job: Job) -> None:
     """Best-effort RQ enqueue. Fails silently if redis is not available.
 
@@ -72,25 +255,40 @@ def _enqueue_rq(job: Job) -> None:
     regression guard.
     """
     try:
-        from redis import Redis
-        from rq import Queue as RqQueue
-
-        from app.config import settings
-        redis_url = getattr(settings, "REDIS_URL", None)
-        if not redis_url:
+        q = _rq_queue(job.queue)
+        if q is None:
             return
-
-        conn = Redis.from_url(redis_url)
-        q = RqQueue(job.queue, connection=conn)
         q.enqueue(
-            "worker.dispatch",
+            _DISPATCH_FUNC,
             job.id,
-            job_timeout="5m",
+            job_timeout=_JOB_TIMEOUT_SECONDS,
         )
     except ImportError:
         pass  # redis/rq not installed yet
 
 
+def _enqueue_rq_many(jobs: list[Job]) -> None:
+    """Best-effort bulk enqueue: one Redis pipeline for all *jobs*."""
+    try:
+        by_queue: dict[str, list[Job]] = {}
+        for job in jobs:
+            by_queue.setdefault(job.queue, []).append(job)
+        queues = {name: _rq_queue(name) for name in by_queue}
+        if not queues or None in queues.values():
+            return
+        with _redis_conn.pipeline() as pipe:
+            for name, queue_jobs in by_queue.items():
+                q = queues[name]
+                q.enqueue_many(
+                    [q.prepare_data(_DISPATCH_FUNC, args=(job.id,), timeout=_JOB_TIMEOUT_SECONDS)
+                     for job in queue_jobs],
+                    pipeline=pipe,
+                )
+            pipe.execute()
+    except ImportError:
+        pass  # redis/rq not installed yet
+
+
 async def mark_running(db: AsyncSession, job_id: int) -> Job | None:
     result = await db.execute(select(Job).where(Job.id == job_id))
     job = result.scalar_one_or_none()
@@ -129,19 +327,13 @@ async def mark_failed(db: AsyncSession, job_id: int, error: str) -> None:
         delay = _backoff_seconds(job.attempt)
         logger.info("Job %s attempt %s failed, retrying in %.1fs", job.id, job.attempt, delay)
         try:
-            from redis import Redis
-            from rq import Queue as RqQueue
-
-            from app.config import settings
-            redis_url = getattr(settings, "REDIS_URL", None)
-            if redis_url:
-                conn = Redis.from_url(redis_url)
-                q = RqQueue(job.queue, connection=conn)
+            q = _rq_queue(job.queue)
+            if q is not None:
                 q.enqueue_in(
-                    __import__("datetime").timedelta(seconds=delay),
-                    "worker.dispatch",
+                    timedelta(seconds=delay),
+                    _DISPATCH_FUNC,
                     job.id,
-                    job_timeout="5m",
+                    job_timeout=_JOB_TIMEOUT_SECONDS,
                 )
         except Exception:
             pass
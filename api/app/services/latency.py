@@ -0,0 +1,105 @@
+"""In-process latency histograms for hot request paths.
+
+A fixed-bucket, cumulative histogram (Prometheus-style ``le`` buckets) per
+named path, kept in process memory.  Cheap enough to call on every request:
+``observe`` is a bisect plus two additions under a lock.  Each worker
+process keeps its own counts; they reset on restart.
+
+    from app.services.latency import histogram
+
+    with histogram("ops_center.lookup").time():
+        ...
+
+``snapshot()`` / ``snapshot_all()`` return plain dicts for an admin
+endpoint (count, sum, per-bucket counts and bucket-resolution p50/p95/p99).
+"""
+
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+# Milliseconds.  Spans a cached index hit to a pathological scan.
+DEFAULT_BUCKETS_MS: tuple[float, ...] = (
+    5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000,
+)
+
+
+class LatencyHistogram:
+    def __init__(self, name: str, buckets_ms: tuple[float, ...] = DEFAULT_BUCKETS_MS):
+        self.name = name
+        self.buckets_ms = tuple(sorted(buckets_ms))
+        self._counts = [0] * (len(self.buckets_ms) + 1)   # last slot is +Inf
+        self._sum_ms = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, ms: float) -> None:
+        i = bisect.bisect_left(self.buckets_ms, ms)
+        with self._lock:
+            self._counts[i] += 1
+            self._sum_ms += ms
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe((time.perf_counter() - start) * 1000)
+
+    def _quantile(self, counts: list[int], total: int, q: float):
+        """Upper bound of the bucket holding the q-quantile (None if empty;
+        ``"+Inf"`` if it falls past the last bucket — JSON has no infinity)."""
+        if not total:
+            return None
+        rank = q * total
+        seen = 0
+        for i, c in enumerate(counts):
+            seen += c
+            if seen >= rank:
+                return self.buckets_ms[i] if i < len(self.buckets_ms) else "+Inf"
+        return "+Inf"
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counts = list(self._counts)
+            sum_ms = self._sum_ms
+        total = sum(counts)
+        cumulative, buckets = 0, []
+        for le, c in zip(list(self.buckets_ms) + ["+Inf"], counts):
+            cumulative += c
+            buckets.append({"le": le, "count": cumulative})
+        return {
+            "name": self.name,
+            "count": total,
+            "sum_ms": round(sum_ms, 3),
+            "buckets": buckets,
+            "p50_ms": self._quantile(counts, total, 0.50),
+            "p95_ms": self._quantile(counts, total, 0.95),
+            "p99_ms": self._quantile(counts, total, 0.99),
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts = [0] * (len(self.buckets_ms) + 1)
+            self._sum_ms = 0.0
+
+
+_registry: dict[str, LatencyHistogram] = {}
+_registry_lock = threading.Lock()
+
+
+def histogram(name: str, buckets_ms: tuple[float, ...] = DEFAULT_BUCKETS_MS) -> LatencyHistogram:
+    """Get-or-create the process-wide histogram called *name*."""
+    h = _registry.get(name)
+    if h is None:
+        with _registry_lock:
+            h = _registry.setdefault(name, LatencyHistogram(name, buckets_ms))
+    return h
+
+
+def snapshot_all() -> list[dict]:
+    return [h.snapshot() for _name, h in sorted(_registry.items())]
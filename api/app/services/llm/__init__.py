@@ -4,6 +4,8 @@ Public surface:
 
   * :func:`generate_health_summary` — the orchestrator.  Always
     returns a HealthSummaryResponse-shaped dict; never raises.
+  * :func:`stream_health_summary` — the same flow, yielding redacted
+    provider deltas before the final payload (SSE endpoint).
 
 Everything in this package is no-op when ``settings.FEATURE_LLLM`` is
 not ``"true"``.  The orchestrator additionally checks
@@ -12,6 +14,6 @@ behavior with bad config is "always returns the deterministic
 summary" rather than "leaks data" or "crashes".
 """
 
-from app.services.llm.orchestrator import generate_health_summary
+from app.services.llm.orchestrator import generate_health_summary, stream_health_summary
 
-__all__ = ["generate_health_summary"]
+__all__ = ["generate_health_summary", "stream_health_summary"]
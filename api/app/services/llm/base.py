@@ -11,7 +11,7 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Literal, Optional
+from typing import AsyncIterator, Literal, Optional
 
 
 ProviderStatus = Literal["ok", "timeout", "error", "invalid_output"]
@@ -36,6 +36,21 @@ class LLMResult:
     error_summary: Optional[str] = None
 
 
+@dataclass
+class LLMStreamChunk:
+    """One item from :meth:`LLMProvider.stream`.
+
+    Every chunk but the last carries a ``text`` delta.  The last chunk
+    carries ``result`` — the same :class:`LLMResult` ``generate()``
+    would have returned, with ``raw_text`` holding the full output — so
+    the orchestrator can validate/cache/audit exactly as it does for a
+    non-streamed call.
+    """
+
+    text: str = ""
+    result: Optional[LLMResult] = None
+
+
 class LLMProvider(ABC):
     """Abstract base for every LLM provider.
 
@@ -68,3 +83,29 @@ class LLMProvider(ABC):
     ) -> LLMResult:
         """Call the underlying model.  Never raises."""
         raise NotImplementedError
+
+    async def stream(
+        self,
+        *,
+        system_prompt: str,
+        user_prompt: str,
+        timeout_seconds: float,
+        model: str,
+        max_tokens: int = 1024,
+    ) -> AsyncIterator[LLMStreamChunk]:
+        """Yield text deltas, then one final chunk with the result.
+
+        Never raises.  The default implementation is for providers with
+        no incremental transport: it calls :meth:`generate` and relays
+        the whole text as a single delta.
+        """
+        result = await self.generate(
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            timeout_seconds=timeout_seconds,
+            model=model,
+            max_tokens=max_tokens,
+        )
+        if result.status == "ok" and result.raw_text:
+            yield LLMStreamChunk(text=result.raw_text)
+        yield LLMStreamChunk(result=result)
@@ -2,10 +2,12 @@
 
 Cache key is a sha256 over ``tenant_id | scope | scope_id |
 data_fingerprint | prompt_template_version``.  ``data_fingerprint`` is
-itself a hash of the underlying input data — so the moment ANY input
-changes (most recent heartbeat timestamp, the set of open incidents,
-the telemetry rollup), the cache key changes too and a fresh summary
-is generated.  This makes the cache a free win when nothing has
+a hash over the tenant/site change version (see
+:mod:`app.services.change_version`) plus a staleness time bucket — so
+the moment ANY input changes (a heartbeat status transition, an
+incident opened or closed, a device/site edit), the cache key changes
+too and a fresh summary is generated.  Reading the version is one
+primary-key lookup, which makes the cache a free win when nothing has
 changed and invisible otherwise.
 
 TTL is a backstop, not the primary invalidation mechanism — even when
@@ -32,6 +32,7 @@ from app.models.device import Device
 from app.models.incident import Incident
 from app.models.site import Site
 from app.models.user import User
+from app.services import change_version
 from app.services.health import (
     CanonicalDeviceState,
     CanonicalSiteState,
@@ -115,6 +116,15 @@ class LLLMContext:
             return await self._load_site_normalized(site_id)
         return await self._load_site_legacy(site_id)
 
+    async def load_change_version(self, site_id: Optional[str] = None) -> int:
+        """Read the tenant (or site) change counter — one PK lookup.
+
+        Cheap enough to run before deciding whether the full context is
+        needed at all: a summary-cache hit returns without ever calling
+        :meth:`load_fleet` / :meth:`load_site`.
+        """
+        return await change_version.read_version(self.db, self.tenant_id, site_id)
+
     # ─── Legacy loaders (heartbeat-only) ───────────────────────────
     # Preserved verbatim so FEATURE_HEALTH_NORMALIZER=false produces
     # byte-identical behavior to the pre-MVP code.  Do not delete
@@ -559,55 +569,34 @@ class LLLMContext:
         return out
 
 
-def fingerprint_inputs_for_fleet(ctx: SummaryContext) -> dict:
-    """Stable dict for the cache fingerprint, fleet scope.
+def fingerprint_inputs_for_version(
+    *,
+    scope: str,
+    tenant_id: str,
+    scope_id: Optional[str],
+    change_version: int,
+    now: Optional[datetime] = None,
+) -> dict:
+    """Stable dict for the cache fingerprint, built WITHOUT loading context.
 
     Lives in the context module because both the orchestrator (when
     computing the cache key) and tests (when asserting fingerprint
     stability) need it.
-    """
-    return {
-        "scope": "fleet",
-        "tenant_id": ctx.tenant_id,
-        "fleet": {
-            "total_sites": ctx.fleet.total_sites,
-            "connected_sites": ctx.fleet.connected_sites,
-            "stale_devices": ctx.fleet.stale_devices,
-            "active_incidents": ctx.fleet.active_incidents,
-            "critical_incidents": ctx.fleet.critical_incidents,
-            "sites_needing_attention": ctx.fleet.sites_needing_attention,
-        },
-        "open_incident_ids": sorted(i.incident_id for i in ctx.incidents),
-    }
 
-
-def fingerprint_inputs_for_site(ctx: SummaryContext) -> dict:
-    """Stable dict for the cache fingerprint, site scope."""
-    site = ctx.site
+    ``change_version`` moves on every write a summary can observe (see
+    :mod:`app.services.change_version`).  Writes can't capture a device
+    silently going stale, so the fingerprint also carries a wall-clock
+    bucket of ``STALE_DEVICE_SECONDS`` — the granularity at which a
+    time-driven live → stale flip can change the summary.  The health
+    normalizer flag is included because the two derivations can
+    summarize identical data differently.
+    """
+    now = now or datetime.now(timezone.utc)
     return {
-        "scope": "site",
-        "tenant_id": ctx.tenant_id,
-        "scope_id": ctx.scope_id,
-        "site_present": site is not None,
-        "site": (
-            {
-                "site_id": site.site_id,
-                "needs_attention": site.needs_attention,
-                "active_incidents": site.active_incidents,
-                "critical_incidents": site.critical_incidents,
-                "stale_devices": site.stale_devices,
-                # Round seconds to the nearest 30s bucket so jitter in
-                # the heartbeat timestamp doesn't bust the cache every
-                # second.
-                "last_heartbeat_bucket": (
-                    None
-                    if site.last_heartbeat_seconds_ago is None
-                    else (site.last_heartbeat_seconds_ago // 30) * 30
-                ),
-                "connection_status": site.connection_status,
-            }
-            if site is not None
-            else None
-        ),
-        "open_incident_ids": sorted(i.incident_id for i in ctx.incidents),
+        "scope": scope,
+        "tenant_id": tenant_id,
+        "scope_id": scope_id,
+        "change_version": int(change_version),
+        "stale_bucket": int(now.timestamp()) // STALE_DEVICE_SECONDS,
+        "health_normalizer": settings.FEATURE_HEALTH_NORMALIZER.strip().lower() == "true",
     }
@@ -7,13 +7,15 @@ flow that the audit doc specifies and that
 
 Flow per request:
 
-  1. Build :class:`SummaryContext` via :class:`LLLMContext` — the
-     ONLY place a SQL query for an AI summary is issued.
-  2. Build the deterministic payload from the context.  This is the
-     floor: every code path below this point either returns this
-     payload or a validator-approved variation of it.
-  3. Compute cache key from (tenant, scope, scope_id, data_fingerprint,
-     template_version).  If cached and fresh, return it.
+  1. Read the tenant/site change version via :class:`LLLMContext`
+     (one primary-key lookup) and compute the cache key from (tenant,
+     scope, scope_id, data_fingerprint, template_version).
+  2. If cached and fresh, return it — without loading the context.
+  3. Build :class:`SummaryContext` via :class:`LLLMContext` — the
+     ONLY place a SQL query for an AI summary is issued — and the
+     deterministic payload from it.  This is the floor: every code
+     path below this point either returns this payload or a
+     validator-approved variation of it.
   4. Check feature flag (FEATURE_LLLM) + external-egress flag
      (LLLM_ALLOW_EXTERNAL) + provider availability.  Any 'no' →
      return deterministic with ``deterministic_fallback=True``.
@@ -25,6 +27,10 @@ Flow per request:
   7. Validate the provider output.  Failure → return deterministic.
   8. Cache the accepted payload, write the audit row, return.
 
+:func:`stream_health_summary` runs the same steps but relays the
+provider's text as it arrives (through the validator's
+:class:`StreamSanitizer`) before yielding the final payload.
+
 Every path writes ONE row to ``llm_audit_log``.  Every path is
 guaranteed to return a valid HealthSummaryResponse shape.
 """
@@ -34,8 +40,8 @@ from __future__ import annotations
 import json
 import logging
 import uuid
-from datetime import datetime, timezone
-from typing import Optional
+from dataclasses import dataclass
+from typing import AsyncIterator, Optional
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -44,10 +50,10 @@ from app.models.llm_audit import LLMAuditLog
 from app.models.user import User
 from app.services.llm import cache as cache_mod
 from app.services.llm import quota as quota_mod
+from app.services.llm.base import LLMProvider, LLMResult
 from app.services.llm.context import (
     LLLMContext,
-    fingerprint_inputs_for_fleet,
-    fingerprint_inputs_for_site,
+    fingerprint_inputs_for_version,
 )
 from app.services.llm.deterministic import (
     SummaryContext,
@@ -55,7 +61,11 @@ from app.services.llm.deterministic import (
 )
 from app.services.llm.prompts import load_template, template_version
 from app.services.llm.providers import get_provider
-from app.services.llm.validator import validate_provider_output
+from app.services.llm.validator import (
+    StreamSanitizer,
+    ValidationResult,
+    validate_provider_output,
+)
 
 logger = logging.getLogger("true911.llm.orchestrator")
 
@@ -213,58 +223,78 @@ def _build_provider_prompt(
     return system_prompt, user_prompt
 
 
-# ─── Public entry point ────────────────────────────────────────────
+# ─── Shared phases ─────────────────────────────────────────────────
+# generate_health_summary and stream_health_summary differ ONLY in how
+# the provider is called.  Everything before the call (steps 1-5) lives
+# in _prepare; everything after it (steps 6-8) lives in _complete, so
+# the streamed and non-streamed paths cannot drift apart.
 
 
-async def generate_health_summary(
+@dataclass
+class _Prepared:
+    """State carried from :func:`_prepare` to :func:`_complete`.
+
+    ``payload`` is set when the request was already answered (cache hit,
+    gate closed, quota exhausted) — the audit row is written and
+    committed, and the caller returns it as-is.
+    """
+
+    audit_id: str
+    model: str
+    template_v: str
+    payload: Optional[dict] = None
+    ctx: Optional[SummaryContext] = None
+    deterministic: Optional[dict] = None
+    fingerprint: str = ""
+    cache_key: str = ""
+    provider: Optional[LLMProvider] = None
+    system_prompt: str = ""
+    user_prompt: str = ""
+
+
+async def _prepare(
     *,
     db: AsyncSession,
     user: User,
     scope: str,
-    scope_id: Optional[str] = None,
-    force_refresh: bool = False,
-) -> dict:
-    """Generate (or fetch cached) AI Health Summary for the caller's tenant.
-
-    The returned dict matches :class:`app.schemas.llm.HealthSummaryResponse`.
-    The function NEVER raises an upstream error — every failure path
-    returns a deterministic summary with ``deterministic_fallback=True``
-    and an audit row that records what went wrong.
-
-    Tenant isolation is structural: the only SQL queries issued live
-    in :class:`LLLMContext`, which filters every query on
-    ``user.tenant_id``.
-    """
+    scope_id: Optional[str],
+    force_refresh: bool,
+) -> _Prepared:
+    """Steps 1-5: cache key, cache lookup, context, gates, quota."""
     audit_id = _new_audit_id()
     model = settings.LLLM_DEFAULT_MODEL
 
-    # 1) Build tenant-scoped context
-    loader = LLLMContext(user=user, db=db)
     if scope == "site" and scope_id:
-        ctx = await loader.load_site(scope_id)
         template_name = "site_health"
-        fingerprint_dict = fingerprint_inputs_for_site(ctx)
     else:
         # default to fleet for any unrecognized scope, matching the
         # schema default and saving a 422 on a typo
         scope = "fleet"
-        ctx = await loader.load_fleet()
+        scope_id = None
         template_name = "fleet_health"
-        fingerprint_dict = fingerprint_inputs_for_fleet(ctx)
     template_v = template_version(template_name)
 
-    # 2) Deterministic floor — always built first
-    deterministic = build_deterministic_summary(ctx)
-
-    # 3) Cache lookup (skip on force_refresh)
-    fingerprint = cache_mod.compute_data_fingerprint(fingerprint_dict)
+    # 1) Cache key from the change-version counter — one PK lookup, so
+    #    a hit never touches the fleet tables.
+    loader = LLLMContext(user=user, db=db)
+    version = await loader.load_change_version(scope_id)
+    fingerprint = cache_mod.compute_data_fingerprint(
+        fingerprint_inputs_for_version(
+            scope=scope,
+            tenant_id=loader.tenant_id,
+            scope_id=scope_id,
+            change_version=version,
+        )
+    )
     cache_key = cache_mod.compute_cache_key(
-        tenant_id=ctx.tenant_id,
-        scope=ctx.scope,
-        scope_id=ctx.scope_id,
+        tenant_id=loader.tenant_id,
+        scope=scope,
+        scope_id=scope_id,
         data_fingerprint=fingerprint,
         prompt_template_version=template_v,
     )
+
+    # 2) Cache lookup (skip on force_refresh)
     if not force_refresh:
         cached = await cache_mod.get_cached(db, cache_key)
         if cached is not None:
@@ -273,18 +303,44 @@ async def generate_health_summary(
             payload = dict(cached)
             payload["summary_id"] = audit_id
             payload["source"] = "cache"
+            # The audit row only needs scope + evidence trail; both are
+            # on the cached payload, so no context load is required.
+            cached_ctx = SummaryContext(
+                scope=scope,
+                scope_id=scope_id,
+                tenant_id=loader.tenant_id,
+                sources_used=list(payload.get("sources_used") or []),
+            )
             await _persist_audit(
                 db,
                 audit_id=audit_id,
                 user=user,
-                ctx=ctx,
+                ctx=cached_ctx,
                 payload=payload,
                 model=payload.get("model", model),
                 status="ok",
                 template_v=template_v,
             )
             await db.commit()
-            return payload
+            return _Prepared(audit_id=audit_id, model=model, template_v=template_v, payload=payload)
+
+    # 3) Build tenant-scoped context
+    if scope == "site":
+        ctx = await loader.load_site(scope_id)
+    else:
+        ctx = await loader.load_fleet()
+
+    # Deterministic floor — always built before any provider call
+    deterministic = build_deterministic_summary(ctx)
+    prep = _Prepared(
+        audit_id=audit_id,
+        model=model,
+        template_v=template_v,
+        ctx=ctx,
+        deterministic=deterministic,
+        fingerprint=fingerprint,
+        cache_key=cache_key,
+    )
 
     # 4) Feature-flag / egress / provider availability gate
     flag_on = settings.FEATURE_LLLM.lower() == "true"
@@ -293,7 +349,7 @@ async def generate_health_summary(
 
     if not flag_on or not egress_on or provider is None:
         # Deterministic-only path
-        payload = _wrap_response(
+        prep.payload = _wrap_response(
             audit_id=audit_id,
             ctx=ctx,
             deterministic=deterministic,
@@ -307,7 +363,7 @@ async def generate_health_summary(
             audit_id=audit_id,
             user=user,
             ctx=ctx,
-            payload=payload,
+            payload=prep.payload,
             model="deterministic",
             status="fallback",
             error_summary=(
@@ -318,11 +374,11 @@ async def generate_health_summary(
             template_v=template_v,
         )
         await db.commit()
-        return payload
+        return prep
 
     # 5) Quota check
     if not await quota_mod.has_budget(db, ctx.tenant_id):
-        payload = _wrap_response(
+        prep.payload = _wrap_response(
             audit_id=audit_id,
             ctx=ctx,
             deterministic=deterministic,
@@ -336,27 +392,43 @@ async def generate_health_summary(
             audit_id=audit_id,
             user=user,
             ctx=ctx,
-            payload=payload,
+            payload=prep.payload,
             model="deterministic",
             status="blocked",
             error_summary="daily token cap exceeded",
             template_v=template_v,
         )
         await db.commit()
-        return payload
+        return prep
 
-    # 6) Provider call
-    system_prompt, user_prompt = _build_provider_prompt(ctx, deterministic, template_name)
-    result = await provider.generate(
-        system_prompt=system_prompt,
-        user_prompt=user_prompt,
-        timeout_seconds=settings.LLLM_PROVIDER_TIMEOUT_SECONDS,
-        model=model,
+    prep.provider = provider
+    prep.system_prompt, prep.user_prompt = _build_provider_prompt(
+        ctx, deterministic, template_name
     )
+    return prep
+
+
+async def _complete(
+    *,
+    db: AsyncSession,
+    user: User,
+    prep: _Prepared,
+    result: LLMResult,
+    reject_reason: Optional[str] = None,
+) -> dict:
+    """Steps 6-8: judge the provider result, then cache + audit + return.
+
+    ``reject_reason`` lets the streaming path veto a result its relay
+    already refused to forward (injection marker mid-stream).
+    """
+    ctx = prep.ctx
+    deterministic = prep.deterministic
+    model = prep.model
 
+    # 6) Provider outcome
     if result.status != "ok" or not result.raw_text:
         payload = _wrap_response(
-            audit_id=audit_id,
+            audit_id=prep.audit_id,
             ctx=ctx,
             deterministic=deterministic,
             chosen=deterministic,
@@ -366,7 +438,7 @@ async def generate_health_summary(
         )
         await _persist_audit(
             db,
-            audit_id=audit_id,
+            audit_id=prep.audit_id,
             user=user,
             ctx=ctx,
             payload=payload,
@@ -376,16 +448,19 @@ async def generate_health_summary(
             tokens_in=result.tokens_in,
             tokens_out=result.tokens_out,
             latency_ms=result.latency_ms,
-            template_v=template_v,
+            template_v=prep.template_v,
         )
         await db.commit()
         return payload
 
     # 7) Validate
-    validation = validate_provider_output(result.raw_text, deterministic)
+    if reject_reason is not None:
+        validation = ValidationResult(False, reject_reason=reject_reason)
+    else:
+        validation = validate_provider_output(result.raw_text, deterministic)
     if not validation.accepted or validation.payload is None:
         payload = _wrap_response(
-            audit_id=audit_id,
+            audit_id=prep.audit_id,
             ctx=ctx,
             deterministic=deterministic,
             chosen=deterministic,
@@ -395,7 +470,7 @@ async def generate_health_summary(
         )
         await _persist_audit(
             db,
-            audit_id=audit_id,
+            audit_id=prep.audit_id,
             user=user,
             ctx=ctx,
             payload=payload,
@@ -405,14 +480,14 @@ async def generate_health_summary(
             tokens_in=result.tokens_in,
             tokens_out=result.tokens_out,
             latency_ms=result.latency_ms,
-            template_v=template_v,
+            template_v=prep.template_v,
         )
         await db.commit()
         return payload
 
     # 8) Accepted — cache + audit + return
     payload = _wrap_response(
-        audit_id=audit_id,
+        audit_id=prep.audit_id,
         ctx=ctx,
         deterministic=deterministic,
         chosen=validation.payload,
@@ -422,16 +497,16 @@ async def generate_health_summary(
     )
     await cache_mod.store(
         db,
-        cache_key=cache_key,
+        cache_key=prep.cache_key,
         tenant_id=ctx.tenant_id,
         scope=ctx.scope,
         scope_id=ctx.scope_id,
-        data_fingerprint=fingerprint,
+        data_fingerprint=prep.fingerprint,
         payload=payload,
     )
     await _persist_audit(
         db,
-        audit_id=audit_id,
+        audit_id=prep.audit_id,
         user=user,
         ctx=ctx,
         payload=payload,
@@ -440,7 +515,108 @@ async def generate_health_summary(
         tokens_in=result.tokens_in,
         tokens_out=result.tokens_out,
         latency_ms=result.latency_ms,
-        template_v=template_v,
+        template_v=prep.template_v,
     )
     await db.commit()
     return payload
+
+
+# ─── Public entry points ───────────────────────────────────────────
+
+
+async def generate_health_summary(
+    *,
+    db: AsyncSession,
+    user: User,
+    scope: str,
+    scope_id: Optional[str] = None,
+    force_refresh: bool = False,
+) -> dict:
+    """Generate (or fetch cached) AI Health Summary for the caller's tenant.
+
+    The returned dict matches :class:`app.schemas.llm.HealthSummaryResponse`.
+    The function NEVER raises an upstream error — every failure path
+    returns a deterministic summary with ``deterministic_fallback=True``
+    and an audit row that records what went wrong.
+
+    Tenant isolation is structural: the only SQL queries issued live
+    in :class:`LLLMContext`, which filters every query on
+    ``user.tenant_id``.
+    """
+    prep = await _prepare(
+        db=db, user=user, scope=scope, scope_id=scope_id, force_refresh=force_refresh
+    )
+    if prep.payload is not None:
+        return prep.payload
+
+    result = await prep.provider.generate(
+        system_prompt=prep.system_prompt,
+        user_prompt=prep.user_prompt,
+        timeout_seconds=settings.LLLM_PROVIDER_TIMEOUT_SECONDS,
+        model=prep.model,
+    )
+    return await _complete(db=db, user=user, prep=prep, result=result)
+
+
+async def stream_health_summary(
+    *,
+    db: AsyncSession,
+    user: User,
+    scope: str,
+    scope_id: Optional[str] = None,
+    force_refresh: bool = False,
+) -> AsyncIterator[tuple[str, dict]]:
+    """Streaming variant of :func:`generate_health_summary`.
+
+    Yields ``(event, data)`` pairs for the SSE router:
+
+      * ``("delta", {"text": ...})`` — provider text as it arrives,
+        already through :class:`StreamSanitizer` (PII redaction +
+        injection check).  Zero or more.
+      * ``("summary", payload)`` — exactly once, last.  Identical to
+        what :func:`generate_health_summary` would have returned, so
+        the UI replaces the streamed draft with the validated result.
+
+    Cache hits, closed gates and quota exhaustion produce the summary
+    event alone.  Same never-raises and audit-row guarantees.
+    """
+    prep = await _prepare(
+        db=db, user=user, scope=scope, scope_id=scope_id, force_refresh=force_refresh
+    )
+    if prep.payload is not None:
+        yield "summary", prep.payload
+        return
+
+    sanitizer = StreamSanitizer()
+    result: Optional[LLMResult] = None
+    async for chunk in prep.provider.stream(
+        system_prompt=prep.system_prompt,
+        user_prompt=prep.user_prompt,
+        timeout_seconds=settings.LLLM_PROVIDER_TIMEOUT_SECONDS,
+        model=prep.model,
+    ):
+        if chunk.result is not None:
+            result = chunk.result
+            break
+        safe = sanitizer.push(chunk.text)
+        if safe:
+            yield "delta", {"text": safe}
+
+    tail = sanitizer.flush()
+    if tail:
+        yield "delta", {"text": tail}
+
+    if result is None:
+        result = LLMResult(
+            status="error",
+            model=prep.model,
+            error_summary="provider stream ended without a result",
+        )
+    payload = await _complete(
+        db=db,
+        user=user,
+        prep=prep,
+        result=result,
+        reject_reason=sanitizer.reject_reason,
+    )
+    yield "summary", payload
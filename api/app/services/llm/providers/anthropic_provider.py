@@ -8,7 +8,7 @@ fallback territory.
 
 This provider:
 
-  * Honors the timeout from the caller exactly (httpx.AsyncClient(timeout=...)).
+  * Honors the timeout from the caller exactly (per-request httpx timeout).
   * Never raises — every exception path returns an LLMResult with a
     non-sensitive ``error_summary``.
   * Records usage tokens from the response when available; otherwise
@@ -16,18 +16,25 @@ This provider:
     the budget.
   * Posts to /v1/messages with ``anthropic-version: 2023-06-01`` — the
     same header used by the support assistant integration.
+  * Shares ONE pooled ``httpx.AsyncClient`` per event loop across all
+    calls (see :func:`_get_client`), so keep-alive connections are
+    reused and only the first summary pays the TCP+TLS handshake.
+  * Supports ``stream()`` over the Messages API server-sent events, for
+    the streaming health-summary endpoint.
 """
 
 from __future__ import annotations
 
+import asyncio
+import json
 import logging
 import time
-from typing import Any
+from typing import Any, AsyncIterator, Optional
 
 import httpx
 
 from app.config import settings
-from app.services.llm.base import LLMProvider, LLMResult
+from app.services.llm.base import LLMProvider, LLMResult, LLMStreamChunk
 
 logger = logging.getLogger("true911.llm.anthropic")
 
@@ -36,9 +43,84 @@ _API_URL = "https://api.anthropic.com/v1/messages"
 _API_VERSION = "2023-06-01"
 
 
+# ─── Pooled client ─────────────────────────────────────────────────
+# An AsyncClient is bound to the event loop that first used it, so the
+# pool is rebuilt if the loop changes (tests, or a worker that runs
+# each job under its own asyncio.run()).
+
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Return the process-wide pooled client for the running loop."""
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        max_conn = max(1, settings.LLLM_PROVIDER_MAX_CONNECTIONS)
+        _client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_conn,
+                max_keepalive_connections=max_conn,
+            ),
+            timeout=settings.LLLM_PROVIDER_TIMEOUT_SECONDS,
+        )
+        _client_loop = loop
+    return _client
+
+
+async def aclose_client() -> None:
+    """Close the pooled client.  Called from app shutdown."""
+    global _client, _client_loop
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+    _client = None
+    _client_loop = None
+
+
+def _api_url() -> str:
+    return settings.LLLM_PROVIDER_BASE_URL.strip() or _API_URL
+
+
+async def _iter_sse(resp: httpx.Response) -> AsyncIterator[tuple[str, dict]]:
+    """Parse a server-sent-event body into ``(event, data)`` pairs."""
+    event = ""
+    data_lines: list[str] = []
+    async for line in resp.aiter_lines():
+        if not line:
+            if data_lines:
+                try:
+                    data = json.loads("\n".join(data_lines))
+                except ValueError:
+                    data = {}
+                yield event, data if isinstance(data, dict) else {}
+            event, data_lines = "", []
+            continue
+        if line.startswith("event:"):
+            event = line[len("event:"):].strip()
+        elif line.startswith("data:"):
+            data_lines.append(line[len("data:"):].strip())
+
+
 class AnthropicProvider(LLMProvider):
     name = "anthropic"
 
+    def _request(
+        self, *, system_prompt: str, user_prompt: str, model: str, max_tokens: int
+    ) -> tuple[dict, dict]:
+        body = {
+            "model": model,
+            "max_tokens": max_tokens,
+            "system": system_prompt,
+            "messages": [{"role": "user", "content": user_prompt}],
+        }
+        headers = {
+            "x-api-key": settings.ANTHROPIC_API_KEY.strip(),
+            "anthropic-version": _API_VERSION,
+            "content-type": "application/json",
+        }
+        return body, headers
+
     async def generate(
         self,
         *,
@@ -58,22 +140,19 @@ class AnthropicProvider(LLMProvider):
                 error_summary="ANTHROPIC_API_KEY not configured",
             )
 
-        body = {
-            "model": model,
-            "max_tokens": max_tokens,
-            "system": system_prompt,
-            "messages": [{"role": "user", "content": user_prompt}],
-        }
-        headers = {
-            "x-api-key": api_key,
-            "anthropic-version": _API_VERSION,
-            "content-type": "application/json",
-        }
+        body, headers = self._request(
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            model=model,
+            max_tokens=max_tokens,
+        )
 
         start = time.perf_counter()
         try:
-            async with httpx.AsyncClient(timeout=timeout_seconds) as client:
-                resp = await client.post(_API_URL, headers=headers, json=body)
+            client = _get_client()
+            resp = await client.post(
+                _api_url(), headers=headers, json=body, timeout=timeout_seconds
+            )
         except httpx.TimeoutException:
             elapsed = int((time.perf_counter() - start) * 1000)
             logger.warning(
@@ -147,3 +226,119 @@ class AnthropicProvider(LLMProvider):
             latency_ms=elapsed,
             model=data.get("model") or model,
         )
+
+    async def stream(
+        self,
+        *,
+        system_prompt: str,
+        user_prompt: str,
+        timeout_seconds: float,
+        model: str,
+        max_tokens: int = 1024,
+    ) -> AsyncIterator[LLMStreamChunk]:
+        """Stream text deltas from the Messages API (``"stream": true``).
+
+        ``timeout_seconds`` bounds the connect and each read — i.e. time
+        to first byte and the longest gap between events — not the
+        total generation time.  Same never-raises contract as
+        :meth:`generate`; failures arrive as the final chunk's result.
+        """
+        if not settings.ANTHROPIC_API_KEY.strip():
+            yield LLMStreamChunk(
+                result=LLMResult(
+                    status="error",
+                    model=model,
+                    error_summary="ANTHROPIC_API_KEY not configured",
+                )
+            )
+            return
+
+        body, headers = self._request(
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            model=model,
+            max_tokens=max_tokens,
+        )
+        body["stream"] = True
+
+        parts: list[str] = []
+        tokens_in: Optional[int] = None
+        tokens_out: Optional[int] = None
+        resolved_model = model
+        failure: Optional[LLMResult] = None
+
+        start = time.perf_counter()
+        try:
+            client = _get_client()
+            async with client.stream(
+                "POST", _api_url(), headers=headers, json=body, timeout=timeout_seconds
+            ) as resp:
+                if resp.status_code >= 400:
+                    logger.warning("Anthropic stream returned %d", resp.status_code)
+                    failure = LLMResult(
+                        status="error",
+                        model=model,
+                        error_summary=f"provider returned HTTP {resp.status_code}",
+                    )
+                else:
+                    async for event, data in _iter_sse(resp):
+                        if event == "content_block_delta":
+                            text = (data.get("delta") or {}).get("text")
+                            if text:
+                                parts.append(text)
+                                yield LLMStreamChunk(text=text)
+                        elif event == "message_start":
+                            message = data.get("message") or {}
+                            resolved_model = message.get("model") or resolved_model
+                            usage = message.get("usage") or {}
+                            if usage.get("input_tokens") is not None:
+                                tokens_in = int(usage["input_tokens"])
+                        elif event == "message_delta":
+                            usage = data.get("usage") or {}
+                            if usage.get("output_tokens") is not None:
+                                tokens_out = int(usage["output_tokens"])
+                        elif event == "error":
+                            failure = LLMResult(
+                                status="error",
+                                model=model,
+                                error_summary="provider stream reported an error",
+                            )
+                            break
+        except httpx.TimeoutException:
+            logger.warning("Anthropic stream timeout (limit %.2fs)", timeout_seconds)
+            failure = LLMResult(
+                status="timeout",
+                model=model,
+                error_summary=f"provider timeout after {timeout_seconds}s",
+            )
+        except httpx.HTTPError as exc:
+            logger.warning("Anthropic stream HTTP error: %s: %s", type(exc).__name__, exc)
+            failure = LLMResult(
+                status="error",
+                model=model,
+                error_summary=f"http error: {type(exc).__name__}",
+            )
+        except Exception as exc:  # noqa: BLE001 — defensive: never raise
+            logger.exception("Anthropic stream unexpected exception")
+            failure = LLMResult(
+                status="error",
+                model=model,
+                error_summary=f"unexpected: {type(exc).__name__}",
+            )
+
+        elapsed = int((time.perf_counter() - start) * 1000)
+        if failure is not None:
+            failure.latency_ms = elapsed
+            yield LLMStreamChunk(result=failure)
+            return
+
+        yield LLMStreamChunk(
+            result=LLMResult(
+                status="ok",
+                raw_text="".join(parts),
+                tokens_in=tokens_in,
+                tokens_out=tokens_out,
+                latency_ms=elapsed,
+                model=resolved_model,
+            )
+        )
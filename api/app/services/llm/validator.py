@@ -82,6 +82,13 @@ _INJECTION_MARKERS = (
 )
 
 
+# Streamed text is held back by this many characters before it is
+# relayed, so a PII match or injection marker that straddles two chunks
+# is still whole when it is scanned.  Comfortably longer than any
+# pattern above.
+STREAM_HOLDBACK_CHARS = 64
+
+
 # ─── Public API ────────────────────────────────────────────────────────
 
 
@@ -231,3 +238,53 @@ def validate_provider_output(
         "generated_at": deterministic_payload.get("generated_at"),
     }
     return ValidationResult(True, payload=payload)
+
+
+class StreamSanitizer:
+    """Incremental :func:`redact_pii` + :func:`looks_like_injection` for streams.
+
+    The streaming health-summary endpoint relays provider text before
+    the full response exists, so :func:`validate_provider_output` can't
+    run yet.  Each :meth:`push` re-scans the whole accumulated text and
+    returns only the newly-stable part of the redacted output — the
+    trailing ``STREAM_HOLDBACK_CHARS`` stay buffered until more text (or
+    :meth:`flush`) proves no pattern spans the boundary.
+
+    Once an injection marker appears, or the text exceeds
+    ``MAX_TOTAL_CHARS``, nothing more is relayed and ``reject_reason``
+    is set; the final validated payload still arrives separately.
+    """
+
+    def __init__(self, holdback: int = STREAM_HOLDBACK_CHARS):
+        self._holdback = holdback
+        self._raw = ""
+        self._emitted = 0
+        self.reject_reason: Optional[str] = None
+
+    def _release(self, keep: int) -> str:
+        if self.reject_reason is not None:
+            return ""
+        if len(self._raw) > MAX_TOTAL_CHARS:
+            self.reject_reason = f"response exceeded {MAX_TOTAL_CHARS} chars"
+            return ""
+        if looks_like_injection(self._raw):
+            logger.warning("LLM stream halted: injection marker in provider output")
+            self.reject_reason = "injection marker detected in streamed output"
+            return ""
+        redacted = redact_pii(self._raw)
+        stable = len(redacted) - keep
+        if stable <= self._emitted:
+            return ""
+        out = redacted[self._emitted:stable]
+        self._emitted = stable
+        return out
+
+    def push(self, chunk: str) -> str:
+        """Add a provider delta; return the text that is now safe to emit."""
+        if chunk:
+            self._raw += chunk
+        return self._release(self._holdback)
+
+    def flush(self) -> str:
+        """End of stream — return whatever is still held back."""
+        return self._release(0)
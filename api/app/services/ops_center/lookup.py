@@ -32,6 +32,7 @@ from app.models.line import Line
 from app.models.ops_center import AssetIdentity
 from app.models.service_unit import ServiceUnit
 from app.models.site import Site
+from app.services.latency import histogram
 from app.services.ops_center.normalize import (
     NAME_LIKE_TYPES,
     PHONE_LIKE_TYPES,
@@ -43,6 +44,9 @@ from app.services.ops_center.normalize import (
 )
 
 
+LOOKUP_HISTOGRAM = "ops_center.lookup"
+
+
 @dataclass
 class RawAssetMatch:
     asset_kind: str
@@ -90,7 +94,20 @@ async def find_assets(
     *restrict_tenant_id* scopes the search to a single tenant (used for
     customer-tenant callers).  ``None`` searches across all tenants — only
     the router's platform-operator path passes that.
+
+    Every call is timed into the ``LOOKUP_HISTOGRAM`` latency histogram.
     """
+    with histogram(LOOKUP_HISTOGRAM).time():
+        return await _find_assets(
+            db,
+            identifier=identifier,
+            identifier_type=identifier_type,
+            restrict_tenant_id=restrict_tenant_id,
+            limit=limit,
+        )
+
+
+async def _find_assets(db, *, identifier, identifier_type, restrict_tenant_id, limit):
     identifier = (identifier or "").strip()
     if not identifier:
         return []
@@ -154,10 +171,9 @@ async def find_assets(
         )
 
     # ── 3. Resolve site name + authorized contact for each match ─────
-    for m in matches:
-        await _enrich_site_and_contact(db, m)
-
-    return matches[:limit]
+    matches = matches[:limit]
+    await _enrich_site_and_contact(db, matches)
+    return matches
 
 
 async def _native_fallback(db, *, identifier, identifier_type, restrict_tenant_id, limit, add) -> None:
@@ -258,16 +274,27 @@ async def _native_fallback(db, *, identifier, identifier_type, restrict_tenant_i
                 )
 
 
-async def _enrich_site_and_contact(db: AsyncSession, m: RawAssetMatch) -> None:
-    """Populate site_name + authorized contact from the owning Site POC."""
-    if not m.site_id:
-        return
-    q = select(Site).where(Site.site_id == m.site_id, Site.tenant_id == m.tenant_id)
-    site = (await db.execute(q)).scalar_one_or_none()
-    if site is None:
+async def _enrich_site_and_contact(db: AsyncSession, matches: list[RawAssetMatch]) -> None:
+    """Populate site_name + authorized contact from each owning Site POC.
+
+    One ``IN`` query over the distinct site ids, however many matches
+    share a building; the rows are keyed by ``(site_id, tenant_id)`` so a
+    match only ever resolves a contact from its own tenant's site.
+    """
+    site_ids = {m.site_id for m in matches if m.site_id}
+    if not site_ids:
         return
-    if not m.site_name:
-        m.site_name = site.site_name
-    if getattr(site, "poc_phone", None):
-        m.contact_name = getattr(site, "poc_name", None)
-        m.contact_phone = site.poc_phone
+    tenant_ids = {m.tenant_id for m in matches if m.site_id}
+    q = select(Site).where(Site.site_id.in_(sorted(site_ids)), Site.tenant_id.in_(sorted(tenant_ids)))
+    sites = {
+        (s.site_id, s.tenant_id): s for s in (await db.execute(q)).scalars().all()
+    }
+    for m in matches:
+        site = sites.get((m.site_id, m.tenant_id))
+        if site is None:
+            continue
+        if not m.site_name:
+            m.site_name = site.site_name
+        if getattr(site, "poc_phone", None):
+            m.contact_name = getattr(site, "poc_name", None)
+            m.contact_phone = site.poc_phone
@@ -7,6 +7,8 @@ from __future__ import annotations
 
 import re
 
+from app.utils.phone import digits_only, normalize_phone
+
 # Identifier types whose values are phone numbers / numeric strings and so
 # should be matched on digits only (formatting-insensitive).
 PHONE_LIKE_TYPES = {
@@ -31,28 +33,10 @@ NAME_LIKE_TYPES = {
 # central_station_account, elevator_number, …) is treated as an opaque
 # token: upper-cased, stripped of spaces and common separators.
 
-_NON_DIGITS = re.compile(r"\D+")
 _WHITESPACE = re.compile(r"\s+")
 _TOKEN_SEPARATORS = re.compile(r"[\s\-_./]+")
 
 
-def digits_only(value: str) -> str:
-    """Return only the digits of *value* (drops +, spaces, dashes, parens)."""
-    return _NON_DIGITS.sub("", value or "")
-
-
-def normalize_phone(value: str) -> str:
-    """Normalize a phone-like value to its trailing 10 digits when it looks
-    like a NANP number (optionally with a leading country code), else to its
-    full digit string.  This lets ``+1 (856) 308-1391`` and ``8563081391``
-    and ``18563081391`` all match.
-    """
-    d = digits_only(value)
-    if len(d) == 11 and d.startswith("1"):
-        return d[1:]
-    return d
-
-
 def normalize_name(value: str) -> str:
     """Lower-case + collapse internal whitespace for name matching."""
     return _WHITESPACE.sub(" ", (value or "").strip()).lower()
@@ -0,0 +1,182 @@
+"""Incremental Portfolio Fusion — Building Digital Twins from a persisted store.
+
+The fusion pipeline itself (RH filtering, source adapters, union-find
+clustering, ``build_twin``, the portfolio-wide report passes) lives in
+``app.services.portfolio_fusion_engine`` and is shared with the offline CLI
+(``scripts.rh_portfolio_fusion``).  This
+service runs it against the ``portfolio_fusion_*`` store
+(``app.models.portfolio_fusion``) so a run only redoes the work for the
+buildings whose inputs changed:
+
+  1. adapt + RH-filter the sources and key every source record by its
+     content hash.  Vendor exports may be streamed in (the CLI's
+     ``iter_napco_csv`` / ``iter_genesis_csv``), but that only bounds
+     parsing — the adapted RH records are held as one list;
+  2. diff the keys against the stored records.  A cluster is dirty when it
+     lost a record, when an added record shares a join key (store # /
+     address / device id) with one of its records, or when its records
+     changed relative order;
+  3. re-cluster only the added records plus the members of dirty clusters
+     and rebuild their twins; every other twin is reused as stored;
+  4. re-apply the cheap portfolio-wide passes (building numbering,
+     shared-address duplicates, registry reconciliation, dashboard) over all
+     twins.
+
+The report is the one ``fuse_portfolio`` returns for the same inputs, plus
+``summary["incremental"]`` counters.  Only the fusion store is written —
+never a source, the approved registry or its review queue.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from collections import Counter, defaultdict
+from typing import Any, Optional
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.portfolio_fusion import PortfolioFusionRecord, PortfolioFusionTwin
+from app.services import portfolio_fusion_engine as engine
+
+logger = logging.getLogger("true911.portfolio_fusion")
+
+_KEY_CHUNK = 1000
+
+
+def record_hash(record: dict) -> str:
+    blob = json.dumps(record, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+
+def record_keys(records: list[dict]) -> list[str]:
+    """Content-hash key per record; identical records get ``:0``, ``:1`` …"""
+    seen: Counter = Counter()
+    keys = []
+    for r in records:
+        h = record_hash(r)
+        keys.append(f"{h}:{seen[h]}")
+        seen[h] += 1
+    return keys
+
+
+def _join_keys(record: dict) -> list[str]:
+    return sorted(f"{kind}|{value}" for kind, value in engine.record_join_keys(record))
+
+
+def _cluster_key(member_keys: list[str]) -> str:
+    return hashlib.sha1("\n".join(member_keys).encode()).hexdigest()
+
+
+async def _load_store(db: AsyncSession, tenant_id: str):
+    recs = (await db.execute(
+        select(PortfolioFusionRecord.record_key, PortfolioFusionRecord.join_keys,
+               PortfolioFusionRecord.cluster_key)
+        .where(PortfolioFusionRecord.tenant_id == tenant_id)
+    )).all()
+    twins = (await db.execute(
+        select(PortfolioFusionTwin.cluster_key, PortfolioFusionTwin.member_keys,
+               PortfolioFusionTwin.twin)
+        .where(PortfolioFusionTwin.tenant_id == tenant_id)
+    )).all()
+    return recs, twins
+
+
+async def _delete_keys(db: AsyncSession, column, tenant_column, tenant_id: str, keys) -> None:
+    keys = list(keys)
+    for i in range(0, len(keys), _KEY_CHUNK):
+        await db.execute(delete(column.class_).where(
+            tenant_column == tenant_id, column.in_(keys[i:i + _KEY_CHUNK])))
+
+
+async def run_fusion(
+    db: AsyncSession,
+    tenant_id: str,
+    *,
+    zoho_rows=None,
+    napco_records=None,
+    genesis_rows=None,
+    true911: Optional[dict] = None,
+    registry: Optional[dict] = None,
+) -> dict:
+    """Fuse the sources for *tenant_id*, rebuilding only changed buildings (see
+    module docstring), update the fusion store and commit."""
+    records, intake = engine.prepare_records(
+        zoho_rows=zoho_rows, napco_records=napco_records,
+        genesis_rows=genesis_rows, true911=true911)
+    keys = record_keys(records)
+    pos = {k: i for i, k in enumerate(keys)}
+
+    stored_recs, stored_twins = await _load_store(db, tenant_id)
+    stored_cluster = {k: ck for k, _jks, ck in stored_recs}
+    added = [k for k in keys if k not in stored_cluster]
+    removed = [k for k in stored_cluster if k not in pos]
+
+    dirty = {stored_cluster[k] for k in removed}
+    if added:
+        clusters_by_join: dict[str, set] = defaultdict(set)
+        for _k, jks, ck in stored_recs:
+            for jk in jks:
+                clusters_by_join[jk].add(ck)
+        for k in added:
+            for jk in _join_keys(records[pos[k]]):
+                dirty |= clusters_by_join.get(jk, set())
+
+    # (member record indexes, base twin) per building
+    buildings: list[tuple[list[int], dict]] = []
+    reused: set[str] = set()
+    for ck, members, twin_json in stored_twins:
+        if ck in dirty:
+            continue
+        idx = [pos[m] for m in members]          # every member is present, or ck is dirty
+        if idx != sorted(idx):
+            continue                             # relative order moved: _pick etc. may differ
+        reused.add(ck)
+        buildings.append((idx, json.loads(twin_json)))
+
+    # ── re-cluster what's left ───────────────────────────────────────
+    rebuild = [i for i, k in enumerate(keys) if stored_cluster.get(k) not in reused]
+    index_of = {id(records[i]): i for i in rebuild}
+    new_records, new_twins = [], []
+    for cluster in engine.fuse_records([records[i] for i in rebuild]):
+        idx = [index_of[id(r)] for r in cluster]
+        member_keys = [keys[i] for i in idx]
+        ck = _cluster_key(member_keys)
+        twin = engine.build_twin(cluster, 0)
+        new_twins.append({"tenant_id": tenant_id, "cluster_key": ck,
+                          "member_keys": member_keys, "twin": json.dumps(twin, default=str)})
+        for i, k in zip(idx, member_keys):
+            new_records.append({"tenant_id": tenant_id, "record_key": k,
+                                "source": records[i]["source"],
+                                "join_keys": _join_keys(records[i]), "cluster_key": ck})
+        buildings.append((idx, twin))
+
+    # ── persist the delta ────────────────────────────────────────────
+    stale_records = set(removed) | {keys[i] for i in rebuild if keys[i] in stored_cluster}
+    stale_twins = {ck for ck, _m, _t in stored_twins if ck not in reused}
+    await _delete_keys(db, PortfolioFusionRecord.record_key, PortfolioFusionRecord.tenant_id,
+                       tenant_id, stale_records)
+    await _delete_keys(db, PortfolioFusionTwin.cluster_key, PortfolioFusionTwin.tenant_id,
+                       tenant_id, stale_twins)
+    if new_records:
+        await db.execute(insert(PortfolioFusionRecord), new_records)
+    if new_twins:
+        await db.execute(insert(PortfolioFusionTwin), new_twins)
+    await db.commit()
+
+    # ── portfolio-wide passes, in fuse_portfolio's order ────────────
+    buildings.sort(key=lambda b: (engine.cluster_order_key([records[b[0][0]]]), b[0][0]))
+    twins = []
+    for n, (_idx, twin) in enumerate(buildings, start=1):
+        twin["building_id"] = engine.building_id(n)
+        twins.append(twin)
+    report = engine.finish_report(twins, records, intake, tenant=tenant_id, registry=registry)
+    stats: dict[str, Any] = {
+        "records": len(records), "records_added": len(added), "records_removed": len(removed),
+        "buildings_reused": len(reused), "buildings_rebuilt": len(new_twins),
+    }
+    report["summary"]["incremental"] = stats
+    logger.info("Portfolio fusion tenant=%s %s", tenant_id, stats)
+    return report
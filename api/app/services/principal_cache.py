@@ -0,0 +1,143 @@
+"""Short-TTL cache of authenticated principals for ``get_current_user``.
+
+Every authenticated request used to ``SELECT`` the user (plus the target
+tenant under ``X-Act-As-Tenant``).  A dashboard polling a dozen endpoints
+repeats that for the same token many times a minute, so the resolved
+user is cached in process memory, keyed by::
+
+    (user_id, token identity, act-as tenant)
+
+where the token identity is its ``jti`` (``iat``/``exp`` for tokens minted
+before ``jti`` existed).  The JWT is still decoded and verified on every
+request; only the database round trips are skipped.
+
+Entries hold a column snapshot, not the ORM instance — every hit builds a
+fresh, session-less :class:`User`, so per-request mutations never leak.
+
+Invalidation:
+  * :func:`invalidate_user` drops every entry for a user.  :func:`install`
+    registers an ``after_flush`` listener that calls it for any ``User``
+    row updated or deleted through the ORM — deactivation, role change,
+    password reset, tenant move — so this process stops serving the old
+    principal as soon as the change is flushed.
+  * A per-user generation counter stops an in-flight miss (which read the
+    row before the change) from re-caching the stale principal.
+  * Other worker processes see the change within
+    ``AUTH_PRINCIPAL_CACHE_TTL_SECONDS`` (0 disables the cache).
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.user import User
+
+MAX_ENTRIES = 10_000
+
+# Columns copied into the snapshot (every mapped User column).
+_COLUMNS = tuple(c.key for c in User.__table__.columns)
+
+Key = tuple[uuid.UUID, str, Optional[str]]
+
+_clock: Callable[[], float] = time.monotonic
+_lock = threading.Lock()
+_entries: "OrderedDict[Key, tuple[float, dict]]" = OrderedDict()
+_generations: dict[uuid.UUID, int] = {}
+_stats = {"hits": 0, "misses": 0, "invalidations": 0, "evictions": 0}
+
+
+def ttl_seconds() -> int:
+    return max(0, int(settings.AUTH_PRINCIPAL_CACHE_TTL_SECONDS))
+
+
+def cache_key(user_id: uuid.UUID, payload: dict, act_as: Optional[str]) -> Key:
+    ident = payload.get("jti") or f"{payload.get('iat')}:{payload.get('exp')}"
+    return (user_id, str(ident), act_as or None)
+
+
+def generation(user_id: uuid.UUID) -> int:
+    """Read before loading the user; pass to :func:`put`."""
+    return _generations.get(user_id, 0)
+
+
+def get(key: Key) -> Optional[User]:
+    """A fresh transient ``User`` for a live entry, or ``None`` (miss)."""
+    now = _clock()
+    with _lock:
+        entry = _entries.get(key)
+        if entry is not None and entry[0] <= now:
+            del _entries[key]
+            entry = None
+        if entry is None:
+            _stats["misses"] += 1
+            return None
+        _stats["hits"] += 1
+        snapshot = entry[1]
+    return User(**snapshot)
+
+
+def put(key: Key, user: User, gen: int) -> None:
+    """Cache *user* unless it was invalidated since *gen* was read."""
+    ttl = ttl_seconds()
+    if not ttl:
+        return
+    snapshot = {col: getattr(user, col) for col in _COLUMNS}
+    with _lock:
+        if _generations.get(key[0], 0) != gen:
+            return
+        _entries[key] = (_clock() + ttl, snapshot)
+        _entries.move_to_end(key)
+        while len(_entries) > MAX_ENTRIES:
+            _entries.popitem(last=False)
+            _stats["evictions"] += 1
+
+
+def invalidate_user(user_id: uuid.UUID) -> None:
+    with _lock:
+        _generations[user_id] = _generations.get(user_id, 0) + 1
+        for key in [k for k in _entries if k[0] == user_id]:
+            del _entries[key]
+        _stats["invalidations"] += 1
+
+
+def clear() -> None:
+    with _lock:
+        _entries.clear()
+        _generations.clear()
+        for k in _stats:
+            _stats[k] = 0
+
+
+def stats() -> dict:
+    with _lock:
+        out = dict(_stats, entries=len(_entries))
+    lookups = out["hits"] + out["misses"]
+    out["hit_rate"] = round(out["hits"] / lookups, 4) if lookups else None
+    out["ttl_seconds"] = ttl_seconds()
+    return out
+
+
+# ─── Invalidation hook ───────────────────────────────────────────────
+
+
+def _after_flush(session: Session, flush_context) -> None:
+    for obj in session.dirty:
+        if isinstance(obj, User) and session.is_modified(obj, include_collections=False):
+            invalidate_user(obj.id)
+    for obj in session.deleted:
+        if isinstance(obj, User):
+            invalidate_user(obj.id)
+
+
+def install() -> None:
+    """Register the User-change listener on every ORM Session.  Idempotent."""
+    if not event.contains(Session, "after_flush", _after_flush):
+        event.listen(Session, "after_flush", _after_flush)
@@ -11,15 +11,20 @@ from __future__ import annotations
 
 import logging
 from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Optional
 
-from sqlalchemy import select
+from sqlalchemy import func, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.device import Device
 from app.models.line import Line
 from app.models.provisioning_queue import ProvisioningQueueItem
+from app.models.provisioning_scan_state import ProvisioningScanState
 from app.models.sim import Sim
 from app.models.site import Site
+from app.services.site_matcher import SiteMatcher
 
 logger = logging.getLogger("true911.provisioning")
 
@@ -28,140 +33,226 @@ _SIM_SKIP_STATUSES = {"terminated", "deactivated", "error"}
 _DEVICE_SKIP_STATUSES = {"decommissioned"}
 _LINE_SKIP_STATUSES = {"disconnected"}
 
+_OPEN_STATUSES = ("new", "suggested", "needs_review")
+_SCAN_CHUNK = 500
+_GLOBAL_SCOPE = "*"
+
+# Every column a scan writes, so each chunk is one homogeneous executemany.
+_ITEM_DEFAULTS: dict[str, Any] = {
+    "external_ref": None, "source_provider": None, "current_site_id": None,
+    "current_device_id": None, "suggested_tenant_id": None, "suggested_site_id": None,
+    "suggested_site_name": None, "suggestion_confidence": None, "suggestion_reason": None,
+    "missing_customer": False, "missing_site": True, "missing_e911": True,
+    "status": "new", "meta": None,
+}
+
+
+class _Sites:
+    """Per-tenant sites and their :class:`SiteMatcher`, loaded on demand —
+    only for tenants that actually have unlinked infrastructure."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.by_tenant: dict[str, list[Site]] = {}
+        self.matchers: dict[str, SiteMatcher] = {}
+
+    async def load(self, tenant_ids: set[str]) -> None:
+        missing = {t for t in tenant_ids if t not in self.by_tenant}
+        if not missing:
+            return
+        rows = await self.db.execute(select(Site).where(Site.tenant_id.in_(missing)))
+        for t in missing:
+            self.by_tenant[t] = []
+        for site in rows.scalars().all():
+            self.by_tenant[site.tenant_id].append(site)
+
+    def suggest(self, tenant_id: str, carrier_label: Optional[str]) -> dict:
+        sites = self.by_tenant.get(tenant_id, [])
+        matcher = self.matchers.get(tenant_id)
+        if matcher is None:
+            matcher = self.matchers[tenant_id] = SiteMatcher(sites)
+        return _suggest(carrier_label, sites, matcher)
+
+
+async def _chunks(db: AsyncSession, stmt, model) -> AsyncIterator[list]:
+    """Stream *stmt*'s rows in id order, ``_SCAN_CHUNK`` at a time (keyset)."""
+    last_id = 0
+    while True:
+        rows = (await db.execute(
+            stmt.where(model.id > last_id).order_by(model.id).limit(_SCAN_CHUNK)
+        )).scalars().all()
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1].id
+        if len(rows) < _SCAN_CHUNK:
+            return
+
+
+async def _open_item_ids(db: AsyncSession, item_type: str, ids: list[int],
+                         tenant_id: Optional[str]) -> set[int]:
+    """Which of *ids* already have an open queue item."""
+    q = select(ProvisioningQueueItem.item_id).where(
+        ProvisioningQueueItem.item_type == item_type,
+        ProvisioningQueueItem.item_id.in_(ids),
+        ProvisioningQueueItem.status.in_(_OPEN_STATUSES),
+    )
+    if tenant_id is not None:
+        q = q.where(ProvisioningQueueItem.tenant_id == tenant_id)
+    return set((await db.execute(q)).scalars().all())
+
+
+async def _scan(db: AsyncSession, item_type: str, stmt, model, sites: _Sites,
+                tenant_id: Optional[str], build) -> tuple[int, int]:
+    """Stream one kind of unlinked row; per chunk: one open-items lookup,
+    at most one sites load, one bulk INSERT.  Returns (created, skipped)."""
+    created = skipped = 0
+    async for chunk in _chunks(db, stmt, model):
+        open_ids = await _open_item_ids(db, item_type, [r.id for r in chunk], tenant_id)
+        await sites.load({r.tenant_id for r in chunk})
+        rows = []
+        for record in chunk:
+            if record.id in open_ids:
+                skipped += 1
+                continue
+            item = build(record, sites)
+            if item is None:
+                skipped += 1
+                continue
+            rows.append({**_ITEM_DEFAULTS, "item_type": item_type, "item_id": record.id, **item})
+        if rows:
+            await db.execute(insert(ProvisioningQueueItem), rows)
+            created += len(rows)
+    return created, skipped
+
+
+def _sim_item(sim: Sim, sites: _Sites) -> Optional[dict]:
+    # Also skip if activation_status indicates dead
+    act = (sim.activation_status or "").lower()
+    if act in ("deactivated", "deactive", "terminated"):
+        return None
+    # Show MSISDN as primary ref, fall back to ICCID; carrier label in meta
+    meta = {"iccid": sim.iccid}
+    if sim.carrier_label:
+        meta = {"carrier_label": sim.carrier_label, "iccid": sim.iccid}
+    return {
+        "tenant_id": sim.tenant_id,
+        "external_ref": sim.msisdn or sim.iccid,
+        "source_provider": sim.carrier if sim.data_source == "carrier_sync" else "manual",
+        "current_site_id": sim.site_id,
+        "current_device_id": sim.device_id,
+        "missing_customer": not bool(sim.tenant_id),
+        "meta": meta,
+        **sites.suggest(sim.tenant_id, sim.carrier_label),
+    }
+
+
+def _device_item(dev: Device, sites: _Sites) -> dict:
+    return {
+        "tenant_id": dev.tenant_id,
+        "external_ref": dev.device_id,
+        "source_provider": dev.carrier or "manual",
+        "current_site_id": dev.site_id,
+        **sites.suggest(dev.tenant_id, None),
+    }
+
+
+def _line_item(line: Line, sites: _Sites) -> dict:
+    return {
+        "tenant_id": line.tenant_id,
+        "external_ref": line.did or line.line_id,
+        "source_provider": line.provider or "manual",
+        "current_site_id": line.site_id,
+        "current_device_id": line.device_id,
+        **sites.suggest(line.tenant_id, None),
+    }
+
+
+def _upsert(db: AsyncSession):
+    return sqlite_insert if db.get_bind().dialect.name == "sqlite" else pg_insert
+
 
 async def scan_and_enqueue(
     db: AsyncSession,
     tenant_id: str | None,
     initiated_by: str,
     is_superadmin: bool = False,
+    *,
+    incremental: bool = False,
 ) -> dict:
-    created = 0
-    skipped = 0
+    """Queue every unlinked SIM, device and line (tenant-scoped unless
+    superadmin) that has no open queue item.
 
-    # Load existing queue keys to avoid duplicates
-    eq = select(ProvisioningQueueItem.item_type, ProvisioningQueueItem.item_id).where(
-        ProvisioningQueueItem.status.in_(["new", "suggested", "needs_review"]),
-    )
-    if not is_superadmin:
-        eq = eq.where(ProvisioningQueueItem.tenant_id == tenant_id)
-    existing_q = await db.execute(eq)
-    existing_keys = {(r[0], r[1]) for r in existing_q.all()}
-
-    # Load ALL sites (grouped by tenant for suggestion matching)
-    sq = select(Site)
-    if not is_superadmin:
-        sq = sq.where(Site.tenant_id == tenant_id)
-    site_result = await db.execute(sq)
-    all_sites = site_result.scalars().all()
-    sites_by_tenant: dict[str, list[Site]] = {}
-    for s in all_sites:
-        sites_by_tenant.setdefault(s.tenant_id, []).append(s)
+    Rows are streamed in chunks of ``_SCAN_CHUNK`` and each chunk's items
+    are written with one multi-row INSERT; sites are loaded, and their
+    matcher compiled, only for tenants that turn up.  ``incremental=True``
+    limits the scan to rows updated since the last completed scan of the
+    same scope (``provisioning_scan_state``); without a watermark it scans
+    everything."""
+    started_at = datetime.now(timezone.utc)
+    scope = _GLOBAL_SCOPE if is_superadmin else tenant_id
+    scoped_tenant = None if is_superadmin else tenant_id
+    since = None
+    if incremental:
+        since = (await db.execute(
+            select(ProvisioningScanState.last_scanned_at).where(ProvisioningScanState.scope == scope)
+        )).scalar_one_or_none()
 
-    # ── Unlinked SIMs (active + suspended only) ──────────────────
-    sim_q = select(Sim).where(
-        Sim.site_id.is_(None),
-        Sim.status.notin_(list(_SIM_SKIP_STATUSES)),
-    )
-    if not is_superadmin:
-        sim_q = sim_q.where(Sim.tenant_id == tenant_id)
-    sim_result = await db.execute(sim_q)
-    for sim in sim_result.scalars().all():
-        if ("sim", sim.id) in existing_keys:
-            skipped += 1
-            continue
-        # Also skip if activation_status indicates dead
-        act = (sim.activation_status or "").lower()
-        if act in ("deactivated", "deactive", "terminated"):
-            skipped += 1
-            continue
-
-        tenant_sites = sites_by_tenant.get(sim.tenant_id, [])
-        suggestion = _suggest(sim.carrier_label, tenant_sites)
-        # Show MSISDN as primary ref, fall back to ICCID
-        ref = sim.msisdn or sim.iccid
-        item = ProvisioningQueueItem(
-            tenant_id=sim.tenant_id,
-            item_type="sim",
-            item_id=sim.id,
-            external_ref=ref,
-            source_provider=sim.carrier if sim.data_source == "carrier_sync" else "manual",
-            current_site_id=sim.site_id,
-            current_device_id=sim.device_id,
-            missing_customer=not bool(sim.tenant_id),
-            **suggestion,
-        )
-        # Store carrier label in meta for display
-        if sim.carrier_label:
-            item.meta = {"carrier_label": sim.carrier_label, "iccid": sim.iccid}
-        else:
-            item.meta = {"iccid": sim.iccid}
-        db.add(item)
-        created += 1
+    def scoped(stmt, model):
+        if scoped_tenant is not None:
+            stmt = stmt.where(model.tenant_id == scoped_tenant)
+        if since is not None:
+            stmt = stmt.where(model.updated_at >= since)
+        return stmt
 
-    # ── Unlinked Devices ─────────────────────────────────────────
-    dev_q = select(Device).where(
-        Device.site_id.is_(None),
-        Device.status.notin_(list(_DEVICE_SKIP_STATUSES)),
-    )
-    if not is_superadmin:
-        dev_q = dev_q.where(Device.tenant_id == tenant_id)
-    dev_result = await db.execute(dev_q)
-    for dev in dev_result.scalars().all():
-        if ("device", dev.id) in existing_keys:
-            skipped += 1
-            continue
-        tenant_sites = sites_by_tenant.get(dev.tenant_id, [])
-        suggestion = _suggest(None, tenant_sites)
-        item = ProvisioningQueueItem(
-            tenant_id=dev.tenant_id,
-            item_type="device",
-            item_id=dev.id,
-            external_ref=dev.device_id,
-            source_provider=dev.carrier or "manual",
-            current_site_id=dev.site_id,
-            **suggestion,
-        )
-        db.add(item)
-        created += 1
+    sites = _Sites(db)
+    created = skipped = 0
 
+    # ── Unlinked SIMs (active + suspended only) ──────────────────
+    sim_q = scoped(select(Sim).where(
+        Sim.site_id.is_(None), Sim.status.notin_(list(_SIM_SKIP_STATUSES)),
+    ), Sim)
+    # ── Unlinked Devices ─────────────────────────────────────────
+    dev_q = scoped(select(Device).where(
+        Device.site_id.is_(None), Device.status.notin_(list(_DEVICE_SKIP_STATUSES)),
+    ), Device)
     # ── Unlinked Lines ───────────────────────────────────────────
-    line_q = select(Line).where(
-        Line.site_id.is_(None),
-        Line.status.notin_(list(_LINE_SKIP_STATUSES)),
-    )
-    if not is_superadmin:
-        line_q = line_q.where(Line.tenant_id == tenant_id)
-    line_result = await db.execute(line_q)
-    for line in line_result.scalars().all():
-        if ("line", line.id) in existing_keys:
-            skipped += 1
-            continue
-        tenant_sites = sites_by_tenant.get(line.tenant_id, [])
-        suggestion = _suggest(None, tenant_sites)
-        item = ProvisioningQueueItem(
-            tenant_id=line.tenant_id,
-            item_type="line",
-            item_id=line.id,
-            external_ref=line.did or line.line_id,
-            source_provider=line.provider or "manual",
-            current_site_id=line.site_id,
-            current_device_id=line.device_id,
-            **suggestion,
+    line_q = scoped(select(Line).where(
+        Line.site_id.is_(None), Line.status.notin_(list(_LINE_SKIP_STATUSES)),
+    ), Line)
+
+    for item_type, stmt, model, build in (
+        ("sim", sim_q, Sim, _sim_item),
+        ("device", dev_q, Device, _device_item),
+        ("line", line_q, Line, _line_item),
+    ):
+        c, s = await _scan(db, item_type, stmt, model, sites, scoped_tenant, build)
+        created += c
+        skipped += s
+
+    if scope is not None:
+        stmt = _upsert(db)(ProvisioningScanState.__table__).values(
+            scope=scope, last_scanned_at=started_at,
         )
-        db.add(item)
-        created += 1
+        await db.execute(stmt.on_conflict_do_update(
+            index_elements=["scope"],
+            set_={"last_scanned_at": stmt.excluded.last_scanned_at, "updated_at": func.now()},
+        ))
 
     await db.commit()
-    logger.info("Provisioning scan: created=%d skipped=%d by=%s", created, skipped, initiated_by)
-    return {"created": created, "skipped": skipped}
+    logger.info("Provisioning scan: created=%d skipped=%d incremental=%s by=%s",
+                created, skipped, since is not None, initiated_by)
+    return {"created": created, "skipped": skipped, "incremental": since is not None}
 
 
-def _suggest(carrier_label: str | None, sites: list[Site]) -> dict:
+def _suggest(carrier_label: str | None, sites: list[Site],
+             matcher: Optional[SiteMatcher] = None) -> dict:
     """Generate suggestion fields based on carrier label and available sites.
 
     If the carrier label (from ThingSpace user-defined field) matches a site name,
     suggest that site.  Otherwise, only suggest if there's exactly one site.
-    Multiple sites with no label match → needs_review.
+    Multiple sites with no label match → needs_review.  ``matcher`` is the
+    precompiled :class:`SiteMatcher` for ``sites`` (built here if omitted).
     """
     flags = {"missing_site": True, "missing_e911": True}
 
@@ -169,26 +260,20 @@ def _suggest(carrier_label: str | None, sites: list[Site]) -> dict:
         return {**flags, "status": "needs_review", "suggestion_confidence": None,
                 "suggestion_reason": "No sites in account — create a site first"}
 
-    # Try to match carrier label to a site name (fuzzy)
-    if carrier_label:
-        label_lower = carrier_label.lower().strip()
-        for s in sites:
-            site_lower = (s.site_name or "").lower()
-            customer_lower = (s.customer_name or "").lower()
-            # Check if label contains site name or vice versa
-            if (label_lower in site_lower or site_lower in label_lower or
-                label_lower in customer_lower or customer_lower in label_lower):
-                has_e911 = bool(s.e911_street and s.e911_city)
-                return {
-                    **flags,
-                    "status": "suggested",
-                    "suggested_site_id": s.site_id,
-                    "suggested_site_name": s.site_name,
-                    "suggested_tenant_id": s.tenant_id,
-                    "suggestion_confidence": 0.85,
-                    "suggestion_reason": f'Carrier label "{carrier_label}" matches site',
-                    "missing_e911": not has_e911,
-                }
+    # Match the carrier label to a site / customer name (substring either way)
+    s = (matcher or SiteMatcher(sites)).match(carrier_label)
+    if s is not None:
+        has_e911 = bool(s.e911_street and s.e911_city)
+        return {
+            **flags,
+            "status": "suggested",
+            "suggested_site_id": s.site_id,
+            "suggested_site_name": s.site_name,
+            "suggested_tenant_id": s.tenant_id,
+            "suggestion_confidence": 0.85,
+            "suggestion_reason": f'Carrier label "{carrier_label}" matches site',
+            "missing_e911": not has_e911,
+        }
 
     if len(sites) == 1:
         s = sites[0]
@@ -1,14 +1,31 @@
 """Reconciliation engine — compares deployed lines vs billed lines vs active subscriptions.
 
 Produces a ReconciliationSnapshot with detailed mismatches for admin review.
+
+Everything is computed with aggregate queries — per-subscription deployed
+counts come from one ``GROUP BY``, the org-wide line totals from one row of
+filtered ``COUNT``s — so memory follows the number of subscriptions, never
+the number of lines.  Only lines that are themselves a mismatch (deployed
+on an inactive subscription) are read individually.
+
+Two modes (job payload ``mode``):
+
+  * ``full`` (default) — recompute every subscription.
+  * ``diff`` — start from the previous snapshot's per-subscription state and
+    recompute only subscriptions changed since it (their own ``updated_at``,
+    or a line on them updated).  A line that leaves an unchanged
+    subscription leaves no trace on that subscription, so the result is
+    checked against the org-wide linked-line count; any disagreement (or no
+    usable previous snapshot) falls back to a full run.
 """
 
 from __future__ import annotations
 
 import logging
-from typing import Any
+from datetime import timedelta
+from typing import Any, Optional
 
-from sqlalchemy import func, select
+from sqlalchemy import and_, desc, func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.customer import Customer
@@ -25,6 +42,206 @@ _DEPLOYED_LINE_STATUSES = {"active", "provisioning"}
 # Statuses that count as "active" for subscriptions
 _ACTIVE_SUB_STATUSES = {"active", "trialing"}
 
+# Diff mode looks back this far before the previous snapshot, so a change
+# committed while that snapshot was being computed is not missed.
+_DIFF_OVERLAP = timedelta(minutes=5)
+
+
+def _is_deployed():
+    return Line.status.in_(_DEPLOYED_LINE_STATUSES)
+
+
+# ── Aggregate reads ──────────────────────────────────────────────
+
+
+async def _subscription_state(
+    db: AsyncSession, org_id: str, only: Optional[set[int]] = None,
+) -> dict[int, dict]:
+    """Per-subscription billed / deployed state, one row per subscription
+    (deployed lines counted in SQL)."""
+    deployed = (
+        select(Line.subscription_id, func.count().label("n"))
+        .where(Line.tenant_id == org_id, _is_deployed(), Line.subscription_id.isnot(None))
+        .group_by(Line.subscription_id)
+    )
+    if only is not None:
+        deployed = deployed.where(Line.subscription_id.in_(only))
+    deployed = deployed.subquery()
+
+    q = (
+        select(
+            Subscription.id, Subscription.customer_id, Subscription.plan_name,
+            Subscription.status, Subscription.qty_lines, Customer.name.label("customer"),
+            func.coalesce(deployed.c.n, 0).label("deployed"),
+        )
+        .outerjoin(Customer, and_(Customer.id == Subscription.customer_id, Customer.tenant_id == org_id))
+        .outerjoin(deployed, deployed.c.subscription_id == Subscription.id)
+        .where(Subscription.tenant_id == org_id)
+        .order_by(Subscription.id)
+    )
+    if only is not None:
+        q = q.where(Subscription.id.in_(only))
+    return {
+        r.id: {
+            "customer_id": r.customer_id,
+            "customer": r.customer or "Unknown",
+            "plan": r.plan_name,
+            "status": r.status,
+            "billed": r.qty_lines or 0,
+            "deployed": r.deployed,
+        }
+        for r in (await db.execute(q)).all()
+    }
+
+
+async def _line_totals(db: AsyncSession, org_id: str):
+    """Org-wide line counts in one row."""
+    return (await db.execute(
+        select(
+            func.count().filter(_is_deployed()).label("deployed"),
+            func.count().filter(_is_deployed(), Line.subscription_id.is_(None)).label("unlinked"),
+            func.count().filter(Line.device_id.isnot(None), Line.device_id != "").label("with_device"),
+        ).where(Line.tenant_id == org_id)
+    )).one()
+
+
+async def _lines_on_inactive_subs(
+    db: AsyncSession, org_id: str, only: Optional[set[int]] = None,
+) -> list[tuple[int, str]]:
+    """(subscription_id, line_id) of deployed lines whose subscription is not active."""
+    q = (
+        select(Line.subscription_id, Line.line_id)
+        .join(Subscription, Subscription.id == Line.subscription_id)
+        .where(
+            Line.tenant_id == org_id, _is_deployed(),
+            Subscription.tenant_id == org_id,
+            Subscription.status.not_in(_ACTIVE_SUB_STATUSES),
+        )
+        .order_by(Line.id)
+    )
+    if only is not None:
+        q = q.where(Line.subscription_id.in_(only))
+    return [(r.subscription_id, r.line_id) for r in (await db.execute(q)).all()]
+
+
+async def _changed_subscriptions(db: AsyncSession, org_id: str, since) -> set[int]:
+    q = select(Subscription.id).where(
+        Subscription.tenant_id == org_id,
+        or_(
+            Subscription.updated_at >= since,
+            Subscription.id.in_(
+                select(Line.subscription_id).where(
+                    Line.tenant_id == org_id, Line.updated_at >= since,
+                    Line.subscription_id.isnot(None),
+                )
+            ),
+        ),
+    )
+    return set((await db.execute(q)).scalars().all())
+
+
+# ── Mismatches ───────────────────────────────────────────────────
+
+
+def _subscription_mismatches(sub_id: int, s: dict) -> list[dict]:
+    billed, deployed = s["billed"], s["deployed"]
+    if s["status"] not in _ACTIVE_SUB_STATUSES:
+        return []
+    base = {
+        "customer": s["customer"],
+        "customer_id": s["customer_id"],
+        "subscription_id": sub_id,
+        "plan": s["plan"],
+        "billed": billed,
+    }
+    out = []
+    if billed > deployed:
+        out.append({
+            "type": "billed_gt_deployed", **base, "deployed": deployed, "delta": billed - deployed,
+            "message": f"Billed {billed} lines but only {deployed} deployed",
+        })
+    elif deployed > billed:
+        out.append({
+            "type": "deployed_gt_billed", **base, "deployed": deployed, "delta": deployed - billed,
+            "message": f"Deployed {deployed} lines but only billing for {billed}",
+        })
+    if deployed == 0 and billed > 0:
+        out.append({
+            "type": "active_sub_no_lines", **base, "deployed": 0,
+            "message": f"Active subscription ({s['plan']}) with {billed} billed lines but none deployed",
+        })
+    return out
+
+
+def _line_mismatch(sub_id: int, s: dict, line_id: str) -> dict:
+    return {
+        "type": "line_active_no_sub",
+        "customer": s["customer"],
+        "customer_id": s["customer_id"],
+        "subscription_id": sub_id,
+        "line_id": line_id,
+        "message": f"Line {line_id} is active but subscription is '{s['status']}'",
+    }
+
+
+def _customer_rollup(subs: dict[int, dict]) -> list[dict]:
+    by_customer: dict[Any, dict] = {}
+    for s in subs.values():
+        c = by_customer.setdefault(s["customer_id"], {
+            "customer_id": s["customer_id"], "customer": s["customer"],
+            "subscriptions": 0, "active_subscriptions": 0, "billed": 0, "deployed": 0,
+        })
+        c["subscriptions"] += 1
+        c["deployed"] += s["deployed"]
+        if s["status"] in _ACTIVE_SUB_STATUSES:
+            c["active_subscriptions"] += 1
+            c["billed"] += s["billed"]
+    return sorted(by_customer.values(), key=lambda c: c["customer_id"])
+
+
+# ── Diff mode ────────────────────────────────────────────────────
+
+
+async def _diff_state(
+    db: AsyncSession, org_id: str, prev: ReconciliationSnapshot,
+) -> Optional[tuple[dict[int, dict], list[tuple[int, str]], int]]:
+    """Previous state with the changed subscriptions recomputed, or ``None``
+    when it cannot be trusted (caller then runs in full)."""
+    prev_subs = (prev.results_json or {}).get("subscriptions")
+    if prev_subs is None or prev.created_at is None:
+        return None
+    changed = await _changed_subscriptions(db, org_id, prev.created_at - _DIFF_OVERLAP)
+    current_ids = set((await db.execute(
+        select(Subscription.id).where(Subscription.tenant_id == org_id)
+    )).scalars().all())
+
+    subs = {int(k): v for k, v in prev_subs.items() if int(k) in current_ids and int(k) not in changed}
+    if current_ids - changed - set(subs):
+        return None                         # a subscription the snapshot never saw
+    fresh = await _subscription_state(db, org_id, changed) if changed else {}
+    subs.update(fresh)
+
+    linked = await db.scalar(
+        select(func.count()).select_from(Line)
+        .join(Subscription, Subscription.id == Line.subscription_id)
+        .where(Line.tenant_id == org_id, _is_deployed(), Subscription.tenant_id == org_id)
+    ) or 0
+    if linked != sum(s["deployed"] for s in subs.values()):
+        return None                         # lines moved off an unchanged subscription
+
+    inactive = [
+        (m["subscription_id"], m["line_id"])
+        for m in (prev.results_json or {}).get("mismatches", [])
+        if m["type"] == "line_active_no_sub" and m["subscription_id"] in subs
+        and m["subscription_id"] not in changed
+    ]
+    if changed:
+        inactive += await _lines_on_inactive_subs(db, org_id, changed)
+    return subs, inactive, len(changed)
+
+
+# ── Entry point ──────────────────────────────────────────────────
+
 
 async def run_reconciliation(db: AsyncSession, job: Job) -> dict[str, Any]:
     """Execute reconciliation and persist snapshot.
@@ -35,157 +252,97 @@ async def run_reconciliation(db: AsyncSession, job: Job) -> dict[str, Any]:
     org_id = payload.get("org_id")
     if not org_id:
         return {"error": "Missing org_id"}
+    mode = payload.get("mode") or "full"
 
-    logger.info("Running reconciliation for org %s", org_id)
+    logger.info("Running %s reconciliation for org %s", mode, org_id)
 
     # ── Gather data ──────────────────────────────────────────────
 
-    # All customers
-    customers = (await db.execute(
-        select(Customer).where(Customer.tenant_id == org_id)
-    )).scalars().all()
+    diff = None
+    if mode == "diff":
+        prev = (await db.execute(
+            select(ReconciliationSnapshot)
+            .where(ReconciliationSnapshot.org_id == org_id)
+            .order_by(desc(ReconciliationSnapshot.created_at), desc(ReconciliationSnapshot.id))
+            .limit(1)
+        )).scalar_one_or_none()
+        diff = await _diff_state(db, org_id, prev) if prev else None
+        if diff is None:
+            logger.info("Reconciliation diff for %s not possible; running in full", org_id)
 
-    # All subscriptions
-    subscriptions = (await db.execute(
-        select(Subscription).where(Subscription.tenant_id == org_id)
-    )).scalars().all()
+    if diff is not None:
+        subs, inactive, recomputed = diff
+        mode = "diff"
+    else:
+        subs = await _subscription_state(db, org_id)
+        inactive = await _lines_on_inactive_subs(db, org_id)
+        recomputed = len(subs)
+        mode = "full"
 
-    # Deployed line counts per subscription
-    deployed_by_sub = {}
-    deployed_no_sub = 0
-
-    lines = (await db.execute(
-        select(Line).where(
-            Line.tenant_id == org_id,
-            Line.status.in_(_DEPLOYED_LINE_STATUSES),
-        )
-    )).scalars().all()
-
-    for line in lines:
-        if line.subscription_id:
-            deployed_by_sub.setdefault(line.subscription_id, 0)
-            deployed_by_sub[line.subscription_id] += 1
-        else:
-            deployed_no_sub += 1
-
-    # Also count lines that have a device_id as deployed
-    # (even if status isn't explicitly in the set, having a device implies deployment)
-    lines_with_device = (await db.execute(
-        select(Line).where(
-            Line.tenant_id == org_id,
-            Line.device_id.isnot(None),
-            Line.device_id != "",
-        )
-    )).scalars().all()
-    total_deployed_by_device = len(lines_with_device)
+    total_customers = await db.scalar(
+        select(func.count()).select_from(Customer).where(Customer.tenant_id == org_id)
+    ) or 0
+    totals = await _line_totals(db, org_id)
 
     # ── Compute mismatches ───────────────────────────────────────
 
     mismatches = []
-    sub_map = {s.id: s for s in subscriptions}
-    cust_map = {c.id: c for c in customers}
-
-    for sub in subscriptions:
-        deployed = deployed_by_sub.get(sub.id, 0)
-        billed = sub.qty_lines
-        is_active = sub.status in _ACTIVE_SUB_STATUSES
-        customer_name = cust_map.get(sub.customer_id, None)
-        cust_name = customer_name.name if customer_name else "Unknown"
-
-        if is_active and billed > deployed:
-            mismatches.append({
-                "type": "billed_gt_deployed",
-                "customer": cust_name,
-                "customer_id": sub.customer_id,
-                "subscription_id": sub.id,
-                "plan": sub.plan_name,
-                "billed": billed,
-                "deployed": deployed,
-                "delta": billed - deployed,
-                "message": f"Billed {billed} lines but only {deployed} deployed",
-            })
-        elif is_active and deployed > billed:
-            mismatches.append({
-                "type": "deployed_gt_billed",
-                "customer": cust_name,
-                "customer_id": sub.customer_id,
-                "subscription_id": sub.id,
-                "plan": sub.plan_name,
-                "billed": billed,
-                "deployed": deployed,
-                "delta": deployed - billed,
-                "message": f"Deployed {deployed} lines but only billing for {billed}",
-            })
-
-        if is_active and deployed == 0 and billed > 0:
-            mismatches.append({
-                "type": "active_sub_no_lines",
-                "customer": cust_name,
-                "customer_id": sub.customer_id,
-                "subscription_id": sub.id,
-                "plan": sub.plan_name,
-                "billed": billed,
-                "deployed": 0,
-                "message": f"Active subscription ({sub.plan_name}) with {billed} billed lines but none deployed",
-            })
+    for sub_id in sorted(subs):
+        mismatches.extend(_subscription_mismatches(sub_id, subs[sub_id]))
 
     # Lines active but no active subscription
-    for line in lines:
-        if line.subscription_id and line.subscription_id in sub_map:
-            sub = sub_map[line.subscription_id]
-            if sub.status not in _ACTIVE_SUB_STATUSES:
-                cust_name = cust_map.get(sub.customer_id, None)
-                mismatches.append({
-                    "type": "line_active_no_sub",
-                    "customer": cust_name.name if cust_name else "Unknown",
-                    "customer_id": sub.customer_id,
-                    "subscription_id": sub.id,
-                    "line_id": line.line_id,
-                    "message": f"Line {line.line_id} is active but subscription is '{sub.status}'",
-                })
+    for sub_id, line_id in inactive:
+        mismatches.append(_line_mismatch(sub_id, subs[sub_id], line_id))
 
     # Unlinked deployed lines (no subscription at all)
-    if deployed_no_sub > 0:
+    if totals.unlinked > 0:
         mismatches.append({
             "type": "unlinked_deployed_lines",
-            "count": deployed_no_sub,
-            "message": f"{deployed_no_sub} deployed lines have no subscription linked",
+            "count": totals.unlinked,
+            "message": f"{totals.unlinked} deployed lines have no subscription linked",
         })
 
     # ── Persist snapshot ─────────────────────────────────────────
 
-    total_billed = sum(s.qty_lines for s in subscriptions if s.status in _ACTIVE_SUB_STATUSES)
-    total_deployed = sum(1 for l in lines if l.status in _DEPLOYED_LINE_STATUSES)
+    total_billed = sum(s["billed"] for s in subs.values() if s["status"] in _ACTIVE_SUB_STATUSES)
+    total_deployed = totals.deployed
 
     snapshot = ReconciliationSnapshot(
         org_id=org_id,
-        total_customers=len(customers),
-        total_subscriptions=len(subscriptions),
+        total_customers=total_customers,
+        total_subscriptions=len(subs),
         total_billed_lines=total_billed,
         total_deployed_lines=total_deployed,
         mismatches_count=len(mismatches),
         results_json={
             "mismatches": mismatches,
             "summary": {
-                "total_customers": len(customers),
-                "active_subscriptions": sum(1 for s in subscriptions if s.status in _ACTIVE_SUB_STATUSES),
+                "total_customers": total_customers,
+                "active_subscriptions": sum(1 for s in subs.values() if s["status"] in _ACTIVE_SUB_STATUSES),
                 "total_billed_lines": total_billed,
                 "total_deployed_lines": total_deployed,
-                "deployed_with_device": total_deployed_by_device,
-                "unlinked_deployed": deployed_no_sub,
+                "deployed_with_device": totals.with_device,
+                "unlinked_deployed": totals.unlinked,
+                "mode": mode,
+                "recomputed_subscriptions": recomputed,
             },
+            "customers": _customer_rollup(subs),
+            # Per-subscription state — the starting point of the next diff run.
+            "subscriptions": {str(k): v for k, v in subs.items()},
         },
     )
     db.add(snapshot)
     await db.flush()
 
     logger.info(
-        "Reconciliation complete for %s: %d customers, %d subs, %d billed, %d deployed, %d mismatches",
-        org_id, len(customers), len(subscriptions), total_billed, total_deployed, len(mismatches),
+        "Reconciliation (%s) complete for %s: %d customers, %d subs (%d recomputed), "
+        "%d billed, %d deployed, %d mismatches",
+        mode, org_id, total_customers, len(subs), recomputed, total_billed, total_deployed, len(mismatches),
     )
 
     return {
         "snapshot_id": snapshot.id,
+        "mode": mode,
         "mismatches_count": len(mismatches),
         "total_billed": total_billed,
         "total_deployed": total_deployed,
@@ -48,7 +48,7 @@ from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Any, Optional
 
-from sqlalchemy import select
+from sqlalchemy import or_, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -141,27 +141,48 @@ def _slugify(label: str) -> str:
     return s or "LOC"
 
 
-async def _next_available_site_id(db: AsyncSession, base: str) -> str:
-    """Find the first non-colliding site_id of the form ``base[-N]``.
+_MAX_SITE_SUFFIX = 9999  # pathological guard
 
-    The unique index on sites.site_id is the source of truth — this
-    helper just probes it.  The race window between probe and INSERT
-    is covered by the IntegrityError path in the conversion loop.
+
+async def _taken_site_ids(db: AsyncSession, bases: set[str]) -> set[str]:
+    """Every existing site_id equal to one of *bases* or of the form
+    ``base-…`` — one query for the whole registration.
+
+    Slugs are ``[A-Z0-9-]`` only, so they need no LIKE escaping.  The
+    result may include ids that merely share a prefix; the allocator
+    only tests membership, so extras are harmless.
+    """
+    if not bases:
+        return set()
+    clauses = []
+    for base in sorted(bases):
+        clauses.append(Site.site_id == base)
+        clauses.append(Site.site_id.like(f"{base}-%"))
+    rows = await db.execute(select(Site.site_id).where(or_(*clauses)))
+    return set(rows.scalars().all())
+
+
+def _allocate_site_id(base: str, taken: set[str]) -> str:
+    """First free id of the form ``base[-N]``; claims it in *taken*.
+
+    The unique index on sites.site_id is the source of truth — *taken*
+    is a snapshot of it plus the ids handed out earlier in this
+    conversion.  The race window between snapshot and INSERT is covered
+    by the IntegrityError path in :func:`_materialize_sites`.
     """
     candidate = base
     n = 2
-    while True:
-        existing = await db.execute(select(Site.id).where(Site.site_id == candidate))
-        if existing.scalar_one_or_none() is None:
-            return candidate
-        candidate = f"{base}-{n}"
-        n += 1
-        if n > 9999:  # pathological guard
+    while candidate in taken:
+        if n > _MAX_SITE_SUFFIX:
             raise ConversionError(
                 stage="create_site",
                 message=f"could not find a free site_id starting with '{base}'",
                 next_steps="Edit the location label and retry.",
             )
+        candidate = f"{base}-{n}"
+        n += 1
+    taken.add(candidate)
+    return candidate
 
 
 def _unit_id(site_id: str, sequence: int) -> str:
@@ -487,10 +508,24 @@ async def _materialize_sites(
             next_steps="Edit the registration to add at least one location.",
         )
 
+    # Already-materialised locations: one IN lookup for their sites.
+    stamped_ids = [loc.materialized_site_id for loc in locations if loc.materialized_site_id]
+    existing_sites: dict[int, Site] = {}
+    if stamped_ids:
+        rows = await db.execute(select(Site).where(Site.id.in_(stamped_ids)))
+        existing_sites = {site.id: site for site in rows.scalars().all()}
+
+    # New locations: one query for every existing id sharing a slug
+    # prefix, then suffixes are allocated in memory for the whole
+    # registration (so two "Lobby" locations get LOBBY and LOBBY-2).
+    fresh = [loc for loc in locations if not loc.materialized_site_id]
+    taken = await _taken_site_ids(db, {_slugify(loc.location_label) for loc in fresh})
+
     out: list[_ConvertedSite] = []
+    created: list[tuple[RegistrationLocation, Site, _ConvertedSite]] = []
     for loc in locations:
         if loc.materialized_site_id:
-            site = await db.get(Site, loc.materialized_site_id)
+            site = existing_sites.get(loc.materialized_site_id)
             if not site:
                 raise ConversionError(
                     stage="create_site",
@@ -513,8 +548,7 @@ async def _materialize_sites(
             ))
             continue
 
-        base = _slugify(loc.location_label)
-        site_id = await _next_available_site_id(db, base)
+        site_id = _allocate_site_id(_slugify(loc.location_label), taken)
         site = Site(
             site_id=site_id,
             tenant_id=tenant.tenant_id,
@@ -530,29 +564,40 @@ async def _materialize_sites(
             onboarding_status="active",
         )
         db.add(site)
-        try:
-            await db.flush()
-        except IntegrityError as exc:
-            # Race lost to a parallel writer.  Re-probe and retry once.
-            await db.rollback()
-            raise ConversionError(
-                stage="create_site",
-                message=(
-                    f"site_id '{site_id}' collided during INSERT; another writer "
-                    f"may have taken it concurrently"
-                ),
-                details={"registration_location_id": loc.id, "site_id": site_id},
-                next_steps="Retry the conversion — the slug picker will skip the now-taken id.",
-            ) from exc
-
-        loc.materialized_site_id = site.id
-        out.append(_ConvertedSite(
-            id=site.id,
-            site_id=site.site_id,
+        converted = _ConvertedSite(
+            id=None,
+            site_id=site_id,
             location_label=loc.location_label,
             registration_location_id=loc.id,
             was_created=True,
-        ))
+        )
+        created.append((loc, site, converted))
+        out.append(converted)
+
+    if not created:
+        return out
+
+    # One flush inserts every new site (the ORM batches the INSERTs).
+    try:
+        await db.flush()
+    except IntegrityError as exc:
+        # Race lost to a parallel writer between the prefix snapshot and
+        # the INSERT.  Nothing is kept; a retry re-reads the taken ids.
+        await db.rollback()
+        site_ids = [c.site_id for _, _, c in created]
+        raise ConversionError(
+            stage="create_site",
+            message=(
+                "a site_id collided during INSERT; another writer may have "
+                "taken one concurrently"
+            ),
+            details={"site_ids": site_ids},
+            next_steps="Retry the conversion — the slug picker will skip the now-taken id.",
+        ) from exc
+
+    for loc, site, converted in created:
+        loc.materialized_site_id = site.id
+        converted.id = site.id
 
     return out
 
@@ -588,6 +633,14 @@ async def _materialize_service_units(
     }
     sequence_by_site: dict[str, int] = {}
 
+    # Already-materialised units: one IN lookup.
+    stamped_ids = [ru.materialized_service_unit_id for ru in reg_units
+                   if ru.materialized_service_unit_id]
+    existing_units: dict[int, ServiceUnit] = {}
+    if stamped_ids:
+        rows = await db.execute(select(ServiceUnit).where(ServiceUnit.id.in_(stamped_ids)))
+        existing_units = {unit.id: unit for unit in rows.scalars().all()}
+
     # Seed the per-site sequence from existing materialized units so a
     # retry-after-partial doesn't reuse the same NN suffix.
     for ru in reg_units:
@@ -596,7 +649,7 @@ async def _materialize_service_units(
         site = sites_by_loc_id.get(ru.registration_location_id)
         if site is None:
             continue
-        existing_unit = await db.get(ServiceUnit, ru.materialized_service_unit_id)
+        existing_unit = existing_units.get(ru.materialized_service_unit_id)
         if existing_unit:
             # Pull "NN" out of the unit_id suffix to anchor the next seq.
             match = re.match(r".*-U(\d{2,})$", existing_unit.unit_id or "")
@@ -607,6 +660,7 @@ async def _materialize_service_units(
                 )
 
     out: list[_ConvertedServiceUnit] = []
+    created: list[tuple[RegistrationServiceUnit, ServiceUnit, _ConvertedServiceUnit]] = []
     for ru in reg_units:
         site = sites_by_loc_id.get(ru.registration_location_id)
         if site is None:
@@ -624,7 +678,7 @@ async def _materialize_service_units(
             )
 
         if ru.materialized_service_unit_id:
-            existing_unit = await db.get(ServiceUnit, ru.materialized_service_unit_id)
+            existing_unit = existing_units.get(ru.materialized_service_unit_id)
             if not existing_unit:
                 raise ConversionError(
                     stage="create_service_unit",
@@ -660,26 +714,34 @@ async def _materialize_service_units(
             status="pending_install",
         )
         db.add(unit)
-        try:
-            await db.flush()
-        except IntegrityError as exc:
-            await db.rollback()
-            raise ConversionError(
-                stage="create_service_unit",
-                message=f"unit_id '{unit_id}' collided during INSERT",
-                details={"registration_service_unit_id": ru.id, "unit_id": unit_id},
-                next_steps="Retry the conversion — the sequence picker will skip the taken id.",
-            ) from exc
-
-        ru.materialized_service_unit_id = unit.id
-        out.append(_ConvertedServiceUnit(
-            id=unit.id,
-            unit_id=unit.unit_id,
+        converted = _ConvertedServiceUnit(
+            id=None,
+            unit_id=unit_id,
             unit_label=ru.unit_label,
             site_id=site.site_id,
             registration_service_unit_id=ru.id,
             was_created=True,
-        ))
+        )
+        created.append((ru, unit, converted))
+        out.append(converted)
+
+    if not created:
+        return out
+
+    try:
+        await db.flush()
+    except IntegrityError as exc:
+        await db.rollback()
+        raise ConversionError(
+            stage="create_service_unit",
+            message="a unit_id collided during INSERT",
+            details={"unit_ids": [c.unit_id for _, _, c in created]},
+            next_steps="Retry the conversion — the sequence picker will skip the taken id.",
+        ) from exc
+
+    for ru, unit, converted in created:
+        ru.materialized_service_unit_id = unit.id
+        converted.id = unit.id
 
     return out
 
@@ -0,0 +1,259 @@
+"""Per-request database instrumentation and per-route request metrics.
+
+``RequestVisibilityMiddleware`` opens a :class:`RequestStats` for each
+request (:func:`begin` / :func:`end`, a context variable — the async
+engine's greenlets inherit it).  Cursor events on the app engine
+(:func:`install`) add every statement the request runs to it:
+
+  * statement count and total time spent in the driver
+  * rows returned / affected, as reported by the driver's ``rowcount``
+    (asyncpg reports it for SELECTs too; other drivers may report -1 → 0)
+  * the slowest statement and its *fingerprint* — a short hash of the
+    statement shape (placeholders and IN-lists / VALUES rows collapsed), so
+    the same query with a different number of ids hashes the same.  The
+    shape behind a fingerprint is logged once per process on first sight
+    (``true911.sql``), so a request log line stays one short line.
+
+With ``SQL_REPEAT_WARN_THRESHOLD`` > 0 the request also counts statements
+per fingerprint and :meth:`RequestStats.repeated` reports the shapes run at
+least that many times — the signature of an N+1 loop.
+
+:func:`observe` folds a finished request into process-wide per-route
+histograms (duration, statements, DB time; route = the matched path
+template, so ids do not explode the label set) and
+:func:`render_prometheus` serves them, the named latency histograms of
+:mod:`app.services.latency` and the integration gateway counters in the
+Prometheus text format for ``GET /metrics``.  Like ``latency``, counts are
+per worker process and reset on restart.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar, Token
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.services.latency import DEFAULT_BUCKETS_MS, LatencyHistogram
+
+sql_logger = logging.getLogger("true911.sql")
+
+STATEMENT_BUCKETS: tuple[float, ...] = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250, 500)
+UNMATCHED_ROUTE = "<unmatched>"
+
+_current: ContextVar[Optional["RequestStats"]] = ContextVar("true911_request_stats", default=None)
+_T0 = "true911_request_metrics_t0"
+
+
+# ─── Statement fingerprints ─────────────────────────────────────────
+
+_PLACEHOLDER = re.compile(r"\$\d+(?:::[A-Z_ ]+(?:\(\d+(?:,\s*\d+)?\))?(?:\[\])?)?|%\(\w+\)s|\?")
+_LIST = re.compile(r"\(\?(?:, \?)*\)(?:, \(\?(?:, \?)*\))+")
+_IN_LIST = re.compile(r"\(\?(?:, \?)+\)")
+_SPACE = re.compile(r"\s+")
+
+_seen_lock = threading.Lock()
+_seen: set[str] = set()
+_SEEN_MAX = 5000
+
+
+def statement_shape(statement: str) -> str:
+    """*statement* with whitespace normalized, placeholders as ``?``, and
+    IN-lists / multi-row VALUES collapsed to one entry."""
+    shape = _SPACE.sub(" ", statement).strip()
+    shape = _PLACEHOLDER.sub("?", shape)
+    shape = _LIST.sub("(?), ...", shape)
+    return _IN_LIST.sub("(?, ...)", shape)
+
+
+def fingerprint(statement: str) -> str:
+    fp = hashlib.sha1(statement_shape(statement).encode()).hexdigest()[:12]
+    if fp not in _seen and len(_seen) < _SEEN_MAX:
+        with _seen_lock:
+            if fp not in _seen:
+                _seen.add(fp)
+                sql_logger.info("sql_fingerprint fp=%s sql=%s", fp, statement_shape(statement)[:500])
+    return fp
+
+
+# ─── Per-request stats ──────────────────────────────────────────────
+
+
+class RequestStats:
+    __slots__ = ("statements", "db_ms", "rows", "slowest_ms", "_slowest_sql", "shapes", "_track")
+
+    def __init__(self, *, track_shapes: bool = False):
+        self.statements = 0
+        self.db_ms = 0.0
+        self.rows = 0
+        self.slowest_ms = 0.0
+        self._slowest_sql: Optional[str] = None
+        self.shapes: Counter[str] = Counter()
+        self._track = track_shapes
+
+    def record(self, statement: str, ms: float, rows: int) -> None:
+        self.statements += 1
+        self.db_ms += ms
+        self.rows += max(rows, 0)
+        if ms >= self.slowest_ms:
+            self.slowest_ms, self._slowest_sql = ms, statement
+        if self._track:
+            self.shapes[fingerprint(statement)] += 1
+
+    @property
+    def slowest(self) -> Optional[str]:
+        """Fingerprint of the slowest statement (``None`` if none ran)."""
+        return fingerprint(self._slowest_sql) if self._slowest_sql is not None else None
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """``(fingerprint, count)`` for every shape run ≥ *threshold* times,
+        most frequent first."""
+        if threshold <= 0:
+            return []
+        return [(fp, n) for fp, n in self.shapes.most_common() if n >= threshold]
+
+
+def begin(*, track_shapes: bool = False) -> tuple[RequestStats, Token]:
+    stats = RequestStats(track_shapes=track_shapes)
+    return stats, _current.set(stats)
+
+
+def end(token: Token) -> None:
+    _current.reset(token)
+
+
+def current() -> Optional[RequestStats]:
+    return _current.get()
+
+
+# ─── Engine events ──────────────────────────────────────────────────
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault(_T0, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    starts = conn.info.get(_T0)
+    if stats is None or not starts:
+        return
+    ms = (time.perf_counter() - starts.pop()) * 1000
+    stats.record(statement, ms, getattr(cursor, "rowcount", -1) or 0)
+
+
+def _handle_error(exception_context):
+    starts = exception_context.connection.info.get(_T0) if exception_context.connection else None
+    if starts:
+        starts.pop()
+
+
+def install(engine: Engine) -> None:
+    """Register the cursor listeners on *engine* (a sync ``Engine`` — pass
+    ``async_engine.sync_engine``).  Idempotent."""
+    for name, fn in (("before_cursor_execute", _before_cursor_execute),
+                     ("after_cursor_execute", _after_cursor_execute),
+                     ("handle_error", _handle_error)):
+        if not event.contains(engine, name, fn):
+            event.listen(engine, name, fn)
+
+
+# ─── Per-route histograms ───────────────────────────────────────────
+
+
+class _RouteMetrics:
+    __slots__ = ("duration", "statements", "db")
+
+    def __init__(self, key: str):
+        self.duration = LatencyHistogram(f"{key}.duration_ms", DEFAULT_BUCKETS_MS)
+        self.statements = LatencyHistogram(f"{key}.sql_statements", STATEMENT_BUCKETS)
+        self.db = LatencyHistogram(f"{key}.db_ms", DEFAULT_BUCKETS_MS)
+
+
+_routes: dict[tuple[str, str], _RouteMetrics] = {}
+_routes_lock = threading.Lock()
+
+
+def route_label(scope: dict) -> str:
+    """The matched route's path template (``/api/sites/{site_id}``)."""
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+def observe(method: str, route: str, duration_ms: float, stats: Optional[RequestStats]) -> None:
+    key = (method, route)
+    m = _routes.get(key)
+    if m is None:
+        with _routes_lock:
+            m = _routes.setdefault(key, _RouteMetrics(f"{method} {route}"))
+    m.duration.observe(duration_ms)
+    if stats is not None:
+        m.statements.observe(stats.statements)
+        m.db.observe(stats.db_ms)
+
+
+def reset() -> None:
+    with _routes_lock:
+        _routes.clear()
+
+
+# ─── Prometheus text exposition ─────────────────────────────────────
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels: dict) -> str:
+    return ",".join(f'{k}="{_escape(str(v))}"' for k, v in labels.items())
+
+
+def _histogram(lines: list[str], metric: str, labels: dict, snap: dict) -> None:
+    base = _labels(labels)
+    sep = "," if base else ""
+    for b in snap["buckets"]:
+        lines.append(f'{metric}_bucket{{{base}{sep}le="{b["le"]}"}} {b["count"]}')
+    lines.append(f"{metric}_sum{{{base}}} {snap['sum_ms']}")
+    lines.append(f"{metric}_count{{{base}}} {snap['count']}")
+
+
+def render_prometheus() -> str:
+    from app.integrations import gateway
+    from app.services.latency import snapshot_all
+
+    lines: list[str] = []
+    routes = sorted(_routes.items())
+    for metric, attr, help_text in (
+        ("true911_http_request_duration_ms", "duration", "Request duration by route (ms)."),
+        ("true911_http_request_sql_statements", "statements", "SQL statements per request by route."),
+        ("true911_http_request_db_ms", "db", "Time spent in the database per request by route (ms)."),
+    ):
+        lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} histogram"]
+        for (method, route), m in routes:
+            _histogram(lines, metric, {"method": method, "route": route}, getattr(m, attr).snapshot())
+
+    lines += ["# HELP true911_latency_ms Named in-process latency histograms (ms).",
+              "# TYPE true911_latency_ms histogram"]
+    for snap in snapshot_all():
+        _histogram(lines, "true911_latency_ms", {"name": snap["name"]}, snap)
+
+    gateways = gateway.stats()
+    for counter in ("requests", "errors", "retries", "throttled"):
+        metric = f"true911_gateway_{counter}_total"
+        lines += [f"# HELP {metric} Integration gateway {counter} by vendor.",
+                  f"# TYPE {metric} counter"]
+        lines += [f'{metric}{{vendor="{_escape(g["vendor"])}"}} {g[counter]}' for g in gateways]
+    lines += ["# HELP true911_gateway_responses_total Integration gateway responses by status class.",
+              "# TYPE true911_gateway_responses_total counter"]
+    for g in gateways:
+        for cls, n in g["status"].items():
+            lines.append(f'true911_gateway_responses_total{{{_labels({"vendor": g["vendor"], "class": cls})}}} {n}')
+    return "\n".join(lines) + "\n"
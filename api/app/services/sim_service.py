@@ -79,6 +79,62 @@ async def enqueue_sim_action(
     )
 
 
+async def enqueue_sim_actions(
+    db: AsyncSession,
+    sim_ids: list[int],
+    action: str,
+    current_user: User,
+) -> tuple[list[SimActionOut], list[dict]]:
+    """Bulk :func:`enqueue_sim_action`: one SIM query, one job insert and one
+    Redis pipeline.  SIMs that are missing or not in a valid state are
+    skipped (returned with a reason) rather than failing the batch; a SIM
+    whose action is already queued reuses that job (idempotency key)."""
+    ids = list(dict.fromkeys(sim_ids))
+    result = await db.execute(
+        select(Sim).where(Sim.id.in_(ids), Sim.tenant_id == current_user.tenant_id)
+    )
+    sims = {s.id: s for s in result.scalars().all()}
+
+    valid_from = _TRANSITIONS.get(action, [])
+    eligible: list[Sim] = []
+    skipped: list[dict] = []
+    for sim_id in ids:
+        sim = sims.get(sim_id)
+        if sim is None:
+            skipped.append({"sim_id": sim_id, "reason": "SIM not found"})
+        elif sim.status not in valid_from:
+            skipped.append({"sim_id": sim_id, "reason": f"Cannot {action} SIM in status '{sim.status}'"})
+        else:
+            eligible.append(sim)
+
+    jobs = await job_service.create_and_enqueue_many(db, [
+        {
+            "job_type": f"sim.{action}",
+            "queue": "provisioning",
+            "tenant_id": current_user.tenant_id,
+            "payload": {"sim_id": sim.id, "iccid": sim.iccid, "carrier": sim.carrier},
+            "idempotency_key": f"sim.{action}.{sim.id}",
+        }
+        for sim in eligible
+    ])
+    for sim, job in zip(eligible, jobs):
+        db.add(SimEvent(
+            sim_id=sim.id,
+            event_type=action,
+            status_before=sim.status,
+            initiated_by=current_user.email,
+            job_id=job.id,
+        ))
+    await db.commit()
+
+    queued = [
+        SimActionOut(sim_id=sim.id, action=action, job_id=job.id,
+                     message=f"SIM {action} queued as job {job.id}")
+        for sim, job in zip(eligible, jobs)
+    ]
+    return queued, skipped
+
+
 # ── Worker Handlers (called by worker.py dispatch) ──────────────
 
 async def handle_sim_activate(db: AsyncSession, job: Job) -> dict[str, Any]:
@@ -140,9 +196,8 @@ async def handle_sim_resume(db: AsyncSession, job: Job) -> dict[str, Any]:
 
 async def handle_poll_usage(db: AsyncSession, job: Job) -> dict[str, Any]:
     """Poll carrier API for usage data and store in sim_usage_daily."""
-    payload = job.payload or {}
-    logger.info("Would poll usage for SIM %s", payload.get("sim_id"))
-    return {"status": "skipped", "reason": "provider credentials not configured"}
+    from app.services.usage_polling import handle_poll_usage as _poll
+    return await _poll(db, job)
 
 
 async def _mark_payload_processed(db: AsyncSession, payload_id: str) -> None:
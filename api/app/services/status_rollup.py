@@ -0,0 +1,247 @@
+"""Persisted device / site liveness and health — filterable in SQL.
+
+``computed_status`` (:mod:`app.services.continuity`) and ``health_status``
+(:mod:`app.services.health_scoring`) used to be derived at read time from
+every device of a site, so the site list had to load the tenant's devices
+and could not filter or sort on either.  They are now stored on ``devices``
+and ``sites`` and kept current in two ways:
+
+  * **Writes** — a ``before_flush`` listener recomputes a device's statuses
+    whenever one of their inputs changes (heartbeat, heartbeat interval,
+    network status / event, device status, site), so heartbeat ingestion,
+    carrier telemetry and device edits need not call anything.  Devices
+    inserted, deleted, moved, or whose statuses changed mark their site(s);
+    an ``after_flush`` hook then re-derives those sites' rollups with one
+    UPDATE per tenant.
+  * **Time** — "no heartbeat for 2× the interval" and "telemetry older than
+    ``TELEMETRY_STALE_MINUTES``" happen without any write.  Each device
+    stores the earliest such deadline in ``status_due_at``;
+    :func:`sweep_due` (``python -m app.sweep_health_status``, every minute)
+    recomputes only the devices whose deadline has passed.
+
+The rules themselves are still the pure functions in ``continuity`` and
+``health_scoring``.  Migration 061 fills existing rows with them; any row
+still without a stored status is picked up by the sweep.  Writes that bypass the ORM unit of work are not
+observed — the sweep is the backstop only for time-driven transitions.
+
+:func:`install` registers the listeners; it is idempotent and runs for
+every session ``app.database.AsyncSessionLocal`` hands out, so the
+heartbeat / telemetry syncs and imports that run as their own processes
+are covered, not just the API and worker.
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import case, event, func, inspect as sa_inspect, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.device import Device
+from app.models.site import Site
+from app.services.continuity import (
+    DEFAULT_HEARTBEAT_INTERVAL,
+    GRACE_MULTIPLIER,
+    compute_device_computed_status,
+)
+from app.services.health_scoring import TELEMETRY_STALE_MINUTES, compute_device_health
+
+logger = logging.getLogger("true911.status_rollup")
+
+# Device columns the two status functions read.
+_INPUTS = ("last_heartbeat", "heartbeat_interval", "network_status",
+           "last_network_event", "status")
+_OUTPUTS = ("computed_status", "health_status")
+
+_SWEEP_CHUNK = 500
+_PENDING_SITES = "status_rollup_sites"
+
+
+def _aware(ts: Optional[datetime]) -> Optional[datetime]:
+    if ts is not None and ts.tzinfo is None:
+        return ts.replace(tzinfo=timezone.utc)
+    return ts
+
+
+def device_statuses(device: Device, now: datetime) -> tuple[str, str, Optional[datetime]]:
+    """``(computed_status, health_status, status_due_at)`` for *device*.
+
+    ``status_due_at`` is the next moment either status can change with no
+    new write (``None`` if none is pending)."""
+    last_heartbeat = _aware(device.last_heartbeat)
+    last_network_event = _aware(device.last_network_event)
+    computed = compute_device_computed_status(last_heartbeat, device.heartbeat_interval)
+    health = compute_device_health(
+        last_heartbeat=last_heartbeat,
+        heartbeat_interval=device.heartbeat_interval,
+        network_status=device.network_status,
+        last_network_event=last_network_event,
+        device_status=device.status,
+    )
+    deadlines = []
+    if last_heartbeat is not None:
+        interval = device.heartbeat_interval or DEFAULT_HEARTBEAT_INTERVAL
+        deadlines.append(last_heartbeat + timedelta(seconds=interval * GRACE_MULTIPLIER))
+    if last_network_event is not None:
+        deadlines.append(last_network_event + timedelta(minutes=TELEMETRY_STALE_MINUTES))
+    due = min((d for d in deadlines if d > now), default=None)
+    return computed, health, due
+
+
+def refresh_device(device: Device, now: Optional[datetime] = None) -> bool:
+    """Recompute and store *device*'s statuses; True if either changed."""
+    now = now or datetime.now(timezone.utc)
+    computed, health, due = device_statuses(device, now)
+    changed = (device.computed_status, device.health_status) != (computed, health)
+    if changed:
+        device.computed_status = computed
+        device.health_status = health
+    if _aware(device.status_due_at) != due:
+        device.status_due_at = due
+    return changed
+
+
+# ─── Site rollup (SQL) ──────────────────────────────────────────────
+
+
+def _site_rollup_values() -> dict:
+    """Correlated aggregates mirroring ``compute_site_computed_status`` and
+    ``compute_site_health``."""
+    def _count(*where):
+        return (select(func.count()).select_from(Device)
+                .where(Device.tenant_id == Site.tenant_id, Device.site_id == Site.site_id, *where)
+                .scalar_subquery())
+
+    total = _count()
+    online = _count(Device.computed_status == "Online")
+    critical = _count(Device.health_status == "critical")
+    warning = _count(Device.health_status == "warning")
+    return {
+        "computed_status": case(
+            (total == 0, "Unknown"),
+            (online == total, "Connected"),
+            (online == 0, "Not Connected"),
+            else_="Attention Needed",
+        ),
+        "health_status": case(
+            (total == 0, "unknown"),
+            (critical > 0, "critical"),
+            (warning > 0, "warning"),
+            else_="healthy",
+        ),
+    }
+
+
+def site_rollup_statement(tenant_id: str, site_ids):
+    """UPDATE the stored rollup of *site_ids* in *tenant_id* from their devices."""
+    return (update(Site)
+            .where(Site.tenant_id == tenant_id, Site.site_id.in_(sorted(site_ids)))
+            .values(**_site_rollup_values())
+            .execution_options(synchronize_session=False))
+
+
+def unrolled_sites_statement():
+    """UPDATE every site with no stored rollup yet from its devices."""
+    return (update(Site)
+            .where(Site.computed_status.is_(None))
+            .values(**_site_rollup_values())
+            .execution_options(synchronize_session=False))
+
+
+# ─── Flush listeners ────────────────────────────────────────────────
+
+
+def _old_value(state, attr: str):
+    hist = state.attrs[attr].history
+    return hist.deleted[0] if hist.deleted else getattr(state.object, attr)
+
+
+def _before_flush(session: Session, flush_context, instances) -> None:
+    now = datetime.now(timezone.utc)
+    sites: set[tuple[str, str]] = session.info.setdefault(_PENDING_SITES, set())
+
+    def _mark(tenant_id, site_id):
+        if tenant_id and site_id:
+            sites.add((tenant_id, site_id))
+
+    for obj in session.new:
+        if isinstance(obj, Device):
+            refresh_device(obj, now)
+            _mark(obj.tenant_id, obj.site_id)
+        elif isinstance(obj, Site) and obj.computed_status is None:
+            obj.computed_status, obj.health_status = "Unknown", "unknown"   # no devices yet
+    for obj in session.deleted:
+        if isinstance(obj, Device):
+            state = sa_inspect(obj)
+            _mark(_old_value(state, "tenant_id"), _old_value(state, "site_id"))
+    for obj in session.dirty:
+        if not isinstance(obj, Device) or obj in session.deleted:
+            continue
+        state = sa_inspect(obj)
+        if any(state.attrs[a].history.has_changes() for a in _INPUTS):
+            refresh_device(obj, now)
+        moved = any(state.attrs[a].history.has_changes() for a in ("tenant_id", "site_id"))
+        if moved or any(state.attrs[a].history.has_changes() for a in _OUTPUTS):
+            _mark(obj.tenant_id, obj.site_id)
+            if moved:
+                _mark(_old_value(state, "tenant_id"), _old_value(state, "site_id"))
+
+
+def _after_flush(session: Session, flush_context) -> None:
+    sites = session.info.pop(_PENDING_SITES, None)
+    if not sites:
+        return
+    by_tenant: dict[str, set[str]] = {}
+    for tenant_id, site_id in sites:
+        by_tenant.setdefault(tenant_id, set()).add(site_id)
+    conn = session.connection()
+    for tenant_id in sorted(by_tenant):
+        conn.execute(site_rollup_statement(tenant_id, by_tenant[tenant_id]))
+
+
+def install() -> None:
+    """Register the flush listeners on every ORM Session.  Idempotent.
+
+    The ``before_flush`` hook goes first so the change-version listener
+    sees the status columns it sets."""
+    if not event.contains(Session, "before_flush", _before_flush):
+        event.listen(Session, "before_flush", _before_flush, insert=True)
+    if not event.contains(Session, "after_flush", _after_flush):
+        event.listen(Session, "after_flush", _after_flush)
+
+
+# ─── Deadline sweep ─────────────────────────────────────────────────
+
+
+async def sweep_due(db: AsyncSession, *, now: Optional[datetime] = None) -> dict:
+    """Recompute every device whose ``status_due_at`` has passed (or that has
+    no stored status yet), then roll up sites that still have none.  Commits
+    per chunk; the flush listeners update the affected sites."""
+    now = now or datetime.now(timezone.utc)
+    checked = changed = 0
+    last_id = 0
+    while True:
+        devices = (await db.execute(
+            select(Device)
+            .where(Device.id > last_id,
+                   or_(Device.status_due_at <= now, Device.computed_status.is_(None)))
+            .order_by(Device.id)
+            .limit(_SWEEP_CHUNK)
+        )).scalars().all()
+        if not devices:
+            break
+        for d in devices:
+            changed += refresh_device(d, now)
+        checked += len(devices)
+        last_id = devices[-1].id
+        await db.commit()
+
+    backfilled = (await db.execute(unrolled_sites_statement())).rowcount
+    await db.commit()
+    result = {"devices_checked": checked, "devices_changed": changed,
+              "sites_backfilled": backfilled or 0}
+    logger.info("Health status sweep: %s", result)
+    return result
@@ -10,16 +10,30 @@ Each adapter returns a normalized DiagnosticResult dict:
 
 Adapters that depend on services not yet fully wired return stub results
 with TODO markers for future integration.
+
+``run_diagnostics`` runs the adapters concurrently on independent sessions
+(at most ``SUPPORT_DIAGNOSTIC_MAX_SESSIONS`` open across the process) under
+a per-check timeout and an overall deadline, and briefly caches
+completed results so repeated messages in one support session reuse them.
 """
 
 from __future__ import annotations
 
+import asyncio
+import copy
 import logging
+import threading
+import time
+import weakref
+from collections import OrderedDict
 from datetime import datetime, timezone, timedelta
+from typing import Callable
 
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
+
 logger = logging.getLogger("true911.support.diagnostics")
 
 
@@ -240,33 +254,146 @@ ALL_CHECK_TYPES = list(DIAGNOSTIC_CHECKS.keys())
 
 
 async def run_diagnostics(
-    db: AsyncSession,
     tenant_id: str,
     checks: list[str] | None = None,
     device_id: int | None = None,
     site_id: int | None = None,
+    *,
+    session_factory: Callable[[], AsyncSession] | None = None,
+    use_cache: bool = True,
 ) -> list[dict]:
-    """Run specified (or all) diagnostic checks and return normalized results."""
-    check_names = checks or ALL_CHECK_TYPES
-    results = []
-    for name in check_names:
-        fn = DIAGNOSTIC_CHECKS.get(name)
-        if not fn:
-            continue
-        try:
-            r = await fn(db, tenant_id, device_id=device_id, site_id=site_id)
-            r["check_type"] = name
-            results.append(r)
-        except Exception as exc:
-            logger.exception("Diagnostic check %s failed", name)
-            results.append({
-                "check_type": name,
-                **_result("unknown", "info", 0.1,
-                          "This check is temporarily unavailable.",
-                          f"Check {name} raised {type(exc).__name__}: {exc}",
-                          {"error": str(exc)})
-            })
-    return results
+    """Run specified (or all) diagnostic checks and return normalized results.
+
+    Checks run concurrently, each on its own session from *session_factory*
+    (default ``AsyncSessionLocal``).  Sessions are opened under a
+    process-wide cap of ``SUPPORT_DIAGNOSTIC_MAX_SESSIONS``; checks beyond
+    it wait for a slot rather than taking more pool connections.  A check
+    that raises, runs longer than ``SUPPORT_DIAGNOSTIC_CHECK_TIMEOUT_SECONDS``
+    once it has a slot, or is still waiting or running at
+    ``SUPPORT_DIAGNOSTIC_DEADLINE_SECONDS`` reports ``unknown``; the others
+    are returned as-is, in the requested order.  Completed results are
+    served from a short per-(tenant, device, site, check) cache unless
+    *use_cache* is false.
+    """
+    if session_factory is None:
+        from app.database import AsyncSessionLocal
+        session_factory = AsyncSessionLocal
+
+    check_names = [n for n in (checks or ALL_CHECK_TYPES) if n in DIAGNOSTIC_CHECKS]
+    results: dict[str, dict] = {}
+    if use_cache:
+        for name in check_names:
+            hit = _cache_get((tenant_id, device_id, site_id, name))
+            if hit is not None:
+                results[name] = hit
+
+    tasks = {
+        name: asyncio.create_task(_run_check(name, session_factory, tenant_id, device_id, site_id))
+        for name in dict.fromkeys(check_names) if name not in results
+    }
+    if tasks:
+        deadline = max(0.0, float(settings.SUPPORT_DIAGNOSTIC_DEADLINE_SECONDS))
+        _, pending = await asyncio.wait(tasks.values(), timeout=deadline or None)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        for name, task in tasks.items():
+            if task in pending:
+                logger.warning("Diagnostic check %s still running at the %.1fs deadline", name, deadline)
+                results[name] = _timeout_result(name, deadline)
+                continue
+            results[name], cacheable = task.result()
+            if cacheable:
+                _cache_put((tenant_id, device_id, site_id, name), results[name])
+
+    return [{**copy.deepcopy(results[name]), "check_type": name} for name in check_names]
+
+
+async def _run_check(name: str, session_factory, tenant_id: str,
+                     device_id: int | None, site_id: int | None) -> tuple[dict, bool]:
+    """One check on its own session.  Returns ``(result, cacheable)``."""
+    timeout = max(0.0, float(settings.SUPPORT_DIAGNOSTIC_CHECK_TIMEOUT_SECONDS))
+    fn = DIAGNOSTIC_CHECKS[name]
+
+    async def _call() -> dict:
+        async with session_factory() as session:
+            return await fn(session, tenant_id, device_id=device_id, site_id=site_id)
+
+    try:
+        # The timeout starts once a slot is held: time queued behind other
+        # checks is bounded by the overall deadline, not charged to this one.
+        async with _session_slots():
+            return await asyncio.wait_for(_call(), timeout=timeout or None), True
+    except asyncio.TimeoutError:
+        logger.warning("Diagnostic check %s timed out after %.1fs", name, timeout)
+        return _timeout_result(name, timeout), False
+    except Exception as exc:
+        logger.exception("Diagnostic check %s failed", name)
+        return _result("unknown", "info", 0.1,
+                       "This check is temporarily unavailable.",
+                       f"Check {name} raised {type(exc).__name__}: {exc}",
+                       {"error": str(exc)}), False
+
+
+# One semaphore per event loop (asyncio primitives are loop-bound; workers
+# and scripts may run several loops over the process lifetime).
+_slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = \
+    weakref.WeakKeyDictionary()
+
+
+def _session_slots() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    sem = _slots.get(loop)
+    if sem is None:
+        sem = _slots[loop] = asyncio.Semaphore(max(1, int(settings.SUPPORT_DIAGNOSTIC_MAX_SESSIONS)))
+    return sem
+
+
+def _timeout_result(name: str, seconds: float) -> dict:
+    return _result("unknown", "info", 0.1,
+                   "This check is taking longer than expected. We'll keep looking into it.",
+                   f"Check {name} did not finish within {seconds:.1f}s.",
+                   {"timeout": True, "timeout_seconds": seconds})
+
+
+# ── Result cache ────────────────────────────────────────────────
+# Keyed on (tenant_id, device_id, site_id, check_type).  Only completed
+# results are stored; errors and timeouts are always re-run.
+
+CACHE_MAX_ENTRIES = 1_000
+
+_clock: Callable[[], float] = time.monotonic
+_cache_lock = threading.Lock()
+_cache: "OrderedDict[tuple, tuple[float, dict]]" = OrderedDict()
+
+
+def _cache_get(key: tuple) -> dict | None:
+    now = _clock()
+    with _cache_lock:
+        entry = _cache.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= now:
+            del _cache[key]
+            return None
+        return entry[1]
+
+
+def _cache_put(key: tuple, result: dict) -> None:
+    ttl = max(0, int(settings.SUPPORT_DIAGNOSTIC_CACHE_TTL_SECONDS))
+    if not ttl:
+        return
+    with _cache_lock:
+        _cache[key] = (_clock() + ttl, copy.deepcopy(result))
+        _cache.move_to_end(key)
+        while len(_cache) > CACHE_MAX_ENTRIES:
+            _cache.popitem(last=False)
+
+
+def clear_cache() -> None:
+    with _cache_lock:
+        _cache.clear()
 
 
 def _result(status: str, severity: str, confidence: float,
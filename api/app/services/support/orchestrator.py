@@ -189,7 +189,6 @@ async def _run_and_store_diagnostics(
 ) -> list[dict]:
     """Run diagnostics and persist results."""
     results = await run_diagnostics(
-        db,
         tenant_id=session.tenant_id,
         checks=checks,
         device_id=session.device_id,
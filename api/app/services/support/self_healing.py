@@ -216,7 +216,8 @@ async def _execute_action(
 
 async def _exec_refresh_diagnostics(db, tenant_id, site_id, device_id, _esc_id) -> dict:
     from .diagnostics import run_diagnostics
-    results = await run_diagnostics(db, tenant_id, device_id=device_id, site_id=site_id)
+    results = await run_diagnostics(tenant_id, device_id=device_id, site_id=site_id,
+                                     use_cache=False)
     return {"checks_run": len(results), "results": {r["check_type"]: r["status"] for r in results}}
 
 
@@ -288,8 +289,8 @@ async def _exec_recheck_after_delay(db, tenant_id, site_id, device_id, _esc_id)
     """Wait briefly then re-run diagnostics. Useful for transient issues."""
     await asyncio.sleep(5)  # Short delay — production might use 30-60s
     from .diagnostics import run_diagnostics
-    results = await run_diagnostics(db, tenant_id, device_id=device_id, site_id=site_id,
-                                     checks=["heartbeat", "device_status"])
+    results = await run_diagnostics(tenant_id, device_id=device_id, site_id=site_id,
+                                     checks=["heartbeat", "device_status"], use_cache=False)
     return {"delayed_recheck": True, "results": {r["check_type"]: r["status"] for r in results}}
 
 
@@ -12,8 +12,11 @@ Everything in this module is config-gated and additive:
     retry the delivery).
 
 Phase 3 scope is inbound: turning Telnyx ``call.hangup`` events into
-CDR rows.  Outbound Telnyx API calls (DID/E911/SIM management, live
-line registration status) are intentionally not wired here.
+CDR rows — inline in the webhook, or (``FEATURE_TELNYX_BATCH_INGEST``)
+drained from the archived payloads by the worker in batches, one DID
+lookup and one idempotent INSERT per batch.  Outbound Telnyx API calls
+(DID/E911/SIM management, live line registration status) are
+intentionally not wired here.
 """
 
 from __future__ import annotations
@@ -21,18 +24,23 @@ from __future__ import annotations
 import base64
 import json
 import logging
-import re
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Any, Iterable, Optional
 
 from cryptography.exceptions import InvalidSignature
 from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PublicKey
-from sqlalchemy import select
+from sqlalchemy import or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
 from app.models.call_record import CallRecord
+from app.models.integration_payload import IntegrationPayload
+from app.models.job import Job
 from app.models.line import Line
+from app.services import call_activity
+from app.utils.phone import normalize_phone
 
 logger = logging.getLogger("true911.telnyx")
 
@@ -109,48 +117,55 @@ def _parse_dt(value: Optional[str]) -> Optional[datetime]:
 
 
 def _normalize_did(value: Optional[str]) -> str:
-    """Reduce a phone number to comparable digits (US: drop a leading 1)."""
-    digits = re.sub(r"\D", "", value or "")
-    if len(digits) == 11 and digits.startswith("1"):
-        digits = digits[1:]
-    return digits
+    """Reduce a phone number to comparable digits (US: drop a leading 1) —
+    the rule ``Line.did_normalized`` is stored with."""
+    return normalize_phone(value or "")
 
 
-async def _match_line(db: AsyncSession, did: str) -> Optional[Line]:
-    """Find the Line whose DID matches ``did``.
+async def match_lines(db: AsyncSession, dids: Iterable[str]) -> dict[str, Line]:
+    """``{did: Line}`` for every DID in *dids* that matches a line — one query.
 
-    Exact match first (fast — covers E.164-stored DIDs), then a
-    digit-normalized fallback so formatting differences (dashes, a
-    leading +1) do not break the association.
+    An exact ``Line.did`` match (E.164-stored DIDs) wins; otherwise the
+    indexed ``did_normalized`` column absorbs formatting differences
+    (dashes, a leading +1).  Ties go to the oldest line.
     """
-    exact = (await db.execute(select(Line).where(Line.did == did))).scalars().first()
-    if exact:
-        return exact
-    target = _normalize_did(did)
-    if not target:
-        return None
-    rows = (await db.execute(select(Line).where(Line.did.isnot(None)))).scalars().all()
+    wanted = sorted({d for d in dids if d})
+    targets = sorted({_normalize_did(d) for d in wanted} - {""})
+    if not wanted:
+        return {}
+    rows = (await db.execute(
+        select(Line)
+        .where(or_(Line.did.in_(wanted), Line.did_normalized.in_(targets)))
+        .order_by(Line.id)
+    )).scalars().all()
+    exact: dict[str, Line] = {}
+    by_digits: dict[str, Line] = {}
     for line in rows:
-        if _normalize_did(line.did) == target:
-            return line
-    return None
+        exact.setdefault(line.did, line)
+        if line.did_normalized:
+            by_digits.setdefault(line.did_normalized, line)
+    matched = {}
+    for did in wanted:
+        line = exact.get(did) or by_digits.get(_normalize_did(did))
+        if line is not None:
+            matched[did] = line
+    return matched
 
 
-async def ingest_call_event(db: AsyncSession, raw_body: bytes) -> Optional[CallRecord]:
-    """Parse a Telnyx call webhook and, on ``call.hangup``, write a CDR.
+async def _match_line(db: AsyncSession, did: str) -> Optional[Line]:
+    """Find the Line whose DID matches ``did`` (see :func:`match_lines`)."""
+    return (await match_lines(db, [did])).get(did)
 
-    Best-effort: returns ``None`` (and logs) on any non-fatal condition —
-    a non-JSON body, a non-call event, an event other than
-    ``call.hangup``, an unrecognized DID, or a duplicate delivery.  The
-    CDR is built from ``call.hangup`` because that event carries the
-    full call timeline (start / answer / end, hangup cause).
-    """
-    try:
-        event = json.loads(raw_body.decode("utf-8", errors="replace"))
-    except (json.JSONDecodeError, ValueError):
-        return None
 
-    data = (event or {}).get("data") or {}
+def parse_call_event(event: Any) -> Optional[dict]:
+    """The CDR fields of a decoded Telnyx ``call.hangup`` webhook, or None.
+
+    ``did`` is the deployment-owned local leg — the line lookup key; the
+    line linkage itself is added at insert.  None for any other event, or a
+    hangup with no call identifier.
+    """
+    data = (event or {}).get("data") if isinstance(event, dict) else None
+    data = data or {}
     if data.get("event_type") != "call.hangup":
         return None
 
@@ -165,14 +180,6 @@ async def ingest_call_event(db: AsyncSession, raw_body: bytes) -> Optional[CallR
     if not session_id:
         logger.warning("Telnyx call.hangup with no call identifier — skipped")
         return None
-    call_id = f"telnyx-{session_id}"[:64]
-
-    # Telnyx retries webhooks — never insert the same call twice.
-    existing = (
-        await db.execute(select(CallRecord).where(CallRecord.call_id == call_id))
-    ).scalars().first()
-    if existing:
-        return existing
 
     direction = (
         "inbound"
@@ -181,58 +188,172 @@ async def ingest_call_event(db: AsyncSession, raw_body: bytes) -> Optional[CallR
     )
     from_number = payload.get("from")
     to_number = payload.get("to")
-    # The deployment-owned DID is the local leg of the call.
-    did = to_number if direction == "inbound" else from_number
-
-    line = await _match_line(db, did) if did else None
-    if line is None:
-        logger.warning(
-            "Telnyx call.hangup for DID %r matched no line — CDR not stored", did,
-        )
-        return None
 
     started_at = _parse_dt(payload.get("start_time"))
-    answered_at = _parse_dt(payload.get("answer_time"))
     ended_at = _parse_dt(payload.get("end_time"))
     duration = None
     if started_at and ended_at:
         duration = max(0, int((ended_at - started_at).total_seconds()))
 
-    status = _STATUS_BY_HANGUP_CAUSE.get(
-        (payload.get("hangup_cause") or "").lower(), "completed",
-    )
-
-    record = CallRecord(
-        call_id=call_id,
-        tenant_id=line.tenant_id,
-        customer_id=line.customer_id,
-        site_id=line.site_id,
-        device_id=line.device_id,
-        line_id=line.line_id,
-        provider="telnyx",
-        direction=direction,
-        from_number=from_number,
-        to_number=to_number,
-        did=line.did,
-        status=status,
-        started_at=started_at,
-        answered_at=answered_at,
-        ended_at=ended_at,
-        duration_seconds=duration,
-        telnyx_call_id=payload.get("call_leg_id") or payload.get("call_control_id"),
-        telnyx_cdr_id=data.get("id"),
-        metadata_json=json.dumps({
+    return {
+        "call_id": f"telnyx-{session_id}"[:64],
+        "local_did": to_number if direction == "inbound" else from_number,
+        "direction": direction,
+        "from_number": from_number,
+        "to_number": to_number,
+        "status": _STATUS_BY_HANGUP_CAUSE.get(
+            (payload.get("hangup_cause") or "").lower(), "completed",
+        ),
+        "started_at": started_at,
+        "answered_at": _parse_dt(payload.get("answer_time")),
+        "ended_at": ended_at,
+        "duration_seconds": duration,
+        "telnyx_call_id": payload.get("call_leg_id") or payload.get("call_control_id"),
+        "telnyx_cdr_id": data.get("id"),
+        "metadata_json": json.dumps({
             "event_id": data.get("id"),
             "hangup_cause": payload.get("hangup_cause"),
             "hangup_source": payload.get("hangup_source"),
             "connection_id": payload.get("connection_id"),
         }),
+    }
+
+
+async def store_call_events(db: AsyncSession, cdrs: list[dict]) -> list[dict]:
+    """Link *cdrs* (from :func:`parse_call_event`) to their lines and insert
+    them — one DID lookup and one ``INSERT … ON CONFLICT (call_id) DO
+    NOTHING`` for the whole list, so Telnyx retries and duplicate payloads
+    are no-ops.  Advances ``Device.last_call_at`` for all the batch's
+    devices in one statement.  Does not commit.  Returns the rows actually
+    inserted."""
+    lines = await match_lines(db, (c["local_did"] for c in cdrs))
+    rows, seen = [], set()
+    for cdr in cdrs:
+        line = lines.get(cdr["local_did"]) if cdr["local_did"] else None
+        if line is None:
+            logger.warning(
+                "Telnyx call.hangup for DID %r matched no line — CDR not stored", cdr["local_did"],
+            )
+            continue
+        if cdr["call_id"] in seen:
+            continue
+        seen.add(cdr["call_id"])
+        row = {k: v for k, v in cdr.items() if k != "local_did"}
+        rows.append({
+            **row,
+            "tenant_id": line.tenant_id,
+            "customer_id": line.customer_id,
+            "site_id": line.site_id,
+            "device_id": line.device_id,
+            "line_id": line.line_id,
+            "provider": "telnyx",
+            "did": line.did,
+        })
+    if not rows:
+        return []
+
+    insert_fn = sqlite_insert if db.get_bind().dialect.name == "sqlite" else pg_insert
+    inserted_ids = set((await db.execute(
+        insert_fn(CallRecord).values(rows)
+        .on_conflict_do_nothing(index_elements=["call_id"])
+        .returning(CallRecord.call_id)
+    )).scalars())
+    inserted = [r for r in rows if r["call_id"] in inserted_ids]
+
+    await call_activity.record_calls(
+        db, ((r["tenant_id"], r["device_id"], r["started_at"]) for r in inserted),
     )
-    db.add(record)
+    for r in inserted:
+        logger.info(
+            "Telnyx CDR stored: call_id=%s line=%s tenant=%s status=%s",
+            r["call_id"], r["line_id"], r["tenant_id"], r["status"],
+        )
+    return inserted
+
+
+async def ingest_call_event(db: AsyncSession, raw_body: bytes) -> Optional[str]:
+    """Parse a Telnyx call webhook and, on ``call.hangup``, write a CDR.
+
+    Best-effort: returns ``None`` (and logs) on any non-fatal condition —
+    a non-JSON body, a non-call event, an event other than
+    ``call.hangup``, an unrecognized DID, or a duplicate delivery.  The
+    CDR is built from ``call.hangup`` because that event carries the
+    full call timeline (start / answer / end, hangup cause).  Returns the
+    stored ``call_id``.
+    """
+    try:
+        event = json.loads(raw_body.decode("utf-8", errors="replace"))
+    except (json.JSONDecodeError, ValueError):
+        return None
+    cdr = parse_call_event(event)
+    if cdr is None:
+        return None
+    inserted = await store_call_events(db, [cdr])
     await db.commit()
-    await db.refresh(record)
-    logger.info(
-        "Telnyx CDR stored: call_id=%s line=%s tenant=%s status=%s",
-        call_id, line.line_id, line.tenant_id, status,
+    return inserted[0]["call_id"] if inserted else None
+
+
+def batch_ingest_enabled() -> bool:
+    return settings.FEATURE_TELNYX_BATCH_INGEST.strip().lower() == "true"
+
+
+async def drain_call_events(db: AsyncSession, *, limit: Optional[int] = None) -> dict[str, int]:
+    """Ingest up to *limit* unprocessed archived Telnyx payloads as one batch.
+
+    Claims the oldest unprocessed ``integration_payloads`` rows (``FOR
+    UPDATE SKIP LOCKED`` — concurrent drains take disjoint batches), stores
+    their CDRs with :func:`store_call_events`, and marks them processed,
+    in one transaction.  Payloads that are not call hangups are just marked.
+    """
+    limit = limit or settings.TELNYX_INGEST_BATCH_SIZE
+    payloads = (await db.execute(
+        select(IntegrationPayload.id, IntegrationPayload.body, IntegrationPayload.raw_body)
+        .where(IntegrationPayload.source == "telnyx", IntegrationPayload.processed.is_(False))
+        .order_by(IntegrationPayload.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )).all()
+    if not payloads:
+        return {"payloads": 0, "call_events": 0, "stored": 0}
+
+    cdrs = []
+    for p in payloads:
+        event = p.body
+        if event is None and p.raw_body:
+            try:
+                event = json.loads(p.raw_body)
+            except (json.JSONDecodeError, ValueError):
+                event = None
+        cdr = parse_call_event(event)
+        if cdr is not None:
+            cdrs.append(cdr)
+    inserted = await store_call_events(db, cdrs) if cdrs else []
+    await db.execute(
+        update(IntegrationPayload)
+        .where(IntegrationPayload.id.in_([p.id for p in payloads]))
+        .values(processed=True)
+        .execution_options(synchronize_session=False)
     )
-    return record
+    await db.commit()
+    return {"payloads": len(payloads), "call_events": len(cdrs), "stored": len(inserted)}
+
+
+async def handle_webhook(db: AsyncSession, job: Job) -> dict[str, Any]:
+    """Worker handler for ``webhook.telnyx``.
+
+    With ``FEATURE_TELNYX_BATCH_INGEST`` on, drains a batch of archived
+    payloads (usually including this job's — a job whose payload an earlier
+    batch already took completes as a no-op).  Off, the CDR was ingested
+    inline by the webhook and this is the generic archive handler.
+    """
+    from app.services.sim_service import handle_webhook as archive_webhook
+
+    if not batch_ingest_enabled():
+        return await archive_webhook(db, job)
+    payload = job.payload or {}
+    return {
+        "payload_id": payload.get("payload_id"),
+        "processed": True,
+        "source": "telnyx",
+        "batch": await drain_call_events(db),
+    }
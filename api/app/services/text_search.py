@@ -0,0 +1,48 @@
+"""Portable substring / typeahead search expressions.
+
+Every search box in the API matches a lower-cased query against a few
+text columns.  The expressions built here are plain ``lower(col) LIKE``
+/ ``=`` so they run unchanged on SQLite (tests) and Postgres — and on
+Postgres they are served by the ``pg_trgm`` GIN expression indexes
+created in migration 054 (``lower(col) gin_trgm_ops``), which answer
+``LIKE '%q%'`` without a sequential scan.  A column searched here
+without such an index still works; it just scans.
+
+Ranking is deliberately simple and dialect-neutral (smaller is better):
+
+  * ``RANK_EXACT``       — the whole value equals the query
+  * ``RANK_PREFIX``      — the value starts with the query (typeahead)
+  * ``RANK_WORD_PREFIX`` — a later word starts with the query
+  * ``RANK_CONTAINS``    — the query appears anywhere
+"""
+
+from __future__ import annotations
+
+from sqlalchemy import case, func, literal
+
+RANK_EXACT = 0
+RANK_PREFIX = 1
+RANK_WORD_PREFIX = 2
+RANK_CONTAINS = 3
+
+
+def normalize_query(q) -> str:
+    """Strip, lower-case and collapse internal whitespace."""
+    return " ".join(str(q or "").lower().split())
+
+
+def contains(col, q: str):
+    """``lower(col) LIKE '%q%'`` with LIKE wildcards in *q* escaped."""
+    return func.lower(col).contains(q, autoescape=True)
+
+
+def match_rank(col, q: str):
+    """Rank expression for a row already known to match ``contains(col, q)``."""
+    lowered = func.lower(col)
+    return case(
+        (lowered == q, literal(RANK_EXACT)),
+        (lowered.startswith(q, autoescape=True), literal(RANK_PREFIX)),
+        (lowered.contains(" " + q, autoescape=True), literal(RANK_WORD_PREFIX)),
+        else_=literal(RANK_CONTAINS),
+    )
+
@@ -0,0 +1,219 @@
+"""Carrier usage polling — feeds ``sim_usage_daily`` and ``sim_usage_monthly``.
+
+One run polls a single carrier for a single UTC day:
+
+  1. load the carrier's SIMs (id, ICCID, tenant) in one query;
+  2. ask the carrier's :class:`UsageSource` for that day's usage in bulk
+     (the source pages its own API — ThingSpace takes 500 ICCIDs per call);
+  3. upsert the daily rows in batches — one ``INSERT ... ON CONFLICT
+     (sim_id, usage_date) DO UPDATE`` per batch, so a re-poll of the same
+     day replaces the values instead of duplicating them;
+  4. rebuild the monthly rollup for the (tenant, carrier, month) keys the run
+     touched with one ``INSERT ... SELECT ... GROUP BY`` upsert.
+
+Run by the ``sim.poll_usage`` job (:func:`handle_poll_usage`) and the
+``python -m app.poll_sim_usage`` cron entry point.  Carriers without a usage
+source, or whose credentials are not configured, are reported as skipped.
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Optional, Protocol
+
+from sqlalchemy import Date, and_, func, literal, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.job import Job
+from app.models.sim import Sim
+from app.models.sim_usage_daily import SimUsageDaily, SimUsageMonthly
+
+logger = logging.getLogger("true911.usage_polling")
+
+UPSERT_BATCH_SIZE = 1000
+
+# SIMs that can still accrue usage.
+_POLLED_STATUSES = ("active", "assigned", "suspended")
+
+
+class UsageSource(Protocol):
+    """A carrier's bulk usage API, reduced to what the pipeline needs."""
+
+    carrier: str
+
+    @property
+    def is_configured(self) -> bool: ...
+
+    async def fetch_daily_usage(self, iccids: list[str], usage_date: date) -> list[dict[str, Any]]:
+        """Normalized records: ``iccid``, ``bytes_up``, ``bytes_down``, ``sms_count``."""
+        ...
+
+
+class VerizonUsageSource:
+    carrier = "verizon"
+
+    def __init__(self, client=None):
+        from app.services.verizon_thingspace import get_verizon_client
+
+        self.client = client or get_verizon_client()
+
+    @property
+    def is_configured(self) -> bool:
+        return self.client.is_configured
+
+    async def fetch_daily_usage(self, iccids: list[str], usage_date: date) -> list[dict[str, Any]]:
+        from app.services.verizon_thingspace import normalize_verizon_usage
+
+        raw = await self.client.fetch_daily_usage(iccids, usage_date)
+        return [r for r in (normalize_verizon_usage(x) for x in raw) if r]
+
+
+_SOURCES: dict[str, type] = {
+    "verizon": VerizonUsageSource,
+}
+
+
+def get_usage_source(carrier: str) -> Optional[UsageSource]:
+    cls = _SOURCES.get(carrier)
+    return cls() if cls else None
+
+
+def default_usage_date(now: Optional[datetime] = None) -> date:
+    """Yesterday (UTC) — the most recent complete day."""
+    return ((now or datetime.now(timezone.utc)) - timedelta(days=1)).date()
+
+
+def _insert(db: AsyncSession):
+    return sqlite_insert if db.get_bind().dialect.name == "sqlite" else pg_insert
+
+
+async def _upsert_daily(db: AsyncSession, rows: list[dict]) -> None:
+    insert_fn = _insert(db)
+    for i in range(0, len(rows), UPSERT_BATCH_SIZE):
+        stmt = insert_fn(SimUsageDaily.__table__).values(rows[i:i + UPSERT_BATCH_SIZE])
+        await db.execute(stmt.on_conflict_do_update(
+            index_elements=["sim_id", "usage_date"],
+            set_={
+                "bytes_up": stmt.excluded.bytes_up,
+                "bytes_down": stmt.excluded.bytes_down,
+                "sms_count": stmt.excluded.sms_count,
+            },
+        ))
+
+
+def _month_start(d: date) -> date:
+    return d.replace(day=1)
+
+
+async def refresh_monthly_rollup(
+    db: AsyncSession, carrier: str, month: date, tenant_ids: Optional[set[str]] = None
+) -> None:
+    """Recompute ``sim_usage_monthly`` for one carrier/month (optionally only
+    some tenants) from the daily rows — one statement."""
+    start = _month_start(month)
+    end = (start + timedelta(days=32)).replace(day=1)
+    conds = [
+        Sim.carrier == carrier,
+        SimUsageDaily.usage_date >= start,
+        SimUsageDaily.usage_date < end,
+    ]
+    if tenant_ids is not None:
+        conds.append(Sim.tenant_id.in_(tenant_ids))
+    agg = (
+        select(
+            Sim.tenant_id,
+            Sim.carrier,
+            literal(start, Date).label("month"),
+            func.count(func.distinct(SimUsageDaily.sim_id)),
+            func.coalesce(func.sum(SimUsageDaily.bytes_up), 0),
+            func.coalesce(func.sum(SimUsageDaily.bytes_down), 0),
+            func.coalesce(func.sum(SimUsageDaily.sms_count), 0),
+        )
+        .join(Sim, Sim.id == SimUsageDaily.sim_id)
+        .where(and_(*conds))
+        .group_by(Sim.tenant_id, Sim.carrier)
+    )
+    table = SimUsageMonthly.__table__
+    stmt = _insert(db)(table).from_select(
+        ["tenant_id", "carrier", "month", "sim_count", "bytes_up", "bytes_down", "sms_count"], agg,
+    )
+    await db.execute(stmt.on_conflict_do_update(
+        index_elements=["tenant_id", "carrier", "month"],
+        set_={
+            "sim_count": stmt.excluded.sim_count,
+            "bytes_up": stmt.excluded.bytes_up,
+            "bytes_down": stmt.excluded.bytes_down,
+            "sms_count": stmt.excluded.sms_count,
+            "updated_at": func.now(),
+        },
+    ))
+
+
+async def poll_usage(
+    db: AsyncSession,
+    source: UsageSource,
+    usage_date: date,
+    *,
+    tenant_id: Optional[str] = None,
+) -> dict[str, Any]:
+    """Poll one carrier for one day and persist the result.  Does not commit."""
+    q = select(Sim.id, Sim.iccid, Sim.tenant_id).where(
+        Sim.carrier == source.carrier, Sim.status.in_(_POLLED_STATUSES),
+    )
+    if tenant_id:
+        q = q.where(Sim.tenant_id == tenant_id)
+    sims = (await db.execute(q)).all()
+    summary: dict[str, Any] = {
+        "carrier": source.carrier, "usage_date": usage_date.isoformat(),
+        "sims": len(sims), "rows": 0, "unmatched": 0,
+    }
+    if not sims:
+        return summary
+
+    by_iccid = {s.iccid: s for s in sims}
+    records = await source.fetch_daily_usage(list(by_iccid), usage_date)
+
+    rows: dict[int, dict] = {}
+    tenants: set[str] = set()
+    for rec in records:
+        sim = by_iccid.get(rec["iccid"])
+        if sim is None:
+            summary["unmatched"] += 1
+            continue
+        rows[sim.id] = {
+            "sim_id": sim.id, "usage_date": usage_date,
+            "bytes_up": rec["bytes_up"], "bytes_down": rec["bytes_down"], "sms_count": rec["sms_count"],
+        }
+        tenants.add(sim.tenant_id)
+
+    await _upsert_daily(db, list(rows.values()))
+    if tenants:
+        await refresh_monthly_rollup(db, source.carrier, usage_date, tenants)
+    summary["rows"] = len(rows)
+    summary["tenants"] = len(tenants)
+    return summary
+
+
+async def handle_poll_usage(db: AsyncSession, job: Job) -> dict[str, Any]:
+    """Worker handler for ``sim.poll_usage``.  Payload (all optional):
+    ``carrier`` (default ``verizon``), ``usage_date`` (ISO, default
+    yesterday UTC), ``tenant_id``."""
+    payload = job.payload or {}
+    carrier = payload.get("carrier") or "verizon"
+    usage_date = (
+        date.fromisoformat(payload["usage_date"]) if payload.get("usage_date") else default_usage_date()
+    )
+    source = get_usage_source(carrier)
+    if source is None:
+        return {"status": "skipped", "reason": f"no usage source for carrier '{carrier}'"}
+    if not source.is_configured:
+        return {"status": "skipped", "reason": "provider credentials not configured"}
+
+    summary = await poll_usage(db, source, usage_date, tenant_id=payload.get("tenant_id") or job.tenant_id)
+    await db.commit()
+    logger.info("Usage poll %s %s: %d rows for %d SIMs (%d unmatched)",
+                carrier, summary["usage_date"], summary["rows"], summary["sims"], summary["unmatched"])
+    return {"status": "completed", **summary}
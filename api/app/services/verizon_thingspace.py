@@ -25,23 +25,28 @@ Environment variables (via Settings):
     VERIZON_THINGSPACE_M2M_ACCOUNT_ID  — override account ID for M2M endpoints
     VERIZON_THINGSPACE_M2M_SESSION_LOGIN_PATH — session login endpoint path
     + mode-specific credential vars (see config.py / .env.example)
+
+HTTP goes through the shared ``verizon`` integration gateway (pooled client,
+rate limit, retries — see ``app.integrations.gateway``).
 """
 
 from __future__ import annotations
 
 import base64
 import logging
+from datetime import date, datetime, time, timedelta, timezone
 from typing import Any
 
 import httpx
 
 from app.config import settings
+from app.integrations.gateway import VendorGateway, gateway
 
 logger = logging.getLogger("true911.verizon")
 
-# Timeouts
-_CONNECT_TIMEOUT = 10.0
-_READ_TIMEOUT = 30.0
+
+def _gateway() -> VendorGateway:
+    return gateway("verizon")
 
 # Supported auth modes (how we obtain a token)
 AUTH_MODES = frozenset({
@@ -298,13 +303,13 @@ class VerizonThingSpaceClient:
 
         logger.info("Verizon OAuth2 client_credentials auth at %s", url)
 
-        async with httpx.AsyncClient(timeout=httpx.Timeout(_READ_TIMEOUT, connect=_CONNECT_TIMEOUT)) as http:
-            resp = await http.post(
-                url,
-                data={"grant_type": "client_credentials"},
-                auth=(client_id, client_secret),
-                headers={"Content-Type": "application/x-www-form-urlencoded"},
-            )
+        resp = await _gateway().post(
+            url,
+            data={"grant_type": "client_credentials"},
+            auth=(client_id, client_secret),
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+            retry=True,
+        )
 
         if resp.status_code != 200:
             logger.error("Verizon OAuth2 auth failed: status=%d", resp.status_code)
@@ -354,16 +359,16 @@ class VerizonThingSpaceClient:
             url, _redact(api_key),
         )
 
-        async with httpx.AsyncClient(timeout=httpx.Timeout(_READ_TIMEOUT, connect=_CONNECT_TIMEOUT)) as http:
-            resp = await http.post(
-                url,
-                data={"grant_type": "client_credentials"},
-                auth=(api_key, api_secret),
-                headers={
-                    "Content-Type": "application/x-www-form-urlencoded",
-                    "VZ-M2M-Token": api_token,
-                },
-            )
+        resp = await _gateway().post(
+            url,
+            data={"grant_type": "client_credentials"},
+            auth=(api_key, api_secret),
+            headers={
+                "Content-Type": "application/x-www-form-urlencoded",
+                "VZ-M2M-Token": api_token,
+            },
+            retry=True,
+        )
 
         if resp.status_code != 200:
             logger.error(
@@ -407,15 +412,15 @@ class VerizonThingSpaceClient:
 
         logger.info("Verizon username/password session auth at %s", url)
 
-        async with httpx.AsyncClient(timeout=httpx.Timeout(_READ_TIMEOUT, connect=_CONNECT_TIMEOUT)) as http:
-            resp = await http.post(
-                url,
-                json={
-                    "username": self._creds["username"],
-                    "password": self._creds["password"],
-                },
-                headers={"Content-Type": "application/json"},
-            )
+        resp = await _gateway().post(
+            url,
+            json={
+                "username": self._creds["username"],
+                "password": self._creds["password"],
+            },
+            headers={"Content-Type": "application/json"},
+            retry=True,
+        )
 
         if resp.status_code != 200:
             logger.error("Verizon session auth failed: status=%d", resp.status_code)
@@ -470,12 +475,12 @@ class VerizonThingSpaceClient:
         if self._session_token:
             headers["Authorization"] = f"Bearer {self._session_token}"
 
-        async with httpx.AsyncClient(timeout=httpx.Timeout(_READ_TIMEOUT, connect=_CONNECT_TIMEOUT)) as http:
-            resp = await http.post(
-                url,
-                json={"username": username, "password": password},
-                headers=headers,
-            )
+        resp = await _gateway().post(
+            url,
+            json={"username": username, "password": password},
+            headers=headers,
+            retry=True,
+        )
 
         if resp.status_code != 200:
             logger.error(
@@ -601,8 +606,7 @@ class VerizonThingSpaceClient:
         url = f"{self.base_url}{path}"
         headers = self._auth_headers()
 
-        async with httpx.AsyncClient(timeout=httpx.Timeout(_READ_TIMEOUT, connect=_CONNECT_TIMEOUT)) as http:
-            resp = await http.request(method, url, headers=headers, json=json, params=params)
+        resp = await _gateway().request(method, url, headers=headers, json=json, params=params)
 
         # 401 retry: re-authenticate (OAuth + session token if needed)
         if resp.status_code == 401 and self._can_reauth:
@@ -612,8 +616,7 @@ class VerizonThingSpaceClient:
                 self._m2m_session_token = None
                 await self._obtain_m2m_session_token()
             headers = self._auth_headers()
-            async with httpx.AsyncClient(timeout=httpx.Timeout(_READ_TIMEOUT, connect=_CONNECT_TIMEOUT)) as http:
-                resp = await http.request(method, url, headers=headers, json=json, params=params)
+            resp = await _gateway().request(method, url, headers=headers, json=json, params=params)
 
         # Session token invalid retry: refresh just the session GUID
         if self._is_session_token_error(resp) and self._needs_m2m_session:
@@ -624,8 +627,7 @@ class VerizonThingSpaceClient:
             self._m2m_session_token = None
             await self._obtain_m2m_session_token()
             headers = self._auth_headers()
-            async with httpx.AsyncClient(timeout=httpx.Timeout(_READ_TIMEOUT, connect=_CONNECT_TIMEOUT)) as http:
-                resp = await http.request(method, url, headers=headers, json=json, params=params)
+            resp = await _gateway().request(method, url, headers=headers, json=json, params=params)
 
         if resp.status_code >= 400:
             header_names = sorted(headers.keys())
@@ -890,6 +892,51 @@ class VerizonThingSpaceClient:
             raise
 
 
+    # Devices per aggregate-usage request.
+    VZ_USAGE_BATCH_SIZE = 500
+
+    async def fetch_daily_usage(
+        self,
+        iccids: list[str],
+        usage_date: date,
+        *,
+        account_name: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """Aggregate usage for *iccids* over one UTC day.
+
+        Uses POST /m2m/v1/devices/usage/actions/list/aggregate, one request
+        per ``VZ_USAGE_BATCH_SIZE`` devices.  Returns the raw per-device
+        records (see :func:`normalize_verizon_usage`).
+        """
+        acct = account_name or self.m2m_account_id or self.account_name
+        if not acct:
+            raise VerizonThingSpaceError("Account name required.")
+
+        start = datetime.combine(usage_date, time.min, tzinfo=timezone.utc)
+        end = start + timedelta(days=1)
+        records: list[dict[str, Any]] = []
+        for i in range(0, len(iccids), self.VZ_USAGE_BATCH_SIZE):
+            chunk = iccids[i:i + self.VZ_USAGE_BATCH_SIZE]
+            data = await self._request(
+                "POST",
+                "/m2m/v1/devices/usage/actions/list/aggregate",
+                json={
+                    "accountName": acct,
+                    "deviceIds": [{"kind": "ICCID", "id": iccid} for iccid in chunk],
+                    "startTime": start.isoformat().replace("+00:00", "Z"),
+                    "endTime": end.isoformat().replace("+00:00", "Z"),
+                },
+            )
+            records.extend(data.get("usage") or data.get("usageList") or data.get("devices") or [])
+
+        logger.info(
+            "Fetched ThingSpace usage for %d/%d devices (date=%s, requests=%d)",
+            len(records), len(iccids), usage_date,
+            -(-len(iccids) // self.VZ_USAGE_BATCH_SIZE),
+        )
+        return records
+
+
 # ── Normalizer ────────────────────────────────────────────────────────────
 
 def normalize_verizon_device(raw: dict[str, Any]) -> dict[str, Any]:
@@ -972,6 +1019,42 @@ def normalize_verizon_device(raw: dict[str, Any]) -> dict[str, Any]:
     }
 
 
+def _as_int(value: Any) -> int:
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return 0
+
+
+def normalize_verizon_usage(raw: dict[str, Any]) -> dict[str, Any] | None:
+    """Convert a ThingSpace aggregate-usage record into the carrier-agnostic
+    usage shape (``iccid``, ``bytes_up``, ``bytes_down``, ``sms_count``).
+
+    ThingSpace reports total data bytes; without an uplink / downlink split
+    the total is recorded as ``bytes_down``.  ``None`` if the record has no
+    ICCID.
+    """
+    ids = raw.get("deviceIds") or raw.get("deviceIdentifiers") or []
+    if isinstance(raw.get("deviceId"), dict):
+        ids = [raw["deviceId"], *ids]
+    iccid = next(
+        (d.get("id") for d in ids if (d.get("kind") or "").upper() == "ICCID" and d.get("id")),
+        None,
+    )
+    if not iccid:
+        return None
+    up = raw.get("dataUsageUplink") or raw.get("bytesUp")
+    down = raw.get("dataUsageDownlink") or raw.get("bytesDown")
+    if up is None and down is None:
+        down = raw.get("dataUsage") or raw.get("totalDataUsage") or raw.get("bytesUsed")
+    return {
+        "iccid": iccid,
+        "bytes_up": _as_int(up),
+        "bytes_down": _as_int(down),
+        "sms_count": _as_int(raw.get("smsUsage") or raw.get("totalSmsUsage")),
+    }
+
+
 # ── Convenience singleton ────────────────────────────────────────────────
 
 _client: VerizonThingSpaceClient | None = None
@@ -8,25 +8,37 @@ Phase 1:
 
 Authentication: OAuth2 refresh_token grant (server-to-server).
 All operations are idempotent via zoho_account_id matching.
+
+Syncs stream pages through :func:`_iter_pages`, which requests page N+1
+while page N is being written, and write each page in bulk: one ``IN``
+lookup plus one ``INSERT ... ON CONFLICT`` (accounts) or one executemany
+``UPDATE`` (contacts).  With ``incremental=True`` the last completed run's
+start time (``zoho_sync_state``) is sent as ``If-Modified-Since`` so only
+changed records come back.  All HTTP goes through the pooled, rate-limited
+"zoho" integration gateway (``app.integrations.gateway``).
 """
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, AsyncIterator, Optional
 
-import httpx
-from sqlalchemy import func, select
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
+from app.integrations.gateway import VendorGateway, gateway
 from app.models.customer import Customer
 from app.models.device import Device
 from app.models.line import Line
 from app.models.sim import Sim
 from app.models.site import Site
 from app.models.tenant import Tenant
+from app.models.zoho_sync_state import ZohoSyncState
 
 logger = logging.getLogger("true911.zoho_crm")
 
@@ -35,6 +47,18 @@ class ZohoCRMError(Exception):
     pass
 
 
+# ── Pooled client ───────────────────────────────────────────────
+
+
+def _gateway() -> VendorGateway:
+    return gateway("zoho")
+
+
+async def aclose_client() -> None:
+    """Close the pooled "zoho" gateway client (one-shot CLIs)."""
+    await _gateway().aclose()
+
+
 # ── OAuth2 Token Management ─────────────────────────────────────
 
 _cached_token: dict | None = None
@@ -53,56 +77,60 @@ async def _get_access_token() -> str:
         if datetime.now(timezone.utc).timestamp() < expires - 60:
             return _cached_token["access_token"]
 
-    async with httpx.AsyncClient(timeout=15.0) as client:
-        resp = await client.post(
-            f"{settings.ZOHO_CRM_ACCOUNTS_DOMAIN}/oauth/v2/token",
-            data={
-                "grant_type": "refresh_token",
-                "client_id": settings.ZOHO_CRM_CLIENT_ID,
-                "client_secret": settings.ZOHO_CRM_CLIENT_SECRET,
-                "refresh_token": settings.ZOHO_CRM_REFRESH_TOKEN,
-            },
-        )
-        if resp.status_code != 200:
-            raise ZohoCRMError(f"Zoho OAuth failed: {resp.status_code} {resp.text[:200]}")
+    resp = await _gateway().post(
+        f"{settings.ZOHO_CRM_ACCOUNTS_DOMAIN}/oauth/v2/token",
+        data={
+            "grant_type": "refresh_token",
+            "client_id": settings.ZOHO_CRM_CLIENT_ID,
+            "client_secret": settings.ZOHO_CRM_CLIENT_SECRET,
+            "refresh_token": settings.ZOHO_CRM_REFRESH_TOKEN,
+        },
+        timeout=15.0,
+        retry=True,
+    )
+    if resp.status_code != 200:
+        raise ZohoCRMError(f"Zoho OAuth failed: {resp.status_code} {resp.text[:200]}")
 
-        data = resp.json()
-        if "access_token" not in data:
-            raise ZohoCRMError(f"Zoho OAuth response missing access_token: {data}")
+    data = resp.json()
+    if "access_token" not in data:
+        raise ZohoCRMError(f"Zoho OAuth response missing access_token: {data}")
 
-        _cached_token = {
-            "access_token": data["access_token"],
-            "expires_at": datetime.now(timezone.utc).timestamp() + data.get("expires_in", 3600),
-        }
-        return _cached_token["access_token"]
+    _cached_token = {
+        "access_token": data["access_token"],
+        "expires_at": datetime.now(timezone.utc).timestamp() + data.get("expires_in", 3600),
+    }
+    return _cached_token["access_token"]
 
 
-async def _zoho_get(path: str, params: dict | None = None) -> dict:
-    """Make an authenticated GET request to Zoho CRM API."""
+async def _zoho_get(path: str, params: dict | None = None, headers: dict | None = None) -> dict:
+    """Make an authenticated GET request to Zoho CRM API.
+
+    Zoho answers 204 (no records) and 304 (nothing modified since
+    ``If-Modified-Since``) without a body; both come back as ``{}``."""
     token = await _get_access_token()
-    async with httpx.AsyncClient(timeout=20.0) as client:
-        resp = await client.get(
-            f"{settings.ZOHO_CRM_API_DOMAIN}/crm/v5{path}",
-            headers={"Authorization": f"Zoho-oauthtoken {token}"},
-            params=params,
-        )
-        if resp.status_code != 200:
-            raise ZohoCRMError(f"Zoho API {path}: {resp.status_code} {resp.text[:300]}")
-        return resp.json()
+    resp = await _gateway().get(
+        f"{settings.ZOHO_CRM_API_DOMAIN}/crm/v5{path}",
+        headers={"Authorization": f"Zoho-oauthtoken {token}", **(headers or {})},
+        params=params,
+    )
+    if resp.status_code in (204, 304):
+        return {}
+    if resp.status_code != 200:
+        raise ZohoCRMError(f"Zoho API {path}: {resp.status_code} {resp.text[:300]}")
+    return resp.json()
 
 
 async def _zoho_put(path: str, data: dict) -> dict:
     """Make an authenticated PUT request to Zoho CRM API."""
     token = await _get_access_token()
-    async with httpx.AsyncClient(timeout=20.0) as client:
-        resp = await client.put(
-            f"{settings.ZOHO_CRM_API_DOMAIN}/crm/v5{path}",
-            headers={"Authorization": f"Zoho-oauthtoken {token}"},
-            json=data,
-        )
-        if resp.status_code not in (200, 201, 202):
-            raise ZohoCRMError(f"Zoho API PUT {path}: {resp.status_code} {resp.text[:300]}")
-        return resp.json()
+    resp = await _gateway().put(
+        f"{settings.ZOHO_CRM_API_DOMAIN}/crm/v5{path}",
+        headers={"Authorization": f"Zoho-oauthtoken {token}"},
+        json=data,
+    )
+    if resp.status_code not in (200, 201, 202):
+        raise ZohoCRMError(f"Zoho API PUT {path}: {resp.status_code} {resp.text[:300]}")
+    return resp.json()
 
 
 def is_configured() -> bool:
@@ -127,6 +155,69 @@ def config_summary() -> dict:
 _DISCRETE_PAGE_LIMIT = 2000
 
 
+def _since_header(modified_since: Optional[datetime]) -> dict:
+    if modified_since is None:
+        return {}
+    if modified_since.tzinfo is None:               # SQLite hands back naive UTC
+        modified_since = modified_since.replace(tzinfo=timezone.utc)
+    return {"headers": {"If-Modified-Since": modified_since.isoformat(timespec="seconds")}}
+
+
+async def _iter_pages(module: str, *, fields: str | None = None, per_page: int = 200,
+                      max_pages: int = 100,
+                      modified_since: Optional[datetime] = None) -> AsyncIterator[list[dict]]:
+    """Yield a module's records page by page, fetching the next page while
+    the caller works on the current one.
+
+    The next request only depends on the current response's ``info``, so it
+    is started before the page is yielded.  Pagination rules are those of
+    :func:`fetch_records`; ``modified_since`` is sent as ``If-Modified-Since``
+    (Zoho then returns only records changed after it)."""
+    extra = _since_header(modified_since)
+
+    def _fetch(page: int, page_token: str | None) -> asyncio.Task:
+        params: dict = {"per_page": per_page}
+        if fields:
+            params["fields"] = fields
+        # Cursor mode once we have a token: Zoho ignores/forbids ``page`` alongside
+        # ``page_token``, so send only the token.  Otherwise use the page number.
+        if page_token:
+            params["page_token"] = page_token
+        else:
+            params["page"] = page
+        return asyncio.create_task(_zoho_get(f"/{module}", params=params, **extra))
+
+    page = 1
+    seen = 0
+    pending: asyncio.Task | None = _fetch(page, None)
+    try:
+        for n in range(max_pages):
+            data = await pending
+            pending = None
+            records = data.get("data") or []
+            info = data.get("info") or {}
+            seen += len(records)
+            page += 1
+
+            if n + 1 < max_pages:
+                next_token = info.get("next_page_token")
+                if next_token:
+                    pending = _fetch(page, next_token)       # continue with the cursor
+                # No cursor token, but Zoho claims more records: page-number pagination
+                # cannot cross the discrete 2000-record limit — stop rather than error.
+                elif records and info.get("more_records") and seen < _DISCRETE_PAGE_LIMIT:
+                    pending = _fetch(page, None)
+
+            if records:
+                yield records
+            if pending is None:
+                break
+    finally:
+        if pending is not None:
+            pending.cancel()
+            pending.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+
 async def fetch_records(module: str = "Accounts", *, fields: str | None = None,
                         per_page: int = 200, max_pages: int = 100) -> list[dict]:
     """READ-ONLY: pull all records from a Zoho CRM module (paginated).  Uses the
@@ -143,180 +234,212 @@ async def fetch_records(module: str = "Accounts", *, fields: str | None = None,
     if not is_configured():
         raise ZohoCRMError("Zoho CRM not configured")
     out: list[dict] = []
-    page = 1
-    page_token: str | None = None
-    for _ in range(max_pages):
-        params: dict = {"per_page": per_page}
-        if fields:
-            params["fields"] = fields
-        # Cursor mode once we have a token: Zoho ignores/forbids ``page`` alongside
-        # ``page_token``, so send only the token.  Otherwise use the page number.
-        if page_token:
-            params["page_token"] = page_token
-        else:
-            params["page"] = page
-        data = await _zoho_get(f"/{module}", params=params)
-        records = data.get("data") or []
+    async for records in _iter_pages(module, fields=fields, per_page=per_page, max_pages=max_pages):
         out.extend(records)
-        info = data.get("info") or {}
-
-        next_token = info.get("next_page_token")
-        if next_token:
-            page_token = next_token          # continue with the cursor (drops ``page``)
-            page += 1
-            continue
-        if not records or not info.get("more_records"):
-            break
-        # No cursor token, but Zoho claims more records: page-number pagination
-        # cannot cross the discrete 2000-record limit — stop rather than error.
-        if len(out) >= _DISCRETE_PAGE_LIMIT:
-            break
-        page_token = None
-        page += 1
     return out
 
 
+# ── Incremental sync watermark ──────────────────────────────────
+
+# Runaway guard for the syncs (200 records per page).
+_SYNC_MAX_PAGES = 1000
+
+# ``zoho_sync_state.scope`` for syncs that are not tenant-scoped.
+_GLOBAL_SCOPE = "*"
+
+
+def _insert(db: AsyncSession):
+    return sqlite_insert if db.get_bind().dialect.name == "sqlite" else pg_insert
+
+
+async def _sync_since(db: AsyncSession, module: str, scope: str, incremental: bool,
+                      modified_since: Optional[datetime]) -> Optional[datetime]:
+    """The ``If-Modified-Since`` for a run: an explicit ``modified_since``,
+    else (incremental runs) the stored watermark; ``None`` means full sync."""
+    if modified_since is not None or not incremental:
+        return modified_since
+    return await db.scalar(
+        select(ZohoSyncState.last_synced_at).where(
+            ZohoSyncState.module == module, ZohoSyncState.scope == scope,
+        )
+    )
+
+
+async def _save_watermark(db: AsyncSession, module: str, scope: str, started_at: datetime) -> None:
+    stmt = _insert(db)(ZohoSyncState.__table__).values(
+        module=module, scope=scope, last_synced_at=started_at,
+    )
+    await db.execute(stmt.on_conflict_do_update(
+        index_elements=["module", "scope"],
+        set_={"last_synced_at": stmt.excluded.last_synced_at, "updated_at": func.now()},
+    ))
+
+
 # ── Sync: Zoho Accounts → True911 Customers ─────────────────────
 
-async def sync_accounts(db: AsyncSession, tenant_id: str) -> dict:
-    """Pull Zoho CRM Accounts and upsert as True911 Customer records."""
+async def _upsert_accounts(db: AsyncSession, tenant_id: str, records: list[dict],
+                           now: datetime) -> tuple[int, int, int]:
+    """Write one page of Accounts: one IN lookup (for the counts) and one
+    ``INSERT ... ON CONFLICT (zoho_account_id) DO UPDATE``.  Returns
+    (created, updated, skipped)."""
+    skipped = 0
+    rows: dict[str, dict] = {}
+    for acct in records:
+        zoho_id = str(acct.get("id", "") or "")
+        if not zoho_id:
+            skipped += 1
+            continue
+        rows[zoho_id] = {
+            "name": acct.get("Account_Name") or "Unknown",
+            "billing_email": acct.get("Email") or acct.get("email") or None,
+            "billing_phone": acct.get("Phone") or acct.get("phone") or None,
+        }
+    if not rows:
+        return 0, 0, skipped
+
+    existing = {
+        r.zoho_account_id: r
+        for r in (await db.execute(
+            select(Customer.zoho_account_id, Customer.name, Customer.billing_email, Customer.billing_phone)
+            .where(Customer.zoho_account_id.in_(list(rows)))
+        )).all()
+    }
+    created = updated = 0
+    for zoho_id, v in rows.items():
+        cur = existing.get(zoho_id)
+        if cur is None:
+            created += 1
+        elif (cur.name != v["name"]
+              or (v["billing_email"] and cur.billing_email != v["billing_email"])
+              or (v["billing_phone"] and cur.billing_phone != v["billing_phone"])):
+            updated += 1
+        else:
+            skipped += 1
+
+    table = Customer.__table__
+    stmt = _insert(db)(table).values([
+        {
+            "tenant_id": tenant_id,
+            "zoho_account_id": zoho_id,
+            **v,
+            "status": "active",
+            "zoho_sync_status": "synced",
+            "zoho_last_synced_at": now,
+            "onboarding_status": "pending",
+        }
+        for zoho_id, v in rows.items()
+    ])
+    # Existing customers keep their tenant and onboarding status; a blank
+    # Zoho email / phone never clears ours.
+    await db.execute(stmt.on_conflict_do_update(
+        index_elements=["zoho_account_id"],
+        set_={
+            "name": stmt.excluded.name,
+            "billing_email": func.coalesce(stmt.excluded.billing_email, table.c.billing_email),
+            "billing_phone": func.coalesce(stmt.excluded.billing_phone, table.c.billing_phone),
+            "zoho_sync_status": stmt.excluded.zoho_sync_status,
+            "zoho_last_synced_at": stmt.excluded.zoho_last_synced_at,
+            "updated_at": func.now(),
+        },
+    ))
+    return created, updated, skipped
+
+
+async def sync_accounts(db: AsyncSession, tenant_id: str, *, incremental: bool = False,
+                        modified_since: Optional[datetime] = None) -> dict:
+    """Pull Zoho CRM Accounts and upsert as True911 Customer records.
+
+    ``incremental`` only pulls Accounts modified since the last completed
+    sync into this tenant (a full sync when there is none yet);
+    ``modified_since`` overrides the stored watermark."""
     if not is_configured():
         raise ZohoCRMError("Zoho CRM not configured")
 
-    created = 0
-    updated = 0
-    skipped = 0
-    page = 1
-    now = datetime.now(timezone.utc)
-
-    while True:
-        try:
-            data = await _zoho_get("/Accounts", params={"page": page, "per_page": 200})
-        except ZohoCRMError:
-            break
-
-        records = data.get("data") or []
-        if not records:
-            break
-
-        for acct in records:
-            zoho_id = str(acct.get("id", ""))
-            if not zoho_id:
-                skipped += 1
-                continue
-
-            name = acct.get("Account_Name") or "Unknown"
-            email = acct.get("Email") or acct.get("email")
-            phone = acct.get("Phone") or acct.get("phone")
-
-            # Upsert by zoho_account_id
-            result = await db.execute(
-                select(Customer).where(Customer.zoho_account_id == zoho_id)
-            )
-            existing = result.scalar_one_or_none()
-
-            if existing:
-                changed = False
-                if existing.name != name:
-                    existing.name = name
-                    changed = True
-                if email and existing.billing_email != email:
-                    existing.billing_email = email
-                    changed = True
-                if phone and existing.billing_phone != phone:
-                    existing.billing_phone = phone
-                    changed = True
-                existing.zoho_sync_status = "synced"
-                existing.zoho_last_synced_at = now
-                if changed:
-                    updated += 1
-                else:
-                    skipped += 1
-            else:
-                customer = Customer(
-                    tenant_id=tenant_id,
-                    name=name,
-                    billing_email=email,
-                    billing_phone=phone,
-                    zoho_account_id=zoho_id,
-                    zoho_sync_status="synced",
-                    zoho_last_synced_at=now,
-                    onboarding_status="pending",
-                )
-                db.add(customer)
-                created += 1
-
-        if not data.get("info", {}).get("more_records"):
-            break
-        page += 1
+    started = datetime.now(timezone.utc)
+    since = await _sync_since(db, "Accounts", tenant_id, incremental, modified_since)
+    created = updated = skipped = 0
+    async for records in _iter_pages("Accounts", max_pages=_SYNC_MAX_PAGES, modified_since=since):
+        c, u, s = await _upsert_accounts(db, tenant_id, records, started)
+        created += c
+        updated += u
+        skipped += s
 
+    await _save_watermark(db, "Accounts", tenant_id, started)
     await db.commit()
-    logger.info("Zoho account sync: created=%d updated=%d skipped=%d", created, updated, skipped)
-    return {"created": created, "updated": updated, "skipped": skipped}
+    logger.info("Zoho account sync: created=%d updated=%d skipped=%d since=%s",
+                created, updated, skipped, since)
+    return {"created": created, "updated": updated, "skipped": skipped,
+            "modified_since": since.isoformat() if since else None}
 
 
 # ── Sync: Zoho Contacts → Customer contact fields ───────────────
 
-async def sync_contacts(db: AsyncSession) -> dict:
-    """Pull Zoho CRM Contacts and update primary contact on linked Customers."""
-    if not is_configured():
-        raise ZohoCRMError("Zoho CRM not configured")
-
-    updated = 0
+async def _apply_contacts(db: AsyncSession, records: list[dict]) -> tuple[int, int]:
+    """Write one page of Contacts: one IN lookup of the linked Customers and
+    one executemany UPDATE of the ones that change.  Contact fields only
+    fill blanks — the first contact seen for an account wins.  Returns
+    (updated, skipped)."""
     skipped = 0
-    page = 1
+    by_account: dict[str, list[dict]] = {}
+    for contact in records:
+        account_ref = contact.get("Account_Name")
+        account_id = str(account_ref.get("id", "") or "") if isinstance(account_ref, dict) else ""
+        if not account_id:
+            skipped += 1
+            continue
+        by_account.setdefault(account_id, []).append(contact)
+    if not by_account:
+        return 0, skipped
 
-    while True:
-        try:
-            data = await _zoho_get("/Contacts", params={"page": page, "per_page": 200})
-        except ZohoCRMError:
-            break
-
-        records = data.get("data") or []
-        if not records:
-            break
-
-        for contact in records:
-            account_id = None
-            account_ref = contact.get("Account_Name")
-            if isinstance(account_ref, dict):
-                account_id = str(account_ref.get("id", ""))
-            elif isinstance(account_ref, str):
-                # Try to find customer by name
-                pass
-
-            if not account_id:
-                skipped += 1
-                continue
-
-            result = await db.execute(
-                select(Customer).where(Customer.zoho_account_id == account_id)
-            )
-            customer = result.scalar_one_or_none()
-            if not customer:
-                skipped += 1
-                continue
-
-            name = f"{contact.get('First_Name', '')} {contact.get('Last_Name', '')}".strip()
-            email = contact.get("Email")
-            phone = contact.get("Phone") or contact.get("Mobile")
-            zoho_contact_id = str(contact.get("id", ""))
-
-            if not customer.zoho_contact_id:
-                customer.zoho_contact_id = zoho_contact_id
-            if email and not customer.billing_email:
-                customer.billing_email = email
-            if phone and not customer.billing_phone:
-                customer.billing_phone = phone
-            updated += 1
+    customers = (await db.execute(
+        select(Customer.id, Customer.zoho_account_id, Customer.zoho_contact_id,
+               Customer.billing_email, Customer.billing_phone)
+        .where(Customer.zoho_account_id.in_(list(by_account)))
+    )).all()
+
+    updated = 0
+    changes: list[dict] = []
+    for cust in customers:
+        contacts = by_account.pop(cust.zoho_account_id)
+        before = {"zoho_contact_id": cust.zoho_contact_id,
+                  "billing_email": cust.billing_email, "billing_phone": cust.billing_phone}
+        after = dict(before)
+        for contact in contacts:
+            after["zoho_contact_id"] = after["zoho_contact_id"] or str(contact.get("id", "") or "") or None
+            after["billing_email"] = after["billing_email"] or contact.get("Email") or None
+            after["billing_phone"] = (after["billing_phone"] or contact.get("Phone")
+                                      or contact.get("Mobile") or None)
+        updated += len(contacts)
+        if after != before:
+            changes.append({"id": cust.id, **after})
+    skipped += sum(len(v) for v in by_account.values())        # no linked customer
+
+    if changes:
+        await db.execute(update(Customer), changes)
+    return updated, skipped
+
+
+async def sync_contacts(db: AsyncSession, *, incremental: bool = False,
+                        modified_since: Optional[datetime] = None) -> dict:
+    """Pull Zoho CRM Contacts and update primary contact on linked Customers.
+
+    ``incremental`` / ``modified_since`` as for :func:`sync_accounts`."""
+    if not is_configured():
+        raise ZohoCRMError("Zoho CRM not configured")
 
-        if not data.get("info", {}).get("more_records"):
-            break
-        page += 1
+    started = datetime.now(timezone.utc)
+    since = await _sync_since(db, "Contacts", _GLOBAL_SCOPE, incremental, modified_since)
+    updated = skipped = 0
+    async for records in _iter_pages("Contacts", max_pages=_SYNC_MAX_PAGES, modified_since=since):
+        u, s = await _apply_contacts(db, records)
+        updated += u
+        skipped += s
 
+    await _save_watermark(db, "Contacts", _GLOBAL_SCOPE, started)
     await db.commit()
-    logger.info("Zoho contact sync: updated=%d skipped=%d", updated, skipped)
-    return {"updated": updated, "skipped": skipped}
+    logger.info("Zoho contact sync: updated=%d skipped=%d since=%s", updated, skipped, since)
+    return {"updated": updated, "skipped": skipped,
+            "modified_since": since.isoformat() if since else None}
 
 
 # ── Push: True911 status → Zoho CRM Account ─────────────────────
@@ -0,0 +1,40 @@
+"""Deadline sweep for the stored device / site health status.
+
+    python -m app.sweep_health_status
+
+Recomputes the devices whose ``status_due_at`` has passed — a heartbeat or
+telemetry observation that just went stale with no write to notice it — and
+re-derives their sites (see :mod:`app.services.status_rollup`).  The first
+run after migration 061 also fills every row that has no stored status yet.
+Safe to re-run; a run with nothing due is two indexed queries.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+logger = logging.getLogger("true911.sweep_health_status")
+
+
+async def run() -> dict:
+    from app.database import AsyncSessionLocal
+    from app.services import status_rollup
+
+    async with AsyncSessionLocal() as db:
+        return await status_rollup.sweep_due(db)
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    summary = asyncio.run(run())
+    for k, v in summary.items():
+        print(f"  {k:18}: {v}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Nightly Zoho CRM sync — Accounts → Customers, then Contacts.
+
+    # incremental (only records modified since the last completed run)
+    ZOHO_SYNC_TENANT=acme python -m app.sync_zoho_crm
+
+    # full re-sync
+    ZOHO_SYNC_TENANT=acme ZOHO_SYNC_FULL=true python -m app.sync_zoho_crm
+
+Runs :func:`app.services.zoho_crm.sync_accounts` / ``sync_contacts`` in
+process (the same code as ``POST /api/zoho-crm/sync/*``).  The first
+incremental run has no watermark yet and syncs everything.  A no-op until
+the ZOHO_CRM_* credentials are set.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+logger = logging.getLogger("true911.sync_zoho_crm")
+
+
+async def run(tenant_id: str, incremental: bool) -> dict:
+    from app.database import AsyncSessionLocal
+    from app.services import zoho_crm
+
+    if not zoho_crm.is_configured():
+        return {"status": "skipped", "reason": "Zoho CRM not configured"}
+    async with AsyncSessionLocal() as db:
+        accounts = await zoho_crm.sync_accounts(db, tenant_id, incremental=incremental)
+        contacts = await zoho_crm.sync_contacts(db, incremental=incremental)
+    await zoho_crm.aclose_client()
+    return {"status": "completed", "accounts": accounts, "contacts": contacts}
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    tenant_id = os.environ.get("ZOHO_SYNC_TENANT")
+    if not tenant_id:
+        logger.warning("ZOHO_SYNC_TENANT not set (tenant new Customers are created in); skipping")
+        return
+    incremental = os.environ.get("ZOHO_SYNC_FULL", "false").lower() != "true"
+
+    summary = asyncio.run(run(tenant_id, incremental))
+    for k, v in summary.items():
+        print(f"  {k:10}: {v}")
+
+
+if __name__ == "__main__":
+    main()
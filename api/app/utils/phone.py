@@ -0,0 +1,27 @@
+"""Phone-number normalization shared by models and services.
+
+Pure functions, no imports from the app — safe to use from ``app.models``.
+"""
+
+from __future__ import annotations
+
+import re
+
+_NON_DIGITS = re.compile(r"\D+")
+
+
+def digits_only(value: str) -> str:
+    """Return only the digits of *value* (drops +, spaces, dashes, parens)."""
+    return _NON_DIGITS.sub("", value or "")
+
+
+def normalize_phone(value: str) -> str:
+    """Normalize a phone-like value to its trailing 10 digits when it looks
+    like a NANP number (optionally with a leading country code), else to its
+    full digit string.  This lets ``+1 (856) 308-1391`` and ``8563081391``
+    and ``18563081391`` all match.
+    """
+    d = digits_only(value)
+    if len(d) == 11 and d.startswith("1"):
+        return d[1:]
+    return d
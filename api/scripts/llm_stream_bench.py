@@ -0,0 +1,248 @@
+"""LLLM provider latency harness — fake Anthropic endpoint, real transport.
+
+Measures what a user of the AI Health Summary actually waits for:
+
+  * **TTFB** — time until the first text delta reaches the caller
+    (``AnthropicProvider.stream``), or until the whole body arrives for
+    the non-streamed ``generate()`` call.
+  * **total** — time until the final result is available.
+
+Runs entirely on localhost.  A tiny asyncio HTTP/1.1 server impersonates
+``POST /v1/messages`` (both the JSON and the ``"stream": true`` SSE
+shapes) with configurable first-token and per-token delays, and the
+REAL ``AnthropicProvider`` is pointed at it through
+``LLLM_PROVIDER_BASE_URL`` — so pooling, SSE parsing and keep-alive are
+exercised exactly as in production, minus the network.  No API key,
+no egress, no database.
+
+Modes compared (each ``--iterations`` calls):
+  * ``generate/pooled``   — non-streamed, shared keep-alive client
+  * ``generate/unpooled`` — non-streamed, pool closed between calls
+                            (what every call cost before pooling)
+  * ``stream/pooled``     — streamed, shared keep-alive client
+
+Usage:
+    python -m scripts.llm_stream_bench --iterations 20 \\
+        --first-token-ms 400 --token-ms 15 --tokens 120 --json /tmp/llm_bench.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+# A summary body the validator accepts, so the harness output is
+# representative of a real accepted response.
+_SUMMARY = json.dumps({
+    "current_status": "Fleet stable; 2 sites need attention.",
+    "likely_issue": "Two devices have not reported a heartbeat recently.",
+    "recommended_next_step": "Check power and connectivity at the affected sites.",
+    "confidence": 0.82,
+    "internal_summary": "Most sites connected; two stale devices and one open warning incident.",
+})
+
+
+class FakeAnthropicServer:
+    """Minimal keep-alive HTTP/1.1 server speaking the Messages API shapes."""
+
+    def __init__(self, *, first_token_ms: float, token_ms: float, tokens: int):
+        self.first_token_s = first_token_ms / 1000.0
+        self.token_s = token_ms / 1000.0
+        self.tokens = max(1, tokens)
+        self.connections = 0
+        self._server: asyncio.AbstractServer | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}/v1/messages"
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+
+    async def stop(self) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+    def _pieces(self) -> list[str]:
+        size = max(1, -(-len(_SUMMARY) // self.tokens))
+        return [_SUMMARY[i:i + size] for i in range(0, len(_SUMMARY), size)]
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                length = 0
+                while True:
+                    header = await reader.readline()
+                    if header in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = header.decode("latin-1").partition(":")
+                    if name.strip().lower() == "content-length":
+                        length = int(value.strip())
+                body = json.loads(await reader.readexactly(length)) if length else {}
+                if body.get("stream"):
+                    await self._stream(writer)
+                else:
+                    await self._json(writer)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _json(self, writer: asyncio.StreamWriter) -> None:
+        pieces = self._pieces()
+        await asyncio.sleep(self.first_token_s + self.token_s * (len(pieces) - 1))
+        payload = json.dumps({
+            "model": "fake-claude",
+            "content": [{"type": "text", "text": "".join(pieces)}],
+            "usage": {"input_tokens": 500, "output_tokens": len(pieces)},
+        }).encode()
+        writer.write(
+            b"HTTP/1.1 200 OK\r\ncontent-type: application/json\r\n"
+            + f"content-length: {len(payload)}\r\n\r\n".encode()
+            + payload
+        )
+        await writer.drain()
+
+    async def _stream(self, writer: asyncio.StreamWriter) -> None:
+        writer.write(
+            b"HTTP/1.1 200 OK\r\ncontent-type: text/event-stream\r\n"
+            b"transfer-encoding: chunked\r\n\r\n"
+        )
+
+        async def frame(event: str, data: dict) -> None:
+            raw = f"event: {event}\ndata: {json.dumps(data)}\n\n".encode()
+            writer.write(f"{len(raw):x}\r\n".encode() + raw + b"\r\n")
+            await writer.drain()
+
+        pieces = self._pieces()
+        await frame("message_start", {
+            "type": "message_start",
+            "message": {"model": "fake-claude", "usage": {"input_tokens": 500}},
+        })
+        await asyncio.sleep(self.first_token_s)
+        for i, piece in enumerate(pieces):
+            if i:
+                await asyncio.sleep(self.token_s)
+            await frame("content_block_delta", {
+                "type": "content_block_delta",
+                "delta": {"type": "text_delta", "text": piece},
+            })
+        await frame("message_delta", {"type": "message_delta", "usage": {"output_tokens": len(pieces)}})
+        await frame("message_stop", {"type": "message_stop"})
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+
+def _percentiles(samples: list[float]) -> dict:
+    ordered = sorted(samples)
+    if not ordered:
+        return {}
+
+    def pct(p: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))], 1)
+
+    return {
+        "p50": pct(0.50),
+        "p95": pct(0.95),
+        "max": round(ordered[-1], 1),
+        "mean": round(statistics.fmean(ordered), 1),
+    }
+
+
+async def _run(args) -> dict:
+    from app.config import settings
+    from app.services.llm.providers import anthropic_provider as ap
+
+    server = FakeAnthropicServer(
+        first_token_ms=args.first_token_ms, token_ms=args.token_ms, tokens=args.tokens
+    )
+    await server.start()
+    settings.ANTHROPIC_API_KEY = "bench-local"
+    settings.LLLM_PROVIDER_BASE_URL = server.url
+    provider = ap.AnthropicProvider()
+    call = {"system_prompt": "bench", "user_prompt": "bench", "timeout_seconds": 30.0, "model": "fake"}
+
+    results: dict[str, dict] = {}
+    try:
+        for mode in ("generate/pooled", "generate/unpooled", "stream/pooled"):
+            await ap.aclose_client()
+            before = server.connections
+            ttfb: list[float] = []
+            total: list[float] = []
+            for _ in range(args.iterations):
+                if mode == "generate/unpooled":
+                    await ap.aclose_client()
+                start = time.perf_counter()
+                if mode.startswith("generate"):
+                    result = await provider.generate(**call)
+                    elapsed = (time.perf_counter() - start) * 1000
+                    ttfb.append(elapsed)
+                    total.append(elapsed)
+                else:
+                    first = None
+                    async for chunk in provider.stream(**call):
+                        if chunk.text and first is None:
+                            first = (time.perf_counter() - start) * 1000
+                        if chunk.result is not None:
+                            result = chunk.result
+                    total.append((time.perf_counter() - start) * 1000)
+                    ttfb.append(first if first is not None else total[-1])
+                if result.status != "ok":
+                    raise RuntimeError(f"{mode}: provider returned {result.status}: {result.error_summary}")
+            results[mode] = {
+                "ttfb_ms": _percentiles(ttfb),
+                "total_ms": _percentiles(total),
+                "connections_opened": server.connections - before,
+            }
+    finally:
+        await ap.aclose_client()
+        await server.stop()
+
+    return {
+        "iterations": args.iterations,
+        "fake_provider": {
+            "first_token_ms": args.first_token_ms,
+            "token_ms": args.token_ms,
+            "tokens": args.tokens,
+        },
+        "modes": results,
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="LLLM provider TTFB / latency harness (local fake provider).")
+    ap.add_argument("--iterations", type=int, default=20)
+    ap.add_argument("--first-token-ms", type=float, default=400.0)
+    ap.add_argument("--token-ms", type=float, default=15.0)
+    ap.add_argument("--tokens", type=int, default=120)
+    ap.add_argument("--json", default=None, help="write the report as JSON to this path")
+    args = ap.parse_args()
+
+    report = asyncio.run(_run(args))
+
+    print(f"{'mode':<20} {'ttfb p50':>9} {'ttfb p95':>9} {'total p50':>10} {'total p95':>10} {'conns':>6}")
+    for mode, r in report["modes"].items():
+        print(
+            f"{mode:<20} {r['ttfb_ms']['p50']:>9} {r['ttfb_ms']['p95']:>9} "
+            f"{r['total_ms']['p50']:>10} {r['total_ms']['p95']:>10} {r['connections_opened']:>6}"
+        )
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+        print(f"\nwrote {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Building→site linking benchmark — synthetic tenant, no database.
+
+Times the pure linking step of the customer portfolio registry view
+(``portfolio_registry_view.build_link_indexes`` + one
+``_resolve_building_site_ids`` per building) on a synthetic tenant, and
+the previous per-building scan of every device mapping for comparison.
+
+The synthetic tenant (defaults: 5,000 buildings, 20,000 device mappings):
+  * one Site per building, named ``Store #<n>`` with a street address
+  * every building carries its store number and address
+  * ``--mappings`` active ``true911_device`` mappings spread round-robin
+    across the buildings, each naming that building's site
+
+Both strategies must produce identical links; the harness checks that
+before reporting.
+
+Usage:
+    python -m scripts.registry_link_bench --buildings 5000 --mappings 20000 \\
+        --repeat 3 --json /tmp/link_bench.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+
+def _tenant(n_buildings: int, n_mappings: int):
+    sites, buildings, mappings = [], [], []
+    for i in range(n_buildings):
+        store = str(i % 10000)
+        sites.append((SimpleNamespace(site_id=f"S{i:06d}", site_name=f"Store #{store}",
+                                      e911_street=f"{i} Main St", e911_city="Springfield",
+                                      e911_state="IL"), None))
+        buildings.append(SimpleNamespace(id=i + 1, store_number=store, address=f"{i} Main St",
+                                         city="Springfield", state="IL"))
+    for j in range(n_mappings):
+        b = j % n_buildings
+        mappings.append(SimpleNamespace(active=True, kind="true911_device", building_id=b + 1,
+                                        value=f"S{b:06d}", value_normalized=f"DEV{j:07d}"))
+    return sites, buildings, mappings
+
+
+def _legacy_link(prv, sites, buildings, mappings):
+    """The pre-index algorithm: every building scans every device mapping."""
+    site_by_id, by_store, by_addr, _ = prv.build_link_indexes(sites, [])
+    dev_site = {}
+    for m in mappings:
+        if m.active and m.kind == "true911_device":
+            dev_site[m.value_normalized] = (m.building_id, m.value)
+    out = []
+    for b in buildings:
+        ids = set()
+        for _norm, (bid, raw) in dev_site.items():
+            if bid == b.id:
+                ids.add(raw)
+        if b.store_number:
+            ids.update(by_store.get(str(b.store_number), []))
+        a = prv._norm_addr_parts(b.address, b.city, b.state)
+        if a:
+            ids.update(by_addr.get(a, []))
+        out.append({sid for sid in ids if sid in site_by_id})
+    return out
+
+
+def _indexed_link(prv, sites, buildings, mappings):
+    site_by_id, by_store, by_addr, dev_by_building = prv.build_link_indexes(sites, mappings)
+    return [{sid for sid in prv._resolve_building_site_ids(b, by_store, by_addr, dev_by_building)
+             if sid in site_by_id} for b in buildings]
+
+
+def _best_ms(fn, repeat: int):
+    best, result = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return round(best, 1), result
+
+
+def run(n_buildings: int, n_mappings: int, repeat: int, *, legacy: bool = True) -> dict:
+    from app.services.customer import portfolio_registry_view as prv
+
+    sites, buildings, mappings = _tenant(n_buildings, n_mappings)
+    report = {"buildings": n_buildings, "mappings": n_mappings, "repeat": repeat}
+    report["indexed_ms"], indexed = _best_ms(
+        lambda: _indexed_link(prv, sites, buildings, mappings), repeat)
+    if legacy:
+        report["legacy_ms"], before = _best_ms(
+            lambda: _legacy_link(prv, sites, buildings, mappings), repeat)
+        if before != indexed:
+            raise RuntimeError("indexed linking disagrees with the legacy algorithm")
+    return report
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Building→site linking benchmark (synthetic tenant).")
+    ap.add_argument("--buildings", type=int, default=5000)
+    ap.add_argument("--mappings", type=int, default=20000)
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--no-legacy", action="store_true", help="skip the O(buildings × mappings) baseline")
+    ap.add_argument("--json", default=None, help="write the report as JSON to this path")
+    args = ap.parse_args()
+
+    report = run(args.buildings, args.mappings, args.repeat, legacy=not args.no_legacy)
+    print(f"{report['buildings']} buildings, {report['mappings']} device mappings "
+          f"(best of {report['repeat']})")
+    print(f"  indexed: {report['indexed_ms']:>10} ms")
+    if "legacy_ms" in report:
+        print(f"  legacy:  {report['legacy_ms']:>10} ms")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+        print(f"\nwrote {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""RH portfolio certification benchmark — synthetic portfolio, no database.
+
+Times ``rh_portfolio_certification.certify`` (indexed candidate generation
+via ``SiteIndex``) on a synthetic portfolio, and the previous pair-wise
+``match_site`` scan of every site per canonical location for comparison.
+
+The synthetic portfolio (defaults: 10,000 locations):
+  * one Zoho row per location, ``Restoration Hardware #<n> <city>`` (each
+    location in its own city), with a street address, an MSISDN and an
+    IMEI; every 50th location has a second device row, every 97th is a
+    label with no store number
+  * one True911 site per location (``RH #<n> <city>``) with the same address,
+    except every 20th site, which is renamed / re-addressed so some locations
+    match on a single signal and some not at all
+  * a device per site carrying the location's phone and IMEI, and a unit on
+    every other site
+
+Both strategies must write byte-identical CSV / JSON / markdown reports; the
+harness checks that before reporting.
+
+Usage:
+    python -m scripts.rh_certification_bench --locations 10000 --repeat 1 \\
+        --json /tmp/rh_cert_bench.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+
+def _portfolio(n: int):
+    rows, sites, devices, units = [], [], [], []
+    for i in range(1, n + 1):
+        city = f"Riverton{i}"
+        street = f"{i} Commerce Way"
+        label = (f"Restoration Hardware {city} Annex {i}" if i % 97 == 0
+                 else f"Restoration Hardware #{i} {city}")
+        for d in range(2 if i % 50 == 0 else 1):
+            rows.append({"account_name": label, "facility_name": None, "street": street,
+                         "city": city, "state": "FL", "zip": f"{32000 + i % 1000}",
+                         "facility_type": "Commercial", "activation_status": "Activated",
+                         "msisdn": f"904{i:07d}", "emergency_line": True,
+                         "connection_type": "Alarm Panel", "imei": f"35{i:09d}{d}",
+                         "sim": None, "starlink_id": None})
+        sid = f"RH-{i:05d}"
+        moved = i % 20 == 0
+        sites.append({"site_id": sid, "name": f"RH Site {i + 7 * n}" if moved else f"RH #{i} {city}",
+                      "street": f"{i} Harbor Rd" if moved else street, "city": city, "state": "FL",
+                      "zip": None, "e911_status": "validated" if i % 3 else "pending"})
+        devices.append({"device_id": f"D{i}", "site_id": sid, "msisdn": f"904{i:07d}",
+                        "imei": f"35{i:09d}0", "iccid": None, "starlink_id": None,
+                        "serial_number": None, "model": "x", "device_type": "y"})
+        if i % 2:
+            units.append({"unit_id": f"U{i}", "site_id": sid, "unit_type": "fire_alarm",
+                          "device_id": None, "line_id": None})
+    true911 = {"tenant": "bench", "sites": sites, "devices": devices, "units": units,
+               "lines": [], "_zoho_rows": len(rows)}
+    return true911, rows
+
+
+def _legacy_match_site(cert, canon, sites, site_phones, site_device_ids, index=None):
+    """The pre-index algorithm: every location scans (and re-normalizes) every site."""
+    ca = cert.norm_addr(canon.get("street"), canon.get("city"), canon.get("state"))
+    cstore = canon.get("store_number")
+    known_tokens = canon.get("known_tokens") or []
+    out = []
+    for s in sites:
+        sid = s.get("site_id")
+        raw_blob = f"{s.get('name') or ''} {sid or ''}"
+        norm_blob = cert.norm_name(raw_blob)
+        sig_store = bool(cstore) and cstore.isdigit() and bool(
+            re.search(rf"#?\s*0*{re.escape(cstore)}\b", raw_blob))
+        sig_addr = bool(ca) and ca == cert.norm_addr(s.get("street"), s.get("city"), s.get("state"))
+        sig_name = cert._name_match(canon.get("raw_zoho_name"), s.get("name"))
+        sig_phone = bool(set(canon.get("phones", [])) & site_phones.get(sid, set()))
+        sig_device = bool(set(canon.get("device_ids", [])) & site_device_ids.get(sid, set()))
+        sig_known = any(
+            (tok in norm_blob if " " in tok else tok in set(norm_blob.split()))
+            for tok in known_tokens)
+        signals = {"store": sig_store, "addr": sig_addr, "name": sig_name,
+                   "phone": sig_phone, "device": sig_device, "known": sig_known}
+        if any(signals.values()):
+            out.append({"site": s, "signals": signals, "score": sum(signals.values())})
+    return sorted(out, key=lambda m: -m["score"])
+
+
+def _artifacts(cert, true911, canon, out_dir: str) -> bytes:
+    report = cert.certify(true911, canon)
+    report["canonical_locations"] = canon
+    paths = [os.path.join(out_dir, name) for name in ("cert.csv", "cert.json", "cert.md")]
+    cert.write_csv(paths[0], report["findings"])
+    cert.write_json(paths[1], report)
+    cert.write_markdown_report(paths[2], report)
+    blob = b""
+    for p in paths:
+        with open(p, "rb") as fh:
+            blob += fh.read()
+    return blob
+
+
+def _best_ms(fn, repeat: int):
+    best, result = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return round(best, 1), result
+
+
+def run(n_locations: int, repeat: int, *, legacy: bool = True) -> dict:
+    from scripts import rh_portfolio_certification as cert
+
+    true911, rows = _portfolio(n_locations)
+    canon = cert.build_canonical_locations(rows)
+    report = {"locations": len(canon), "sites": len(true911["sites"]), "repeat": repeat}
+    with tempfile.TemporaryDirectory() as tmp:
+        report["indexed_ms"], indexed = _best_ms(
+            lambda: _artifacts(cert, true911, canon, tmp), repeat)
+        if legacy:
+            indexed_match = cert.match_site
+            cert.match_site = lambda *a: _legacy_match_site(cert, *a)
+            try:
+                report["legacy_ms"], before = _best_ms(
+                    lambda: _artifacts(cert, true911, canon, tmp), repeat)
+            finally:
+                cert.match_site = indexed_match
+            if before != indexed:
+                raise RuntimeError("indexed certification disagrees with the legacy algorithm")
+    return report
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="RH portfolio certification benchmark (synthetic portfolio).")
+    ap.add_argument("--locations", type=int, default=10000)
+    ap.add_argument("--repeat", type=int, default=1)
+    ap.add_argument("--no-legacy", action="store_true", help="skip the O(locations × sites) baseline")
+    ap.add_argument("--json", default=None, help="write the report as JSON to this path")
+    args = ap.parse_args()
+
+    report = run(args.locations, args.repeat, legacy=not args.no_legacy)
+    print(f"{report['locations']} canonical locations, {report['sites']} True911 sites "
+          f"(best of {report['repeat']})")
+    print(f"  indexed: {report['indexed_ms']:>10} ms")
+    if "legacy_ms" in report:
+        print(f"  legacy:  {report['legacy_ms']:>10} ms")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+        print(f"\nwrote {args.json}")
+
+
+if __name__ == "__main__":
+    main()
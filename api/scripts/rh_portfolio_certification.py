@@ -53,6 +53,18 @@ from collections import Counter, defaultdict
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
+# Pure normalization + known RH special locations (shared with the fusion engine).
+from app.services.rh_labels import (  # noqa: E402,F401
+    KNOWN_RH_LOCATIONS,
+    detect_site_type,
+    extract_store_number,
+    is_rh_label,
+    match_known_location,
+    norm_addr,
+    norm_name,
+    norm_phone,
+)
+
 DEFAULT_TENANT = os.environ.get("RH_READINESS_TENANT", "restoration-hardware")
 DEFAULT_CSV = "/tmp/rh_portfolio_certification.csv"
 DEFAULT_JSON = "/tmp/rh_portfolio_certification.json"
@@ -133,127 +145,6 @@ CONDITIONAL_CLASSES = frozenset({CLASS_POSSIBLE, CLASS_MISSING_ZOHO, CLASS_DUP_Z
                                  CLASS_ADDR_MISMATCH, CLASS_PHONE_MISMATCH, CLASS_WEIRD_LABEL})
 
 
-# ══════════════════════════════════════════════════════════════════════
-# Pure normalization (unit-tested; no DB, no Zoho, no I/O)
-# ══════════════════════════════════════════════════════════════════════
-def norm_name(s) -> str:
-    return re.sub(r"[^a-z0-9]+", " ", (s or "").lower()).strip()
-
-
-def norm_addr(street, city, state) -> str:
-    return norm_name(f"{street or ''} {city or ''} {state or ''}")
-
-
-def norm_phone(s) -> str:
-    digits = re.sub(r"\D", "", str(s or ""))
-    return digits[-10:] if len(digits) >= 10 else digits
-
-
-def is_rh_label(*labels) -> bool:
-    """True when any label looks Restoration-Hardware-related (incl. aliases)."""
-    blob = " ".join((x or "") for x in labels).lower()
-    if "restoration hardware" in blob or "restoration hdwr" in blob:
-        return True
-    # operator-confirmed known special location (e.g. a bare "MDC" / "RHNYC")
-    if match_known_location(blob):
-        return True
-    # standalone RH token or an RH### / RH- store code
-    return bool(re.search(r"\brh\b", blob) or re.search(r"\brh[#\-\s]?\d", blob))
-
-
-def extract_store_number(name) -> str | None:
-    """Store number from an RH label.  Numeric (#177 / # 177 / -150 / #001) is
-    returned without leading zeros; an alpha store code (#RHNYC) is returned
-    upper-cased.  Ambiguous / address-like numbers return None (manual review)."""
-    n = name or ""
-    m = re.search(r"#\s*0*(\d{1,4})\b", n)
-    if m:
-        return m.group(1)
-    m = re.search(r"(?:hardware|hdwr)\s*[-–]\s*0*(\d{2,4})\b", n, re.I)
-    if m:
-        return m.group(1)
-    m = re.search(r"#\s*(RH[A-Z0-9]+)\b", n, re.I)
-    if m:
-        return m.group(1).upper()
-    return None
-
-
-def detect_site_type(name) -> str:
-    """Coarse RH location type from the label.  'store' is the default; the rest
-    are context an operator should confirm."""
-    b = (name or "").lower()
-    if "guest" in b:
-        return "guest_house"
-    if "warehouse" in b:
-        return "warehouse"
-    if "outlet" in b:
-        return "outlet"
-    if "gallery" in b:
-        return "gallery"
-    if re.search(r"\bmdc\b", b) or "distribution" in b:
-        return "distribution_center"
-    if "main account" in b or "corporate" in b:
-        return "corporate"
-    if any(w in b for w in ("house", "modern", "grocery", "pier")):
-        return "special"
-    return "store"
-
-
-# ══════════════════════════════════════════════════════════════════════
-# Known RH special-location registry (operator-confirmed 2026-07-01).
-#
-# These labels are LEGITIMATE RH customer locations — they were previously flagged
-# as "weird RH label" only because they lack a numeric store number.  The operator
-# has confirmed each one, so we canonicalize them, give them a definitive
-# ``site_type``, count them as real RH locations, and DO NOT flag them L.  They are
-# still checked for missing-in-True911 / address / duplicate / device / service
-# unit / E911 exactly like every other location.
-#
-# ``match`` tokens are matched against a NORMALIZED name (lowercase, alphanumeric).
-# ``code`` is an optional alpha store code.  ``city``/``state`` are context for
-# reporting/disambiguation only — never injected into the E911 address.
-# ══════════════════════════════════════════════════════════════════════
-KNOWN_RH_LOCATIONS = (
-    {"alias": "Greenwich 265", "match": ("greenwich 265",),
-     "canonical_name": "RH Greenwich (265)", "site_type": "special",
-     "code": None, "city": "Greenwich", "state": "CT"},
-    {"alias": "RHNYC", "match": ("rhnyc",),
-     "canonical_name": "RH NYC Gallery", "site_type": "gallery",
-     "code": "RHNYC", "city": "New York", "state": "NY"},
-    {"alias": "Beverly Modern", "match": ("beverly modern",),
-     "canonical_name": "RH Beverly Modern", "site_type": "special",
-     "code": None, "city": None, "state": None},
-    {"alias": "Patterson Warehouse", "match": ("patterson warehouse",),
-     "canonical_name": "RH Patterson Warehouse", "site_type": "warehouse",
-     "code": None, "city": None, "state": None},
-    {"alias": "MDC", "match": ("mdc",),
-     "canonical_name": "RH MDC (Distribution Center)", "site_type": "distribution_center",
-     "code": None, "city": None, "state": None},
-    {"alias": "Linden House", "match": ("linden house",),
-     "canonical_name": "RH Linden House", "site_type": "special",
-     "code": None, "city": None, "state": None},
-)
-
-
-def match_known_location(name) -> dict | None:
-    """Return the known-RH-location registry entry whose alias token(s) appear in
-    ``name`` (operator-confirmed legitimate special locations), else None.  Short
-    codes (e.g. ``mdc``) are matched as whole normalized-name tokens to avoid
-    substring false positives; multi-word aliases match as a phrase."""
-    n = norm_name(name)
-    if not n:
-        return None
-    tokens = set(n.split())
-    for entry in KNOWN_RH_LOCATIONS:
-        for tok in entry["match"]:
-            if " " in tok:
-                if tok in n:
-                    return entry
-            elif tok in tokens:
-                return entry
-    return None
-
-
 def _pick(rec: dict, *keys):
     """First non-empty scalar value among ``keys`` (ignores dict/list Zoho lookups)."""
     for k in keys:
@@ -468,27 +359,109 @@ def _site_indexes(true911: dict):
     return sites, by_site_devices, by_site_units, site_phones, site_device_ids
 
 
-def match_site(canon: dict, sites, site_phones, site_device_ids) -> list[dict]:
+class SiteIndex:
+    """True911 sites precomputed for :func:`match_site`.
+
+    Per site: the raw / normalized name+id blob, its token set, the
+    normalized address, the distinctive name tokens and the numeric runs the
+    store regex can hit.  Inverted indexes on each signal turn a match into a
+    few dict lookups that yield the candidate sites; only candidates are then
+    scored, with exactly the per-pair rules ``match_site`` always used."""
+
+    def __init__(self, sites, site_phones, site_device_ids):
+        self.sites = list(sites)
+        self.site_phones = site_phones
+        self.site_device_ids = site_device_ids
+        self.raw_blobs, self.norm_blobs, self.blob_tokens = [], [], []
+        self.addrs, self.name_tokens, self.store_suffixes = [], [], []
+        self.by_store, self.by_addr, self.by_name_token = defaultdict(set), defaultdict(set), defaultdict(set)
+        self.by_blob_token, self.by_sid = defaultdict(set), defaultdict(set)
+        self._by_phrase: dict[str, set] = {}
+        for i, site in enumerate(self.sites):
+            sid = site.get("site_id")
+            raw_blob = f"{site.get('name') or ''} {sid or ''}"
+            norm_blob = norm_name(raw_blob)
+            tokens = set(norm_blob.split())
+            addr = norm_addr(site.get("street"), site.get("city"), site.get("state"))
+            name_tokens = _distinctive_tokens(site.get("name"))
+            # ``#?\s*0*<store>\b`` hits wherever <store> ends a digit run at a
+            # word boundary, i.e. <store> is a suffix of such a run.
+            suffixes = {run[k:] for run in re.findall(r"\d+\b", raw_blob) for k in range(len(run))}
+            self.raw_blobs.append(raw_blob)
+            self.norm_blobs.append(norm_blob)
+            self.blob_tokens.append(tokens)
+            self.addrs.append(addr)
+            self.name_tokens.append(name_tokens)
+            self.store_suffixes.append(suffixes)
+            for suffix in suffixes:
+                self.by_store[suffix].add(i)
+            if addr:
+                self.by_addr[addr].add(i)
+            for tok in name_tokens:
+                self.by_name_token[tok].add(i)
+            for tok in tokens:
+                self.by_blob_token[tok].add(i)
+            self.by_sid[sid].add(i)
+        self.by_phone, self.by_device_id = defaultdict(set), defaultdict(set)
+        for sid, phones in site_phones.items():
+            for p in phones:
+                self.by_phone[p] |= self.by_sid.get(sid, set())
+        for sid, ids in site_device_ids.items():
+            for v in ids:
+                self.by_device_id[v] |= self.by_sid.get(sid, set())
+
+    def _phrase(self, phrase: str) -> set:
+        hit = self._by_phrase.get(phrase)
+        if hit is None:
+            hit = self._by_phrase[phrase] = {
+                i for i, blob in enumerate(self.norm_blobs) if phrase in blob}
+        return hit
+
+    def candidates(self, canon: dict, ca: str) -> list[int]:
+        """Indexes of every site that could raise at least one signal."""
+        cstore = canon.get("store_number")
+        found = set()
+        if cstore and cstore.isdigit():
+            found |= self.by_store.get(cstore, set())
+        if ca:
+            found |= self.by_addr.get(ca, set())
+        for tok in _distinctive_tokens(canon.get("raw_zoho_name")):
+            found |= self.by_name_token.get(tok, set())
+        for p in canon.get("phones", []):
+            found |= self.by_phone.get(p, set())
+        for v in canon.get("device_ids", []):
+            found |= self.by_device_id.get(v, set())
+        for tok in canon.get("known_tokens") or []:
+            found |= self._phrase(tok) if " " in tok else self.by_blob_token.get(tok, set())
+        return sorted(found)
+
+
+def match_site(canon: dict, sites, site_phones, site_device_ids,
+               index: SiteIndex | None = None) -> list[dict]:
     """All True911 sites matching a canonical Zoho location, with the signals hit.
     ``known`` = an operator-confirmed alias appears in the True911 site name — a
-    high-precision positive signal (e.g. "MDC", "Patterson Warehouse", "RHNYC")."""
+    high-precision positive signal (e.g. "MDC", "Patterson Warehouse", "RHNYC").
+    Pass a prebuilt ``index`` when matching many locations against the same sites."""
+    if index is None:
+        index = SiteIndex(sites, site_phones, site_device_ids)
     ca = norm_addr(canon.get("street"), canon.get("city"), canon.get("state"))
     cstore = canon.get("store_number")
     known_tokens = canon.get("known_tokens") or []
+    phones = set(canon.get("phones", []))
+    device_ids = set(canon.get("device_ids", []))
+    name_tokens = _distinctive_tokens(canon.get("raw_zoho_name"))
     out = []
-    for s in sites:
+    for i in index.candidates(canon, ca):
+        s = index.sites[i]
         sid = s.get("site_id")
-        raw_blob = f"{s.get('name') or ''} {sid or ''}"
-        norm_blob = norm_name(raw_blob)
         # store signal: numeric store numbers only (alpha codes go via ``known``)
-        sig_store = bool(cstore) and cstore.isdigit() and bool(
-            re.search(rf"#?\s*0*{re.escape(cstore)}\b", raw_blob))
-        sig_addr = bool(ca) and ca == norm_addr(s.get("street"), s.get("city"), s.get("state"))
-        sig_name = _name_match(canon.get("raw_zoho_name"), s.get("name"))
-        sig_phone = bool(set(canon.get("phones", [])) & site_phones.get(sid, set()))
-        sig_device = bool(set(canon.get("device_ids", [])) & site_device_ids.get(sid, set()))
+        sig_store = bool(cstore) and cstore.isdigit() and cstore in index.store_suffixes[i]
+        sig_addr = bool(ca) and ca == index.addrs[i]
+        sig_name = _shared_tokens_match(name_tokens & index.name_tokens[i])
+        sig_phone = bool(phones & site_phones.get(sid, set()))
+        sig_device = bool(device_ids & site_device_ids.get(sid, set()))
         sig_known = any(
-            (tok in norm_blob if " " in tok else tok in set(norm_blob.split()))
+            (tok in index.norm_blobs[i] if " " in tok else tok in index.blob_tokens[i])
             for tok in known_tokens)
         signals = {"store": sig_store, "addr": sig_addr, "name": sig_name,
                    "phone": sig_phone, "device": sig_device, "known": sig_known}
@@ -511,7 +484,10 @@ def _name_match(a, b) -> bool:
     A single shared token counts only when it is specific — a numeric store number
     or a long token (>=5 chars) — so a bare 3-letter city like "nyc" alone does not
     force a match (avoids RHNYC ↔ generic-NYC confusion)."""
-    shared = _distinctive_tokens(a) & _distinctive_tokens(b)
+    return _shared_tokens_match(_distinctive_tokens(a) & _distinctive_tokens(b))
+
+
+def _shared_tokens_match(shared: set) -> bool:
     if not shared:
         return False
     if len(shared) >= 2:
@@ -524,6 +500,7 @@ def certify(true911: dict, canon_locations: list[dict]) -> dict:
     """Cross-certify canonical Zoho RH locations against True911.  Returns
     per-location classification (A–L), findings, and summary counts."""
     sites, by_site_devices, by_site_units, site_phones, site_device_ids = _site_indexes(true911)
+    index = SiteIndex(sites, site_phones, site_device_ids)
     findings = []
     matched_site_ids = set()
     results = []
@@ -550,7 +527,7 @@ def certify(true911: dict, canon_locations: list[dict]) -> dict:
 
     # ── Zoho → True911 per canonical location ──
     for c in canon_locations:
-        matches = match_site(c, sites, site_phones, site_device_ids)
+        matches = match_site(c, sites, site_phones, site_device_ids, index)
         classes = []
         if tuple(c["key"]) in dup_zoho_keys:
             classes.append(CLASS_DUP_ZOHO)
@@ -730,13 +707,13 @@ async def load_true911(db, tenant_id: str) -> dict:
 def load_zoho_csv(path: str) -> tuple[list[dict], int]:
     """READ-ONLY parse of the operator-supplied Zoho export; keeps RH rows only.
     Returns (rh_rows, total_rows_scanned)."""
+    rh, total = [], 0
     with open(path, newline="", encoding="utf-8-sig") as f:
-        rows = list(csv.DictReader(f))
-    rh = []
-    for r in rows:
-        if is_rh_label(r.get(Z_ACCOUNT), r.get(Z_FACILITY), r.get(Z_SUBSCRIPTION)):
-            rh.append(map_zoho_row(r))
-    return rh, len(rows)
+        for r in csv.DictReader(f):               # streamed: only RH rows are kept
+            total += 1
+            if is_rh_label(r.get(Z_ACCOUNT), r.get(Z_FACILITY), r.get(Z_SUBSCRIPTION)):
+                rh.append(map_zoho_row(r))
+    return rh, total
 
 
 # Safe default Zoho field set for the Accounts module (billing + shipping address +
@@ -0,0 +1,90 @@
+"""Shared fixtures: ``db`` — service code on an in-memory SQLite database."""
+
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+import app.models  # noqa: F401  (registers every table on Base.metadata)
+from app.database import Base
+
+
+@compiles(JSONB, "sqlite")
+def _jsonb_on_sqlite(element, compiler, **kw):
+    return "JSON"
+
+
+class SyncBackedAsyncSession:
+    """The slice of ``AsyncSession`` the services use, over a sync
+    ``Session`` (``.s``) — stdlib sqlite3 has no async driver."""
+
+    def __init__(self, session: Session):
+        self.s = session
+
+    async def execute(self, stmt, params=None):
+        await asyncio.sleep(0)          # a real driver yields to the loop here
+        return self.s.execute(stmt, params)
+
+    async def scalar(self, stmt, params=None):
+        return self.s.scalar(stmt, params)
+
+    async def scalars(self, stmt, params=None):
+        return self.s.scalars(stmt, params)
+
+    async def get(self, model, pk):
+        return self.s.get(model, pk)
+
+    def add(self, obj):
+        self.s.add(obj)
+
+    def expunge(self, obj):
+        self.s.expunge(obj)
+
+    async def flush(self):
+        self.s.flush()
+
+    async def commit(self):
+        self.s.commit()
+
+    async def rollback(self):
+        self.s.rollback()
+
+    async def refresh(self, obj):
+        self.s.refresh(obj)
+
+    def get_bind(self):
+        return self.s.get_bind()
+
+
+_schema: sqlite3.Connection | None = None
+
+
+def _fresh_connection() -> sqlite3.Connection:
+    """A new in-memory database holding every table (the DDL runs once per
+    test session; each test gets a copy)."""
+    global _schema
+    if _schema is None:
+        _schema = sqlite3.connect(":memory:", check_same_thread=False)
+        Base.metadata.create_all(create_engine("sqlite://", creator=lambda: _schema,
+                                               poolclass=StaticPool))
+    conn = sqlite3.connect(":memory:", check_same_thread=False)
+    _schema.backup(conn)
+    return conn
+
+
+@pytest.fixture
+def db():
+    conn = _fresh_connection()
+    engine = create_engine("sqlite://", creator=lambda: conn, poolclass=StaticPool)
+    session = Session(engine, expire_on_commit=False)
+    yield SyncBackedAsyncSession(session)
+    session.close()
+    engine.dispose()
+    conn.close()
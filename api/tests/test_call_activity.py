@@ -0,0 +1,104 @@
+"""Denormalized Device.last_call_at (app.services.call_activity)."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from app.models.call_record import CallRecord
+from app.models.device import Device
+from app.models.job import Job
+from app import backfill_device_last_call
+from app.services import call_activity, change_version, job_service
+
+NOW = datetime(2026, 10, 19, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def db(db):
+    s = db.s
+    for tenant, did in (("t1", "D1"), ("t1", "D2"), ("t1", "D3"), ("t2", "E1")):
+        s.add(Device(device_id=did, tenant_id=tenant, status="active"))
+    for i, (tenant, did, hours_ago) in enumerate((
+        ("t1", "D1", 5), ("t1", "D1", 1), ("t1", "D2", 3), ("t2", "E1", 2),
+    )):
+        s.add(CallRecord(call_id=f"C{i}", tenant_id=tenant, device_id=did,
+                         started_at=NOW - timedelta(hours=hours_ago)))
+    s.commit()
+    return db
+
+
+def _last_calls(db) -> dict:
+    db.s.expire_all()
+    return {d.device_id: d.last_call_at.replace(tzinfo=timezone.utc) if d.last_call_at else None
+            for d in db.s.execute(select(Device)).scalars().all()}
+
+
+def _record(db, *calls):
+    return asyncio.run(call_activity.record_calls(db, calls))
+
+
+def test_record_calls_only_moves_forward(db):
+    later, earlier = NOW, NOW - timedelta(hours=2)
+    assert _record(db, ("t1", "D3", earlier), ("t1", "D3", later), ("t1", "D2", earlier)) == 2
+    assert _record(db, ("t1", "D3", earlier), ("t1", "D2", NOW - timedelta(hours=3))) == 0
+    calls = _last_calls(db)
+    assert (calls["D3"], calls["D2"]) == (later, earlier)
+
+
+def test_record_calls_never_bump_change_versions(db):
+    was_installed = event.contains(Session, "before_flush", change_version._before_flush)
+    change_version.install()
+    try:
+        before = asyncio.run(change_version.read_versions(db, "t1"))
+        for started_at in (NOW - timedelta(hours=2), NOW):     # first call, then stale -> live
+            _record(db, ("t1", "D3", started_at))
+            asyncio.run(db.commit())
+        assert _last_calls(db)["D3"] == NOW
+        assert asyncio.run(change_version.read_versions(db, "t1")) == before
+    finally:
+        if not was_installed:
+            event.remove(Session, "before_flush", change_version._before_flush)
+
+
+def test_record_calls_is_tenant_scoped_and_ignores_unmatched(db):
+    assert _record(db, ("t2", "D3", NOW), ("t1", None, NOW), ("t1", "D3", None)) == 0
+    assert _last_calls(db)["D3"] is None
+
+
+def test_backfill_matches_aggregate_and_parity(db):
+    before = asyncio.run(call_activity.parity(db))
+    assert before["mismatched"] == 3        # D1, D2, E1 have calls but no column yet
+
+    assert asyncio.run(call_activity.backfill(db, "t1")) == 2
+    calls = _last_calls(db)
+    assert calls["D1"] == NOW - timedelta(hours=1)
+    assert calls["D2"] == NOW - timedelta(hours=3)
+    assert calls["D3"] is None and calls["E1"] is None
+    assert asyncio.run(call_activity.parity(db, "t1"))["mismatched"] == 0
+    assert asyncio.run(call_activity.parity(db))["sample"] == [{"tenant_id": "t2", "device_id": "E1"}]
+
+
+def test_backfill_job_reports_parity(db):
+    out = asyncio.run(call_activity.handle_backfill(db, SimpleNamespace(payload=None, tenant_id=None)))
+    assert out["updated"] == 3 and out["mismatched"] == 0
+
+
+def test_entry_point_enqueues_one_job_and_reports_parity(db, monkeypatch):
+    enqueued = []
+    monkeypatch.setattr(job_service, "_enqueue_rq", enqueued.append)
+    first = asyncio.run(backfill_device_last_call.enqueue(db, "t1"))
+    again = asyncio.run(backfill_device_last_call.enqueue(db, "t1"))
+    assert first["mismatched"] == 2 and again["job_id"] == first["job_id"]
+    job = db.s.get(Job, first["job_id"])
+    assert (job.job_type, job.payload, job.status) == ("devices.last_call_backfill",
+                                                        {"tenant_id": "t1"}, "queued")
+    assert enqueued == [job]
+
+    out = asyncio.run(call_activity.handle_backfill(db, job))
+    assert out["mismatched"] == 0
@@ -0,0 +1,264 @@
+"""Tests for app.services.change_version and the LLLM cache fast path.
+
+The change-version counters are what let a summary-cache hit skip the
+fleet tables, so these tests pin:
+
+  * which writes bump a counter (edits, incidents, stale → live
+    heartbeats) and which don't (routine heartbeats)
+  * the flush listener really increments the rows, end-to-end, on a
+    sync in-memory SQLite session (stdlib sqlite3 — no async driver)
+  * the orchestrator answers a cache hit WITHOUT loading the context
+  * the version fingerprint is stable within a staleness bucket and
+    moves with the version
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+import uuid
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from app.database import Base
+from app.models.action_audit import SERVICE_CLASSIFICATION_OVERRIDE, ActionAudit
+from app.models.change_version import ChangeVersion
+from app.models.device import Device
+from app.models.incident import Incident
+from app.models.infra_test_result import InfraTestResult
+from app.models.line import Line
+from app.models.portfolio_registry import PortfolioBuilding
+from app.models.service_unit import ServiceUnit
+from app.models.site import Site
+from app.services import change_version as cv
+from app.services.llm import cache as cache_mod
+from app.services.llm import orchestrator
+from app.services.llm.context import fingerprint_inputs_for_version
+
+
+_NOW = datetime(2026, 10, 19, 12, 0, 0, tzinfo=timezone.utc)
+
+
+# ─── is_liveness_transition ─────────────────────────────────────────
+
+
+class TestLivenessTransition:
+    def test_first_observation_is_a_transition(self):
+        assert cv.is_liveness_transition(None, _NOW) is True
+
+    def test_routine_heartbeat_is_not(self):
+        assert cv.is_liveness_transition(_NOW - timedelta(seconds=60), _NOW) is False
+
+    def test_recovery_after_stale_gap_is(self):
+        assert cv.is_liveness_transition(_NOW - timedelta(minutes=30), _NOW) is True
+
+    def test_clearing_is_a_transition(self):
+        assert cv.is_liveness_transition(_NOW, None) is True
+
+    def test_unchanged_none_is_not(self):
+        assert cv.is_liveness_transition(None, None) is False
+
+
+# ─── Flush listener, end-to-end on sync SQLite ──────────────────────
+
+
+@pytest.fixture
+def session():
+    cv.install()
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(
+        engine,
+        tables=[
+            Site.__table__,
+            Device.__table__,
+            Incident.__table__,
+            ChangeVersion.__table__,
+        ],
+    )
+    # Same as AsyncSessionLocal — loaded rows keep their attribute
+    # history across commits, which is what the listener diffs against.
+    with Session(engine, expire_on_commit=False) as s:
+        yield s
+    engine.dispose()
+
+
+def _versions(s: Session) -> dict[tuple[str, str], int]:
+    rows = s.execute(
+        select(ChangeVersion.tenant_id, ChangeVersion.scope_key, ChangeVersion.version)
+    ).all()
+    return {(r.tenant_id, r.scope_key): r.version for r in rows}
+
+
+def _seed(s: Session) -> Device:
+    s.add(Site(site_id="S1", tenant_id="t1", site_name="One", customer_name="C", status="active"))
+    dev = Device(
+        device_id="D1", tenant_id="t1", site_id="S1", status="active",
+        last_heartbeat=_NOW,
+    )
+    s.add(dev)
+    s.commit()
+    return dev
+
+
+class TestFlushListener:
+    def test_inserts_bump_tenant_and_site(self, session):
+        _seed(session)
+        v = _versions(session)
+        assert v[("t1", cv.TENANT_SCOPE)] == 1
+        assert v[("t1", "S1")] == 1
+
+    def test_routine_heartbeat_does_not_bump(self, session):
+        dev = _seed(session)
+        dev.last_heartbeat = _NOW + timedelta(seconds=60)
+        session.commit()
+        assert _versions(session)[("t1", "S1")] == 1
+
+    def test_heartbeat_after_stale_gap_bumps(self, session):
+        dev = _seed(session)
+        dev.last_heartbeat = _NOW + timedelta(hours=1)
+        session.commit()
+        v = _versions(session)
+        assert v[("t1", "S1")] == 2
+        assert v[("t1", cv.TENANT_SCOPE)] == 2
+
+    def test_device_edit_bumps(self, session):
+        dev = _seed(session)
+        dev.network_status = "disconnected"
+        session.commit()
+        assert _versions(session)[("t1", "S1")] == 2
+
+    def test_moving_device_bumps_both_sites(self, session):
+        dev = _seed(session)
+        dev.site_id = "S2"
+        session.commit()
+        v = _versions(session)
+        assert v[("t1", "S1")] == 2
+        assert v[("t1", "S2")] == 1
+
+    def test_incident_lifecycle_bumps(self, session):
+        _seed(session)
+        inc = Incident(
+            incident_id="INC-1", tenant_id="t1", site_id="S1", opened_at=_NOW,
+            severity="critical", status="open", summary="down",
+        )
+        session.add(inc)
+        session.commit()
+        assert _versions(session)[("t1", "S1")] == 2
+        inc.status = "closed"
+        session.commit()
+        assert _versions(session)[("t1", "S1")] == 3
+
+    def test_other_tenant_untouched(self, session):
+        _seed(session)
+        assert ("t2", cv.TENANT_SCOPE) not in _versions(session)
+
+
+class TestRegistryAndOverrideScopes:
+    def test_registry_rows_bump_only_the_registry_scope(self):
+        b = PortfolioBuilding(tenant_id="t1", canonical_name="HQ")
+        assert cv._is_tracked(b)
+        assert cv._scopes_for_row(b, tenant_ids=["t1"], site_ids=[None]) == {
+            ("t1", cv.REGISTRY_SCOPE)
+        }
+
+    def test_endpoint_rows_bump_only_their_site(self):
+        for row in (ServiceUnit(tenant_id="t1", site_id="S1", unit_id="U1"),
+                    Line(tenant_id="t1", site_id="S1", line_id="L1", provider="telnyx"),
+                    InfraTestResult(tenant_id="t1", site_id="S1")):
+            assert cv._scopes_for_row(row, tenant_ids=["t1"], site_ids=["S1", "S2"]) == {
+                ("t1", "S1"), ("t1", "S2")
+            }
+            assert cv._scopes_for_row(row, tenant_ids=["t1"], site_ids=[None]) == {
+                ("t1", cv.UNSITED_SCOPE)
+            }
+
+    def test_only_override_audits_are_tracked(self):
+        override = ActionAudit(tenant_id="t1", site_id="S1", action_type=SERVICE_CLASSIFICATION_OVERRIDE)
+        other = ActionAudit(tenant_id="t1", site_id="S1", action_type="login")
+        assert cv._is_tracked(override)
+        assert not cv._is_tracked(other)
+        assert cv._scopes_for_row(override, tenant_ids=["t1"], site_ids=["S1"]) == {
+            ("t1", cv.TENANT_SCOPE), ("t1", "S1")
+        }
+
+
+# ─── read_version ───────────────────────────────────────────────────
+
+
+class TestReadVersion:
+    @pytest.mark.asyncio
+    async def test_missing_row_reads_zero(self):
+        result = MagicMock()
+        result.scalar_one_or_none.return_value = None
+        db = MagicMock()
+        db.execute = AsyncMock(return_value=result)
+        assert await cv.read_version(db, "t1") == 0
+        assert db.execute.call_count == 1
+
+
+# ─── Fingerprint ────────────────────────────────────────────────────
+
+
+class TestVersionFingerprint:
+    def _fp(self, version, now):
+        return cache_mod.compute_data_fingerprint(
+            fingerprint_inputs_for_version(
+                scope="fleet", tenant_id="t1", scope_id=None,
+                change_version=version, now=now,
+            )
+        )
+
+    def test_stable_within_bucket(self):
+        base = datetime(2026, 10, 19, 12, 0, 0, tzinfo=timezone.utc)
+        assert self._fp(3, base) == self._fp(3, base + timedelta(seconds=30))
+
+    def test_changes_with_version(self):
+        assert self._fp(3, _NOW) != self._fp(4, _NOW)
+
+    def test_changes_across_stale_bucket(self):
+        assert self._fp(3, _NOW) != self._fp(3, _NOW + timedelta(minutes=10))
+
+
+# ─── Orchestrator cache fast path ───────────────────────────────────
+
+
+def _user():
+    u = SimpleNamespace(id=uuid.uuid4(), email="a@example.com", role="Admin", tenant_id="t1")
+    u._original_tenant_id = "t1"
+    u._is_impersonating = False
+    return u
+
+
+class TestOrchestratorCacheHit:
+    @pytest.mark.asyncio
+    async def test_hit_skips_context_load(self):
+        cached = {
+            "summary_id": "ai-old",
+            "scope": "fleet",
+            "scope_id": None,
+            "current_status": "Fleet stable.",
+            "recommended_next_step": "Continue monitoring.",
+            "internal_summary": "All good.",
+            "sources_used": ["sites:tenant=t1"],
+            "model": "m",
+            "source": "fresh",
+        }
+        db = MagicMock()
+        db.add = MagicMock()
+        db.commit = AsyncMock()
+        with patch.object(
+            orchestrator.LLLMContext, "load_change_version", AsyncMock(return_value=7)
+        ), patch.object(
+            orchestrator.LLLMContext, "load_fleet", AsyncMock(side_effect=AssertionError)
+        ), patch.object(cache_mod, "get_cached", AsyncMock(return_value=cached)):
+            payload = await orchestrator.generate_health_summary(
+                db=db, user=_user(), scope="fleet"
+            )
+        assert payload["source"] == "cache"
+        assert payload["summary_id"] != "ai-old"
+        audit = db.add.call_args.args[0]
+        assert audit.sources_used == ["sites:tenant=t1"]
+        assert audit.status == "ok"
@@ -259,11 +259,7 @@ def test_search_portfolio_scopes_and_dedupes(monkeypatch):
                            e911_city="Boston", e911_state="MA", e911_street="1 Main",
                            e911_zip="02116", e911_status="validated", lat=None, lng=None)
     db = _FakeDB([
-        _Res([("RH-7",)]),   # sites by name/city/state/id
-        _Res([("RH-7",)]),   # service units (same site -> dedupe)
-        _Res([]),            # devices by msisdn
-        _Res([("RH-7",)]),   # lines by did
-        _Res([site]),        # final Site load
+        _Res([(site, 1)]),   # one ranked statement, already deduped per site
     ])
     out = asyncio.run(cc.search_portfolio(db, RH, "boston", NOW))
     assert out["query"] == "boston"
@@ -0,0 +1,108 @@
+"""Bulk customer portfolio loader — the same answers as the per-site loader."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.models.action_audit import ActionAudit
+from app.models.call_record import CallRecord
+from app.models.device import Device
+from app.models.infra_test_result import InfraTestResult
+from app.models.line import Line
+from app.models.portfolio_registry import PortfolioBuilding
+from app.models.service_unit import ServiceUnit
+from app.models.site import Site
+from app.models.verification_task import VerificationTask
+from app.services.assurance.loader import load_site_assurance_signals
+from app.services.customer import command_center as cc
+from app.services.customer import portfolio as cportfolio
+from app.services.customer import portfolio_registry_view as prv
+from app.services.customer import service_inference as si
+
+T = "acme"
+NOW = datetime(2026, 10, 19, 12, 0, tzinfo=timezone.utc)
+
+N_SITES = 6
+
+
+def _seed(s: Session, n_sites: int) -> None:
+    for i in range(n_sites):
+        sid = f"S{i:03d}"
+        s.add(Site(site_id=sid, tenant_id=T, site_name=f"Store #{i}", customer_name="Acme",
+                   status="active", e911_street=f"{i} Main St", e911_city="Springfield",
+                   e911_state="IL", e911_zip="62701", e911_status="validated"))
+        for j in range(2):
+            did = f"D{i:03d}-{j}"
+            s.add(Device(device_id=did, tenant_id=T, site_id=sid, status="active",
+                         model="MS130" if j == 0 else "LM150", msisdn=f"55501{i:03d}{j}",
+                         last_heartbeat=NOW - timedelta(minutes=2 if i % 3 else 90),
+                         heartbeat_interval=300))
+            s.add(CallRecord(call_id=f"C{i}-{j}", tenant_id=T, site_id=sid, device_id=did,
+                             started_at=NOW - timedelta(hours=j + 1)))
+        s.add(ServiceUnit(tenant_id=T, site_id=sid, unit_id=f"U{i}", unit_name="Panel",
+                          unit_type="fire_alarm", device_id=f"D{i:03d}-0", line_id=f"L{i}",
+                          status="active"))
+        s.add(Line(line_id=f"L{i}", tenant_id=T, site_id=sid, provider="telnyx",
+                   did=f"+1312555{i:04d}", device_id=f"D{i:03d}-0", status="active"))
+        s.add(VerificationTask(tenant_id=T, site_id=sid, task_type="test", title="t",
+                               result="pass" if i % 2 else "fail",
+                               completed_at=NOW - timedelta(days=i + 1)))
+        s.add(InfraTestResult(result_id=f"R{i}", test_id=f"IT{i}", tenant_id=T, site_id=sid,
+                              status="pass", started_at=NOW - timedelta(days=3),
+                              completed_at=NOW - timedelta(days=3)))
+        s.add(ActionAudit(audit_id=f"A{i}", request_id=f"q{i}", tenant_id=T, user_email="ops@x",
+                          role="Admin", action_type=si.OVERRIDE_ACTION, site_id=sid,
+                          timestamp=NOW, result="ok",
+                          details=json.dumps({"device_id": f"D{i:03d}-1",
+                                              "service_type": "Elevator"})))
+        s.add(PortfolioBuilding(tenant_id=T, canonical_name=f"Store #{i}", store_number=str(i),
+                                approved=True))
+    s.commit()
+
+
+@pytest.fixture
+def db(db):
+    _seed(db.s, N_SITES)
+    return db
+
+
+@pytest.fixture
+def registry_on(monkeypatch):
+    monkeypatch.setattr("app.config.settings.FEATURE_CUSTOMER_PORTFOLIO_REGISTRY", "true")
+    monkeypatch.setattr("app.config.settings.CUSTOMER_PORTFOLIO_REGISTRY_TENANT_ALLOWLIST", T)
+
+
+class TestCoversEverySite:
+    def test_portfolio_lists_every_site(self, db):
+        portfolio = asyncio.run(cportfolio.load_portfolio(db, T, NOW))
+        assert sorted(site.site_id for site, _p in portfolio) == [f"S{i:03d}" for i in range(N_SITES)]
+        assert all(protection["status"] for _s, protection in portfolio)
+
+    def test_registry_buildings_carry_services(self, db, registry_on):
+        records = asyncio.run(prv.load_customer_buildings(db, T, NOW))
+        assert len(records) == N_SITES and all(r["services"] for r in records)
+
+    def test_portfolio_summary_counts(self, db):
+        out = asyncio.run(cc.load_portfolio_summary(db, T, NOW))
+        assert (out["locations_total"], out["life_safety_services"], out["devices"]) == (N_SITES, N_SITES, 2 * N_SITES)
+        assert out["total_phone_numbers"] == 3 * N_SITES          # one DID + two MSISDNs per site
+        assert out["e911_verification_pct"] == 100.0
+
+
+class TestParityWithPerSiteLoader:
+    def test_signals_match(self, db):
+        snap = asyncio.run(cportfolio.load_portfolio_snapshot(db, T, NOW))
+        for site in snap.assurance.sites:
+            single = asyncio.run(load_site_assurance_signals(db, T, site.site_id))
+            assert snap.assurance.signals_by_site[site.site_id] == single
+
+    def test_service_cards_match(self, db):
+        snap = asyncio.run(cportfolio.load_portfolio_snapshot(db, T, NOW))
+        for site, _protection in snap.portfolio:
+            single = asyncio.run(cc._build_location_services(db, T, site, NOW))
+            assert cc.services_from_snapshot(snap, site, NOW) == single
@@ -1,7 +1,7 @@
 """Customer Portfolio-Registry read model — mode gating, aggregation, redaction.
 
-No DB fixture exists, so these mock the query seams (visible rows / load_portfolio /
-link indexes / service inference) and test the pure aggregation + serializer.  Pins:
+No DB fixture exists, so these mock the query seams (visible rows / portfolio
+snapshot / link indexes / service inference) and test the pure aggregation + serializer.  Pins:
 flag OFF -> legacy (None), flag ON + no buildings -> fallback (None), approved
 visible, pending hidden by default / visible under preview, and that no source-system
 internals (Zoho / Napco / Genesis / ICCID / IMEI / raw aliases) ever leak.
@@ -65,7 +65,7 @@ def _wire(monkeypatch, rows, sites_portfolio, services):
     async def _vis(db, tenant):
         return rows
     async def _lp(db, tenant, now):
-        return sites_portfolio
+        return SimpleNamespace(portfolio=sites_portfolio)
     async def _idx(db, tenant, sp):
         site_by_id = {s.site_id: (s, p) for s, p in sp}
         by_store, by_addr = {}, {}
@@ -74,12 +74,12 @@ def _wire(monkeypatch, rows, sites_portfolio, services):
             if st:
                 by_store.setdefault(st, []).append(s.site_id)
         return site_by_id, by_store, by_addr, {}
-    async def _svcs(db, tenant, site, now):
+    def _svcs(snapshot, site, now):
         return services
     monkeypatch.setattr(prv, "_visible_building_rows", _vis)
-    monkeypatch.setattr(cportfolio, "load_portfolio", _lp)
+    monkeypatch.setattr(cportfolio, "load_portfolio_snapshot", _lp)
     monkeypatch.setattr(prv, "_link_indexes", _idx)
-    monkeypatch.setattr(cc, "_build_location_services", _svcs)
+    monkeypatch.setattr(cc, "services_from_snapshot", _svcs)
 
 
 # ── mode gating ──────────────────────────────────────────────────────
@@ -138,6 +138,29 @@ def test_pending_hidden_by_default_visible_under_preview(monkeypatch):
     assert out["service_address"] is None
 
 
+# ── building → site linkage indexes ──────────────────────────────────
+def _mapping(building_id, value, norm, *, active=True, kind="true911_device"):
+    return SimpleNamespace(building_id=building_id, value=value, value_normalized=norm,
+                           active=active, kind=kind)
+
+
+def test_link_indexes_group_device_mappings_by_building():
+    sites = [(_site(site_id="RH-147"), None), (_site(site_id="RH-9", site_name="RH #9",
+                                                     e911_street="9 Elm St"), None)]
+    maps = [_mapping(1, "RH-147", "A"), _mapping(2, "RH-9", "B"),
+            _mapping(2, "RH-147", "C", active=False), _mapping(2, "RH-147", "D", kind="zoho"),
+            _mapping(3, "RH-9", "B")]       # same normalized value: last mapping wins
+    site_by_id, by_store, by_addr, dev_by_building = prv.build_link_indexes(sites, maps)
+    assert set(site_by_id) == {"RH-147", "RH-9"}
+    assert by_store == {"147": ["RH-147"], "9": ["RH-9"]}
+    assert dev_by_building == {1: ["RH-147"], 3: ["RH-9"]}
+    ids = prv._resolve_building_site_ids(_building(id=3, store_number=None, address=None),
+                                         by_store, by_addr, dev_by_building)
+    assert ids == {"RH-9"}
+    ids = prv._resolve_building_site_ids(_building(id=2), by_store, by_addr, dev_by_building)
+    assert ids == {"RH-147"}                # store number + address, no device mapping
+
+
 # ── dashboard / summary / search ─────────────────────────────────────
 def _records(monkeypatch, statuses=("Protected", "Attention Needed")):
     _flags_on(monkeypatch)
@@ -151,19 +174,19 @@ def _records(monkeypatch, statuses=("Protected", "Attention Needed")):
     async def _vis(db, tenant):
         return rows
     async def _lp(db, tenant, now):
-        return sites
+        return SimpleNamespace(portfolio=sites)
     async def _idx(db, tenant, sp):
         sbi = {s.site_id: (s, p) for s, p in sp}
         bystore = {}
         for s, _p in sp:
             bystore.setdefault(prv._site_store_number(s.site_name), []).append(s.site_id)
         return sbi, bystore, {}, {}
-    async def _svcs(db, tenant, site, now):
+    def _svcs(snapshot, site, now):
         return [_svc(status="Protected" if "pending" not in (site.e911_status or "") else "Attention Needed")]
     monkeypatch.setattr(prv, "_visible_building_rows", _vis)
-    monkeypatch.setattr(cportfolio, "load_portfolio", _lp)
+    monkeypatch.setattr(cportfolio, "load_portfolio_snapshot", _lp)
     monkeypatch.setattr(prv, "_link_indexes", _idx)
-    monkeypatch.setattr(cc, "_build_location_services", _svcs)
+    monkeypatch.setattr(cc, "services_from_snapshot", _svcs)
     return asyncio.run(prv.load_customer_buildings(object(), RH, NOW))
 
 
@@ -0,0 +1,218 @@
+"""Customer portfolio read model — precomputed registry-mode reads."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.customer_read_model import CustomerPortfolioBuilding, CustomerPortfolioReadModel
+from app.models.device import Device
+from app.models.line import Line
+from app.models.portfolio_registry import PortfolioBuilding
+from app.models.service_unit import ServiceUnit
+from app.models.site import Site
+from app.services import change_version as cv
+from app.services.customer import portfolio_registry_view as prv
+from app.services.customer import read_model as rmod
+
+T = "acme"
+NOW = datetime(2026, 10, 19, 12, 0, tzinfo=timezone.utc)
+
+def _seed(s: Session, n: int) -> None:
+    for i in range(n):
+        sid = f"S{i:03d}"
+        s.add(Site(site_id=sid, tenant_id=T, site_name=f"Store #{i}", customer_name="Acme",
+                   status="active", e911_street=f"{i} Main St", e911_city="Springfield",
+                   e911_state="IL", e911_zip="62701", e911_status="validated"))
+        s.add(Device(device_id=f"D{i:03d}", tenant_id=T, site_id=sid, status="active",
+                     model="MS130", last_heartbeat=NOW - timedelta(minutes=2),
+                     heartbeat_interval=300))
+        s.add(ServiceUnit(tenant_id=T, site_id=sid, unit_id=f"U{i}", unit_name="Panel",
+                          unit_type="fire_alarm", device_id=f"D{i:03d}", line_id=f"L{i}",
+                          status="active"))
+        s.add(Line(line_id=f"L{i}", tenant_id=T, site_id=sid, provider="telnyx",
+                   did=f"+1312555{i:04d}", device_id=f"D{i:03d}", status="active"))
+        s.add(PortfolioBuilding(tenant_id=T, canonical_name=f"Store #{i}", store_number=str(i),
+                                city="Springfield", state="IL", approved=True))
+    s.commit()
+
+
+@pytest.fixture(autouse=True)
+def _flags(monkeypatch):
+    monkeypatch.setattr("app.config.settings.FEATURE_CUSTOMER_PORTFOLIO_REGISTRY", "true")
+    monkeypatch.setattr("app.config.settings.CUSTOMER_PORTFOLIO_REGISTRY_TENANT_ALLOWLIST", T)
+    monkeypatch.setattr("app.config.settings.FEATURE_CUSTOMER_READ_MODEL", "true")
+
+
+@pytest.fixture
+def make_db(db):
+    cv.install()
+
+    def _make(n: int):
+        _seed(db.s, n)
+        return db
+
+    return _make
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def _stored(db) -> dict:
+    return {r.building_id: r.record for r in db.s.execute(
+        select(CustomerPortfolioBuilding)).scalars().all()}
+
+
+# ── plan ─────────────────────────────────────────────────────────────
+def _header(versions, *, expires=NOW + timedelta(minutes=5), key="k"):
+    return SimpleNamespace(config_key=key, versions=versions, expires_at=expires)
+
+
+class TestPlan:
+    def test_no_header_is_full(self):
+        assert rmod.plan(None, {}, "k", NOW).full
+
+    def test_config_change_is_full(self):
+        assert rmod.plan(_header({}), {}, "other", NOW).full
+
+    def test_unchanged_is_noop(self):
+        p = rmod.plan(_header({"*": 3, "S1": 2}), {"*": 3, "S1": 2}, "k", NOW)
+        assert not p.full and not p.changed_sites and not p.expired
+
+    def test_site_bump_is_incremental(self):
+        p = rmod.plan(_header({"*": 3, "S1": 2}), {"*": 4, "S1": 3, "S2": 1}, "k", NOW)
+        assert not p.full and p.changed_sites == {"S1", "S2"}
+
+    def test_registry_bump_is_full(self):
+        assert rmod.plan(_header({}), {cv.REGISTRY_SCOPE: 1}, "k", NOW).full
+
+    def test_unsited_endpoint_bump_is_full(self):
+        p = rmod.plan(_header({"S1": 2}), {"S1": 2, cv.UNSITED_SCOPE: 1}, "k", NOW)
+        assert p.full and not p.changed_sites
+
+    def test_unattributed_tenant_bump_is_full(self):
+        assert rmod.plan(_header({"*": 1}), {"*": 2}, "k", NOW).full
+
+    def test_ttl(self):
+        assert rmod.plan(_header({}, expires=NOW), {}, "k", NOW).expired
+
+
+# ── build + serve ────────────────────────────────────────────────────
+class TestServe:
+    def test_matches_in_memory_answers(self, make_db):
+        db = make_db(6)
+        records = rmod._jsonable(_run(prv.load_customer_buildings(db, T, NOW)))
+        rm = _run(rmod.get_read_model(db, T, NOW))
+        assert rm.building_count == 6 and not rm.stale
+        assert rm.aggregates["health"] == rmod._jsonable(prv.health(records))
+        assert rm.aggregates["services_summary"] == rmod._jsonable(prv.services_summary(records))
+        for kw in ({}, {"q": "store #3"}, {"status_filter": "Protected"}, {"page": 2, "page_size": 4}):
+            assert _run(rmod.locations_page(db, rm, **kw)) == prv.locations_page(records, **kw)
+        assert _run(rmod.search(db, rm, "1312555")) == prv.search(records, "1312555")
+        detail = prv.locations_page(records, page_size=100)["items"][2]["building_ref"]
+        assert prv.building_detail(_run(rmod.building_records(db, rm, detail)), detail) \
+            == prv.building_detail(records, detail)
+        assert _run(rmod.building_records(db, rm, "bldg_forged")) == []
+
+    def test_cold_start_rebuilds_race_to_one_header(self, make_db):
+        db = make_db(3)
+        versions = _run(cv.read_versions(db, T))
+        key = rmod._config_key(T)
+        _run(rmod._rebuild_full(db, T, NOW, None, versions, key))
+        db.s.expunge_all()
+        # A parallel first read that also saw no header must not hit the PK.
+        header = _run(rmod._rebuild_full(db, T, NOW, None, versions, key))
+        assert header.tenant_id == T and header.building_count == 3
+        assert db.s.query(CustomerPortfolioReadModel).count() == 1
+
+    def test_page_read_comes_from_stored_rows(self, make_db):
+        db = make_db(25)
+        _run(rmod.get_read_model(db, T, NOW))        # build
+        rm = _run(rmod.get_read_model(db, T, NOW))
+        assert rm.records is None and len(_stored(db)) == 25
+        page = _run(rmod.locations_page(db, rm, page=3, page_size=10))
+        assert page["total"] == 25 and len(page["items"]) == 5
+
+    def test_disabled_flag_serves_in_memory(self, make_db, monkeypatch):
+        monkeypatch.setattr("app.config.settings.FEATURE_CUSTOMER_READ_MODEL", "false")
+        db = make_db(3)
+        rm = _run(rmod.get_read_model(db, T, NOW))
+        assert rm.records is not None and rm.building_count == 3
+        assert db.s.execute(select(CustomerPortfolioReadModel)).first() is None
+
+    def test_registry_off_is_legacy(self, make_db, monkeypatch):
+        monkeypatch.setattr("app.config.settings.FEATURE_CUSTOMER_PORTFOLIO_REGISTRY", "false")
+        assert _run(rmod.get_read_model(make_db(2), T, NOW)) is None
+
+
+# ── freshness ────────────────────────────────────────────────────────
+class TestFreshness:
+    def test_site_edit_rebuilds_only_its_building(self, make_db):
+        db = make_db(5)
+        _run(rmod.get_read_model(db, T, NOW))
+        before = _stored(db)
+
+        line = db.s.execute(select(Line).where(Line.site_id == "S002")).scalar_one()
+        line.did = "+13125559999"
+        db.s.commit()
+
+        rm = _run(rmod.get_read_model(db, T, NOW + timedelta(seconds=5)))
+        after = _stored(db)
+        changed = {bid for bid in before if before[bid] != after[bid]}
+        assert len(changed) == 1
+        (bid,) = changed
+        assert after[bid]["_site_ids"] == ["S002"]
+        assert _run(rmod.search(db, rm, "13125559999"))["results"]
+        assert rm.built_at == NOW       # incremental does not reset the TTL clock
+
+    def test_registry_edit_is_full_rebuild(self, make_db):
+        db = make_db(3)
+        _run(rmod.get_read_model(db, T, NOW))
+        b = db.s.execute(select(PortfolioBuilding).where(PortfolioBuilding.store_number == "1")).scalar_one()
+        b.approved = False
+        db.s.commit()
+        later = NOW + timedelta(seconds=5)
+        rm = _run(rmod.get_read_model(db, T, later))
+        assert rm.building_count == 2 and rm.built_at == later
+        assert len(_stored(db)) == 2
+
+    def test_expired_is_served_stale_and_enqueues_once(self, make_db, monkeypatch):
+        enqueued = []
+
+        async def fake_enqueue(db, *, job_type, tenant_id=None, **kw):
+            enqueued.append((job_type, tenant_id))
+
+        monkeypatch.setattr("app.services.job_service.create_and_enqueue", fake_enqueue)
+        db = make_db(2)
+        _run(rmod.get_read_model(db, T, NOW))
+        later = NOW + timedelta(seconds=301)
+        rm = _run(rmod.get_read_model(db, T, later))
+        assert rm.stale and rm.built_at == NOW
+        _run(rmod.get_read_model(db, T, later + timedelta(seconds=1)))
+        assert enqueued == [(rmod.REFRESH_JOB_TYPE, T)]
+
+        assert _run(rmod.refresh(db, T, later))["mode"] == "full"
+        assert _run(rmod.refresh(db, T, later))["mode"] == "noop"
+
+    def test_past_max_stale_rebuilds_synchronously(self, make_db):
+        db = make_db(2)
+        _run(rmod.get_read_model(db, T, NOW))
+        much_later = NOW + timedelta(hours=2)
+        rm = _run(rmod.get_read_model(db, T, much_later))
+        assert not rm.stale and rm.built_at == much_later
+
+
+# ── search parity ────────────────────────────────────────────────────
+def test_search_text_matches_like_matches():
+    record = {"canonical_name": "Store #12", "store_number": "12", "city": "Springfield",
+              "state": "IL", "site_type": None,
+              "services": [{"service": "Fire Alarm", "phone_numbers": ["+13125550012"]}]}
+    hay = rmod.search_text(record)
+    for q in ("store", "springfield il", "fire alarm", "5550012", "12", "nope", "alarm +1312"):
+        assert (q in hay) == prv._matches(record, q), q
@@ -0,0 +1,119 @@
+"""E911 gap worklist (app.services.e911_gaps)."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from app.models.device import Device
+from app.models.line import Line
+from app.models.service_unit import ServiceUnit
+from app.models.site import Site
+from app.services import change_version, e911_gaps
+
+
+ADDR = dict(e911_street="1 Main St", e911_city="Napa", e911_state="CA", e911_zip="94559")
+
+
+def _site(site_id, tenant_id, site_name, **kw):
+    return Site(site_id=site_id, tenant_id=tenant_id, site_name=site_name,
+                customer_name="Acme", status="active", **kw)
+
+
+@pytest.fixture
+def db(db):
+    s = db.s
+    for n in range(30):                                    # complete + verified: omitted
+        s.add(_site(f"ok{n}", "acme", f"OK {n:02d}", e911_status="verified", **ADDR))
+        s.add(ServiceUnit(unit_id=f"u-ok{n}", tenant_id="acme", site_id=f"ok{n}",
+                          unit_name="Phone", unit_type="elevator_phone", floor="1",
+                          line_id=f"l-ok{n}"))
+        s.add(Line(line_id=f"l-ok{n}", tenant_id="acme", provider="telnyx", did=f"70755500{n:02d}"))
+    s.add_all([
+        _site("a", "acme", "A Pending", e911_status="pending", **ADDR),
+        _site("b", "acme", "B Verified", e911_status="validated", **ADDR),
+        _site("c", "acme", "C No Address", e911_status="verified"),
+        _site("x", "other", "X Other", e911_status="pending"),
+        # b: line without DID falls back to the device MSISDN
+        ServiceUnit(unit_id="u-b1", tenant_id="acme", site_id="b", unit_name="Fire panel",
+                    unit_type="fire_panel", floor="2", line_id="l-nodid", device_id="d-b"),
+        Line(line_id="l-nodid", tenant_id="acme", provider="telnyx"),
+        Device(device_id="d-b", tenant_id="acme", status="active", device_type="ata", msisdn="7075550199"),
+        # b: the linked device belongs to another tenant, so there's no callback
+        ServiceUnit(unit_id="u-b2", tenant_id="acme", site_id="b", unit_name="Pool phone",
+                    unit_type="pool_phone", location_description="Deck", device_id="d-x"),
+        Device(device_id="d-x", tenant_id="other", status="active", device_type="ata", msisdn="7075550000"),
+        # c: no type, no location, nothing linked
+        ServiceUnit(unit_id="u-c1", tenant_id="acme", site_id="c", unit_name="Mystery", unit_type=""),
+    ])
+    s.commit()
+    e911_gaps.invalidate()
+    yield db
+    e911_gaps.invalidate()
+
+
+def test_worklist_lists_only_sites_with_gaps(db):
+    gaps = asyncio.run(e911_gaps.list_e911_gaps(db, "acme"))
+    assert [g["site_id"] for g in gaps] == ["a", "b", "c"]
+    a, b, c = gaps
+    assert a["missing"] == ["e911_verification"] and a["endpoint_gaps"] == []
+    assert b["missing"] == [] and b["endpoint_gaps"] == [
+        {"unit_id": "u-b2", "unit_name": "Pool phone", "missing": ["callback_number"]}]
+    assert c["missing"] == ["service_address"]
+    assert c["endpoint_gaps"][0]["missing"] == ["service_type", "location", "callback_number"]
+
+
+def test_sql_predicate_matches_the_python_taxonomy(db):
+    sites = db.s.query(Site).filter_by(tenant_id="acme").order_by(Site.site_name).all()
+    units = asyncio.run(e911_gaps._units_with_callbacks(db, "acme", [s.site_id for s in sites]))
+    expected = [g for g in (e911_gaps.compute_site_e911_gaps(s, units.get(s.site_id, ()))
+                            for s in sites) if g is not None]
+    assert asyncio.run(e911_gaps.list_e911_gaps(db, "acme")) == expected
+
+
+def test_pages_are_sliced_in_sql(db):
+    pages = [asyncio.run(e911_gaps.list_e911_gaps(db, "acme", limit=2, offset=o)) for o in (0, 2, 4)]
+    assert [[g["site_id"] for g in page] for page in pages] == [["a", "b"], ["c"], []]
+    assert pages[0][1]["endpoint_gaps"][0]["unit_id"] == "u-b2"
+
+
+@pytest.fixture
+def versioned(db):
+    was_installed = event.contains(Session, "before_flush", change_version._before_flush)
+    change_version.install()
+    yield db
+    if not was_installed:
+        event.remove(Session, "before_flush", change_version._before_flush)
+
+
+def _verify_site_a(db):
+    db.s.get(Site, db.s.query(Site.id).filter_by(site_id="a").scalar()).e911_status = "verified"
+    db.s.commit()
+
+
+def test_gap_count_is_cached_until_the_ttl_for_writes_outside_the_orm(versioned, monkeypatch):
+    db, now = versioned, [0.0]
+    monkeypatch.setattr(e911_gaps, "_clock", lambda: now[0])
+    assert asyncio.run(e911_gaps.gap_count(db, "acme")) == 3
+    db.s.execute(text("UPDATE sites SET e911_status = 'verified' WHERE site_id = 'a'"))
+    db.s.commit()
+    assert asyncio.run(e911_gaps.gap_count(db, "acme")) == 3          # still cached
+    now[0] = 10_000                                                   # TTL elapsed
+    assert asyncio.run(e911_gaps.gap_count(db, "acme")) == 2
+    assert asyncio.run(e911_gaps.gap_count(db, "other")) == 1
+
+
+def test_orm_writes_refresh_the_cached_count(versioned):
+    db = versioned
+    assert asyncio.run(e911_gaps.gap_count(db, "acme")) == 3
+    assert asyncio.run(e911_gaps.gap_count(db, "other")) == 1
+    _verify_site_a(db)
+    assert asyncio.run(e911_gaps.gap_count(db, "acme")) == 2
+
+    db.s.get(ServiceUnit, db.s.query(ServiceUnit.id).filter_by(unit_id="u-b2").scalar()).device_id = "d-b"
+    db.s.commit()                                                     # b's last endpoint gap closed
+    assert asyncio.run(e911_gaps.gap_count(db, "acme")) == 1
+    assert asyncio.run(e911_gaps.gap_count(db, "other")) == 1
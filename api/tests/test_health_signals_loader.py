@@ -40,10 +40,12 @@ def _device(
     vola_last_sync=None,
     heartbeat_interval=300,
     status="active",
+    last_call_at=None,
 ):
     """Build a Device-shaped SimpleNamespace the loader will accept."""
     return SimpleNamespace(
         device_id=device_id,
+        last_call_at=last_call_at,
         site_id=site_id,
         last_heartbeat=last_heartbeat,
         network_status=network_status,
@@ -133,7 +135,9 @@ class TestLoadSignalsForTenant:
         assert result["dev-a"].last_vola_sync_at == ts
 
     @pytest.mark.asyncio
-    async def test_telnyx_last_call_attached_per_device(self):
+    async def test_telnyx_last_call_attached_per_device(self, monkeypatch):
+        # Aggregate fallback (column switched off).
+        monkeypatch.setattr("app.config.settings.FEATURE_DEVICE_LAST_CALL_COLUMN", "false")
         ts_a = _NOW - timedelta(seconds=60)
         ts_b = _NOW - timedelta(seconds=600)
         devices = [_device("dev-a"), _device("dev-b"), _device("dev-c")]
@@ -185,14 +189,25 @@ class TestLoadSignalsForTenant:
         assert result["dev-a"].sip_status is None
 
     @pytest.mark.asyncio
-    async def test_total_round_trips_is_two_with_devices(self):
+    async def test_total_round_trips_is_two_with_devices(self, monkeypatch):
         # The 'bulk queries, not per-device' guarantee — fleet of
-        # 50 devices is still 2 DB round-trips.
+        # 50 devices is still 2 DB round-trips on the aggregate path.
+        monkeypatch.setattr("app.config.settings.FEATURE_DEVICE_LAST_CALL_COLUMN", "false")
         devices = [_device(f"dev-{i}") for i in range(50)]
         db = _mock_db(devices)
         await load_signals_for_tenant(db, "tenant-x")
         assert db.execute.call_count == 2
 
+    @pytest.mark.asyncio
+    async def test_last_call_column_is_a_single_device_scan(self):
+        ts_a = _NOW - timedelta(seconds=60)
+        devices = [_device("dev-a", last_call_at=ts_a), _device("dev-b")]
+        db = _mock_db(devices)
+        result = await load_signals_for_tenant(db, "tenant-x")
+        assert db.execute.call_count == 1
+        assert result["dev-a"].last_call_event_at == ts_a
+        assert result["dev-b"].last_call_event_at is None
+
 
 # ─── load_signals_for_site ─────────────────────────────────────────
 
@@ -0,0 +1,210 @@
+"""Outbound integration gateway (app.integrations.gateway).
+
+Pooling and the concurrency cap run against a local stub HTTP server; the
+retry rules use an ``httpx.MockTransport``.  Pins:
+
+  * one vendor's requests reuse pooled connections
+  * no more than ``max_concurrency`` requests are in flight
+  * the token bucket spaces requests at ``rate_per_second`` after ``burst``
+  * 503 is retried for GET but not POST; 429 is retried for any method and
+    honours Retry-After; T-Mobile is never retried
+  * provider clients keep that default: a Telnyx POST is not re-sent
+  * counters / status classes, and the INTEGRATION_GATEWAY_LIMITS override
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from app.config import Settings
+from app.integrations import gateway as gw
+from app.integrations.gateway import POLICIES, TokenBucket, VendorPolicy
+
+FAST = VendorPolicy(rate_per_second=0, max_concurrency=2, backoff_base=0, backoff_max=0)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_registry():
+    gw.reset()
+    yield
+    gw.reset()
+
+
+@pytest.fixture
+def stub():
+    """A local HTTP server recording client ports and peak concurrency."""
+    state = {"ports": set(), "active": 0, "peak": 0, "delay": 0.0}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"          # keep-alive
+
+        def do_GET(self):
+            with lock:
+                state["ports"].add(self.client_address[1])
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            time.sleep(state["delay"])
+            with lock:
+                state["active"] -= 1
+            self.send_response(200)
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"ok")
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    state["url"] = f"http://127.0.0.1:{server.server_address[1]}/"
+    yield state
+    server.shutdown()
+    server.server_close()
+
+
+def _scripted(responses, seen):
+    """MockTransport answering with ``responses`` in order (exceptions are raised)."""
+    def handler(request):
+        seen.append(request.method)
+        nxt = responses[min(len(seen), len(responses)) - 1]
+        if isinstance(nxt, Exception):
+            raise nxt
+        return nxt
+    return httpx.MockTransport(handler)
+
+
+def test_requests_reuse_pooled_connections(stub):
+    async def go():
+        g = gw.configure("stub", FAST)
+        for _ in range(10):
+            assert (await g.get(stub["url"])).text == "ok"
+        await gw.aclose_all()
+        return g
+
+    g = asyncio.run(go())
+    assert len(stub["ports"]) == 1
+    s = g.stats()
+    assert s["requests"] == 10 and s["errors"] == 0 and s["status"] == {"2xx": 10}
+
+
+def test_concurrency_is_capped(stub):
+    stub["delay"] = 0.05
+
+    async def go():
+        g = gw.configure("stub", FAST)
+        await asyncio.gather(*(g.get(stub["url"]) for _ in range(8)))
+        await gw.aclose_all()
+
+    asyncio.run(go())
+    assert stub["peak"] == 2 and len(stub["ports"]) <= 2
+
+
+def test_token_bucket_spaces_requests_after_burst():
+    now = [0.0]
+    bucket = TokenBucket(rate=2, burst=2, clock=lambda: now[0])
+    assert bucket.try_acquire() == 0 and bucket.try_acquire() == 0
+    assert bucket.try_acquire() == pytest.approx(0.5)
+    now[0] = 0.5
+    assert bucket.try_acquire() == 0
+    now[0] = 100                                         # refills to burst, no more
+    assert [bucket.try_acquire() for _ in range(3)][-1] > 0
+    assert TokenBucket(rate=0, burst=1).try_acquire() == 0   # disabled
+
+
+def test_503_retried_for_get_not_post():
+    async def go(method, **kw):
+        seen = []
+        g = gw.configure("v", FAST, transport=_scripted(
+            [httpx.Response(503), httpx.Response(200)], seen))
+        resp = await g.request(method, "https://v.example/x", **kw)
+        return resp.status_code, len(seen), g.counters
+
+    assert asyncio.run(go("GET"))[:2] == (200, 2)
+    assert asyncio.run(go("POST"))[:2] == (503, 1)
+    status, calls, counters = asyncio.run(go("POST", retry=True))   # e.g. a token grant
+    assert (status, calls, counters["retries"], counters["errors"]) == (200, 2, 1, 1)
+    assert asyncio.run(go("GET", retry=False))[:2] == (503, 1)
+
+
+def test_429_retried_for_post_honouring_retry_after(monkeypatch):
+    sleeps = []
+
+    async def _sleep(delay):
+        sleeps.append(delay)
+
+    monkeypatch.setattr(gw.asyncio, "sleep", _sleep)
+
+    async def go():
+        seen = []
+        policy = VendorPolicy(rate_per_second=0, backoff_base=5, backoff_max=30)
+        g = gw.configure("v", policy, transport=_scripted(
+            [httpx.Response(429, headers={"Retry-After": "2"}), httpx.Response(201)], seen))
+        return (await g.post("https://v.example/x", json={})).status_code, len(seen)
+
+    assert asyncio.run(go()) == (201, 2)
+    assert sleeps == [2.0]
+
+
+def test_transport_errors_retried_only_when_unsent_or_idempotent():
+    async def go(method, exc):
+        seen = []
+        g = gw.configure("v", FAST, transport=_scripted([exc, httpx.Response(200)], seen))
+        try:
+            return (await g.request(method, "https://v.example/x")).status_code
+        except httpx.TransportError:
+            return "raised"
+
+    assert asyncio.run(go("POST", httpx.ConnectError("refused"))) == 200
+    assert asyncio.run(go("POST", httpx.ReadError("reset"))) == "raised"
+    assert asyncio.run(go("GET", httpx.ReadError("reset"))) == 200
+
+
+def test_provider_client_writes_are_not_resent():
+    from app.integrations.base import ProviderError
+    from app.integrations.telnyx import TelnyxClient
+
+    async def go(call):
+        seen = []
+        gw.configure("telnyx", FAST, transport=_scripted(
+            [httpx.Response(503), httpx.Response(200, json={"data": {}})], seen))
+        try:
+            await call(TelnyxClient(api_key="k"))
+        except ProviderError as exc:
+            return exc.status_code, len(seen)
+        return 200, len(seen)
+
+    assert asyncio.run(go(lambda c: c.order_phone_number("+15555550100", "conn"))) == (503, 1)
+    assert asyncio.run(go(lambda c: c.get_sim_status("sim-1"))) == (200, 2)
+
+
+def test_tmobile_is_never_retried():
+    assert POLICIES["tmobile"].retries == 0
+
+    async def go():
+        seen = []
+        policy = POLICIES["tmobile"]
+        g = gw.configure("tmobile", VendorPolicy(rate_per_second=0, retries=policy.retries),
+                         transport=_scripted([httpx.Response(429), httpx.Response(200)], seen))
+        return (await g.post("https://t.example/x", retry=True)).status_code, len(seen)
+
+    assert asyncio.run(go()) == (429, 1)
+
+
+def test_limits_setting_overrides_policy(monkeypatch):
+    s = Settings(INTEGRATION_GATEWAY_LIMITS="verizon=2.5/3, zoho=1")
+    assert s.integration_gateway_limits == {"verizon": (2.5, 3), "zoho": (1.0, 1)}
+
+    monkeypatch.setattr(gw, "settings", s)
+    verizon = gw.gateway("verizon").policy
+    assert (verizon.rate_per_second, verizon.max_concurrency, verizon.http2) == (2.5, 3, True)
+    assert gw.gateway("vola").policy == POLICIES["vola"]
+    assert gw.gateway("verizon") is gw.gateway("verizon")
+    assert [row["vendor"] for row in gw.stats()] == ["verizon", "vola"]
@@ -0,0 +1,138 @@
+"""job_service bulk enqueue and idempotency-key de-duplication."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+
+from app.models.job import Job
+from app.services import job_service
+
+
+class _Pipeline:
+    def __init__(self, log):
+        self.log = log
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self):
+        self.log.append(("execute",))
+
+
+class _Queue:
+    def __init__(self, name, log):
+        self.name, self.log = name, log
+
+    def prepare_data(self, func, args=(), timeout=None):
+        return (func, args)
+
+    def enqueue_many(self, datas, pipeline=None):
+        assert pipeline is not None
+        self.log.append(("enqueue_many", self.name, list(datas)))
+
+    def enqueue(self, func, *args, **kw):
+        self.log.append(("enqueue", self.name, func, args))
+
+
+@pytest.fixture
+def rq_log(monkeypatch):
+    log: list = []
+    queues: dict = {}
+    monkeypatch.setattr(job_service, "_rq_queue", lambda name: queues.setdefault(name, _Queue(name, log)))
+    monkeypatch.setattr(job_service, "_redis_conn", type("R", (), {"pipeline": lambda self: _Pipeline(log)})())
+    return log
+
+
+def _spec(key, job_type="sim.activate", queue="provisioning"):
+    return {"job_type": job_type, "queue": queue, "tenant_id": "t1",
+            "payload": {"k": key}, "idempotency_key": key}
+
+
+def test_bulk_insert_and_pipelined_enqueue(db, rq_log):
+    jobs = asyncio.run(job_service.create_and_enqueue_many(
+        db, [_spec("a"), _spec("b"), _spec(None, "webhook.vola", "default")],
+    ))
+    assert [j.idempotency_key for j in jobs] == ["a", "b", None]
+    assert len({j.id for j in jobs}) == 3
+    assert db.s.query(Job).filter_by(status="queued").count() == 3
+    enqueued = {entry[1]: entry[2] for entry in rq_log if entry[0] == "enqueue_many"}
+    assert enqueued["provisioning"] == [("worker.dispatch", (jobs[0].id,)), ("worker.dispatch", (jobs[1].id,))]
+    assert enqueued["default"] == [("worker.dispatch", (jobs[2].id,))]
+    assert rq_log[-1] == ("execute",)
+
+
+def test_duplicates_reuse_in_flight_jobs(db, rq_log):
+    db.s.add_all([
+        Job(job_type="sim.activate", queue="provisioning", status="running", idempotency_key="a"),
+        Job(job_type="sim.activate", queue="provisioning", status="completed", idempotency_key="b"),
+    ])
+    db.s.flush()
+    running = db.s.execute(select(Job).where(Job.status == "running")).scalar_one()
+
+    jobs = asyncio.run(job_service.create_and_enqueue_many(
+        db, [_spec("a"), _spec("b"), _spec("b"), _spec("c")],
+    ))
+    assert jobs[0] is running
+    assert jobs[1] is jobs[2] and jobs[1].status == "queued"   # completed "b" doesn't block
+    assert db.s.query(Job).count() == 4                       # + new b, c
+    [(_, _, enqueued)] = [e for e in rq_log if e[0] == "enqueue_many"]
+    assert [args[0] for _, args in enqueued] == [jobs[1].id, jobs[3].id]
+
+
+def test_a_second_in_flight_job_for_a_key_is_refused(db, rq_log):
+    db.s.add(Job(job_type="sim.activate", status="queued", idempotency_key="a"))
+    db.s.commit()
+    db.s.add(Job(job_type="sim.activate", status="running", idempotency_key="a"))
+    with pytest.raises(IntegrityError):
+        db.s.commit()
+    db.s.rollback()
+    db.s.add(Job(job_type="sim.activate", status="completed", idempotency_key="a"))
+    db.s.commit()                                               # finished rows don't count
+
+    [job] = asyncio.run(job_service.create_and_enqueue_many(db, [_spec("a")]))
+    assert job.status == "queued" and db.s.query(Job).count() == 2
+    assert rq_log == []
+
+
+def test_single_create_and_enqueue_dedupes(db, rq_log):
+    first = asyncio.run(job_service.create_and_enqueue(db, job_type="sim.suspend", idempotency_key="s.1"))
+    again = asyncio.run(job_service.create_and_enqueue(db, job_type="sim.suspend", idempotency_key="s.1"))
+    assert again is first
+    assert [e[0] for e in rq_log] == ["enqueue"]
+
+
+def test_stale_in_flight_jobs_do_not_block(db, rq_log):
+    old = datetime.now(timezone.utc) - job_service._DEDUP_WINDOW - timedelta(minutes=1)
+    db.s.add_all([
+        Job(job_type="sim.activate", queue="provisioning", status="queued",
+            idempotency_key="q", created_at=old),
+        Job(job_type="sim.activate", queue="provisioning", status="running",
+            idempotency_key="r", created_at=old, started_at=old),
+    ])
+    db.s.flush()
+    stale = db.s.execute(select(Job)).scalars().all()
+
+    job = asyncio.run(job_service.create_and_enqueue(db, job_type="sim.activate",
+                                                     queue="provisioning", idempotency_key="q"))
+    assert job not in stale and job.status == "queued"
+    assert rq_log == [("enqueue", "provisioning", "worker.dispatch", (job.id,))]
+
+    [again] = asyncio.run(job_service.create_and_enqueue_many(db, [_spec("r")]))
+    assert again not in stale
+    assert db.s.query(Job).count() == 4
+    db.s.expire_all()
+    assert {(j.idempotency_key, j.status) for j in stale} == {("q", "failed"), ("r", "failed")}
+    assert all(j.error.startswith("Abandoned") for j in stale)
+
+
+def test_empty_batch_is_a_no_op(db, rq_log):
+    assert asyncio.run(job_service.create_and_enqueue_many(db, [])) == []
+    assert db.s.query(Job).count() == 0 and rq_log == []
@@ -0,0 +1,43 @@
+"""In-process latency histograms (app.services.latency)."""
+
+from __future__ import annotations
+
+import json
+
+from app.services.latency import LatencyHistogram, histogram
+
+
+def test_buckets_are_cumulative():
+    h = LatencyHistogram("t", buckets_ms=(10, 100))
+    for ms in (1, 10, 50, 500):
+        h.observe(ms)
+    snap = h.snapshot()
+    assert snap["count"] == 4
+    assert snap["sum_ms"] == 561
+    assert snap["buckets"] == [{"le": 10, "count": 2}, {"le": 100, "count": 3},
+                               {"le": "+Inf", "count": 4}]
+
+
+def test_quantiles_are_bucket_upper_bounds():
+    h = LatencyHistogram("t", buckets_ms=(10, 100))
+    for _ in range(95):
+        h.observe(5)
+    for _ in range(5):
+        h.observe(1000)
+    snap = h.snapshot()
+    assert snap["p50_ms"] == 10 and snap["p95_ms"] == 10 and snap["p99_ms"] == "+Inf"
+    json.dumps(snap, allow_nan=False)       # JSON-safe, no infinities
+
+
+def test_empty_and_reset():
+    h = LatencyHistogram("t")
+    assert h.snapshot()["p50_ms"] is None
+    with h.time():
+        pass
+    assert h.snapshot()["count"] == 1
+    h.reset()
+    assert h.snapshot()["count"] == 0
+
+
+def test_registry_returns_the_same_histogram():
+    assert histogram("test.same") is histogram("test.same")
@@ -111,3 +111,83 @@ class TestAnthropicProviderFailure:
                 model="claude-x",
             )
         assert result.status == "error"
+
+
+# ─── Pooled client + streaming transport ───────────────────────────
+
+
+def _sse(*frames: tuple[str, dict]) -> bytes:
+    import json as _json
+
+    return b"".join(
+        f"event: {event}\ndata: {_json.dumps(data)}\n\n".encode() for event, data in frames
+    )
+
+
+class TestPooledClient:
+    @pytest.mark.asyncio
+    async def test_client_is_reused_across_calls(self):
+        from app.services.llm.providers import anthropic_provider as ap
+
+        await ap.aclose_client()
+        first = ap._get_client()
+        assert ap._get_client() is first
+        await ap.aclose_client()
+        assert ap._get_client() is not first
+        await ap.aclose_client()
+
+
+class TestAnthropicStream:
+    @pytest.mark.asyncio
+    async def test_stream_yields_deltas_then_result(self):
+        from app.services.llm.providers import anthropic_provider as ap
+
+        body = _sse(
+            ("message_start", {"message": {"model": "claude-x", "usage": {"input_tokens": 11}}}),
+            ("content_block_delta", {"delta": {"type": "text_delta", "text": '{"a":'}}),
+            ("content_block_delta", {"delta": {"type": "text_delta", "text": " 1}"}}),
+            ("message_delta", {"usage": {"output_tokens": 4}}),
+            ("message_stop", {}),
+        )
+        transport = httpx.MockTransport(
+            lambda req: httpx.Response(200, content=body, headers={"content-type": "text/event-stream"})
+        )
+        await ap.aclose_client()
+        with patch("app.services.llm.providers.anthropic_provider.settings.ANTHROPIC_API_KEY", "test-key"), \
+             patch.object(ap, "_get_client", return_value=httpx.AsyncClient(transport=transport)):
+            chunks = [
+                c async for c in AnthropicProvider().stream(
+                    system_prompt="x", user_prompt="y", timeout_seconds=5.0, model="claude-x",
+                )
+            ]
+        assert [c.text for c in chunks[:-1]] == ['{"a":', " 1}"]
+        result = chunks[-1].result
+        assert result.status == "ok"
+        assert result.raw_text == '{"a": 1}'
+        assert (result.tokens_in, result.tokens_out) == (11, 4)
+
+    @pytest.mark.asyncio
+    async def test_stream_http_error_is_final_result(self):
+        from app.services.llm.providers import anthropic_provider as ap
+
+        transport = httpx.MockTransport(lambda req: httpx.Response(529))
+        with patch("app.services.llm.providers.anthropic_provider.settings.ANTHROPIC_API_KEY", "test-key"), \
+             patch.object(ap, "_get_client", return_value=httpx.AsyncClient(transport=transport)):
+            chunks = [
+                c async for c in AnthropicProvider().stream(
+                    system_prompt="x", user_prompt="y", timeout_seconds=5.0, model="claude-x",
+                )
+            ]
+        assert len(chunks) == 1
+        assert chunks[0].result.status == "error"
+        assert "529" in chunks[0].result.error_summary
+
+    @pytest.mark.asyncio
+    async def test_stream_without_key_makes_no_call(self):
+        with patch("app.services.llm.providers.anthropic_provider.settings.ANTHROPIC_API_KEY", ""):
+            chunks = [
+                c async for c in AnthropicProvider().stream(
+                    system_prompt="x", user_prompt="y", timeout_seconds=5.0, model="claude-x",
+                )
+            ]
+        assert chunks[-1].result.status == "error"
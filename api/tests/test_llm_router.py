@@ -214,3 +214,57 @@ class TestRefreshEndpoint:
         kwargs = stub.await_args.kwargs
         assert kwargs["force_refresh"] is True
         assert kwargs["scope"] == "fleet"
+
+
+# ─── SSE streaming endpoint ────────────────────────────────────────
+
+
+class _NullSession:
+    async def __aenter__(self):
+        return SimpleNamespace()
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class TestStreamEndpoint:
+    def test_feature_off_returns_404(self):
+        user = _stub_user(role="SuperAdmin", tenant_id="default")
+        client = TestClient(_build_app(user=user))
+        with patch("app.routers.llm.settings.FEATURE_LLLM", "false"):
+            r = client.get("/api/llm/health-summary/stream?scope=fleet")
+        assert r.status_code == 404
+
+    def test_customer_tenant_admin_blocked(self):
+        user = _stub_user(
+            role="Admin",
+            tenant_id="restoration-hardware",
+            original_tenant_id="restoration-hardware",
+        )
+        client = TestClient(_build_app(user=user))
+        with patch("app.routers.llm.settings.FEATURE_LLLM", "true"):
+            r = client.get("/api/llm/health-summary/stream?scope=fleet")
+        assert r.status_code == 403
+
+    def test_emits_deltas_then_summary_frame(self):
+        user = _stub_user(role="SuperAdmin", tenant_id="default")
+        client = TestClient(_build_app(user=user))
+
+        async def _fake_stream(**kwargs):
+            yield "delta", {"text": '{"current_status":'}
+            yield "delta", {"text": ' "Fleet stable."}'}
+            yield "summary", _deterministic_response()
+
+        with patch("app.routers.llm.settings.FEATURE_LLLM", "true"), \
+             patch("app.routers.llm.AsyncSessionLocal", new=_NullSession), \
+             patch("app.routers.llm.stream_health_summary", new=_fake_stream):
+            r = client.get("/api/llm/health-summary/stream?scope=fleet")
+        assert r.status_code == 200
+        assert r.headers["content-type"].startswith("text/event-stream")
+        frames = [f for f in r.text.split("\n\n") if f]
+        assert [f.split("\n")[0] for f in frames] == [
+            "event: delta", "event: delta", "event: summary",
+        ]
+        import json as _json
+        summary = _json.loads(frames[-1].split("data: ", 1)[1])
+        assert summary["summary_id"] == "ai-abc123"
@@ -561,3 +561,69 @@ def test_non_emergency_session_not_blocked_by_guard(monkeypatch):
     # The create path proceeds past the emergency guard and succeeds.
     assert r.status_code == 201
     assert r.json()["verification_status"] == "unverified"
+
+
+# ════════════════════════════════════════════════════════════════════
+# Batched enrichment + lookup latency
+# ════════════════════════════════════════════════════════════════════
+
+class _CountingFakeDB(FakeDB):
+    def __init__(self, results=None):
+        super().__init__(results)
+        self.executes = 0
+
+    async def execute(self, stmt, *a, **k):
+        self.executes += 1
+        return await super().execute(stmt, *a, **k)
+
+
+@pytest.mark.asyncio
+async def test_enrichment_is_one_query_for_many_matches():
+    site_a = SimpleNamespace(site_id="S-A", tenant_id="rh", site_name="RH Boston",
+                             poc_name="Pat", poc_phone="8563081391")
+    site_b = SimpleNamespace(site_id="S-B", tenant_id="rh", site_name="RH Salem",
+                             poc_name=None, poc_phone=None)
+    matches = [
+        lookup_svc.RawAssetMatch(asset_kind="device", asset_ref=f"D{i}", match_source="device",
+                                 tenant_id="rh", site_id="S-A" if i % 2 else "S-B")
+        for i in range(12)
+    ]
+    # Same site id under another tenant must not pick up rh's contact.
+    matches.append(lookup_svc.RawAssetMatch(asset_kind="device", asset_ref="X", match_source="device",
+                                            tenant_id="other", site_id="S-A"))
+    matches.append(lookup_svc.RawAssetMatch(asset_kind="device", asset_ref="Y", match_source="device",
+                                            tenant_id="rh"))
+    db = _CountingFakeDB([[site_a, site_b]])
+    await lookup_svc._enrich_site_and_contact(db, matches)
+    assert db.executes == 1
+    assert {m.site_name for m in matches[:12]} == {"RH Boston", "RH Salem"}
+    assert all(m.contact_phone == "8563081391" for m in matches[:12] if m.site_id == "S-A")
+    assert all(m.contact_phone is None for m in matches[:12] if m.site_id == "S-B")
+    assert matches[12].site_name is None and matches[12].contact_phone is None
+    assert matches[13].site_name is None
+
+
+@pytest.mark.asyncio
+async def test_enrichment_skips_query_without_sites():
+    db = _CountingFakeDB()
+    await lookup_svc._enrich_site_and_contact(db, [])
+    assert db.executes == 0
+
+
+@pytest.mark.asyncio
+async def test_find_assets_records_latency():
+    from app.services.latency import histogram
+
+    h = histogram(lookup_svc.LOOKUP_HISTOGRAM)
+    before = h.snapshot()["count"]
+    await lookup_svc.find_assets(_CountingFakeDB(), identifier="8563081391")
+    assert h.snapshot()["count"] == before + 1
+
+
+def test_lookup_latency_is_platform_only(monkeypatch):
+    monkeypatch.setattr("app.config.settings.FEATURE_OPS_CENTER", "true")
+    r = _client(role="SuperAdmin").get("/api/ops-center/lookup-latency")
+    assert r.status_code == 200
+    assert r.json()["name"] == lookup_svc.LOOKUP_HISTOGRAM
+    r = _client(role="Admin", tenant="rh").get("/api/ops-center/lookup-latency")
+    assert r.status_code == 403
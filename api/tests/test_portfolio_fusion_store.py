@@ -0,0 +1,132 @@
+"""Incremental Portfolio Fusion (app.services.portfolio_fusion) and streaming inputs."""
+
+from __future__ import annotations
+
+import asyncio
+import csv
+import json
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import func, select
+
+from app.models.portfolio_fusion import PortfolioFusionRecord, PortfolioFusionTwin
+from app.services import portfolio_fusion as store
+from app.services import portfolio_registry as _reg
+from app.services.inventory_reconciliation.adapters import napco
+from scripts import rh_portfolio_fusion as fz
+
+
+@pytest.fixture
+def db(db):
+    db.s.expire_on_commit = True
+    return db
+
+
+_STORES = [("177", "Jacksonville", "FL"), ("149", "Austin", "TX"), ("140", "Houston", "TX"),
+           ("142", "Boston", "MA"), ("147", "Chicago", "IL"), ("150", "Leawood", "KS")]
+
+
+def _sources(stores=_STORES):
+    true911 = {"tenant": "rh",
+               "sites": [{"site_id": f"RH-{n}", "name": f"Restoration Hardware #{n}",
+                          "street": f"{n} Main St", "city": c, "state": st, "zip": None,
+                          "e911_status": "validated" if n != "150" else "pending"}
+                         for n, c, st in stores],
+               "devices": [{"device_id": f"D{n}", "site_id": f"RH-{n}", "msisdn": f"90055500{n}",
+                            "iccid": f"IC{n}", "imei": None, "starlink_id": f"RAD{n}",
+                            "serial_number": f"RAD{n}", "identifier_type": "starlink",
+                            "model": "SLE", "device_type": "fire_alarm"} for n, _, _ in stores],
+               "units": [], "lines": []}
+    zoho = [{"account_name": f"Restoration Hardware #{n} {c}", "facility_name": None,
+             "street": f"{n} Main St", "city": c, "state": st, "zip": None,
+             "connection_type": "Alarm Panel", "imei": None, "sim": f"IC{n}", "msisdn": None,
+             "starlink_id": f"RAD{n}"} for n, c, st in stores]
+    napco_rows = [SimpleNamespace(vendor="napco", radio_number=f"RAD{n}b", iccid=f"IC{n}b",
+                                  subscriber_name=f"Restoration Hardware #{n} {c}",
+                                  site_hint=None) for n, c, _ in stores]
+    napco_rows.append(SimpleNamespace(vendor="napco", radio_number="NX1", iccid="NIC1",
+                                      subscriber_name="Some Dealer School", site_hint=None))
+    # a second building sharing store 177's address
+    zoho.append({"account_name": "Restoration Hardware Outlet Jacksonville", "facility_name": None,
+                 "street": "177 Main St", "city": "Jacksonville", "state": "FL", "zip": None,
+                 "connection_type": None, "imei": None, "sim": None, "msisdn": "9045550999",
+                 "starlink_id": None})
+    return {"zoho_rows": zoho, "napco_records": napco_rows, "true911": true911}
+
+
+def _run(db, sources, registry=None):
+    return asyncio.run(store.run_fusion(db, "rh", registry=registry, **sources))
+
+
+def _full(sources, registry=None):
+    return fz.fuse_portfolio(tenant="rh", registry=registry, **sources)
+
+
+def _same(report, expected):
+    stats = report["summary"].pop("incremental")
+    assert json.loads(json.dumps(report, default=str)) == json.loads(json.dumps(expected, default=str))
+    return stats
+
+
+def test_first_run_matches_fuse_portfolio_and_fills_store(db):
+    registry = _reg.empty_registry("rh")
+    stats = _same(_run(db, _sources(), registry), _full(_sources(), registry))
+    assert stats["buildings_reused"] == 0 and stats["records_added"] == stats["records"]
+    twins = db.s.scalar(select(func.count()).select_from(PortfolioFusionTwin))
+    assert twins == stats["buildings_rebuilt"] > 0
+    assert db.s.scalar(select(func.count()).select_from(PortfolioFusionRecord)) == stats["records"]
+
+
+def test_unchanged_rerun_reuses_every_building(db):
+    first = _same(_run(db, _sources()), _full(_sources()))
+    again = _same(_run(db, _sources()), _full(_sources()))
+    assert again == {"records": first["records"], "records_added": 0, "records_removed": 0,
+                     "buildings_reused": first["buildings_rebuilt"], "buildings_rebuilt": 0}
+
+
+def test_changes_rebuild_only_the_touched_buildings(db):
+    first = _same(_run(db, _sources()), _full(_sources()))
+
+    changed = _sources()
+    changed["true911"]["sites"][1]["e911_status"] = "pending"          # store 149
+    stats = _same(_run(db, changed), _full(changed))
+    assert (stats["records_added"], stats["records_removed"], stats["buildings_rebuilt"]) == (1, 1, 1)
+    assert stats["buildings_reused"] == first["buildings_rebuilt"] - 1
+
+    grown = _sources(_STORES + [("161", "San Francisco", "CA")])       # a new store
+    grown["true911"]["sites"][1]["e911_status"] = "pending"
+    stats = _same(_run(db, grown), _full(grown))
+    assert stats["buildings_rebuilt"] == 1 and stats["buildings_reused"] == first["buildings_rebuilt"]
+
+    shrunk = _sources(_STORES[1:] + [("161", "San Francisco", "CA")])  # store 177 closes
+    shrunk["true911"]["sites"][0]["e911_status"] = "pending"
+    stats = _same(_run(db, shrunk), _full(shrunk))
+    # the outlet sharing 177's address is re-clustered on its own
+    assert (stats["records_removed"], stats["buildings_rebuilt"]) == (3, 1)
+
+
+def test_store_is_per_tenant(db):
+    _run(db, _sources())
+    other = asyncio.run(store.run_fusion(db, "other", **_sources()))
+    assert other["summary"]["incremental"]["buildings_reused"] == 0
+
+
+def test_streaming_readers_match_loaders(tmp_path):
+    radios = tmp_path / "napco.csv"
+    radios.write_text("RadioNumber\tICCID\tSubscriber Name\n"
+                      "9743676\t8901260882237499857\tRestoration Hardware #177\n"
+                      "\t\tno identifiers\n"
+                      "R2\tIC2\tSome Dealer School\n", encoding="utf-8")
+    assert [vars(r) for r in napco.iter_parse(str(radios))] == [
+        vars(r) for r in napco.parse(str(radios))]
+
+    genesis = tmp_path / "genesis.csv"
+    with open(genesis, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(["Phone Number", "SIM ICCID", "IMEI", "Site Name"])
+        w.writerow(["614-209-8841", "8901260882237499857", "868105041862416", "RH MDC"])
+        w.writerow(["303-555-2000", "", "", "Infatrac Subscriber"])
+    rows = fz.iter_genesis_csv(str(genesis))
+    assert not isinstance(rows, list)
+    assert list(rows) == fz.load_genesis_csv(str(genesis))
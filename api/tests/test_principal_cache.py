@@ -0,0 +1,137 @@
+"""get_current_user principal cache (app.services.principal_cache)."""
+
+from __future__ import annotations
+
+import asyncio
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import update
+
+from app.config import settings
+from app.dependencies import get_current_user
+from app.models.tenant import Tenant
+from app.models.user import User
+from app.services import principal_cache
+from app.services.auth import create_access_token
+
+# Non-numeric hex: SQLite gives the UUID column numeric affinity.
+USER_ID = uuid.UUID("aaaaaaaa-bbbb-cccc-dddd-eeeeeeeeeeee")
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    c = _Clock()
+    monkeypatch.setattr(principal_cache, "_clock", c)
+    monkeypatch.setattr(settings, "AUTH_PRINCIPAL_CACHE_TTL_SECONDS", 30)
+    principal_cache.install()
+    principal_cache.clear()
+    yield c
+    principal_cache.clear()
+
+
+@pytest.fixture
+def db(db):
+    s = db.s
+    s.add_all([Tenant(tenant_id="acme", name="Acme"), Tenant(tenant_id="other", name="Other")])
+    s.add(User(id=USER_ID, email="a@x.io", name="A", password_hash="x",
+               role="superadmin", tenant_id="acme", is_active=True))
+    s.commit()
+    return db
+
+
+def _auth(db, token, act_as=None):
+    request = SimpleNamespace(state=SimpleNamespace())
+    return asyncio.run(get_current_user(request, token=token, db=db, x_act_as_tenant=act_as))
+
+
+def _token():
+    return create_access_token(USER_ID, "acme", "SuperAdmin")
+
+
+def _rename_elsewhere(db, email):
+    """Another process edits the user: no ORM flush here, no hook."""
+    db.s.execute(update(User).where(User.id == USER_ID).values(email=email))
+    db.s.commit()
+
+
+def test_repeat_requests_hit_the_cache(db, clock):
+    token = _token()
+    first = _auth(db, token)
+    assert first.role == "SuperAdmin"
+    _rename_elsewhere(db, "b@x.io")
+    second = _auth(db, token)
+    assert second is not first and second.email == "a@x.io" and second.role == "SuperAdmin"
+    stats = principal_cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1 and stats["hit_rate"] == 0.5
+
+
+def test_new_token_is_a_new_key(db, clock):
+    _auth(db, _token())
+    _rename_elsewhere(db, "b@x.io")
+    assert _auth(db, _token()).email == "b@x.io"
+    assert principal_cache.stats()["misses"] == 2
+
+
+def test_flushed_deactivation_is_rejected_immediately(db, clock):
+    token = _token()
+    _auth(db, token)
+    db.s.expire_all()
+    user = db.s.get(User, USER_ID)
+    user.is_active = False
+    db.s.commit()
+    with pytest.raises(HTTPException) as exc:
+        _auth(db, token)
+    assert exc.value.status_code == 401
+
+
+def test_unseen_deactivation_is_rejected_after_ttl(db, clock):
+    token = _token()
+    _auth(db, token)
+    # Another process deactivates the user: no ORM flush here, no hook.
+    db.s.execute(update(User).where(User.id == USER_ID).values(is_active=False))
+    db.s.commit()
+    clock.now += 29
+    assert _auth(db, token).is_active            # still inside the window
+    clock.now += 2
+    with pytest.raises(HTTPException) as exc:
+        _auth(db, token)
+    assert exc.value.status_code == 401
+
+
+def test_invalidation_during_a_miss_is_not_recached(db, clock):
+    key = principal_cache.cache_key(USER_ID, {"jti": "j"}, None)
+    gen = principal_cache.generation(USER_ID)
+    principal_cache.invalidate_user(USER_ID)
+    principal_cache.put(key, db.s.get(User, USER_ID), gen)
+    assert principal_cache.get(key) is None
+
+
+def test_act_as_is_keyed_separately_and_not_leaked(db, clock):
+    token = _token()
+    acting = _auth(db, token, act_as="other")
+    assert acting.tenant_id == "other" and acting._is_impersonating
+    again = _auth(db, token, act_as="other")
+    assert again.tenant_id == "other" and again._original_tenant_id == "acme"
+    plain = _auth(db, token)
+    assert plain.tenant_id == "acme" and not plain._is_impersonating
+    stats = principal_cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 2)          # act-as hit, plain miss
+
+
+def test_ttl_zero_disables(db, clock, monkeypatch):
+    monkeypatch.setattr(settings, "AUTH_PRINCIPAL_CACHE_TTL_SECONDS", 0)
+    token = _token()
+    _auth(db, token)
+    _rename_elsewhere(db, "b@x.io")
+    assert _auth(db, token).email == "b@x.io"
@@ -0,0 +1,125 @@
+"""Provisioning scan (app.services.provisioning_engine) and SiteMatcher."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import func, select, update
+
+from app.models.device import Device
+from app.models.line import Line
+from app.models.provisioning_queue import ProvisioningQueueItem
+from app.models.provisioning_scan_state import ProvisioningScanState
+from app.models.sim import Sim
+from app.models.site import Site
+from app.services import provisioning_engine as engine_mod
+from app.services.site_matcher import SiteMatcher
+
+
+@pytest.fixture
+def db(db):
+    s = db.s
+    s.add_all([
+        Site(site_id="s-lobby", tenant_id="acme", site_name="Lobby", customer_name="Acme",
+             status="active", e911_street="1 Main", e911_city="Napa"),
+        Site(site_id="s-garage", tenant_id="acme", site_name="Garage", customer_name="Acme",
+             status="active"),
+        Site(site_id="s-other", tenant_id="other", site_name="Lobby", customer_name="Other",
+             status="active"),
+    ])
+    s.commit()
+    return db
+
+
+def _reference(label, sites):
+    """The pair-wise loop SiteMatcher replaced."""
+    if not label:
+        return None
+    label = label.lower().strip()
+    for s in sites:
+        a, b = (s.site_name or "").lower(), (s.customer_name or "").lower()
+        if label in a or a in label or label in b or b in label:
+            return s
+    return None
+
+
+def test_matcher_agrees_with_pairwise_loop():
+    rng = random.Random(911)
+    words = ["lobby", "north", "tower", "acme", "bldg", "a", "ab", "garage", "east", ""]
+    for _ in range(2000):
+        sites = [SimpleNamespace(site_name=" ".join(rng.sample(words, rng.randint(0, 2))) or None,
+                                 customer_name=rng.choice(words).title())
+                 for _ in range(rng.randint(0, 6))]
+        label = rng.choice([None, "", " Lobby ", "TOWER", "ab", "acme north tower bldg",
+                            " ".join(rng.sample(words, 3))])
+        assert SiteMatcher(sites).match(label) is _reference(label, sites)
+
+
+def _sims(s, n, tenant="acme", label=None, start=0):
+    s.add_all([Sim(iccid=f"8901{tenant}{i:06d}", tenant_id=tenant, carrier="verizon",
+                   status="active", carrier_label=label) for i in range(start, start + n)])
+    s.commit()
+
+
+def test_chunked_scan_enqueues_every_row_and_matches_labels(db, monkeypatch):
+    monkeypatch.setattr(engine_mod, "_SCAN_CHUNK", 50)
+    _sims(db.s, 120, label="ACME Lobby 3F")
+    _sims(db.s, 5, tenant="other", label="nowhere")
+    db.s.add(Device(device_id="d1", tenant_id="acme", status="active"))
+    db.s.add(Line(line_id="l1", tenant_id="acme", provider="telnyx", did="7075550100"))
+    db.s.commit()
+
+    result = asyncio.run(engine_mod.scan_and_enqueue(db, None, "ops@x", is_superadmin=True))
+    assert result == {"created": 127, "skipped": 0, "incremental": False}
+    assert db.s.scalar(select(func.count()).select_from(ProvisioningQueueItem)) == 127
+    assert db.s.get(ProvisioningScanState, "*") is not None
+
+    items = db.s.scalars(select(ProvisioningQueueItem).where(
+        ProvisioningQueueItem.item_type == "sim")).all()
+    acme = [i for i in items if i.tenant_id == "acme"]
+    assert {(i.status, i.suggested_site_id, i.missing_e911) for i in acme} == {("suggested", "s-lobby", False)}
+    assert acme[0].meta == {"carrier_label": "ACME Lobby 3F", "iccid": acme[0].external_ref}
+    other = [i for i in items if i.tenant_id == "other"]
+    assert {(i.status, i.suggested_site_id, i.suggestion_confidence) for i in other} == {
+        ("suggested", "s-other", 0.7)}                      # single site fallback
+    dev = db.s.scalars(select(ProvisioningQueueItem).where(
+        ProvisioningQueueItem.item_type == "device")).one()
+    assert dev.status == "needs_review" and dev.external_ref == "d1"
+
+
+def test_open_items_are_skipped_per_tenant(db):
+    _sims(db.s, 3)
+    first = asyncio.run(engine_mod.scan_and_enqueue(db, "acme", "ops@x"))
+    again = asyncio.run(engine_mod.scan_and_enqueue(db, "acme", "ops@x"))
+    assert (first["created"], again) == (3, {"created": 0, "skipped": 3, "incremental": False})
+
+    db.s.execute(update(ProvisioningQueueItem).values(status="ignored"))
+    db.s.commit()
+    assert asyncio.run(engine_mod.scan_and_enqueue(db, "acme", "ops@x"))["created"] == 3
+
+
+def test_incremental_scan_uses_watermark(db):
+    _sims(db.s, 4)
+    # No watermark yet: an incremental scan is a full one.
+    assert asyncio.run(engine_mod.scan_and_enqueue(db, "acme", "ops@x", incremental=True)) == {
+        "created": 4, "skipped": 0, "incremental": False}
+    state = db.s.get(ProvisioningScanState, "acme")
+    assert state is not None and db.s.get(ProvisioningScanState, "*") is None
+
+    mark = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    state.last_scanned_at = mark
+    db.s.execute(update(ProvisioningQueueItem).values(status="ignored"))
+    db.s.execute(update(Sim).values(updated_at=mark - timedelta(days=1)))
+    db.s.execute(update(Sim).where(Sim.iccid.in_(["8901acme000001", "8901acme000003"]))
+                 .values(updated_at=mark + timedelta(hours=1)))
+    db.s.commit()
+
+    result = asyncio.run(engine_mod.scan_and_enqueue(db, "acme", "ops@x", incremental=True))
+    assert result == {"created": 2, "skipped": 0, "incremental": True}
+    db.s.expire_all()
+    assert db.s.get(ProvisioningScanState, "acme").last_scanned_at.replace(tzinfo=timezone.utc) > mark
+    assert db.s.scalar(select(func.count()).select_from(ProvisioningQueueItem)) == 6
@@ -0,0 +1,121 @@
+"""Reconciliation snapshots (app.services.reconciliation)."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import delete, update
+
+from app.models.customer import Customer
+from app.models.line import Line
+from app.models.reconciliation_snapshot import ReconciliationSnapshot
+from app.models.subscription import Subscription
+from app.services.reconciliation import run_reconciliation
+
+
+OLD = datetime(2020, 1, 1)
+
+
+@pytest.fixture
+def db(db):
+    s = db.s
+    s.add_all([
+        Customer(id=1, tenant_id="acme", name="Acme HQ"),
+        Customer(id=2, tenant_id="acme", name="Acme West"),
+        Subscription(id=10, tenant_id="acme", customer_id=1, plan_name="Basic", status="active", qty_lines=3),
+        Subscription(id=11, tenant_id="acme", customer_id=1, plan_name="Pro", status="active", qty_lines=1),
+        Subscription(id=12, tenant_id="acme", customer_id=2, plan_name="Old", status="cancelled", qty_lines=2),
+        Subscription(id=13, tenant_id="acme", customer_id=2, plan_name="Empty", status="active", qty_lines=2),
+        Subscription(id=20, tenant_id="other", customer_id=1, plan_name="X", status="active", qty_lines=9),
+    ])
+    lines = [("a", 10, "active", "d1"), ("b", 10, "provisioning", None),
+             ("c", 11, "active", "d2"), ("d", 11, "active", ""),
+             ("e", 12, "active", None), ("f", None, "active", "d3"),
+             ("g", 10, "disconnected", "d4")]
+    for n in range(40):                                   # bulk: deployed on sub 11
+        lines.append((f"bulk{n}", 11, "active", None))
+    for line_id, sub, status, device in lines:
+        s.add(Line(line_id=line_id, tenant_id="acme", provider="telnyx", subscription_id=sub,
+                   status=status, device_id=device))
+    s.commit()
+    return db
+
+
+def _run(db, mode=None):
+    payload = {"org_id": "acme"}
+    if mode:
+        payload["mode"] = mode
+    return asyncio.run(run_reconciliation(db, SimpleNamespace(payload=payload)))
+
+
+def _snapshot(db, snapshot_id):
+    return db.s.get(ReconciliationSnapshot, snapshot_id)
+
+
+def _age_everything(db):
+    """Pretend the data and the last snapshot are old."""
+    db.s.execute(update(Subscription).values(updated_at=OLD))
+    db.s.execute(update(Line).values(updated_at=OLD))
+    db.s.execute(update(ReconciliationSnapshot).values(created_at=datetime(2021, 1, 1)))
+    db.s.commit()
+
+
+def _key(m):
+    return sorted((x["type"], x.get("subscription_id"), x.get("line_id"), x.get("deployed")) for x in m)
+
+
+def test_full_run_is_aggregate_and_correct(db):
+    out = _run(db)
+    assert out["mode"] == "full" and out["total_billed"] == 3 + 1 + 2 and out["total_deployed"] == 46
+    snap = _snapshot(db, out["snapshot_id"])
+    assert snap.total_customers == 2 and snap.total_subscriptions == 4
+    assert _key(snap.results_json["mismatches"]) == sorted([
+        ("billed_gt_deployed", 10, None, 2),
+        ("deployed_gt_billed", 11, None, 42),
+        ("billed_gt_deployed", 13, None, 0),
+        ("active_sub_no_lines", 13, None, 0),
+        ("line_active_no_sub", 12, "e", None),
+        ("unlinked_deployed_lines", None, None, None),
+    ])
+    summary = snap.results_json["summary"]
+    assert summary["deployed_with_device"] == 4 and summary["unlinked_deployed"] == 1
+    assert snap.results_json["customers"] == [
+        {"customer_id": 1, "customer": "Acme HQ", "subscriptions": 2, "active_subscriptions": 2,
+         "billed": 4, "deployed": 44},
+        {"customer_id": 2, "customer": "Acme West", "subscriptions": 2, "active_subscriptions": 1,
+         "billed": 2, "deployed": 1},
+    ]
+
+
+def test_diff_recomputes_only_changed_and_matches_full(db):
+    _run(db)
+    _age_everything(db)
+    db.s.execute(update(Subscription).where(Subscription.id == 13).values(qty_lines=0))
+    db.s.add(Line(line_id="new", tenant_id="acme", provider="telnyx", subscription_id=10, status="active"))
+    db.s.commit()
+
+    diff = _run(db, "diff")
+    snap = _snapshot(db, diff["snapshot_id"])
+    assert diff["mode"] == "diff" and snap.results_json["summary"]["recomputed_subscriptions"] == 2
+    full = _snapshot(db, _run(db, "full")["snapshot_id"])
+    assert _key(snap.results_json["mismatches"]) == _key(full.results_json["mismatches"])
+    assert snap.results_json["subscriptions"] == full.results_json["subscriptions"]
+    assert snap.total_billed_lines == full.total_billed_lines == 4
+
+
+def test_diff_falls_back_when_lines_leave_unchanged_subscription(db):
+    _run(db)
+    _age_everything(db)
+    db.s.execute(delete(Line).where(Line.line_id.like("bulk1%")))     # 11 lines off sub 11
+    db.s.commit()
+    out = _run(db, "diff")
+    assert out["mode"] == "full"
+    snap = _snapshot(db, out["snapshot_id"])
+    assert snap.results_json["subscriptions"]["11"]["deployed"] == 42 - 11
+
+
+def test_diff_without_previous_snapshot_runs_full(db):
+    assert _run(db, "diff")["mode"] == "full"
@@ -5,7 +5,7 @@ staging rows into production tables.  These tests cover:
 
   * the request-schema validation that gates the endpoint
   * the convertable-state allow-list
-  * id-generation helpers (slugify, next_available_site_id, _unit_id)
+  * id-generation helpers (slugify, _allocate_site_id, _unit_id)
   * the subscription-skip rule (no plan code -> no subscription)
 
 DB-touching paths (resolve_tenant, materialize_sites, etc.) are not
@@ -161,6 +161,20 @@ class TestSlugify:
         assert conv._slugify("Building 2 East") == "BUILDING-2-EAST"
 
 
+class TestAllocateSiteId:
+    def test_first_free_suffix_and_claims_it(self):
+        taken = {"LOBBY", "LOBBY-2", "LOBBY-EAST"}
+        assert conv._allocate_site_id("LOBBY", taken) == "LOBBY-3"
+        assert conv._allocate_site_id("LOBBY", taken) == "LOBBY-4"
+        assert conv._allocate_site_id("ANNEX", taken) == "ANNEX"
+        assert {"LOBBY-3", "LOBBY-4", "ANNEX"} <= taken
+
+    def test_gives_up_past_the_guard(self):
+        taken = {"X"} | {f"X-{n}" for n in range(2, 10000)}
+        with pytest.raises(conv.ConversionError):
+            conv._allocate_site_id("X", taken)
+
+
 class TestUnitId:
     def test_zero_pads_sequence_to_two_digits(self):
         # Matches the existing SiteOnboarding.jsx convention so a
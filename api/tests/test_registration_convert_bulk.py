@@ -0,0 +1,82 @@
+"""Bulk registration conversion (app.services.registration_conversion)."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+
+from app.models.registration import Registration
+from app.models.registration_location import RegistrationLocation
+from app.models.registration_service_unit import RegistrationServiceUnit
+from app.models.service_unit import ServiceUnit
+from app.models.site import Site
+from app.services import registration_conversion as conv
+
+
+def _registration(db, labels):
+    reg = Registration(
+        registration_id="REG-BULK", tenant_id="ops", status="internal_review",
+        resume_token_hash="x", resume_token_expires_at=datetime(2099, 1, 1, tzinfo=timezone.utc),
+        submitter_email="ops@example.com", customer_name="Bulk Co",
+    )
+    db.s.add(reg)
+    db.s.flush()
+    for label in labels:
+        loc = RegistrationLocation(registration_id=reg.id, location_label=label)
+        db.s.add(loc)
+        db.s.flush()
+        db.s.add(RegistrationServiceUnit(registration_id=reg.id, registration_location_id=loc.id,
+                                         unit_label=f"{label} phone", unit_type="elevator_phone"))
+    db.s.commit()
+    return reg
+
+
+def _convert(db, reg):
+    return asyncio.run(conv.convert_registration(
+        db, reg,
+        tenant_choice="create_new", existing_tenant_id=None,
+        new_tenant_id="bulk", new_tenant_name="Bulk Co",
+        customer_choice="create_new", existing_customer_id=None,
+        create_subscription=False, dry_run=False,
+        actor_user_id=None, actor_email="ops@example.com",
+    ))
+
+
+def test_500_locations_convert_with_unique_site_ids(db):
+    db.s.add(Site(site_id="LOBBY", tenant_id="x", site_name="old", customer_name="x", status="active"))
+    db.s.commit()
+    labels = ["Lobby"] * 300 + [f"Tower {n}" for n in range(200)]
+    reg = _registration(db, labels)
+
+    result = _convert(db, reg)
+
+    site_ids = [s.site_id for s in result.sites]
+    assert len(set(site_ids)) == 500
+    assert site_ids[:3] == ["LOBBY-2", "LOBBY-3", "LOBBY-4"] and site_ids[299] == "LOBBY-301"
+    assert result.service_units[0].unit_id == "LOBBY-2-U01"
+    assert db.s.scalar(select(func.count()).select_from(Site)) == 501
+    assert db.s.scalar(select(func.count()).select_from(ServiceUnit)) == 500
+    assert db.s.scalar(select(func.count()).where(
+        RegistrationLocation.materialized_site_id.is_(None))) == 0
+
+
+def test_site_id_collision_at_insert_is_a_conversion_error(db, monkeypatch):
+    reg = _registration(db, ["Lobby", "Annex"])
+
+    async def _stale(db, bases):
+        return set()                                   # snapshot misses a racing writer
+
+    monkeypatch.setattr(conv, "_taken_site_ids", _stale)
+    db.s.add(Site(site_id="ANNEX", tenant_id="x", site_name="race", customer_name="x", status="active"))
+    db.s.commit()
+
+    with pytest.raises(conv.ConversionError) as exc:
+        _convert(db, reg)
+    assert exc.value.stage == "create_site"
+    assert isinstance(exc.value.__cause__, IntegrityError)
+    assert exc.value.details["site_ids"] == ["LOBBY", "ANNEX"]
+    assert db.s.scalar(select(func.count()).select_from(Site)) == 1
@@ -0,0 +1,124 @@
+"""Per-request SQL instrumentation and GET /metrics (app.services.request_metrics).
+
+A minimal app with RequestVisibilityMiddleware and the metrics router runs
+real statements on an in-memory SQLite engine with the cursor listeners
+installed.  Pins:
+
+  * the request log line carries statement count, DB time, rows and the
+    slowest statement's fingerprint; statements outside a request are not
+    attributed to anything
+  * statement shapes collapse placeholders and IN-lists / VALUES rows
+  * the N+1 detector warns once per repeated shape, only when enabled
+  * /metrics is 404 without a token, 401 with a wrong one, and serves
+    per-route histograms keyed by the path template
+"""
+
+from __future__ import annotations
+
+import logging
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from app.config import settings
+from app.middleware import RequestVisibilityMiddleware
+from app.routers import metrics as metrics_router
+from app.services import request_metrics as rm
+
+
+@pytest.fixture
+def engine():
+    eng = create_engine("sqlite://", poolclass=StaticPool,
+                        connect_args={"check_same_thread": False})
+    with eng.begin() as conn:
+        conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)"))
+        conn.execute(text("INSERT INTO items (id, name) VALUES (1, 'a'), (2, 'b'), (3, 'c')"))
+    rm.install(eng)
+    rm.reset()
+    yield eng
+    eng.dispose()
+    rm.reset()
+
+
+@pytest.fixture
+def client(engine, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape-me")
+    app = FastAPI()
+    app.add_middleware(RequestVisibilityMiddleware)
+    app.include_router(metrics_router.router)
+
+    @app.get("/items/{item_id}")
+    async def item(item_id: int):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            return {"name": conn.execute(text("SELECT name FROM items WHERE id = :i"),
+                                         {"i": item_id}).scalar()}
+
+    @app.get("/loop")
+    async def loop():
+        with engine.connect() as conn:
+            return [conn.execute(text("SELECT name FROM items WHERE id = :i"), {"i": i}).scalar()
+                    for i in (1, 2, 3, 1)]
+
+    return TestClient(app)
+
+
+def _request_line(caplog) -> str:
+    return [r.getMessage() for r in caplog.records if r.name == "true911.request"][-1]
+
+
+def test_request_log_line_carries_db_work(client, engine, caplog):
+    with caplog.at_level(logging.INFO, logger="true911"):
+        assert client.get("/items/2").json() == {"name": "b"}
+    line = _request_line(caplog)
+    assert "db_statements=2 " in line and "db_ms=" in line and "db_rows=" in line
+    fp = line.split("db_slowest=")[1].split()[0]
+    assert len(fp) == 12
+    assert any(r.name == "true911.sql" and f"fp={fp}" in r.getMessage() for r in caplog.records)
+
+    with engine.connect() as conn:            # outside any request: harmless, unattributed
+        conn.execute(text("SELECT 1"))
+    assert rm.current() is None
+
+
+def test_statement_shapes():
+    assert rm.statement_shape("SELECT a FROM t\n WHERE id IN ($1::VARCHAR, $2::VARCHAR) AND b = $3") == \
+        "SELECT a FROM t WHERE id IN (?, ...) AND b = ?"
+    assert rm.statement_shape("INSERT INTO t (a, b) VALUES (?, ?), (?, ?)") == \
+        "INSERT INTO t (a, b) VALUES (?), ..."
+    assert rm.fingerprint("SELECT x FROM t WHERE id IN (?, ?)") == \
+        rm.fingerprint("SELECT x FROM t WHERE id IN (?, ?, ?, ?)")
+
+
+def test_repeat_detector_is_opt_in(client, monkeypatch, caplog):
+    with caplog.at_level(logging.WARNING, logger="true911.sql"):
+        client.get("/loop")
+    assert not [r for r in caplog.records if "sql_repeated" in r.getMessage()]
+
+    monkeypatch.setattr(settings, "SQL_REPEAT_WARN_THRESHOLD", 3)
+    with caplog.at_level(logging.WARNING, logger="true911.sql"):
+        client.get("/loop")
+    warnings = [r.getMessage() for r in caplog.records if "sql_repeated" in r.getMessage()]
+    assert len(warnings) == 1
+    assert "count=4" in warnings[0] and "route=/loop" in warnings[0]
+
+
+def test_metrics_endpoint(client, monkeypatch):
+    for item_id in (1, 2, 3):
+        client.get(f"/items/{item_id}")
+
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer nope"}).status_code == 401
+    r = client.get("/metrics", headers={"Authorization": "Bearer scrape-me"})
+    assert r.status_code == 200 and r.headers["content-type"].startswith("text/plain")
+    body = r.text
+    assert 'true911_http_request_duration_ms_count{method="GET",route="/items/{item_id}"} 3' in body
+    assert 'true911_http_request_sql_statements_bucket{method="GET",route="/items/{item_id}",le="2"} 3' in body
+    assert 'true911_http_request_sql_statements_bucket{method="GET",route="/items/{item_id}",le="1"} 0' in body
+    assert "# TYPE true911_gateway_requests_total counter" in body
+
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "")
+    assert client.get("/metrics", headers={"Authorization": "Bearer scrape-me"}).status_code == 404
@@ -59,6 +59,9 @@ class _Res:
     def scalar_one_or_none(self):
         return self._rows[0] if self._rows else None
 
+    def all(self):
+        return list(self._rows)
+
 
 class _FakeDB:
     """Returns queued results in call order."""
@@ -308,8 +311,7 @@ def test_list_e911_gaps_omits_complete_sites(monkeypatch):
     pending_site = _site(2, "RH Pending", e911_status="pending")
     db = _FakeDB([
         _Res([verified_site, pending_site]),  # Site list
-        _Res([]),                             # units for verified_site
-        _Res([]),                             # units for pending_site
+        _Res([]),                             # tenant-wide units + callbacks
     ])
     import asyncio
     gaps = asyncio.run(e911_gaps.list_e911_gaps(db, RH))
@@ -317,15 +319,25 @@ def test_list_e911_gaps_omits_complete_sites(monkeypatch):
 
 
 def test_e911_gaps_endpoint_rbac(monkeypatch):
-    async def _lg(db, tenant):
-        return [{"site_id": "RH-2", "site_name": "RH Pending", "e911_verified": False,
-                 "missing": ["e911_verification"], "endpoint_gaps": []}]
+    gaps = [{"site_id": "RH-2", "site_name": "RH Pending", "e911_verified": False,
+             "missing": ["e911_verification"], "endpoint_gaps": []}]
+
+    async def _lg(db, tenant, *, limit=None, offset=0):
+        return gaps[offset:] if limit is None else gaps[offset:offset + limit]
+
+    async def _count(db, tenant):
+        return len(gaps)
 
     monkeypatch.setattr(e911_router, "list_e911_gaps", _lg)
+    monkeypatch.setattr(e911_router, "gap_count", _count)
     # Admin holds UPDATE_E911 -> 200
     ok = _client(e911_router.router, "/api", object(), role="Admin").get("/api/e911-changes/gaps")
     assert ok.status_code == 200
     assert ok.json()["gap_count"] == 1
+    # paging keeps the full count
+    paged = _client(e911_router.router, "/api", object(), role="Admin").get(
+        "/api/e911-changes/gaps?offset=1&limit=10").json()
+    assert paged["gap_count"] == 1 and paged["gaps"] == []
     # a customer role does NOT hold UPDATE_E911 -> 403 (internal-only worklist)
     denied = _client(e911_router.router, "/api", object(), role="CUSTOMER_ADMIN").get(
         "/api/e911-changes/gaps")
@@ -475,3 +475,36 @@ def test_name_match_ignores_generic_restoration_hardware():
     # a distinctive shared token does match
     assert cert._name_match("Restoration Hardware #177 Jacksonville",
                             "RH #177 Jacksonville") is True
+
+
+# ── indexed matching (SiteIndex) == the pair-wise scan ───────────────
+def test_indexed_match_site_agrees_with_pairwise_scan():
+    import random
+
+    from scripts.rh_certification_bench import _legacy_match_site
+
+    rng = random.Random(177)
+    names = ["Restoration Hardware #177 Jacksonville", "RH #0177", "RH 1177", "RH #17a",
+             "RH MDC", "Patterson Warehouse RH", "RH RHNYC Gallery", "Jacksonville Outlet", None]
+    sites = [{"site_id": rng.choice([f"RH-{i}", "RH-177", None]), "name": rng.choice(names),
+              "street": rng.choice([None, "1 Main St"]), "city": "Jacksonville", "state": "FL",
+              "e911_status": "validated"} for i in range(40)]
+    site_phones = {"RH-177": {"9045550100"}, None: {"9045550199"}}
+    site_device_ids = {"RH-3": {"111"}}
+    index = cert.SiteIndex(sites, site_phones, site_device_ids)
+    for _ in range(300):
+        canon = {"store_number": rng.choice([None, "177", "17", "1", "RHNYC"]),
+                 "raw_zoho_name": rng.choice(names), "street": rng.choice([None, "1 Main St"]),
+                 "city": "Jacksonville", "state": "FL",
+                 "phones": rng.sample(["9045550100", "9045550199"], rng.randint(0, 2)),
+                 "device_ids": rng.sample(["111", "222"], rng.randint(0, 2)),
+                 "known_tokens": rng.choice([[], ["mdc"], ["patterson warehouse"], ["rhnyc"]])}
+        expected = _legacy_match_site(cert, canon, sites, site_phones, site_device_ids)
+        assert cert.match_site(canon, sites, site_phones, site_device_ids, index) == expected
+
+
+def test_bench_reports_are_byte_identical():
+    from scripts import rh_certification_bench as bench
+
+    report = bench.run(300, 1)                   # raises if the artifacts differ
+    assert report["locations"] == 300 and report["legacy_ms"] > 0
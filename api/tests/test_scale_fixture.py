@@ -0,0 +1,87 @@
+"""Scale fixture generator and API bench helpers.
+
+Pins:
+  * ICCIDs / IMEIs carry a valid Luhn check digit and the right length;
+    MSISDNs are 10-digit NANP numbers with no N11 exchange
+  * generation is deterministic for a seed and the rows insert cleanly into
+    the real schema (in-memory SQLite), FK-consistent across tables
+  * the bench's subscriber-import CSV passes the import engine's row checks
+  * nearest-rank percentiles and the report summary
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from sqlalchemy import create_engine, func, insert, select
+
+from app.database import Base
+from app.services import subscriber_import_engine as sie
+from scripts import api_bench
+from scripts.scale_fixture import ScaleSpec, iccid, imei, luhn_digit, msisdn, tenant_rows
+
+_TABLES = ("tenants", "users", "customers", "sites", "devices", "sims", "lines",
+           "service_units", "incidents", "command_telemetry")
+_NOW = datetime(2026, 10, 1, tzinfo=timezone.utc)
+
+
+def _luhn_ok(number: str) -> bool:
+    return luhn_digit(number[:-1]) == number[-1]
+
+
+def _rows(spec: ScaleSpec, t: int = 1) -> dict:
+    return dict(tenant_rows(spec, t, now=_NOW, password_hash="pw", device_key_hash="dk"))
+
+
+def test_identifier_formats():
+    assert luhn_digit("7992739871") == "3"
+    for n in (0, 1, 123_456_789, 10_000_000 * 7 + 42):
+        assert len(iccid(n)) == 20 and iccid(n).startswith("8901260") and _luhn_ok(iccid(n))
+        assert len(imei("35345678", n)) == 15 and _luhn_ok(imei("35345678", n))
+        number = msisdn("214", n)
+        assert len(number) == 10 and number[3] in "23456789" and number[4:6] != "11"
+
+
+def test_rows_are_deterministic_and_fit_the_schema():
+    spec = ScaleSpec(tenants=1, customers=3, sites=40, devices=3, lines=2, telemetry=4)
+    rows = _rows(spec)
+    assert rows == _rows(spec)
+    assert rows != _rows(ScaleSpec(tenants=1, customers=3, sites=40, devices=3, lines=2,
+                                   telemetry=4, seed=7))
+
+    eng = create_engine("sqlite://")
+    Base.metadata.create_all(eng, tables=[Base.metadata.tables[t] for t in _TABLES])
+    with eng.begin() as conn:
+        for table in _TABLES:
+            if rows[table]:
+                conn.execute(insert(Base.metadata.tables[table]), rows[table])
+        count = lambda t: conn.scalar(select(func.count()).select_from(Base.metadata.tables[t]))
+        assert [count(t) for t in ("sites", "devices", "sims", "lines", "command_telemetry")] == \
+            [40, 120, 120, 80, 480]
+
+    site_ids = {s["site_id"] for s in rows["sites"]}
+    device_ids = {d["device_id"] for d in rows["devices"]}
+    assert {d["site_id"] for d in rows["devices"]} == site_ids
+    assert {ln["device_id"] for ln in rows["lines"]} <= device_ids
+    assert len({d["iccid"] for d in rows["devices"]}) == 120              # unique per device
+    assert sum(s["e911_zip"] is None for s in rows["sites"]) == 4         # E911 gaps to find
+
+
+def test_bench_import_csv_validates():
+    parsed, errors = sie._parse_csv(api_bench.subscriber_csv("scale-0001", 20).decode())
+    assert errors == [] and len(parsed) == 20
+    seen: dict = {}
+    for i, row in enumerate(parsed):
+        assert sie._validate_row(sie._extract_row(row, i + 2), seen) == ([], [])
+
+
+def test_percentiles_and_summary():
+    samples = [float(x) for x in range(100, 0, -1)]
+    assert (api_bench.percentile(samples, 50), api_bench.percentile(samples, 99)) == (50.0, 99.0)
+    assert api_bench.percentile([], 95) == 0.0
+    summary = api_bench.summarize([1.0, 3.0], [4, 6], [(500, "boom")])
+    assert (summary["p50_ms"], summary["mean_ms"], summary["sql_mean"], summary["sql_max"]) == (1.0, 2.0, 5.0, 6)
+    assert summary["first_error"] == {"status": 500, "body": "boom"}
+    lines = api_bench.compare({"endpoints": {"sites": summary}},
+                              {"endpoints": {"sites": {"p50_ms": 2.0, "p95_ms": 3.0, "sql_mean": 10.0}}})
+    assert len(lines) == 1 and "sql_mean 10.0 → 5.0 (-50%)" in lines[0]
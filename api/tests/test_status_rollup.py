@@ -0,0 +1,181 @@
+"""Stored device / site health status (app.services.status_rollup)."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import random
+import subprocess
+import sys
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import event, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.models.device import Device
+from app.models.site import Site
+from app.routers import sites as sites_router
+from app.services import status_rollup as sr
+from app.services.continuity import compute_site_computed_status
+from app.services.health_scoring import compute_site_health
+
+
+@pytest.fixture
+def db(db):
+    was_installed = event.contains(Session, "before_flush", sr._before_flush)
+    sr.install()
+    db.s.add_all([Site(site_id=sid, tenant_id="acme", site_name=sid, customer_name="Acme",
+                       status="active") for sid in ("s1", "s2", "s3")])
+    db.s.commit()
+    yield db
+    if not was_installed:
+        event.remove(Session, "before_flush", sr._before_flush)
+        event.remove(Session, "after_flush", sr._after_flush)
+
+
+def _ago(**kw):
+    return datetime.now(timezone.utc) - timedelta(**kw)
+
+
+def _device(device_id, site_id="s1", **kw):
+    return Device(device_id=device_id, tenant_id="acme", site_id=site_id,
+                  status=kw.pop("status", "active"), **kw)
+
+
+def _site(s, site_id):
+    s.expire_all()
+    site = s.get(Site, s.scalar(select(Site.id).where(Site.site_id == site_id)))
+    return site.computed_status, site.health_status
+
+
+def test_writes_keep_devices_and_sites_current(db):
+    s = db.s
+    assert _site(s, "s3") == ("Unknown", "unknown")          # stamped on insert
+
+    s.add_all([_device("d1", last_heartbeat=_ago(seconds=30)),
+               _device("d2", last_heartbeat=_ago(hours=1))])
+    s.commit()
+    d1 = s.scalar(select(Device).where(Device.device_id == "d1"))
+    assert (d1.computed_status, d1.health_status) == ("Online", "healthy")
+    assert abs((sr._aware(d1.status_due_at) - sr._aware(d1.last_heartbeat)).total_seconds() - 600) < 1
+    assert _site(s, "s1") == ("Attention Needed", "critical")
+
+    d2 = s.scalar(select(Device).where(Device.device_id == "d2"))
+    d2.last_heartbeat = datetime.now(timezone.utc)           # heartbeat ingestion
+    s.commit()
+    assert _site(s, "s1") == ("Connected", "healthy")
+
+    d2.site_id = "s2"                                        # move: both sites re-rolled
+    d2.network_status = "disconnected"
+    s.commit()
+    assert (_site(s, "s1"), _site(s, "s2")) == (("Connected", "healthy"), ("Connected", "critical"))
+
+    s.delete(s.scalar(select(Device).where(Device.device_id == "d1")))
+    s.commit()
+    assert _site(s, "s1") == ("Unknown", "unknown")
+
+
+def test_stored_rollup_matches_read_time_rules(db):
+    s = db.s
+    rng = random.Random(911)
+    for i in range(60):
+        s.add(_device(
+            f"r{i}", site_id=rng.choice(["s1", "s2", "s3"]),
+            status=rng.choice(["active", "active", "inactive"]),
+            last_heartbeat=rng.choice([None, _ago(seconds=20), _ago(hours=3)]),
+            network_status=rng.choice([None, "connected", "detached"]),
+            last_network_event=rng.choice([None, _ago(minutes=5), _ago(hours=5)]),
+        ))
+        if i % 7 == 6:
+            s.commit()
+            for sid in ("s1", "s2", "s3"):
+                devices = s.scalars(select(Device).where(Device.site_id == sid)).all()
+                assert _site(s, sid) == (
+                    compute_site_computed_status([d.computed_status for d in devices]),
+                    compute_site_health([d.health_status for d in devices]))
+
+
+def test_sweep_flips_due_devices_and_backfills(db):
+    s = db.s
+    s.add_all([_device("fresh", last_heartbeat=_ago(seconds=10)),
+               _device("lapsing", site_id="s2", last_heartbeat=_ago(seconds=10))])
+    s.commit()
+    assert _site(s, "s2") == ("Connected", "healthy")
+
+    # Time passes for "lapsing" with no write: its deadline is now behind us.
+    s.execute(update(Device).where(Device.device_id == "lapsing").values(
+        last_heartbeat=_ago(minutes=30), status_due_at=_ago(minutes=20)))
+    # A pre-migration row: no stored status at all.
+    s.execute(insert(Device).values(device_id="legacy", tenant_id="acme", site_id="s3",
+                                    status="active", last_heartbeat=_ago(seconds=5)))
+    s.execute(update(Site).where(Site.site_id == "s3").values(computed_status=None,
+                                                               health_status=None))
+    s.commit()
+
+    result = asyncio.run(sr.sweep_due(db))
+    assert result == {"devices_checked": 2, "devices_changed": 2, "sites_backfilled": 0}
+    assert _site(s, "s2") == ("Not Connected", "critical")
+    assert _site(s, "s3") == ("Connected", "healthy")
+    lapsing = s.scalar(select(Device).where(Device.device_id == "lapsing"))
+    assert (lapsing.computed_status, lapsing.status_due_at) == ("Offline", None)
+
+    assert asyncio.run(sr.sweep_due(db))["devices_checked"] == 0
+
+
+def test_list_sites_filters_sorts_and_returns_the_stored_rollups(db):
+    s = db.s
+    s.add_all([_device("a", site_id="s1", last_heartbeat=_ago(seconds=10)),
+               _device("b", site_id="s2", last_heartbeat=_ago(hours=2)),
+               _device("c", site_id="s3", last_heartbeat=_ago(seconds=10),
+                       network_status="connected", last_network_event=_ago(hours=3))])
+    s.commit()
+    user = SimpleNamespace(tenant_id="acme")
+
+    def _list(**kw):
+        params = dict(sort=None, limit=500, site_id=None, status_filter=None, carrier=None,
+                      kit_type=None, e911_state=None, health=None, computed_status=None)
+        params.update(kw)
+        rows = asyncio.run(sites_router.list_sites(db=db, current_user=user, **params))
+        return [(r.site_id, r.health_status) for r in rows]
+
+    assert _list(health="critical") == [("s2", "critical")]
+    assert _list(sort="health") == [("s2", "critical"), ("s3", "warning"), ("s1", "healthy")]
+    assert _list(computed_status="Connected", sort="-health") == [("s1", "healthy"), ("s3", "warning")]
+
+    # a device gone quiet with no write yet: the row keeps showing the stored
+    # rollup it was filtered on until the sweep moves it
+    s.execute(update(Device).where(Device.device_id == "a")
+              .values(last_heartbeat=_ago(hours=2)).execution_options(synchronize_session=False))
+    s.commit()
+    assert _list(health="healthy") == [("s1", "healthy")]
+
+
+_SESSION_FACTORY_PROBE = """
+import sys
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+import app.sync_device_health  # noqa: F401  (the cron's module)
+from app.database import AsyncSessionLocal, engine
+from app.services import change_version, principal_cache, request_metrics, status_rollup
+
+assert "app.main" not in sys.modules
+listeners = lambda: (event.contains(Session, "before_flush", status_rollup._before_flush),
+                     event.contains(Session, "after_flush", status_rollup._after_flush),
+                     event.contains(Session, "before_flush", change_version._before_flush),
+                     event.contains(Session, "after_flush", principal_cache._after_flush),
+                     event.contains(engine.sync_engine, "before_cursor_execute",
+                                    request_metrics._before_cursor_execute))
+assert listeners() == (False,) * 5
+AsyncSessionLocal()
+assert listeners() == (True,) * 5
+"""
+
+
+def test_non_app_writers_get_the_listeners_from_the_session_factory():
+    api_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run([sys.executable, "-c", _SESSION_FACTORY_PROBE], cwd=api_dir,
+                            capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,166 @@
+"""Concurrent support diagnostics (app.services.support.diagnostics).
+
+The registry is replaced with fake checks that sleep, hang or raise, run on
+a fake session factory that records every session opened.  Pins:
+
+  * checks run concurrently, each on its own session, results in the
+    requested order
+  * no more than SUPPORT_DIAGNOSTIC_MAX_SESSIONS sessions are open at once,
+    and the per-check timeout starts only once a check holds a slot
+  * a check over the per-check timeout — or still running at the overall
+    deadline — reports ``unknown`` while the rest come back intact
+  * completed results are reused per (tenant, device, site, check) until
+    the TTL lapses; timeouts and errors are never cached
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from app.config import settings
+from app.services.support import diagnostics as diag
+
+
+class _Session:
+    open_now = 0
+    peak = 0
+
+    def __init__(self, opened: list):
+        opened.append(self)
+        self.closed = False
+        _Session.open_now += 1
+        _Session.peak = max(_Session.peak, _Session.open_now)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.closed = True
+        _Session.open_now -= 1
+
+
+@pytest.fixture
+def opened():
+    _Session.open_now = _Session.peak = 0
+    return []
+
+
+@pytest.fixture
+def calls(monkeypatch, opened):
+    calls: list[tuple] = []
+
+    def check(name, delay=0.0, exc=None):
+        async def fn(db, tenant_id, device_id=None, site_id=None):
+            calls.append((name, db, tenant_id, device_id, site_id))
+            await asyncio.sleep(delay)
+            if exc:
+                raise exc
+            return diag._result("ok", "info", 0.9, f"{name} fine", f"{name} internal", {"n": name})
+        return fn
+
+    monkeypatch.setattr(diag, "DIAGNOSTIC_CHECKS", {
+        "fast": check("fast"),
+        "slow": check("slow", delay=0.2),
+        "slower": check("slower", delay=0.2),
+        "hangs": check("hangs", delay=30),
+        "broken": check("broken", exc=RuntimeError("boom")),
+    })
+    monkeypatch.setattr(settings, "SUPPORT_DIAGNOSTIC_CHECK_TIMEOUT_SECONDS", 1.0)
+    monkeypatch.setattr(settings, "SUPPORT_DIAGNOSTIC_DEADLINE_SECONDS", 2.0)
+    monkeypatch.setattr(settings, "SUPPORT_DIAGNOSTIC_CACHE_TTL_SECONDS", 60)
+    monkeypatch.setattr(settings, "SUPPORT_DIAGNOSTIC_MAX_SESSIONS", 8)
+    diag.clear_cache()
+    yield calls
+    diag.clear_cache()
+
+
+def _run(opened, checks, **kw):
+    return asyncio.run(diag.run_diagnostics(
+        "t1", checks=checks, device_id=kw.pop("device_id", 7), site_id=3,
+        session_factory=lambda: _Session(opened), **kw))
+
+
+def test_checks_run_concurrently_on_their_own_sessions(calls, opened):
+    started = time.monotonic()
+    results = _run(opened, ["slow", "fast", "slower", "nope"])
+    assert time.monotonic() - started < 0.35                 # not 0.2 + 0.2
+    assert [r["check_type"] for r in results] == ["slow", "fast", "slower"]
+    assert all(r["status"] == "ok" for r in results)
+    assert len(opened) == 3 and all(s.closed for s in opened)
+    assert {c[1] for c in calls} == set(opened)
+    assert {c[2:] for c in calls} == {("t1", 7, 3)}
+
+
+def test_open_sessions_are_capped_process_wide(calls, opened, monkeypatch):
+    monkeypatch.setattr(settings, "SUPPORT_DIAGNOSTIC_MAX_SESSIONS", 2)
+
+    async def two_chats():
+        return await asyncio.gather(*(
+            diag.run_diagnostics("t1", checks=["slow", "slower", "fast"], device_id=d,
+                                 site_id=3, session_factory=lambda: _Session(opened))
+            for d in (1, 2)))
+
+    started = time.monotonic()
+    results = asyncio.run(two_chats())
+    assert time.monotonic() - started < 1.0
+    assert all(r["status"] == "ok" for chat in results for r in chat)
+    assert len(opened) == 6 and all(s.closed for s in opened)
+    assert _Session.peak == 2
+
+
+def test_waiting_for_a_slot_does_not_count_against_the_check_timeout(calls, opened, monkeypatch):
+    monkeypatch.setattr(settings, "SUPPORT_DIAGNOSTIC_MAX_SESSIONS", 1)
+    monkeypatch.setattr(settings, "SUPPORT_DIAGNOSTIC_CHECK_TIMEOUT_SECONDS", 0.3)
+    results = _run(opened, ["slow", "slower", "fast"])              # 0.4s queued for "fast"
+    assert [r["status"] for r in results] == ["ok", "ok", "ok"]
+    assert _Session.peak == 1
+
+
+def test_timeouts_and_errors_return_partial_results(calls, opened, monkeypatch):
+    monkeypatch.setattr(settings, "SUPPORT_DIAGNOSTIC_CHECK_TIMEOUT_SECONDS", 0.1)
+    started = time.monotonic()
+    results = {r["check_type"]: r for r in _run(opened, ["fast", "hangs", "broken"])}
+    assert time.monotonic() - started < 1.0
+    assert results["fast"]["status"] == "ok"
+    assert results["hangs"]["status"] == "unknown" and results["hangs"]["raw_payload"]["timeout"]
+    assert results["broken"]["status"] == "unknown" and results["broken"]["raw_payload"] == {"error": "boom"}
+    assert all(s.closed for s in opened)
+
+
+def test_deadline_cancels_stragglers(calls, opened, monkeypatch):
+    monkeypatch.setattr(settings, "SUPPORT_DIAGNOSTIC_CHECK_TIMEOUT_SECONDS", 0)   # no per-check limit
+    monkeypatch.setattr(settings, "SUPPORT_DIAGNOSTIC_DEADLINE_SECONDS", 0.1)
+    started = time.monotonic()
+    results = {r["check_type"]: r for r in _run(opened, ["fast", "hangs"])}
+    assert time.monotonic() - started < 1.0
+    assert results["fast"]["status"] == "ok"
+    assert results["hangs"]["raw_payload"]["timeout"] is True
+    assert all(s.closed for s in opened)
+
+
+def test_completed_results_are_cached_per_scope(calls, opened, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(diag, "_clock", lambda: now[0])
+
+    first = _run(opened, ["fast", "broken"])
+    first[0]["raw_payload"]["n"] = "mutated by caller"
+    again = _run(opened, ["fast", "broken"])
+    assert [c[0] for c in calls] == ["fast", "broken", "broken"]   # errors re-run
+    assert again[0]["raw_payload"] == {"n": "fast"}
+
+    _run(opened, ["fast"], device_id=8)                            # different device
+    _run(opened, ["fast"], use_cache=False)
+    assert [c[0] for c in calls].count("fast") == 3
+
+    now[0] += 61
+    _run(opened, ["fast"])
+    assert [c[0] for c in calls].count("fast") == 4
+
+    monkeypatch.setattr(settings, "SUPPORT_DIAGNOSTIC_CACHE_TTL_SECONDS", 0)
+    diag.clear_cache()
+    _run(opened, ["fast"])
+    _run(opened, ["fast"])
+    assert [c[0] for c in calls].count("fast") == 6
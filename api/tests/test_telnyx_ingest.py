@@ -0,0 +1,98 @@
+"""Telnyx CDR ingestion (app.services.telnyx_service)."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from datetime import timezone
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import select
+
+from app.config import settings
+from app.models.call_record import CallRecord
+from app.models.device import Device
+from app.models.integration_payload import IntegrationPayload
+from app.models.line import Line
+from app.services import telnyx_service as ts
+
+
+@pytest.fixture
+def db(db):
+    s = db.s
+    s.add_all([
+        Device(device_id="DEV1", tenant_id="t1", status="active"),
+        Device(device_id="DEV2", tenant_id="t2", status="active"),
+        Line(line_id="L1", tenant_id="t1", provider="telnyx", device_id="DEV1", did="+18563081391"),
+        Line(line_id="L2", tenant_id="t2", provider="telnyx", device_id="DEV2", did="(469) 555-0102"),
+        Line(line_id="L3", tenant_id="t1", provider="telnyx", did=None),
+    ])
+    s.commit()
+    return db
+
+
+def _hangup(session_id, *, to, start="2026-10-19T12:00:00Z", event_type="call.hangup"):
+    return {"data": {"id": f"evt-{session_id}", "event_type": event_type, "payload": {
+        "call_session_id": session_id, "direction": "incoming", "from": "+12145550000", "to": to,
+        "start_time": start, "end_time": "2026-10-19T12:01:30Z", "hangup_cause": "normal_clearing",
+    }}}
+
+
+def test_did_normalized_follows_assignment(db):
+    line = db.s.scalar(select(Line).where(Line.line_id == "L2"))
+    assert line.did_normalized == "4695550102"
+    line.did = "1-972-555-0199"
+    db.s.commit()
+    assert db.s.scalar(select(Line.did_normalized).where(Line.line_id == "L2")) == "9725550199"
+    line.did = None
+    assert line.did_normalized is None
+
+
+def test_match_lines_by_normalized_did(db):
+    matched = asyncio.run(ts.match_lines(db, ["+18563081391", "+14695550102", "+19995550000", ""]))
+    assert {did: line.line_id for did, line in matched.items()} == {
+        "+18563081391": "L1",          # exact
+        "+14695550102": "L2",          # formatting differs — normalized digits
+    }
+
+
+def test_redelivered_hangup_is_a_no_op(db):
+    raw = json.dumps(_hangup("sess-1", to="856-308-1391")).encode()
+    assert asyncio.run(ts.ingest_call_event(db, raw)) == "telnyx-sess-1"
+    assert asyncio.run(ts.ingest_call_event(db, raw)) is None
+
+    records = db.s.execute(select(CallRecord)).scalars().all()
+    assert [(r.call_id, r.line_id, r.tenant_id, r.duration_seconds) for r in records] == [
+        ("telnyx-sess-1", "L1", "t1", 90)]
+    last_call = db.s.scalar(select(Device.last_call_at).where(Device.device_id == "DEV1"))
+    assert last_call.replace(tzinfo=timezone.utc) == records[0].started_at.replace(tzinfo=timezone.utc)
+    assert asyncio.run(ts.ingest_call_event(db, b"not json")) is None
+
+
+def test_drain_ingests_archived_payloads_in_one_batch(db, monkeypatch):
+    bodies = [
+        _hangup("a", to="+18563081391"),
+        _hangup("b", to="+14695550102", start="2026-10-19T12:05:00Z"),
+        _hangup("a", to="+18563081391"),                    # duplicate delivery
+        _hangup("c", to="+19995550000"),                    # unknown DID
+        _hangup("d", to="+18563081391", event_type="call.initiated"),
+    ]
+    db.s.add_all([IntegrationPayload(payload_id=f"wh-{i}", source="telnyx", direction="inbound",
+                                     body=b, processed=False) for i, b in enumerate(bodies)])
+    db.s.add(IntegrationPayload(payload_id="wh-vola", source="vola", direction="inbound",
+                                body={}, processed=False))
+    db.s.commit()
+
+    job = SimpleNamespace(payload={"payload_id": "wh-0", "source": "telnyx"})
+    monkeypatch.setattr(settings, "FEATURE_TELNYX_BATCH_INGEST", "true")
+    result = asyncio.run(ts.handle_webhook(db, job))
+    assert result["batch"] == {"payloads": 5, "call_events": 4, "stored": 2}
+
+    assert sorted(db.s.execute(select(CallRecord.call_id, CallRecord.line_id)).all()) == [
+        ("telnyx-a", "L1"), ("telnyx-b", "L2")]
+    db.s.expire_all()
+    unprocessed = db.s.execute(select(IntegrationPayload.payload_id)
+                               .where(IntegrationPayload.processed.is_(False))).scalars().all()
+    assert unprocessed == ["wh-vola"]
+    assert asyncio.run(ts.drain_call_events(db)) == {"payloads": 0, "call_events": 0, "stored": 0}
@@ -0,0 +1,72 @@
+"""Ranked portfolio search (app.services.text_search), portable to SQLite."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+
+from app.models.line import Line
+from app.models.service_unit import ServiceUnit
+from app.models.site import Site
+from app.services import text_search as ts
+from app.services.customer import command_center as cc
+
+T = "acme"
+NOW = datetime(2026, 10, 19, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def db(db):
+    s = db.s
+    for sid, name, city, tenant in (
+        ("S1", "Boston Back Bay", "Boston", T),
+        ("S2", "Acme South Boston", "Boston", T),
+        ("S3", "Bostonia Outlet", "Quincy", T),
+        ("S4", "Boston", "Boston", T),
+        ("S5", "100% Fire Depot", "Salem", T),
+        ("X1", "Boston Other Tenant", "Boston", "other"),
+    ):
+        s.add(Site(site_id=sid, tenant_id=tenant, site_name=name, customer_name="Acme",
+                   status="active", e911_city=city, e911_state="MA"))
+    s.add(ServiceUnit(tenant_id=T, site_id="S5", unit_id="U5", unit_name="Elevator 2",
+                      unit_type="elevator_phone", status="active"))
+    s.add(Line(line_id="L1", tenant_id=T, site_id="S3", provider="telnyx", did="+16175550123",
+               status="active"))
+    s.commit()
+    return db
+
+
+def _names(out):
+    return [r["location"] for r in out["results"]]
+
+
+def test_exact_then_prefix_then_word_then_substring(db):
+    out = asyncio.run(cc.search_portfolio(db, T, "Boston", NOW))
+    # exact name/city for S4 and the Boston-city sites; substring-only last
+    assert _names(out) == ["Acme South Boston", "Boston", "Boston Back Bay", "Bostonia Outlet"]
+
+
+def test_typeahead_prefix(db):
+    assert _names(asyncio.run(cc.search_portfolio(db, T, "bostoni", NOW))) == ["Bostonia Outlet"]
+
+
+def test_matches_service_units_and_lines(db):
+    assert _names(asyncio.run(cc.search_portfolio(db, T, "elevator", NOW))) == ["100% Fire Depot"]
+    assert _names(asyncio.run(cc.search_portfolio(db, T, "5550123", NOW))) == ["Bostonia Outlet"]
+
+
+def test_like_wildcards_are_literal(db):
+    assert _names(asyncio.run(cc.search_portfolio(db, T, "100%", NOW))) == ["100% Fire Depot"]
+    assert _names(asyncio.run(cc.search_portfolio(db, T, "%", NOW))) == ["100% Fire Depot"]
+    assert _names(asyncio.run(cc.search_portfolio(db, T, "bo_ton", NOW))) == []
+
+
+def test_tenant_scoped(db):
+    assert "Boston Other Tenant" not in _names(asyncio.run(cc.search_portfolio(db, T, "boston", NOW)))
+
+
+def test_normalize_query():
+    assert ts.normalize_query("  Back   BAY ") == "back bay"
+    assert ts.normalize_query(None) == ""
@@ -0,0 +1,118 @@
+"""Carrier usage polling (app.services.usage_polling)."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import select
+
+from app.models.sim import Sim
+from app.models.sim_usage_daily import SimUsageDaily, SimUsageMonthly
+from app.services import usage_polling
+from app.services.verizon_thingspace import VerizonThingSpaceClient, normalize_verizon_usage
+
+
+class FakeCarrier:
+    carrier = "verizon"
+    is_configured = True
+
+    def __init__(self, usage: dict[str, tuple[int, int, int]]):
+        self.usage = usage
+        self.calls: list[list[str]] = []
+
+    async def fetch_daily_usage(self, iccids, usage_date):
+        self.calls.append(list(iccids))
+        return [
+            {"iccid": i, "bytes_up": u, "bytes_down": d, "sms_count": s}
+            for i, (u, d, s) in self.usage.items()
+        ]
+
+
+@pytest.fixture
+def db(db):
+    s = db.s
+    for i, (tenant, carrier, status) in enumerate((
+        ("t1", "verizon", "active"), ("t1", "verizon", "active"),
+        ("t2", "verizon", "suspended"), ("t1", "tmobile", "active"),
+        ("t1", "verizon", "deactivated"),
+    ), start=1):
+        s.add(Sim(id=i, iccid=f"8901{i}", tenant_id=tenant, carrier=carrier, status=status))
+    s.commit()
+    return db
+
+
+def _daily(db):
+    return {(r.sim_id, r.usage_date): (r.bytes_up, r.bytes_down, r.sms_count)
+            for r in db.s.execute(select(SimUsageDaily)).scalars()}
+
+
+def _monthly(db):
+    db.s.expire_all()
+    return {(r.tenant_id, r.carrier, r.month): (r.sim_count, r.bytes_up, r.bytes_down, r.sms_count)
+            for r in db.s.execute(select(SimUsageMonthly)).scalars()}
+
+
+def test_poll_upserts_daily_rows_and_rollup(db):
+    src = FakeCarrier({"89011": (10, 100, 1), "89012": (20, 200, 2), "89013": (5, 50, 0),
+                       "unknown": (1, 1, 1)})
+    out = asyncio.run(usage_polling.poll_usage(db, src, date(2026, 10, 1)))
+    assert out["sims"] == 3 and out["rows"] == 3 and out["unmatched"] == 1
+    assert sorted(src.calls[0]) == ["89011", "89012", "89013"]   # carrier + status scoped
+    assert _daily(db)[(1, date(2026, 10, 1))] == (10, 100, 1)
+
+    src.usage = {"89011": (11, 111, 3)}
+    asyncio.run(usage_polling.poll_usage(db, src, date(2026, 10, 1)))   # re-poll replaces
+    asyncio.run(usage_polling.poll_usage(db, src, date(2026, 10, 2)))
+    daily = _daily(db)
+    assert len(daily) == 4 and daily[(1, date(2026, 10, 1))] == (11, 111, 3)
+
+    month = date(2026, 10, 1)
+    assert _monthly(db) == {
+        ("t1", "verizon", month): (2, 11 + 20 + 11, 111 + 200 + 111, 3 + 2 + 3),
+        ("t2", "verizon", month): (1, 5, 50, 0),
+    }
+
+
+def test_poll_stores_only_reported_sims(db):
+    src = FakeCarrier({"89011": (1, 1, 1), "89013": (1, 1, 1)})
+    out = asyncio.run(usage_polling.poll_usage(db, src, date(2026, 10, 1)))
+    assert out["sims"] == 3 and out["rows"] == 2
+    assert sorted(_daily(db)) == [(1, date(2026, 10, 1)), (3, date(2026, 10, 1))]
+
+
+def test_handle_poll_usage_skips_unconfigured(db, monkeypatch):
+    src = FakeCarrier({})
+    src.is_configured = False
+    monkeypatch.setattr(usage_polling, "get_usage_source", lambda carrier: src)
+    job = SimpleNamespace(payload={"usage_date": "2026-10-01"}, tenant_id=None)
+    assert asyncio.run(usage_polling.handle_poll_usage(db, job))["status"] == "skipped"
+
+
+def test_thingspace_usage_is_batched(monkeypatch):
+    client = VerizonThingSpaceClient()
+    client.m2m_account_id = "acct"
+    client.VZ_USAGE_BATCH_SIZE = 2
+    bodies = []
+
+    async def _request(method, path, *, json=None, params=None):
+        bodies.append(json)
+        return {"usage": [{"deviceIds": [{"kind": "iccid", "id": d["id"]}], "dataUsage": "42"}
+                          for d in json["deviceIds"]]}
+
+    monkeypatch.setattr(client, "_request", _request)
+    raw = asyncio.run(client.fetch_daily_usage(["a", "b", "c"], date(2026, 10, 1)))
+    assert [len(b["deviceIds"]) for b in bodies] == [2, 1]
+    assert bodies[0]["startTime"] == "2026-10-01T00:00:00Z"
+    assert bodies[0]["endTime"] == "2026-10-02T00:00:00Z"
+    assert normalize_verizon_usage(raw[0]) == {"iccid": "a", "bytes_up": 0, "bytes_down": 42, "sms_count": 0}
+
+
+def test_normalize_usage_split_and_missing_iccid():
+    assert normalize_verizon_usage({
+        "deviceId": {"kind": "ICCID", "id": "x"}, "dataUsageUplink": 3, "dataUsageDownlink": 4,
+        "smsUsage": "2",
+    }) == {"iccid": "x", "bytes_up": 3, "bytes_down": 4, "sms_count": 2}
+    assert normalize_verizon_usage({"deviceIds": [{"kind": "IMEI", "id": "1"}]}) is None
@@ -295,12 +295,9 @@ class TestAuthDispatch:
         mock_response.status_code = 200
         mock_response.json.return_value = {"access_token": "oauth-tok-123", "token_type": "Bearer"}
 
-        with patch("app.services.verizon_thingspace.httpx.AsyncClient") as MockClient:
-            mock_ctx = AsyncMock()
-            mock_ctx.post.return_value = mock_response
-            mock_ctx.__aenter__ = AsyncMock(return_value=mock_ctx)
-            mock_ctx.__aexit__ = AsyncMock(return_value=False)
-            MockClient.return_value = mock_ctx
+        with patch("app.services.verizon_thingspace._gateway") as mock_gateway:
+            mock_ctx = mock_gateway.return_value
+            mock_ctx.post = AsyncMock(return_value=mock_response)
 
             token = await client.authenticate()
 
@@ -320,12 +317,9 @@ class TestAuthDispatch:
         mock_response.status_code = 401
         mock_response.text = "Unauthorized"
 
-        with patch("app.services.verizon_thingspace.httpx.AsyncClient") as MockClient:
-            mock_ctx = AsyncMock()
-            mock_ctx.post.return_value = mock_response
-            mock_ctx.__aenter__ = AsyncMock(return_value=mock_ctx)
-            mock_ctx.__aexit__ = AsyncMock(return_value=False)
-            MockClient.return_value = mock_ctx
+        with patch("app.services.verizon_thingspace._gateway") as mock_gateway:
+            mock_ctx = mock_gateway.return_value
+            mock_ctx.post = AsyncMock(return_value=mock_response)
 
             with pytest.raises(VerizonThingSpaceError, match="OAuth2 authentication failed"):
                 await client.authenticate()
@@ -346,12 +340,9 @@ class TestAuthDispatch:
         mock_response.status_code = 200
         mock_response.json.return_value = {"access_token": "real-oauth-tok", "token_type": "Bearer"}
 
-        with patch("app.services.verizon_thingspace.httpx.AsyncClient") as MockClient:
-            mock_ctx = AsyncMock()
-            mock_ctx.post.return_value = mock_response
-            mock_ctx.__aenter__ = AsyncMock(return_value=mock_ctx)
-            mock_ctx.__aexit__ = AsyncMock(return_value=False)
-            MockClient.return_value = mock_ctx
+        with patch("app.services.verizon_thingspace._gateway") as mock_gateway:
+            mock_ctx = mock_gateway.return_value
+            mock_ctx.post = AsyncMock(return_value=mock_response)
 
             token = await client.authenticate()
 
@@ -381,12 +372,9 @@ class TestAuthDispatch:
         mock_response.status_code = 401
         mock_response.text = "Invalid credentials"
 
-        with patch("app.services.verizon_thingspace.httpx.AsyncClient") as MockClient:
-            mock_ctx = AsyncMock()
-            mock_ctx.post.return_value = mock_response
-            mock_ctx.__aenter__ = AsyncMock(return_value=mock_ctx)
-            mock_ctx.__aexit__ = AsyncMock(return_value=False)
-            MockClient.return_value = mock_ctx
+        with patch("app.services.verizon_thingspace._gateway") as mock_gateway:
+            mock_ctx = mock_gateway.return_value
+            mock_ctx.post = AsyncMock(return_value=mock_response)
 
             with pytest.raises(VerizonThingSpaceError, match="API-key OAuth2 token exchange failed"):
                 await client.authenticate()
@@ -416,12 +404,9 @@ class TestAuthDispatch:
         mock_response.status_code = 200
         mock_response.json.return_value = {"sessionToken": "sess-tok-456"}
 
-        with patch("app.services.verizon_thingspace.httpx.AsyncClient") as MockClient:
-            mock_ctx = AsyncMock()
-            mock_ctx.post.return_value = mock_response
-            mock_ctx.__aenter__ = AsyncMock(return_value=mock_ctx)
-            mock_ctx.__aexit__ = AsyncMock(return_value=False)
-            MockClient.return_value = mock_ctx
+        with patch("app.services.verizon_thingspace._gateway") as mock_gateway:
+            mock_ctx = mock_gateway.return_value
+            mock_ctx.post = AsyncMock(return_value=mock_response)
 
             token = await client.authenticate()
 
@@ -449,12 +434,9 @@ class TestAuthDispatch:
         mock_response.status_code = 404
         mock_response.text = "Not Found"
 
-        with patch("app.services.verizon_thingspace.httpx.AsyncClient") as MockClient:
-            mock_ctx = AsyncMock()
-            mock_ctx.post.return_value = mock_response
-            mock_ctx.__aenter__ = AsyncMock(return_value=mock_ctx)
-            mock_ctx.__aexit__ = AsyncMock(return_value=False)
-            MockClient.return_value = mock_ctx
+        with patch("app.services.verizon_thingspace._gateway") as mock_gateway:
+            mock_ctx = mock_gateway.return_value
+            mock_ctx.post = AsyncMock(return_value=mock_response)
 
             result = await client.test_connection()
 
@@ -891,12 +873,9 @@ class TestM2MSessionToken:
         mock_response.status_code = 200
         mock_response.json.return_value = {"sessionToken": "guid-session-12345"}
 
-        with patch("app.services.verizon_thingspace.httpx.AsyncClient") as MockClient:
-            mock_ctx = AsyncMock()
-            mock_ctx.post.return_value = mock_response
-            mock_ctx.__aenter__ = AsyncMock(return_value=mock_ctx)
-            mock_ctx.__aexit__ = AsyncMock(return_value=False)
-            MockClient.return_value = mock_ctx
+        with patch("app.services.verizon_thingspace._gateway") as mock_gateway:
+            mock_ctx = mock_gateway.return_value
+            mock_ctx.post = AsyncMock(return_value=mock_response)
 
             token = await client._obtain_m2m_session_token()
 
@@ -917,12 +896,9 @@ class TestM2MSessionToken:
         mock_response.status_code = 401
         mock_response.text = "Invalid credentials"
 
-        with patch("app.services.verizon_thingspace.httpx.AsyncClient") as MockClient:
-            mock_ctx = AsyncMock()
-            mock_ctx.post.return_value = mock_response
-            mock_ctx.__aenter__ = AsyncMock(return_value=mock_ctx)
-            mock_ctx.__aexit__ = AsyncMock(return_value=False)
-            MockClient.return_value = mock_ctx
+        with patch("app.services.verizon_thingspace._gateway") as mock_gateway:
+            mock_ctx = mock_gateway.return_value
+            mock_ctx.post = AsyncMock(return_value=mock_response)
 
             with pytest.raises(VerizonThingSpaceError, match="M2M session login failed"):
                 await client._obtain_m2m_session_token()
@@ -11,6 +11,7 @@ import respx
 import httpx
 from unittest import mock
 
+from app.integrations import gateway as integration_gateway
 from app.integrations.vola import (
     VolaClient,
     extract_parameter_values,
@@ -22,6 +23,14 @@ from app.integrations.vola import (
 VOLA_BASE = "https://cloudapi.volanetworks.net"
 
 
+@pytest.fixture(autouse=True)
+def _unthrottled_gateway():
+    """The vola rate limit is exercised in test_integration_gateway."""
+    integration_gateway.configure("vola", integration_gateway.VendorPolicy(rate_per_second=0))
+    yield
+    integration_gateway.reset()
+
+
 def _make_client(**kwargs) -> VolaClient:
     return VolaClient(
         base_url=kwargs.get("base_url", VOLA_BASE),
@@ -86,8 +86,14 @@ def _capture_enqueue_string() -> str:
     ), patch("app.config.settings.REDIS_URL", "redis://fake:6379/0"):
         from app.models.job import Job as _Job
 
+        # The connection / queues are pooled per process: start from (and
+        # leave behind) a clean pool so the fakes don't leak.
+        job_service._reset_rq_connection()
         job = _Job(id=42, job_type="webhook.tmobile", queue="default")
-        job_service._enqueue_rq(job)
+        try:
+            job_service._enqueue_rq(job)
+        finally:
+            job_service._reset_rq_connection()
 
     return captured.get("func_path", "")
 
@@ -142,21 +148,25 @@ class TestEnqueueStringResolvesToRealDispatch:
 
     def test_retry_enqueue_uses_same_string(self):
         """The retry path in ``mark_failed`` re-enqueues via
-        ``q.enqueue_in``.  It must use the same correct string — a
-        divergence between the two paths would mean the first attempt
-        works but every retry silently dies."""
-        # Grep the source so we catch hard-coded literals (including
-        # the comment-only documentation that the two paths must match).
+        ``q.enqueue_in`` and the bulk path via ``enqueue_many``.  They
+        must use the same correct string — a divergence between the
+        paths would mean the first attempt works but every retry
+        silently dies."""
+        # Grep the source so we catch hard-coded literals.  The string
+        # is centralised in ``_DISPATCH_FUNC``: exactly one quoted
+        # literal, and every enqueue call site passes the constant.
         src = inspect.getsource(job_service)
-        # Exactly two occurrences as quoted literal: one in
-        # _enqueue_rq, one in mark_failed.
-        assert src.count('"worker.dispatch"') == 2, (
-            "Expected exactly two occurrences of \"worker.dispatch\" "
-            "in job_service.py (initial enqueue + retry).  Found "
-            f"{src.count(chr(34) + 'worker.dispatch' + chr(34))}.  If a "
-            "refactor centralised the string into a constant, update "
-            "this guard to match."
+        assert job_service._DISPATCH_FUNC == "worker.dispatch"
+        assert src.count('"worker.dispatch"') == 1, (
+            "Expected exactly one occurrence of \"worker.dispatch\" "
+            "in job_service.py (the _DISPATCH_FUNC constant).  Found "
+            f"{src.count(chr(34) + 'worker.dispatch' + chr(34))}."
         )
+        for call in (".enqueue(", ".enqueue_in(", ".prepare_data("):
+            for chunk in src.split(call)[1:]:
+                assert "_DISPATCH_FUNC" in chunk[:120], (
+                    f"An {call!r} call in job_service.py does not pass _DISPATCH_FUNC"
+                )
         # And the historically-wrong string must not reappear.
         assert '"app.worker.dispatch"' not in src, (
             "job_service.py contains the historically-wrong "
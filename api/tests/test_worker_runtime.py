@@ -0,0 +1,180 @@
+"""Async worker runtime (worker.AsyncWorkerRuntime) on in-memory Redis / RQ fakes."""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+import worker
+from app.models.job import Job
+
+
+class _FakeRqJob:
+    def __init__(self, job_id: int, timeout=None, func_name="worker.dispatch"):
+        self.id = f"rq-{job_id}"
+        self.func_name = func_name
+        self.args = (job_id,)
+        self.timeout = timeout
+        self.deleted = False
+
+    def delete(self):
+        self.deleted = True
+
+
+class _Registry:
+    added: list = []
+
+    def __init__(self, queue=None):
+        self.kind = type(self).__name__
+
+    def add(self, job, ttl=0, **kw):
+        self.added.append((self.kind, job.id, ttl))
+        return 1
+
+    def remove(self, job):
+        pass
+
+
+@pytest.fixture
+def fake_rq(monkeypatch):
+    import rq
+    import rq.registry
+
+    monkeypatch.setattr(rq, "Queue", lambda name, connection=None: SimpleNamespace(name=name))
+    monkeypatch.setattr(_Registry, "added", [])
+    monkeypatch.setattr(rq.registry, "StartedJobRegistry", type("Started", (_Registry,), {}))
+    monkeypatch.setattr(rq.registry, "FailedJobRegistry", type("Failed", (_Registry,), {}))
+    return _Registry
+
+
+def _runtime(jobs: dict[str, list], concurrency: dict[str, int]):
+    rt = worker.AsyncWorkerRuntime(None, concurrency, {"sim.poll_usage": None}, dequeue_timeout=0)
+
+    def _dequeue(queue):
+        pending = jobs[queue.name]
+        return pending.pop(0) if pending else None
+
+    rt._dequeue = _dequeue
+    return rt
+
+
+def test_per_queue_concurrency_limit_and_stats(fake_rq, monkeypatch):
+    jobs = {"polling": [_FakeRqJob(i) for i in range(6)], "default": []}
+    seen = {"now": 0, "max": 0, "handlers": []}
+
+    async def _fake_dispatch(job_id, handlers=None):
+        seen["handlers"].append(handlers)
+        seen["now"] += 1
+        seen["max"] = max(seen["max"], seen["now"])
+        await asyncio.sleep(0.01)
+        seen["now"] -= 1
+        return "sim.poll_usage"
+
+    monkeypatch.setattr(worker, "_dispatch_async", _fake_dispatch)
+    all_jobs = list(jobs["polling"])
+    rt = _runtime(jobs, {"polling": 2, "default": 1})
+
+    async def _main():
+        run = asyncio.create_task(rt.run())
+        while jobs["polling"] or rt._in_flight:
+            await asyncio.sleep(0.005)
+        rt.stop()
+        await run
+
+    asyncio.run(_main())
+    assert seen["max"] == 2
+    assert all(h is rt.handlers for h in seen["handlers"]) and len(seen["handlers"]) == 6
+    assert all(j.deleted for j in all_jobs)
+    [row] = rt.stats.snapshot()
+    assert row["job_type"] == "sim.poll_usage" and row["completed"] == 6
+
+
+def test_stop_drains_in_flight_jobs(fake_rq, monkeypatch):
+    jobs = {"default": [_FakeRqJob(1)]}
+    done = []
+
+    async def _slow_dispatch(job_id, handlers=None):
+        await asyncio.sleep(0.05)
+        done.append(job_id)
+        return "sim.activate"
+
+    monkeypatch.setattr(worker, "_dispatch_async", _slow_dispatch)
+    rt = _runtime(jobs, {"default": 1})
+
+    async def _main():
+        run = asyncio.create_task(rt.run())
+        while jobs["default"]:
+            await asyncio.sleep(0.001)
+        rt.stop()
+        await run
+
+    asyncio.run(_main())
+    assert done == [1]
+
+
+def _run_one(rt, rq_job):
+    async def _main():
+        await rt._run(SimpleNamespace(name="default"), rq_job)
+
+    asyncio.run(_main())
+
+
+def test_timeout_marks_db_job_failed(fake_rq, monkeypatch, db):
+    db.s.add(Job(id=7, job_type="sim.activate", status="queued", max_attempts=1))
+    db.s.commit()
+
+    class _SessionLocal:
+        async def __aenter__(self):
+            return db
+
+        async def __aexit__(self, *exc):
+            return False
+
+    async def _hung_dispatch(job_id, handlers=None):
+        job = db.s.get(Job, job_id)
+        job.status, job.attempt = "running", job.attempt + 1
+        db.s.commit()
+        await asyncio.sleep(10)
+
+    monkeypatch.setattr("app.database.AsyncSessionLocal", _SessionLocal)
+    monkeypatch.setattr(worker, "_dispatch_async", _hung_dispatch)
+    rt = _runtime({}, {"default": 1})
+    rq_job = _FakeRqJob(7, timeout=0.02)
+
+    _run_one(rt, rq_job)
+
+    db.s.expire_all()
+    job = db.s.get(Job, 7)
+    assert (job.status, job.error) == ("failed", "Timed out after 0.02s")
+    assert [(kind, ttl) for kind, _, ttl in fake_rq.added] == [("Started", 0.02), ("Failed", 0)]
+    assert not rq_job.deleted
+
+
+def test_foreign_job_is_time_boxed(fake_rq, monkeypatch):
+    import time as _time
+
+    abandoned = []
+    monkeypatch.setattr(worker, "_mark_abandoned", lambda *a: abandoned.append(a))
+    rt = _runtime({}, {"default": 1})
+    rq_job = _FakeRqJob(8, timeout=0.02, func_name="other.task")
+    rq_job.perform = lambda: _time.sleep(0.2)
+
+    _run_one(rt, rq_job)
+
+    assert [kind for kind, _, _ in fake_rq.added] == ["Started", "Failed"]
+    assert abandoned == []                          # no DB Job row to mark
+
+
+def test_resolve_handlers_imports_every_entry():
+    handlers = worker.resolve_handlers()
+    assert set(handlers) == set(worker._HANDLERS)
+    assert all(callable(h) for h in handlers.values())
+
+
+def test_queue_concurrency_setting_parses():
+    from app.config import Settings
+
+    s = Settings(WORKER_QUEUE_CONCURRENCY="default=4, polling=2,provisioning")
+    assert s.worker_queue_concurrency == {"default": 4, "polling": 2, "provisioning": 1}
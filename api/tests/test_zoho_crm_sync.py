@@ -0,0 +1,108 @@
+"""Zoho CRM account / contact sync (app.services.zoho_crm) on SQLite, with the Zoho GET layer faked."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timezone
+
+from sqlalchemy import func, select
+
+from app.models.customer import Customer
+from app.models.zoho_sync_state import ZohoSyncState
+from app.services import zoho_crm
+
+
+def _fake_zoho(monkeypatch, db, pages):
+    """Serve ``pages`` (lists of records) in order; record params/headers
+    and how many customers were stored when each page was requested."""
+    calls = []
+
+    async def _fake_get(path, params=None, headers=None):
+        i = len(calls)
+        calls.append({"path": path, "params": dict(params or {}), "headers": headers,
+                      "customers": db.s.scalar(select(func.count()).select_from(Customer))})
+        await asyncio.sleep(0)
+        return {"data": pages[i], "info": {"more_records": i + 1 < len(pages)}}
+
+    monkeypatch.setattr(zoho_crm, "is_configured", lambda: True)
+    monkeypatch.setattr(zoho_crm, "_zoho_get", _fake_get)
+    return calls
+
+
+def _acct(i, **kw):
+    return {"id": f"z{i}", "Account_Name": f"Acct {i}", **kw}
+
+
+def _customers(db):
+    db.s.expire_all()
+    return {c.zoho_account_id: c for c in db.s.execute(select(Customer)).scalars()}
+
+
+def test_accounts_sync_prefetches_the_next_page(db, monkeypatch):
+    pages = [[_acct(i) for i in range(50)], [_acct(i) for i in range(50, 120)], [{"Account_Name": "no id"}]]
+    calls = _fake_zoho(monkeypatch, db, pages)
+    out = asyncio.run(zoho_crm.sync_accounts(db, "acme"))
+    assert out == {"created": 120, "updated": 0, "skipped": 1, "modified_since": None}
+    # page N+1 was requested before page N's writes
+    assert calls[1]["customers"] == 0
+    assert len(_customers(db)) == 120
+    assert db.s.scalar(select(ZohoSyncState.last_synced_at)) is not None
+
+
+def test_resync_updates_in_place_and_keeps_blanks(db, monkeypatch):
+    _fake_zoho(monkeypatch, db, [[_acct(1, Email="a@x.io", Phone="555"), _acct(2)]])
+    asyncio.run(zoho_crm.sync_accounts(db, "acme"))
+    db.s.execute(Customer.__table__.update().values(onboarding_status="complete"))
+    db.s.commit()
+
+    _fake_zoho(monkeypatch, db, [[_acct(1, Account_Name="Renamed"), _acct(2), _acct(3)]])
+    out = asyncio.run(zoho_crm.sync_accounts(db, "other"))
+    assert (out["created"], out["updated"], out["skipped"]) == (1, 1, 1)
+    rows = _customers(db)
+    assert len(rows) == 3
+    assert rows["z1"].name == "Renamed" and rows["z1"].billing_email == "a@x.io"
+    assert rows["z1"].billing_phone == "555" and rows["z1"].tenant_id == "acme"
+    assert rows["z1"].onboarding_status == "complete"
+    assert rows["z3"].tenant_id == "other" and rows["z3"].onboarding_status == "pending"
+
+
+def test_incremental_sends_previous_run_start(db, monkeypatch):
+    calls = _fake_zoho(monkeypatch, db, [[_acct(1)]])
+    asyncio.run(zoho_crm.sync_accounts(db, "acme", incremental=True))
+    assert calls[0]["headers"] is None                     # no watermark yet → full
+    first = db.s.scalar(select(ZohoSyncState.last_synced_at))
+
+    calls = _fake_zoho(monkeypatch, db, [[]])
+    out = asyncio.run(zoho_crm.sync_accounts(db, "acme", incremental=True))
+    sent = datetime.fromisoformat(calls[0]["headers"]["If-Modified-Since"])
+    assert sent == first.replace(tzinfo=timezone.utc, microsecond=0)
+    assert out["created"] == 0 and out["modified_since"]
+
+    calls = _fake_zoho(monkeypatch, db, [[]])
+    explicit = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    asyncio.run(zoho_crm.sync_contacts(db, modified_since=explicit))
+    assert calls[0]["path"] == "/Contacts"
+    assert calls[0]["headers"] == {"If-Modified-Since": "2026-01-01T00:00:00+00:00"}
+
+
+def test_contacts_fill_blanks_on_linked_customers(db, monkeypatch):
+    db.s.add_all([
+        Customer(tenant_id="acme", name="A", zoho_account_id="z1"),
+        Customer(tenant_id="acme", name="B", zoho_account_id="z2", billing_email="keep@x.io",
+                 zoho_contact_id="c0"),
+    ])
+    db.s.commit()
+    _fake_zoho(monkeypatch, db, [[
+        {"id": "c1", "Account_Name": {"id": "z1"}, "Email": "one@x.io", "Mobile": "111"},
+        {"id": "c2", "Account_Name": {"id": "z1"}, "Email": "two@x.io", "Phone": "222"},
+        {"id": "c3", "Account_Name": {"id": "z2"}, "Email": "new@x.io", "Phone": "333"},
+        {"id": "c4", "Account_Name": {"id": "missing"}},
+        {"id": "c5", "Account_Name": "by name only"},
+    ]])
+    out = asyncio.run(zoho_crm.sync_contacts(db))
+    assert (out["updated"], out["skipped"]) == (3, 2)
+    rows = _customers(db)
+    assert (rows["z1"].zoho_contact_id, rows["z1"].billing_email, rows["z1"].billing_phone) == (
+        "c1", "one@x.io", "111")
+    assert (rows["z2"].zoho_contact_id, rows["z2"].billing_email, rows["z2"].billing_phone) == (
+        "c0", "keep@x.io", "333")
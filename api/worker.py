@@ -1,16 +1,32 @@
 """RQ worker entry point — dispatches jobs by type to handler functions.
 
 Usage:
+    python worker.py                      # WORKER_RUNTIME (default "rq")
     rq worker default provisioning polling --url $REDIS_URL --path api
 
 Or via the Render worker service start command.
+
+Two runtimes share the same RQ queues and the same ``worker.dispatch``
+job payload (the DB ``Job`` id):
+
+  * ``rq`` (default) — the stock forking RQ ``Worker``: one job at a
+    time, each in a fresh ``asyncio.run`` via :func:`dispatch`.
+  * ``async`` (opt-in) — :class:`AsyncWorkerRuntime`: one event loop and
+    one DB pool for the life of the process, handlers resolved once at
+    startup, and up to ``WORKER_QUEUE_CONCURRENCY`` jobs in flight per
+    queue.  Per-job-type latency / throughput is logged every
+    ``WORKER_STATS_INTERVAL_SECONDS``.
 """
 
 from __future__ import annotations
 
 import asyncio
 import logging
+import signal
 import sys
+import time
+import traceback
+from typing import Any, Awaitable, Callable, Optional
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
 logger = logging.getLogger("true911.worker")
@@ -21,7 +37,7 @@ _HANDLERS: dict[str, str] = {
     "sim.suspend": "app.services.sim_service:handle_sim_suspend",
     "sim.resume": "app.services.sim_service:handle_sim_resume",
     "sim.poll_usage": "app.services.sim_service:handle_poll_usage",
-    "webhook.telnyx": "app.services.sim_service:handle_webhook",
+    "webhook.telnyx": "app.services.telnyx_service:handle_webhook",
     "webhook.vola": "app.services.sim_service:handle_webhook",
     "webhook.tmobile": "app.services.sim_service:handle_webhook",
     "line.provision_e911": "app.services.line_service:handle_provision_e911",
@@ -29,8 +45,15 @@ _HANDLERS: dict[str, str] = {
     "integration.process.zoho": "app.services.integration_processor:process_integration_event",
     "integration.process.qb": "app.services.integration_processor:process_integration_event",
     "integration.reconcile": "app.services.reconciliation:run_reconciliation",
+    "customer.portfolio_refresh": "app.services.customer.read_model:handle_refresh",
+    "devices.last_call_backfill": "app.services.call_activity:handle_backfill",
 }
 
+Handler = Callable[[Any, Any], Awaitable[Any]]
+
+# Function path every job is enqueued with (job_service._enqueue_rq).
+_DISPATCH_FUNC = "worker.dispatch"
+
 
 def _import_handler(dotted_path: str):
     """Import 'module:func' and return the callable."""
@@ -39,6 +62,11 @@ def _import_handler(dotted_path: str):
     return getattr(module, func_name)
 
 
+def resolve_handlers() -> dict[str, Handler]:
+    """Import every registered handler up front (fails fast on a bad path)."""
+    return {job_type: _import_handler(path) for job_type, path in _HANDLERS.items()}
+
+
 def dispatch(job_id: int) -> None:
     """Main dispatch function called by RQ for every job.
 
@@ -47,7 +75,10 @@ def dispatch(job_id: int) -> None:
     asyncio.run(_dispatch_async(job_id))
 
 
-async def _dispatch_async(job_id: int) -> None:
+async def _dispatch_async(job_id: int, handlers: Optional[dict[str, Handler]] = None) -> Optional[str]:
+    """Run one job.  *handlers* is the pre-resolved registry (async
+    runtime); without it the handler is imported per job.  Returns the
+    job type, or ``None`` if the Job row does not exist."""
     from app.database import AsyncSessionLocal
     from app.services import job_service
 
@@ -55,16 +86,19 @@ async def _dispatch_async(job_id: int) -> None:
         job = await job_service.mark_running(db, job_id)
         if not job:
             logger.error("Job %s not found", job_id)
-            return
+            return None
+        # Commit the attempt now: if the handler is cut short its
+        # transaction is lost, and _mark_abandoned must see this attempt.
+        await db.commit()
 
         handler_path = _HANDLERS.get(job.job_type)
         if not handler_path:
             await job_service.mark_failed(db, job_id, f"Unknown job type: {job.job_type}")
             await db.commit()
-            return
+            return job.job_type
 
         try:
-            handler = _import_handler(handler_path)
+            handler = handlers[job.job_type] if handlers else _import_handler(handler_path)
             result = await handler(db, job)
             await job_service.mark_completed(db, job_id, result)
         except Exception as exc:
@@ -72,10 +106,217 @@ async def _dispatch_async(job_id: int) -> None:
             await job_service.mark_failed(db, job_id, str(exc))
 
         await db.commit()
+        return job.job_type
+
+
+async def _mark_abandoned(job_id: int, error: str) -> None:
+    """Record a dispatch that was cut short (timeout, cancellation) on the
+    Job row, in a fresh session — the handler's own one was torn down."""
+    from app.database import AsyncSessionLocal
+    from app.services import job_service
+
+    async with AsyncSessionLocal() as db:
+        await job_service.mark_failed(db, job_id, error)
+        await db.commit()
+
+
+# ─── Async runtime ──────────────────────────────────────────────────
+
+
+class JobTypeStats:
+    """Per-job-type counters and latency (``app.services.latency``)."""
+
+    def __init__(self):
+        self.started_at = time.monotonic()
+        self.completed: dict[str, int] = {}
+
+    def observe(self, job_type: str, ms: float) -> None:
+        from app.services.latency import histogram
+
+        self.completed[job_type] = self.completed.get(job_type, 0) + 1
+        histogram(f"worker.{job_type}").observe(ms)
+
+    def snapshot(self) -> list[dict]:
+        from app.services.latency import histogram
+
+        uptime = max(time.monotonic() - self.started_at, 1e-9)
+        out = []
+        for job_type, n in sorted(self.completed.items()):
+            h = histogram(f"worker.{job_type}").snapshot()
+            out.append({
+                "job_type": job_type,
+                "completed": n,
+                "per_minute": round(n * 60 / uptime, 2),
+                "p50_ms": h["p50_ms"],
+                "p95_ms": h["p95_ms"],
+                "mean_ms": round(h["sum_ms"] / h["count"], 1) if h["count"] else None,
+            })
+        return out
+
+
+class AsyncWorkerRuntime:
+    """Long-lived worker: pops RQ jobs and runs them on one event loop.
+
+    One consumer per queue; each holds a semaphore sized by the queue's
+    concurrency limit and only pops when a slot is free, so a queue never
+    has more than its limit in flight.  The blocking Redis pop runs in a
+    thread (``dequeue_timeout`` bounds it, so shutdown is prompt).
+
+    RQ is only the transport: the DB ``Job`` row stays the system of
+    record (status, attempts, retries via ``job_service.mark_failed``).
+    A popped RQ job sits in the queue's ``StartedJobRegistry`` while it
+    runs and is deleted afterwards; an infrastructure error (as opposed
+    to a handler error, which ``_dispatch_async`` records on the row)
+    lands it in the ``FailedJobRegistry``.
+
+    Each job is bounded by its RQ ``timeout`` (``job_timeout`` when it has
+    none).  A dispatch that times out or is cancelled is marked failed on
+    the DB row too, so the row never stays ``running``.  A foreign job run
+    in a thread cannot be interrupted; on timeout it is only abandoned.
+    """
+
+    def __init__(
+        self,
+        connection,
+        concurrency: dict[str, int],
+        handlers: dict[str, Handler],
+        *,
+        dequeue_timeout: int = 5,
+        job_timeout: int = 300,
+        stats_interval: int = 300,
+    ):
+        self.connection = connection
+        self.concurrency = concurrency
+        self.handlers = handlers
+        self.dequeue_timeout = dequeue_timeout
+        self.job_timeout = job_timeout
+        self.stats_interval = stats_interval
+        self.stats = JobTypeStats()
+        self._stopping = asyncio.Event()
+        self._in_flight: set[asyncio.Task] = set()
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    async def run(self) -> None:
+        consumers = [
+            asyncio.create_task(self._consume(name, limit), name=f"consume:{name}")
+            for name, limit in self.concurrency.items()
+        ]
+        reporter = asyncio.create_task(self._report())
+        try:
+            await self._stopping.wait()
+        finally:
+            await asyncio.gather(*consumers, return_exceptions=True)
+            if self._in_flight:
+                logger.info("Waiting for %d in-flight job(s)", len(self._in_flight))
+                await asyncio.gather(*self._in_flight, return_exceptions=True)
+            reporter.cancel()
+            self._log_stats()
+
+    def _dequeue(self, queue):
+        from rq import Queue
+        from rq.exceptions import DequeueTimeout
+
+        try:
+            popped = Queue.dequeue_any([queue], self.dequeue_timeout, connection=self.connection)
+        except DequeueTimeout:
+            return None
+        return popped[0] if popped else None
+
+    async def _consume(self, queue_name: str, limit: int) -> None:
+        from rq import Queue
+
+        queue = Queue(queue_name, connection=self.connection)
+        slots = asyncio.Semaphore(limit)
+        while not self._stopping.is_set():
+            await slots.acquire()
+            try:
+                rq_job = await asyncio.to_thread(self._dequeue, queue)
+            except Exception:
+                slots.release()
+                logger.exception("Dequeue from %s failed; backing off", queue_name)
+                await asyncio.sleep(self.dequeue_timeout)
+                continue
+            if rq_job is None:
+                slots.release()
+                continue
+            task = asyncio.create_task(self._run(queue, rq_job))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+            task.add_done_callback(lambda _t: slots.release())
+
+    async def _run(self, queue, rq_job) -> None:
+        from rq.registry import FailedJobRegistry, StartedJobRegistry
+
+        timeout = getattr(rq_job, "timeout", None) or self.job_timeout
+        ours = rq_job.func_name == _DISPATCH_FUNC
+        started = StartedJobRegistry(queue=queue)
+        await asyncio.to_thread(started.add, rq_job, timeout)
+        t0 = time.perf_counter()
+        try:
+            if ours:
+                job_type = await asyncio.wait_for(
+                    _dispatch_async(rq_job.args[0], self.handlers), timeout,
+                )
+            else:
+                # Not ours: run it the way RQ would, off the loop.
+                await asyncio.wait_for(asyncio.to_thread(rq_job.perform), timeout)
+                job_type = rq_job.func_name
+        except (asyncio.TimeoutError, asyncio.CancelledError) as exc:
+            timed_out = not isinstance(exc, asyncio.CancelledError)
+            logger.error("RQ job %s (%s) %s", rq_job.id, rq_job.func_name,
+                         f"timed out after {timeout}s" if timed_out else "was cancelled")
+            if ours:
+                await _mark_abandoned(
+                    rq_job.args[0], f"Timed out after {timeout}s" if timed_out else "Cancelled",
+                )
+            await asyncio.to_thread(
+                FailedJobRegistry(queue=queue).add, rq_job, exc_string=traceback.format_exc(),
+            )
+            if not timed_out:
+                raise
+            return
+        except Exception:
+            logger.exception("RQ job %s (%s) failed", rq_job.id, rq_job.func_name)
+            await asyncio.to_thread(
+                FailedJobRegistry(queue=queue).add, rq_job, exc_string=traceback.format_exc(),
+            )
+            return
+        finally:
+            await asyncio.to_thread(started.remove, rq_job)
+        if job_type:
+            self.stats.observe(job_type, (time.perf_counter() - t0) * 1000)
+        await asyncio.to_thread(rq_job.delete)
+
+    async def _report(self) -> None:
+        while True:
+            await asyncio.sleep(self.stats_interval)
+            self._log_stats()
+
+    def _log_stats(self) -> None:
+        for row in self.stats.snapshot():
+            logger.info(
+                "Worker stats: %(job_type)s completed=%(completed)s per_min=%(per_minute)s "
+                "p50_ms=%(p50_ms)s p95_ms=%(p95_ms)s mean_ms=%(mean_ms)s", row,
+            )
+
+
+async def _run_async_worker(conn, settings) -> None:
+    runtime = AsyncWorkerRuntime(
+        conn,
+        settings.worker_queue_concurrency,
+        resolve_handlers(),
+        stats_interval=settings.WORKER_STATS_INTERVAL_SECONDS,
+    )
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, runtime.stop)
+    logger.info("Starting async worker: %s", settings.worker_queue_concurrency)
+    await runtime.run()
 
 
 if __name__ == "__main__":
-    # Start the RQ worker directly
     try:
         from redis import Redis
         from rq import Worker, Queue
@@ -83,10 +324,14 @@ if __name__ == "__main__":
         from app.config import settings
 
         conn = Redis.from_url(settings.REDIS_URL)
-        queues = [Queue(name, connection=conn) for name in ("default", "provisioning", "polling")]
-        worker = Worker(queues, connection=conn)
-        logger.info("Starting RQ worker on queues: default, provisioning, polling")
-        worker.work()
+        if settings.WORKER_RUNTIME == "async":
+            asyncio.run(_run_async_worker(conn, settings))
+        else:
+            # Start the RQ worker directly
+            queues = [Queue(name, connection=conn) for name in ("default", "provisioning", "polling")]
+            worker = Worker(queues, connection=conn)
+            logger.info("Starting RQ worker on queues: default, provisioning, polling")
+            worker.work()
     except ImportError:
         logger.error("redis and rq packages required. Install: pip install redis rq")
         sys.exit(1)